@@ -1,4 +1,6 @@
 import flet as ft
+import atexit
+import multiprocessing
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -99,9 +101,15 @@ class QuizApp:
         # Initialize database
         init_database()
 
+        # Write answers left in the local journal by an exam that did not close cleanly
+        from quiz_app.utils.answer_journal import replay_answer_journals
+        replay_answer_journals()
+
         # Create database instance and connect it to session manager
         self.db = Database()
         self.session_manager.set_database(self.db)
+        # Connections are shared by every thread; release them all on exit
+        atexit.register(self.db.close_all)
 
         # Load system language setting from database
         self.load_system_language()
@@ -155,6 +163,11 @@ class QuizApp:
         if user_data['role'] == 'expert':
             self.expert_view_mode = 'expert'
 
+        # Admins and experts export PDFs; parse the fonts before the first export
+        if user_data['role'] in (ROLE_ADMIN, ROLE_EXPERT):
+            from quiz_app.utils.pdf_fonts import warm_pdf_fonts
+            warm_pdf_fonts()
+
         # Show appropriate dashboard
         self.show_dashboard(page)
 
@@ -319,6 +332,8 @@ def main(page: ft.Page):
     app.main(page)
 
 if __name__ == "__main__":
+    # PDF export renders variants in worker processes; needed in the packaged executable
+    multiprocessing.freeze_support()
     # Determine assets directory based on whether we're packaged or not
     if getattr(sys, 'frozen', False):
         # Running as packaged executable
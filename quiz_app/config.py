@@ -71,6 +71,30 @@ def get_database_path():
 
 # Database configuration
 DATABASE_PATH = get_database_path()
+DATABASE_BUSY_TIMEOUT_MS = 5000  # How long a connection waits on a locked database
+DATABASE_JOURNAL_MODE = 'WAL'  # WAL lets report readers run alongside examinee writes
+
+# Query profiling (can also be toggled at runtime from admin Settings)
+QUERY_PROFILING_ENABLED = False
+SLOW_QUERY_THRESHOLD_MS = 200  # Statements slower than this are logged with their query plan
+SLOW_QUERY_LOG_PATH = os.path.join(DATA_DIR, 'logs', 'slow_queries.log')
+
+# Write-behind answer journal (local disk, even when the database is on a shared folder)
+ANSWER_JOURNAL_DIR = os.path.join(DATA_DIR, 'journal')
+ANSWER_FLUSH_INTERVAL_SECONDS = 3  # Background flush cadence for queued answers
+ANSWER_SUBMIT_FLUSH_ATTEMPTS = 5  # Flushes tried at submission before it is refused
+ANSWER_SUBMIT_FLUSH_RETRY_SECONDS = 1.0  # Pause between those flushes
+
+# In-progress exam checkpoints (local disk), used to resume after a crash
+EXAM_CHECKPOINT_DIR = os.path.join(DATA_DIR, 'checkpoints')
+EXAM_CHECKPOINT_INTERVAL_SECONDS = 15  # Periodic save cadence; navigation and answers save within a second
+TELEMETRY_FLUSH_INTERVAL_SECONDS = 30  # Batch cadence for per-question exam events
+
+# PDF export: processes rendering variant documents in parallel (None = one per CPU, 1 = in-process)
+PDF_EXPORT_MAX_WORKERS = None
+# Rendered exam papers and answer keys, keyed by a hash of everything they are rendered from
+PDF_CACHE_DIR = os.path.join(DATA_DIR, 'pdf_cache')
+PDF_CACHE_MAX_MB = 500  # Least recently used files are removed beyond this
 
 # Security settings
 SECRET_KEY = "your-secret-key-change-in-production"
@@ -100,12 +124,22 @@ UPLOAD_FOLDER = os.path.join(DATA_DIR, 'assets', 'images')
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
+# Downscaled copies generated once per uploaded question image (longest side, px)
+IMAGE_THUMBNAIL_MAX_PX = 200  # Question list and upload previews
+IMAGE_DISPLAY_MAX_PX = 600  # Exam interface and question preview
+
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Exam interface image cache (per exam session)
+IMAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Image bytes the cache keeps pinned in the asset server
+IMAGE_PREFETCH_RADIUS = 2  # Questions ahead of and behind the current one to warm
+ASSET_SERVER_MAX_BYTES = 64 * 1024 * 1024  # Local asset server budget; only unpinned images are evicted beyond it
+
 # Exam settings
 DEFAULT_EXAM_DURATION = 60  # minutes
 MAX_QUESTIONS_PER_EXAM = 100
+EXAM_TIMER_UNFOCUSED_REFRESH_SECONDS = 5  # Countdown redraw cadence while the exam window is in the background
 
 # UI Settings
 COLORS = {
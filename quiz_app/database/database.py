@@ -8,10 +8,16 @@ except ImportError:
     ENCRYPTION_ENABLED = False
 
 import os
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Iterable
+from contextlib import contextmanager
 from datetime import datetime
-from quiz_app.config import DATABASE_PATH
+from quiz_app.config import DATABASE_PATH, DATABASE_BUSY_TIMEOUT_MS, DATABASE_JOURNAL_MODE
+from quiz_app.database import profiler as _profiling
 
 logger = logging.getLogger(__name__)
 
@@ -20,59 +26,473 @@ logger = logging.getLogger(__name__)
 # For now, using a strong default key
 DATABASE_ENCRYPTION_KEY = "QuizApp2025!AzErCoSmOs#SecureKey$Protected"
 
+# Statements that may be served by the read-only connection
+_READ_ONLY_PREFIXES = ('SELECT', 'WITH')
+
+# Rows fetched per fetchmany() call by the streaming APIs
+DEFAULT_FETCH_SIZE = 500
+
+# Question columns needed for selection, scoring and navigation. The image
+# columns are left out; has_image flags their presence and the bytes are
+# fetched on demand with Database.get_question_image().
+QUESTION_METADATA_COLUMNS = (
+    'id', 'exam_id', 'question_text', 'question_type', 'correct_answer', 'explanation',
+    'points', 'difficulty_level', 'order_index', 'is_active', 'created_at',
+)
+
+
+def question_columns(alias: str = '') -> str:
+    """
+    Build the BLOB-free SELECT list for the questions table.
+
+    Args:
+        alias: Table alias used in the query (e.g. 'q'), or '' for none
+
+    Returns:
+        str: Comma-separated column list ending with a has_image flag
+    """
+    prefix = f"{alias}." if alias else ''
+    columns = ', '.join(f"{prefix}{column}" for column in QUESTION_METADATA_COLUMNS)
+    return (f"{columns}, CASE WHEN {prefix}image_sha256 IS NOT NULL OR {prefix}image_data IS NOT NULL "
+            f"THEN 1 ELSE 0 END as has_image")
+
+# SQLCipher stores its per-database KDF salt in the first 16 bytes of the file
+_SQLCIPHER_SALT_SIZE = 16
+_SQLCIPHER_KEY_SIZE = 32
+_KDF_HASHES = {
+    'PBKDF2_HMAC_SHA512': 'sha512',
+    'PBKDF2_HMAC_SHA256': 'sha256',
+    'PBKDF2_HMAC_SHA1': 'sha1',
+}
+# (iterations, algorithm) pragmas of a keyed connection (True) or the library defaults (False)
+_KDF_PRAGMAS = {
+    True: ('kdf_iter', 'cipher_kdf_algorithm'),
+    False: ('cipher_default_kdf_iter', 'cipher_default_kdf_algorithm'),
+}
+
+# Session-wide counters for SQLCipher key handling
+_key_stats_lock = threading.Lock()
+_key_stats = {
+    'key_derivations': 0,      # full PBKDF2 runs (passphrase-keyed opens and raw key derivations)
+    'derivation_seconds': 0.0,
+    'raw_key_opens': 0,        # connections keyed with the cached derived key
+}
+
+
+def _record_key_stat(name: str, elapsed: float = 0.0):
+    with _key_stats_lock:
+        _key_stats[name] += 1
+        if name == 'key_derivations':
+            _key_stats['derivation_seconds'] += elapsed
+
+
+def get_key_derivation_stats() -> Dict[str, Any]:
+    """Return how many SQLCipher key derivations happened in this process."""
+    with _key_stats_lock:
+        return dict(_key_stats)
+
+
+class _ConnectionPool:
+    """
+    Per-database-file connection state shared by every Database instance.
+
+    Each thread gets its own read-write connection and, when WAL is active,
+    its own read-only connection. The SQLCipher key is derived once; every
+    connection is then keyed with the derived raw key and skips PBKDF2.
+    """
+
+    _registry: Dict[str, '_ConnectionPool'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, db_path: str, busy_timeout_ms: int, journal_mode: str):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.journal_mode = journal_mode
+        self.local = threading.local()
+        self._lock = threading.Lock()
+        # (thread, connection) pairs so close() can release every connection
+        self._connections = []
+        self.wal_enabled = False
+        self._raw_key: Optional[str] = None
+        # Set once the key derived from the default KDF settings failed for this file
+        self._default_kdf_rejected = False
+
+    @classmethod
+    def for_path(cls, db_path: str, busy_timeout_ms: int, journal_mode: str) -> '_ConnectionPool':
+        key = db_path if db_path == ':memory:' else os.path.abspath(db_path)
+        if db_path == ':memory:':
+            # Every in-memory database is private to its Database instance
+            return cls(db_path, busy_timeout_ms, journal_mode)
+        with cls._registry_lock:
+            pool = cls._registry.get(key)
+            if pool is None:
+                pool = cls(db_path, busy_timeout_ms, journal_mode)
+                cls._registry[key] = pool
+            return pool
+
+    def _apply_key(self, conn, read_only: bool = False):
+        """
+        Key a fresh SQLCipher connection, preferring the cached raw key.
+
+        The raw key is derived in Python (one PBKDF2) from the file's salt and
+        SQLCipher's default KDF settings, and the first connection is keyed
+        with it as well, so a session costs a single derivation. The passphrase
+        is only used when that key is rejected or the file has no salt yet.
+        """
+        if not self._raw_key and not self._default_kdf_rejected:
+            self._raw_key = self._derive_raw_key(conn, keyed=False)
+        if self._raw_key:
+            conn.execute(f"PRAGMA key = \"x'{self._raw_key}'\"")
+            try:
+                conn.execute("SELECT count(*) FROM sqlite_master")
+                _record_key_stat('raw_key_opens')
+                return conn
+            except sqlite3.DatabaseError:
+                # Non-default KDF settings, or the file was replaced/rekeyed
+                logger.info("Derived SQLCipher key rejected, keying with the passphrase")
+                self._raw_key = None
+                self._default_kdf_rejected = True
+                conn.close()
+                conn = self._connect(read_only)
+
+        started = time.perf_counter()
+        conn.execute(f"PRAGMA key='{DATABASE_ENCRYPTION_KEY}'")
+        # Verify database is accessible (will fail if key is wrong)
+        try:
+            conn.execute("SELECT count(*) FROM sqlite_master")
+        except sqlite3.DatabaseError as e:
+            conn.close()
+            logger.error(f"Database encryption key validation failed: {e}")
+            raise Exception("Unable to decrypt database. Encryption key may be incorrect.")
+        _record_key_stat('key_derivations', time.perf_counter() - started)
+
+        if not self._raw_key:
+            # The keyed connection reports the file's actual KDF settings
+            self._raw_key = self._derive_raw_key(conn, keyed=True)
+        return conn
+
+    def _derive_raw_key(self, conn, keyed: bool) -> Optional[str]:
+        """
+        Derive the raw SQLCipher key of the file from the passphrase.
+
+        Args:
+            conn: Connection to read the KDF settings from
+            keyed: True if conn is keyed (file settings), False for SQLCipher's defaults
+
+        Returns:
+            Hex key, or None if the file has no salt yet or the KDF is unsupported
+        """
+        if self.db_path == ':memory:':
+            return None
+        try:
+            with open(self.db_path, 'rb') as handle:
+                salt = handle.read(_SQLCIPHER_SALT_SIZE)
+            if len(salt) < _SQLCIPHER_SALT_SIZE:
+                return None  # Empty database; no salt has been written yet
+            iter_pragma, algorithm_pragma = _KDF_PRAGMAS[keyed]
+            iterations = int(conn.execute(f"PRAGMA {iter_pragma}").fetchone()[0])
+            algorithm_row = conn.execute(f"PRAGMA {algorithm_pragma}").fetchone()
+            algorithm = str(algorithm_row[0]).upper() if algorithm_row else 'PBKDF2_HMAC_SHA512'
+            digest = _KDF_HASHES.get(algorithm)
+            if not digest:
+                return None
+            started = time.perf_counter()
+            derived = hashlib.pbkdf2_hmac(
+                digest, DATABASE_ENCRYPTION_KEY.encode('utf-8'), salt, iterations, _SQLCIPHER_KEY_SIZE
+            )
+            _record_key_stat('key_derivations', time.perf_counter() - started)
+            return derived.hex().upper()
+        except Exception as e:
+            logger.debug(f"SQLCipher raw key derivation skipped: {e}")
+            return None
+
+    def _connect(self, read_only: bool = False):
+        if read_only:
+            uri = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+            return sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   timeout=self.busy_timeout_ms / 1000)
+        # check_same_thread=False only so close() may release it from another thread
+        return sqlite3.connect(self.db_path, check_same_thread=False,
+                               timeout=self.busy_timeout_ms / 1000)
+
+    def open_connection(self, read_only: bool = False):
+        """Open and configure a new connection for the calling thread."""
+        conn = self._connect(read_only)
+        if ENCRYPTION_ENABLED:
+            conn = self._apply_key(conn, read_only)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+
+        if not read_only and self.db_path != ':memory:':
+            try:
+                mode = conn.execute(f"PRAGMA journal_mode = {self.journal_mode}").fetchone()[0]
+                self.wal_enabled = str(mode).upper() == 'WAL'
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Could not set journal_mode={self.journal_mode}: {e}")
+
+        self._register_connection(conn)
+        return conn
+
+    def _register_connection(self, conn):
+        current = threading.current_thread()
+        with self._lock:
+            alive = []
+            for thread, existing in self._connections:
+                if thread.is_alive():
+                    alive.append((thread, existing))
+                else:
+                    # Thread finished without closing; release its connection
+                    try:
+                        existing.close()
+                    except Exception:
+                        pass
+            alive.append((current, conn))
+            self._connections = alive
+
+    def close(self):
+        """Close the calling thread's connections."""
+        current = threading.current_thread()
+        with self._lock:
+            connections = [conn for thread, conn in self._connections if thread is current]
+            self._connections = [(thread, conn) for thread, conn in self._connections if thread is not current]
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self.local.__dict__.pop('connection', None)
+        self.local.__dict__.pop('read_connection', None)
+
+    def close_all(self):
+        """Close every thread's connections (application shutdown)."""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for _, conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self.local = threading.local()
+
+
 class Database:
-    def __init__(self, db_path: Optional[str] = None):
+    """
+    Thread-aware access to the application database.
+
+    Every thread gets its own read-write connection (SQLite connections must
+    not be used by two threads at once), plus a separate read-only connection
+    for SELECT queries. With WAL journaling the readers never block writers,
+    so report queries cannot stall examinee answer saves.
+
+    Connections are shared process-wide per database file, so creating a new
+    Database() is cheap and does not repeat the SQLCipher key derivation.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, busy_timeout_ms: Optional[int] = None,
+                 journal_mode: Optional[str] = None):
         self.db_path = db_path or DATABASE_PATH
-        self._connection = None
-        
+        self.busy_timeout_ms = DATABASE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+        self.journal_mode = (journal_mode or DATABASE_JOURNAL_MODE).upper()
+        # Settings of the first Database() for a file win; later instances share its pool
+        self._pool = _ConnectionPool.for_path(self.db_path, self.busy_timeout_ms, self.journal_mode)
+
     def get_connection(self):
-        if self._connection is None:
-            # check_same_thread=False allows using the connection across Flet threads
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-
-            # Apply encryption key if SQLCipher is enabled
-            if ENCRYPTION_ENABLED:
-                conn.execute(f"PRAGMA key='{DATABASE_ENCRYPTION_KEY}'")
-                # Verify database is accessible (will fail if key is wrong)
-                try:
-                    conn.execute("SELECT count(*) FROM sqlite_master")
-                except sqlite3.DatabaseError as e:
-                    logger.error(f"Database encryption key validation failed: {e}")
-                    raise Exception("Unable to decrypt database. Encryption key may be incorrect.")
-            
-            self._connection = conn
-
-        return self._connection
-    
+        """Return the calling thread's read-write connection."""
+        local = self._pool.local
+        conn = getattr(local, 'connection', None)
+        if conn is None:
+            conn = self._pool.open_connection()
+            local.connection = conn
+        return conn
+
+    def get_read_connection(self):
+        """
+        Return the calling thread's read-only connection.
+
+        Falls back to the read-write connection when WAL is not active
+        (a separate reader would then contend for the same locks) or when
+        the database file cannot be opened read-only.
+        """
+        writer = self.get_connection()
+        if not self._pool.wal_enabled:
+            return writer
+
+        local = self._pool.local
+        conn = getattr(local, 'read_connection', None)
+        if conn is None:
+            try:
+                conn = self._pool.open_connection(read_only=True)
+            except Exception as e:
+                logger.warning(f"Read-only connection unavailable, using writer: {e}")
+                return writer
+            local.read_connection = conn
+        return conn
+
+    def _connection_for(self, query: str):
+        if self.in_transaction():
+            return self.get_connection()
+        if query.lstrip().upper().startswith(_READ_ONLY_PREFIXES):
+            return self.get_read_connection()
+        return self.get_connection()
+
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict]:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        conn = self._connection_for(query)
+        profiler = _profiling.get_active_profiler()
+        started = time.perf_counter() if profiler else 0.0
+        cursor = conn.cursor()
+        try:
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            rows = [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+        if profiler:
+            profiler.record(query, params, (time.perf_counter() - started) * 1000, conn)
+        return rows
     
+    def execute_chunks(self, query: str, params: tuple = (), chunk_size: int = DEFAULT_FETCH_SIZE,
+                       row_type: str = 'dict') -> Iterator[List[Any]]:
+        """
+        Stream a query's result in lists of at most chunk_size rows.
+
+        Rows are fetched with fetchmany() so only one chunk is held in memory.
+        The cursor stays open until the generator is exhausted or closed.
+
+        Args:
+            query: SQL statement to run
+            params: Statement parameters
+            chunk_size: Rows per fetchmany() call
+            row_type: 'dict' (like execute_query), 'row' (sqlite3.Row) or 'tuple'
+
+        Yields:
+            List of rows in the requested representation
+        """
+        if row_type not in ('dict', 'row', 'tuple'):
+            raise ValueError(f"Unsupported row_type: {row_type}")
+
+        conn = self._connection_for(query)
+        profiler = _profiling.get_active_profiler()
+        # Only time spent inside SQLite is counted, not time the consumer holds each chunk
+        elapsed = 0.0
+        cursor = conn.cursor()
+        if row_type == 'tuple':
+            cursor.row_factory = None
+        try:
+            started = time.perf_counter()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if row_type == 'dict':
+                    rows = [dict(row) for row in rows]
+                elapsed += time.perf_counter() - started
+                yield rows
+                started = time.perf_counter()
+            elapsed += time.perf_counter() - started
+        finally:
+            cursor.close()
+        if profiler:
+            profiler.record(query, params, elapsed * 1000, conn)
+
+    def execute_iter(self, query: str, params: tuple = (), row_type: str = 'dict',
+                     fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Any]:
+        """Stream a query's result one row at a time (see execute_chunks)."""
+        for chunk in self.execute_chunks(query, params, chunk_size=fetch_size, row_type=row_type):
+            yield from chunk
+
     def execute_single(self, query: str, params: tuple = ()) -> Optional[Dict]:
         result = self.execute_query(query, params)
         return result[0] if result else None
     
+    def in_transaction(self) -> bool:
+        """True while the calling thread is inside a db.transaction() block."""
+        return getattr(self._pool.local, 'transaction_depth', 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one atomic commit.
+
+        Inside the block execute_insert/execute_update/execute_many do not
+        commit individually, and reads go through the read-write connection
+        so they see the pending changes. The outermost block commits on
+        success and rolls back on any exception; nested blocks join it.
+
+            with db.transaction():
+                db.execute_many("INSERT INTO ...", rows)
+                db.execute_update("UPDATE ...", params)
+        """
+        local = self._pool.local
+        conn = self.get_connection()
+        depth = getattr(local, 'transaction_depth', 0)
+        if depth == 0 and not conn.in_transaction:
+            # IMMEDIATE takes the write lock up front so the commit cannot hit SQLITE_BUSY
+            conn.execute("BEGIN IMMEDIATE")
+        local.transaction_depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            local.transaction_depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        else:
+            local.transaction_depth = depth
+            if depth == 0:
+                conn.commit()
+
+    def _run_write(self, query: str, params, many: bool = False):
+        conn = self.get_connection()
+        profiler = _profiling.get_active_profiler()
+        started = time.perf_counter() if profiler else 0.0
+        cursor = conn.cursor()
+        try:
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
+            if not self.in_transaction():
+                conn.commit()
+            if profiler:
+                # executemany consumes its parameter iterator, so there is nothing to EXPLAIN with
+                profiler.record(query, None if many else params, (time.perf_counter() - started) * 1000,
+                                None if many else conn)
+            return cursor
+        except Exception:
+            if not self.in_transaction():
+                conn.rollback()
+            raise
+
     def execute_insert(self, query: str, params: tuple = ()) -> int:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.lastrowid
+        return self._run_write(query, params).lastrowid
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.rowcount
-            
+        return self._run_write(query, params).rowcount
+
+    def execute_many(self, query: str, params_seq: Iterable[tuple]) -> int:
+        """
+        Run one statement for every parameter tuple with executemany().
+
+        Commits once for the whole batch (or joins the enclosing transaction).
+
+        Returns:
+            int: Total rows affected across the batch
+        """
+        return self._run_write(query, params_seq, many=True).rowcount
+
     def close(self):
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """
+        Close the calling thread's connections to this database file.
+
+        Connections are shared by all Database instances for the same file, so
+        other threads keep theirs; they reopen lazily on next use.
+        """
+        self._pool.close()
+
+    def close_all(self):
+        """Close every thread's connections to this database file (for shutdown)."""
+        self._pool.close_all()
 
     @staticmethod
     def _validate_identifier(name: str):
@@ -83,10 +503,9 @@ class Database:
     def _column_exists(self, table: str, column: str) -> bool:
         self._validate_identifier(table)
         self._validate_identifier(column)
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table})")
-            return any(row[1] == column for row in cursor.fetchall())
+        cursor = self.get_connection().cursor()
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
 
     def ensure_column_exists(self, table: str, column: str, definition: str) -> bool:
         """
@@ -102,10 +521,8 @@ class Database:
             raise ValueError("Column definition must be provided")
 
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
-                conn.commit()
+            # Commits immediately unless called inside db.transaction()
+            self.execute_update(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
             logger.info("Added missing column %s.%s", table, column)
             return True
         except sqlite3.OperationalError as exc:
@@ -115,7 +532,11 @@ class Database:
     # Image storage helper methods
     def store_question_image(self, question_id: int, image_bytes: bytes, filename: str, mime_type: str) -> bool:
         """
-        Store image data as encrypted BLOB in database for a question.
+        Store an image for a question in the content-addressed image store.
+
+        Images are keyed by the SHA-256 of their bytes, so byte-identical
+        uploads (e.g. bulk-imported duplicates) are stored once. Thumbnail and
+        display derivatives are generated on first upload.
 
         Args:
             question_id: The question ID to attach the image to
@@ -127,52 +548,126 @@ class Database:
             bool: True if successful, False otherwise
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+            digest = hashlib.sha256(image_bytes).hexdigest()
+            with self.transaction():
+                previous = self.execute_single(
+                    "SELECT image_sha256 FROM questions WHERE id = ?", (question_id,)
+                )
+                if not self.execute_single("SELECT 1 as found FROM question_images WHERE sha256 = ?", (digest,)):
+                    from quiz_app.utils.image_derivatives import generate_derivatives
+                    derivatives = generate_derivatives(image_bytes)
+                    thumbnail = derivatives.get('thumbnail') or (None, None)
+                    display = derivatives.get('display') or (None, None)
+                    self.execute_insert("""
+                        INSERT INTO question_images
+                            (sha256, mime_type, width, height, original_data,
+                             display_data, display_mime_type, thumbnail_data, thumbnail_mime_type)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (digest, mime_type, derivatives['width'], derivatives['height'], image_bytes,
+                          display[0], display[1], thumbnail[0], thumbnail[1]))
+                    logger.info(f"Stored new image {digest[:12]} ({len(image_bytes)} bytes)")
+
+                self.execute_update("""
                     UPDATE questions
-                    SET image_data = ?, image_filename = ?, image_mime_type = ?
+                    SET image_sha256 = ?, image_data = NULL, image_filename = ?, image_mime_type = ?
                     WHERE id = ?
-                """, (image_bytes, filename, mime_type, question_id))
-                conn.commit()
-                logger.info(f"Stored encrypted image for question {question_id}: {filename} ({len(image_bytes)} bytes)")
-                return True
+                """, (digest, filename, mime_type, question_id))
+
+                if previous and previous.get('image_sha256') not in (None, digest):
+                    self._delete_orphaned_image(previous['image_sha256'])
+            logger.info(f"Attached image {digest[:12]} to question {question_id}: {filename}")
+            return True
         except Exception as e:
             logger.error(f"Failed to store image for question {question_id}: {e}")
             return False
 
-    def get_question_image(self, question_id: int) -> Optional[Dict[str, Any]]:
+    def get_question_image(self, question_id: int, max_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
-        Retrieve encrypted image data from database for a question.
+        Retrieve a question's image, optionally as a smaller derivative.
 
         Args:
             question_id: The question ID to retrieve image for
+            max_size: Longest side (px) the caller displays the image at; the
+                smallest stored version covering it is returned. None returns
+                the original.
 
         Returns:
-            Dict with 'data' (bytes), 'filename' (str), 'mime_type' (str), or None if no image
+            Dict with 'data' (bytes), 'filename' (str), 'mime_type' (str),
+            'variant' (str) and 'sha256' (str or None), or None if no image
         """
         try:
             result = self.execute_single("""
-                SELECT image_data, image_filename, image_mime_type
-                FROM questions
-                WHERE id = ? AND image_data IS NOT NULL
+                SELECT q.image_filename, q.image_mime_type, q.image_sha256,
+                       CASE WHEN qi.sha256 IS NULL THEN q.image_data END as legacy_data
+                FROM questions q
+                LEFT JOIN question_images qi ON qi.sha256 = q.image_sha256
+                WHERE q.id = ? AND (qi.sha256 IS NOT NULL OR q.image_data IS NOT NULL)
             """, (question_id,))
-
-            if result and result.get('image_data'):
-                return {
-                    'data': result['image_data'],
-                    'filename': result.get('image_filename', 'image.png'),
-                    'mime_type': result.get('image_mime_type', 'image/png')
-                }
-            return None
+            if not result:
+                return None
+
+            image = {
+                'filename': result.get('image_filename') or 'image.png',
+                'mime_type': result.get('image_mime_type') or 'image/png',
+                'sha256': result.get('image_sha256'),
+                'variant': 'original',
+            }
+            if result.get('legacy_data'):
+                # Not yet moved into question_images
+                image['data'] = result['legacy_data']
+                return image
+
+            stored = self.get_stored_image(result['image_sha256'], max_size)
+            if not stored:
+                return None
+            image.update(stored)
+            return image
         except Exception as e:
             logger.error(f"Failed to retrieve image for question {question_id}: {e}")
             return None
 
+    def get_stored_image(self, sha256: str, max_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load one version of an image from the content-addressed store.
+
+        Returns:
+            Dict with 'data', 'mime_type' and 'variant', or None if unknown
+        """
+        from quiz_app.utils.image_derivatives import pick_variant
+
+        available = self.execute_single("""
+            SELECT thumbnail_data IS NOT NULL as thumbnail, display_data IS NOT NULL as display
+            FROM question_images WHERE sha256 = ?
+        """, (sha256,))
+        if not available:
+            return None
+
+        variant = pick_variant(available, max_size)
+        # Only the chosen version's BLOB is read
+        data_column, mime_column = {
+            'thumbnail': ('thumbnail_data', 'thumbnail_mime_type'),
+            'display': ('display_data', 'display_mime_type'),
+            'original': ('original_data', 'mime_type'),
+        }[variant]
+        row = self.execute_single(
+            f"SELECT {data_column} as data, {mime_column} as mime_type FROM question_images WHERE sha256 = ?",
+            (sha256,)
+        )
+        return {'data': row['data'], 'mime_type': row['mime_type'], 'variant': variant}
+
+    def _delete_orphaned_image(self, sha256: str):
+        """Drop a stored image once no question references it."""
+        self.execute_update("""
+            DELETE FROM question_images
+            WHERE sha256 = ? AND NOT EXISTS (SELECT 1 FROM questions WHERE image_sha256 = ?)
+        """, (sha256, sha256))
+
     def delete_question_image(self, question_id: int) -> bool:
         """
         Delete image data from a question.
 
+        The stored image itself is removed once no other question uses it.
+
         Args:
             question_id: The question ID to remove image from
 
@@ -180,655 +675,538 @@ class Database:
             bool: True if successful, False otherwise
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+            with self.transaction():
+                previous = self.execute_single(
+                    "SELECT image_sha256 FROM questions WHERE id = ?", (question_id,)
+                )
+                self.execute_update("""
                     UPDATE questions
-                    SET image_data = NULL, image_filename = NULL, image_mime_type = NULL
+                    SET image_data = NULL, image_sha256 = NULL, image_filename = NULL, image_mime_type = NULL
                     WHERE id = ?
                 """, (question_id,))
-                conn.commit()
-                logger.info(f"Deleted image for question {question_id}")
-                return True
+                if previous and previous.get('image_sha256'):
+                    self._delete_orphaned_image(previous['image_sha256'])
+            logger.info(f"Deleted image for question {question_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to delete image for question {question_id}: {e}")
             return False
 
-# Database schema creation
-def create_tables():
-    db = Database()
-    
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                full_name TEXT NOT NULL,
-                role TEXT NOT NULL DEFAULT 'examinee',
-                department TEXT,
-                section TEXT,
-                unit TEXT,
-                employee_id TEXT,
-                is_active BOOLEAN DEFAULT 1,
-                password_change_required BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        ''')
-
-        # Add section and unit columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN section TEXT')
-        except sqlite3.OperationalError:
-            # Column already exists
-            pass
-
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN unit TEXT')
-        except sqlite3.OperationalError:
-            # Column already exists
-            pass
-
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN language_preference TEXT DEFAULT "en"')
-        except sqlite3.OperationalError:
-            # Column already exists
-            pass
-
-        # Set default language preference for existing users who don't have it
-        try:
-            cursor.execute('UPDATE users SET language_preference = "en" WHERE language_preference IS NULL')
-            conn.commit()
-        except:
-            pass
-
-        # Exams table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                duration_minutes INTEGER NOT NULL DEFAULT 60,
-                passing_score REAL NOT NULL DEFAULT 70.0,
-                max_attempts INTEGER DEFAULT 1,
-                randomize_questions BOOLEAN DEFAULT 0,
-                show_results BOOLEAN DEFAULT 1,
-                is_active BOOLEAN DEFAULT 1,
-                start_date TIMESTAMP,
-                end_date TIMESTAMP,
-                created_by INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by) REFERENCES users (id)
-            )
-        ''')
-        
-        # Add category column if it doesn't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN category TEXT')
-        except sqlite3.OperationalError:
-            # Column already exists
-            pass
-        
-        # Add security settings columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN enable_fullscreen BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN prevent_focus_loss BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN enable_logging BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN enable_pattern_analysis BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        # Add question pool columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN use_question_pool BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN total_questions_in_pool INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN questions_to_select INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN easy_questions_count INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN medium_questions_count INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE exams ADD COLUMN hard_questions_count INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-
-        # Ensure PDF variant count column exists on exam assignments
-        try:
-            cursor.execute('ALTER TABLE exam_assignments ADD COLUMN pdf_variant_count INTEGER DEFAULT 1')
-        except sqlite3.OperationalError:
-            pass
-        
-        # Questions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                exam_id INTEGER NOT NULL,
-                question_text TEXT NOT NULL,
-                question_type TEXT NOT NULL,
-                image_data BLOB,
-                image_filename TEXT,
-                image_mime_type TEXT,
-                correct_answer TEXT,
-                explanation TEXT,
-                points REAL DEFAULT 1.0,
-                difficulty_level TEXT DEFAULT 'medium',
-                order_index INTEGER,
-                is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (exam_id) REFERENCES exams (id)
-            )
-        ''')
-        
-        # Question options table (for multiple choice questions)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS question_options (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                question_id INTEGER NOT NULL,
-                option_text TEXT NOT NULL,
-                is_correct BOOLEAN DEFAULT 0,
-                order_index INTEGER,
-                FOREIGN KEY (question_id) REFERENCES questions (id)
-            )
-        ''')
-        
-        # Exam sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exam_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                exam_id INTEGER NOT NULL,
-                assignment_id INTEGER,
-                start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                end_time TIMESTAMP,
-                duration_seconds INTEGER,
-                score REAL,
-                total_questions INTEGER,
-                correct_answers INTEGER,
-                status TEXT DEFAULT 'in_progress',
-                attempt_number INTEGER DEFAULT 1,
-                ip_address TEXT,
-                user_agent TEXT,
-                is_completed BOOLEAN DEFAULT 0,
-                is_active BOOLEAN DEFAULT 1,
-                email_sent BOOLEAN DEFAULT 0,
-                focus_loss_count INTEGER DEFAULT 0,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (exam_id) REFERENCES exams (id),
-                FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE
-            )
-        ''')
-        
-        # User answers table
-        # CRITICAL FIX: Added UNIQUE constraint on (session_id, question_id) to prevent duplicates
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_answers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                question_id INTEGER NOT NULL,
-                answer_text TEXT,
-                selected_option_id INTEGER,
-                selected_option_ids TEXT,
-                is_correct BOOLEAN,
-                points_earned REAL DEFAULT 0,
-                time_spent_seconds INTEGER,
-                answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
-                FOREIGN KEY (question_id) REFERENCES questions (id),
-                FOREIGN KEY (selected_option_id) REFERENCES question_options (id),
-                UNIQUE(session_id, question_id)
-            )
-        ''')
-        
-        # Add selected_option_ids column if it doesn't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE user_answers ADD COLUMN selected_option_ids TEXT')
-        except sqlite3.OperationalError:
-            # Column already exists
-            pass
-        
-        # Session questions table (tracks which questions were selected for each exam session)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS session_questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                question_id INTEGER NOT NULL,
-                difficulty_level TEXT NOT NULL,
-                order_index INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
-                FOREIGN KEY (question_id) REFERENCES questions (id),
-                UNIQUE(session_id, question_id)
-            )
-        ''')
-        
-        # Exam permissions table (for user-specific exam access)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exam_permissions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                exam_id INTEGER NOT NULL,
-                granted_by INTEGER NOT NULL,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP,
-                is_active BOOLEAN DEFAULT 1,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (exam_id) REFERENCES exams (id),
-                FOREIGN KEY (granted_by) REFERENCES users (id),
-                UNIQUE(user_id, exam_id)
-            )
-        ''')
-
-        # Exam observers table (experts allowed to view specific topics)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exam_observers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                exam_id INTEGER NOT NULL,
-                observer_id INTEGER NOT NULL,
-                granted_by INTEGER NOT NULL,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (exam_id) REFERENCES exams (id),
-                FOREIGN KEY (observer_id) REFERENCES users (id),
-                FOREIGN KEY (granted_by) REFERENCES users (id),
-                UNIQUE(exam_id, observer_id)
-            )
-        ''')
-        
-        # PDF exports table (for tracking variant exports)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pdf_exports (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                exam_id INTEGER NOT NULL,
-                variant_number INTEGER NOT NULL,
-                question_snapshot TEXT NOT NULL,
-                exported_by INTEGER NOT NULL,
-                exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                file_path TEXT,
-                notes TEXT,
-                FOREIGN KEY (exam_id) REFERENCES exams (id),
-                FOREIGN KEY (exported_by) REFERENCES users (id),
-                UNIQUE(exam_id, variant_number)
-            )
-        ''')
-
-        # Email templates table (for customizable email notifications)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS email_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                template_type TEXT NOT NULL,
-                language TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                body_template TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(template_type, language)
-            )
-        ''')
-
-        # Email log table (for tracking email notifications)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS email_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                recipient_email TEXT NOT NULL,
-                recipient_name TEXT,
-                sent_by INTEGER NOT NULL,
-                email_type TEXT NOT NULL,
-                language TEXT NOT NULL,
-                sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
-                FOREIGN KEY (sent_by) REFERENCES users (id)
-            )
-        ''')
-
-        # Exam Preset Templates table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exam_preset_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                created_by_user_id INTEGER NOT NULL,
-                is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by_user_id) REFERENCES users (id)
-            )
-        ''')
-
-        # Add is_active column to exam_preset_templates if it doesn't exist
-        db.ensure_column_exists('exam_preset_templates', 'is_active', 'BOOLEAN DEFAULT 1')
-
-        # Junction table for preset templates and exam topics
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS preset_template_exams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                template_id INTEGER NOT NULL,
-                exam_id INTEGER NOT NULL,
-                easy_count INTEGER DEFAULT 0,
-                medium_count INTEGER DEFAULT 0,
-                hard_count INTEGER DEFAULT 0,
-                FOREIGN KEY (template_id) REFERENCES exam_preset_templates (id) ON DELETE CASCADE,
-                FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
-                UNIQUE(template_id, exam_id)
-            )
-        ''')
-
-        # Preset Observers table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS preset_observers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                preset_id INTEGER NOT NULL,
-                observer_id INTEGER NOT NULL,
-                granted_by INTEGER NOT NULL,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (preset_id) REFERENCES exam_preset_templates (id) ON DELETE CASCADE,
-                FOREIGN KEY (observer_id) REFERENCES users (id) ON DELETE CASCADE,
-                FOREIGN KEY (granted_by) REFERENCES users (id),
-                UNIQUE(preset_id, observer_id)
-            )
-        ''')
-
-        # Exam Assignments table (allows same exam to be assigned multiple times with different settings)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exam_assignments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                exam_id INTEGER NOT NULL,
-                assignment_name TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                unit TEXT,
-                duration_minutes INTEGER NOT NULL,
-                passing_score REAL NOT NULL,
-                max_attempts INTEGER DEFAULT 1,
-                randomize_questions BOOLEAN DEFAULT 0,
-                show_results BOOLEAN DEFAULT 1,
-                enable_fullscreen BOOLEAN DEFAULT 0,
-                prevent_focus_loss BOOLEAN DEFAULT 0,
-                enable_logging BOOLEAN DEFAULT 0,
-                enable_pattern_analysis BOOLEAN DEFAULT 0,
-                delivery_method TEXT DEFAULT 'online',
-                use_question_pool BOOLEAN DEFAULT 0,
-                questions_to_select INTEGER DEFAULT 0,
-                easy_questions_count INTEGER DEFAULT 0,
-                medium_questions_count INTEGER DEFAULT 0,
-                hard_questions_count INTEGER DEFAULT 0,
-                start_date TIMESTAMP,
-                end_date TIMESTAMP,
-                deadline TIMESTAMP,
-                created_by INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_active BOOLEAN DEFAULT 1,
-                is_archived BOOLEAN DEFAULT 0,
-                pdf_variant_count INTEGER DEFAULT 1,
-                is_deleted BOOLEAN DEFAULT 0,
-                deleted_at TIMESTAMP NULL,
-                deleted_by INTEGER NULL,
-                deletion_reason TEXT NULL,
-                FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
-                FOREIGN KEY (created_by) REFERENCES users (id)
-            )
-        ''')
-
-        # Assignment Users junction table (tracks which users have access to which assignments)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS assignment_users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                assignment_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                granted_by INTEGER NOT NULL,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_active BOOLEAN DEFAULT 1,
-                FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (granted_by) REFERENCES users (id),
-                UNIQUE(assignment_id, user_id)
-            )
-        ''')
-
-        # Assignment Exam Templates junction table (supports multiple exam templates per assignment)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS assignment_exam_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                assignment_id INTEGER NOT NULL,
-                exam_id INTEGER NOT NULL,
-                order_index INTEGER DEFAULT 0,
-                easy_count INTEGER DEFAULT 0,
-                medium_count INTEGER DEFAULT 0,
-                hard_count INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE,
-                FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
-                UNIQUE(assignment_id, exam_id)
-            )
-        ''')
-
-        # System Settings table (for application-wide settings)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS system_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                setting_key TEXT UNIQUE NOT NULL,
-                setting_value TEXT NOT NULL,
-                description TEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Insert default language setting if not exists
-        cursor.execute('''
-            INSERT OR IGNORE INTO system_settings (setting_key, setting_value, description)
-            VALUES ('language', 'English', 'System-wide language setting')
-        ''')
-
-        # Insert default custom database path setting (empty = use default)
-        cursor.execute('''
-            INSERT OR IGNORE INTO system_settings (setting_key, setting_value, description)
-            VALUES ('custom_database_path', '', 'Custom database location path (empty = use default)')
-        ''')
-
-        # Organizational Structure table (departments, sections, units)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS organizational_structure (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT UNIQUE NOT NULL,
-                type TEXT NOT NULL CHECK(type IN ('department', 'section', 'unit')),
-                name_az TEXT NOT NULL,
-                name_en TEXT NOT NULL,
-                abbr_az TEXT NOT NULL,
-                abbr_en TEXT NOT NULL,
-                parent_key TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (parent_key) REFERENCES organizational_structure(key) ON DELETE CASCADE
-            )
-        ''')
-
-        # Pattern Analysis table (stub for backward compatibility - feature deprecated)
-        # This table is no longer actively used but kept for backward compatibility with legacy code
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pattern_analysis (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                suspicion_score INTEGER DEFAULT 0,
-                details TEXT,
-                issues_detected TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES exam_sessions (id)
-            )
-        ''')
-
-        # Grade Edit History table (tracks all grade edits with audit trail)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS grade_edit_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                question_id INTEGER NOT NULL,
-                answer_id INTEGER NOT NULL,
-                old_points REAL NOT NULL,
-                new_points REAL NOT NULL,
-                old_total_score REAL,
-                new_total_score REAL,
-                edited_by INTEGER NOT NULL,
-                edit_reason TEXT,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
-                FOREIGN KEY (question_id) REFERENCES questions (id),
-                FOREIGN KEY (answer_id) REFERENCES user_answers (id),
-                FOREIGN KEY (edited_by) REFERENCES users (id)
-            )
-        ''')
-
-        # Add language_preference column to users table if it doesn't exist
-        try:
-            cursor.execute("ALTER TABLE users ADD COLUMN language_preference TEXT DEFAULT 'en'")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-
-        # Add grade editing audit columns to exam_sessions table if they don't exist
-        try:
-            cursor.execute('ALTER TABLE exam_sessions ADD COLUMN last_edited_by INTEGER')
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            cursor.execute('ALTER TABLE exam_sessions ADD COLUMN last_edited_at TIMESTAMP')
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            cursor.execute('ALTER TABLE exam_sessions ADD COLUMN edit_count INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-
-        # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_sessions_user_exam ON exam_sessions(user_id, exam_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_sessions_assignment ON exam_sessions(assignment_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_answers_session ON user_answers(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_exam ON questions(exam_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_options_question ON question_options(question_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_questions_session ON session_questions(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty_level)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_exports_exam ON pdf_exports(exam_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_exports_variant ON pdf_exports(exam_id, variant_number)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_templates_type_lang ON email_templates(template_type, language)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_log_session ON email_log(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_log_sent_by ON email_log(sent_by)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_observers_exam ON exam_observers(exam_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_observers_observer ON exam_observers(observer_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_assignments_exam ON exam_assignments(exam_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_assignment_users_assignment ON assignment_users(assignment_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_assignment_users_user ON assignment_users(user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_assignment_exam_templates_assignment ON assignment_exam_templates(assignment_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_settings_key ON system_settings(setting_key)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_organizational_structure_key ON organizational_structure(key)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_organizational_structure_type ON organizational_structure(type)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_organizational_structure_parent ON organizational_structure(parent_key)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pattern_analysis_session ON pattern_analysis(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_grade_edit_history_session ON grade_edit_history(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_grade_edit_history_answer ON grade_edit_history(answer_id)')
-
-        # Soft delete indexes for exam_assignments
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_assignments_deleted ON exam_assignments(is_deleted)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_assignments_lifecycle ON exam_assignments(is_archived, is_deleted)')
-
-        # Backward compatibility: Add soft delete columns if they don't exist in existing databases
-        try:
-            # Check if is_deleted column exists
-            cursor.execute("SELECT is_deleted FROM exam_assignments LIMIT 1")
-        except sqlite3.OperationalError:
-            # Column doesn't exist, add all soft delete columns
-            print("Adding soft delete columns to existing database...")
-            try:
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN is_deleted BOOLEAN DEFAULT 0")
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN deleted_at TIMESTAMP NULL")
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN deleted_by INTEGER NULL")
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN deletion_reason TEXT NULL")
-                print("✓ Soft delete columns added successfully")
-            except sqlite3.OperationalError as e:
-                # Columns might already exist, ignore
-                print(f"Note: {e}")
-                pass
+# Columns added after the original schema shipped. Databases created by older
+# versions lack them, so the base migration backfills them with
+# ensure_column_exists() instead of attempting every ALTER TABLE blindly.
+# Part of migration 1 and frozen with it; later columns get their own migration.
+LEGACY_COLUMNS = [
+    ('users', 'section', 'TEXT'),
+    ('users', 'unit', 'TEXT'),
+    ('users', 'language_preference', "TEXT DEFAULT 'en'"),
+    ('exams', 'category', 'TEXT'),
+    ('exams', 'enable_fullscreen', 'BOOLEAN DEFAULT 0'),
+    ('exams', 'prevent_focus_loss', 'BOOLEAN DEFAULT 0'),
+    ('exams', 'enable_logging', 'BOOLEAN DEFAULT 0'),
+    ('exams', 'enable_pattern_analysis', 'BOOLEAN DEFAULT 0'),
+    ('exams', 'use_question_pool', 'BOOLEAN DEFAULT 0'),
+    ('exams', 'total_questions_in_pool', 'INTEGER DEFAULT 0'),
+    ('exams', 'questions_to_select', 'INTEGER DEFAULT 0'),
+    ('exams', 'easy_questions_count', 'INTEGER DEFAULT 0'),
+    ('exams', 'medium_questions_count', 'INTEGER DEFAULT 0'),
+    ('exams', 'hard_questions_count', 'INTEGER DEFAULT 0'),
+    ('user_answers', 'selected_option_ids', 'TEXT'),
+    ('exam_sessions', 'last_edited_by', 'INTEGER'),
+    ('exam_sessions', 'last_edited_at', 'TIMESTAMP'),
+    ('exam_sessions', 'edit_count', 'INTEGER DEFAULT 0'),
+    ('exam_preset_templates', 'is_active', 'BOOLEAN DEFAULT 1'),
+    ('exam_assignments', 'pdf_variant_count', 'INTEGER DEFAULT 1'),
+    ('exam_assignments', 'is_deleted', 'BOOLEAN DEFAULT 0'),
+    ('exam_assignments', 'deleted_at', 'TIMESTAMP NULL'),
+    ('exam_assignments', 'deleted_by', 'INTEGER NULL'),
+    ('exam_assignments', 'deletion_reason', 'TEXT NULL'),
+    ('exam_assignments', 'description', 'TEXT'),
+    ('exam_assignments', 'category', 'TEXT'),
+    ('exam_assignments', 'unit', 'TEXT'),
+]
 
-        # Add description column to exam_assignments if it doesn't exist
-        try:
-            cursor.execute("SELECT description FROM exam_assignments LIMIT 1")
-        except sqlite3.OperationalError:
-            # Column doesn't exist, add it
-            print("Adding description column to exam_assignments table...")
-            try:
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN description TEXT")
-                print("✓ Description column added successfully")
-            except sqlite3.OperationalError as e:
-                print(f"Note: {e}")
-                pass
-
-        # Add category column to exam_assignments if it doesn't exist
-        try:
-            cursor.execute("SELECT category FROM exam_assignments LIMIT 1")
-        except sqlite3.OperationalError:
-            # Column doesn't exist, add it
-            print("Adding category column to exam_assignments table...")
-            try:
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN category TEXT")
-                print("✓ Category column added successfully")
-            except sqlite3.OperationalError as e:
-                print(f"Note: {e}")
-                pass
-
-        # Add unit column to exam_assignments if it doesn't exist
-        try:
-            cursor.execute("SELECT unit FROM exam_assignments LIMIT 1")
-        except sqlite3.OperationalError:
-            # Column doesn't exist, add it
-            print("Adding unit column to exam_assignments table...")
-            try:
-                cursor.execute("ALTER TABLE exam_assignments ADD COLUMN unit TEXT")
-                print("✓ Unit column added successfully")
-            except sqlite3.OperationalError as e:
-                print(f"Note: {e}")
-                pass
-
-        conn.commit()
-
-def create_default_admin():
+# Database schema creation
+def create_base_schema(db: Optional[Database] = None):
+    """
+    Create the base schema (migration 1).
+
+    Idempotent: tables use CREATE IF NOT EXISTS, missing legacy columns are
+    backfilled and indexes are created last. Runs inside the migration
+    engine's transaction; see quiz_app.database.migrations.
+
+    This is the schema migration 1 shipped with and must not change: later
+    schema changes are separate migrations with their own DDL.
+    """
+    db = db or Database()
+    conn = db.get_connection()
+    cursor = conn.cursor()
+
+    # Users table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'examinee',
+            department TEXT,
+            section TEXT,
+            unit TEXT,
+            employee_id TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            password_change_required BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        )
+    ''')
+
+    # Exams table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            category TEXT,
+            duration_minutes INTEGER NOT NULL DEFAULT 60,
+            passing_score REAL NOT NULL DEFAULT 70.0,
+            max_attempts INTEGER DEFAULT 1,
+            randomize_questions BOOLEAN DEFAULT 0,
+            show_results BOOLEAN DEFAULT 1,
+            is_active BOOLEAN DEFAULT 1,
+            start_date TIMESTAMP,
+            end_date TIMESTAMP,
+            created_by INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users (id)
+        )
+    ''')
+
+    # Questions table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exam_id INTEGER NOT NULL,
+            question_text TEXT NOT NULL,
+            question_type TEXT NOT NULL,
+            image_data BLOB,
+            image_filename TEXT,
+            image_mime_type TEXT,
+            correct_answer TEXT,
+            explanation TEXT,
+            points REAL DEFAULT 1.0,
+            difficulty_level TEXT DEFAULT 'medium',
+            order_index INTEGER,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (exam_id) REFERENCES exams (id)
+        )
+    ''')
+
+    # Question options table (for multiple choice questions)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS question_options (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_id INTEGER NOT NULL,
+            option_text TEXT NOT NULL,
+            is_correct BOOLEAN DEFAULT 0,
+            order_index INTEGER,
+            FOREIGN KEY (question_id) REFERENCES questions (id)
+        )
+    ''')
+
+    # Exam sessions table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exam_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            exam_id INTEGER NOT NULL,
+            assignment_id INTEGER,
+            start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            end_time TIMESTAMP,
+            duration_seconds INTEGER,
+            score REAL,
+            total_questions INTEGER,
+            correct_answers INTEGER,
+            status TEXT DEFAULT 'in_progress',
+            attempt_number INTEGER DEFAULT 1,
+            ip_address TEXT,
+            user_agent TEXT,
+            is_completed BOOLEAN DEFAULT 0,
+            is_active BOOLEAN DEFAULT 1,
+            email_sent BOOLEAN DEFAULT 0,
+            focus_loss_count INTEGER DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (exam_id) REFERENCES exams (id),
+            FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # User answers table
+    # CRITICAL FIX: Added UNIQUE constraint on (session_id, question_id) to prevent duplicates
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_answers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            answer_text TEXT,
+            selected_option_id INTEGER,
+            selected_option_ids TEXT,
+            is_correct BOOLEAN,
+            points_earned REAL DEFAULT 0,
+            time_spent_seconds INTEGER,
+            answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
+            FOREIGN KEY (question_id) REFERENCES questions (id),
+            FOREIGN KEY (selected_option_id) REFERENCES question_options (id),
+            UNIQUE(session_id, question_id)
+        )
+    ''')
+
+    # Session questions table (tracks which questions were selected for each exam session)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS session_questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            difficulty_level TEXT NOT NULL,
+            order_index INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
+            FOREIGN KEY (question_id) REFERENCES questions (id),
+            UNIQUE(session_id, question_id)
+        )
+    ''')
+
+    # Exam permissions table (for user-specific exam access)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exam_permissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            exam_id INTEGER NOT NULL,
+            granted_by INTEGER NOT NULL,
+            granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (exam_id) REFERENCES exams (id),
+            FOREIGN KEY (granted_by) REFERENCES users (id),
+            UNIQUE(user_id, exam_id)
+        )
+    ''')
+
+    # Exam observers table (experts allowed to view specific topics)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exam_observers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exam_id INTEGER NOT NULL,
+            observer_id INTEGER NOT NULL,
+            granted_by INTEGER NOT NULL,
+            granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (exam_id) REFERENCES exams (id),
+            FOREIGN KEY (observer_id) REFERENCES users (id),
+            FOREIGN KEY (granted_by) REFERENCES users (id),
+            UNIQUE(exam_id, observer_id)
+        )
+    ''')
+
+    # PDF exports table (for tracking variant exports)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pdf_exports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exam_id INTEGER NOT NULL,
+            variant_number INTEGER NOT NULL,
+            question_snapshot TEXT NOT NULL,
+            exported_by INTEGER NOT NULL,
+            exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            file_path TEXT,
+            notes TEXT,
+            FOREIGN KEY (exam_id) REFERENCES exams (id),
+            FOREIGN KEY (exported_by) REFERENCES users (id),
+            UNIQUE(exam_id, variant_number)
+        )
+    ''')
+
+    # Email templates table (for customizable email notifications)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            template_type TEXT NOT NULL,
+            language TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body_template TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(template_type, language)
+        )
+    ''')
+
+    # Email log table (for tracking email notifications)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            recipient_email TEXT NOT NULL,
+            recipient_name TEXT,
+            sent_by INTEGER NOT NULL,
+            email_type TEXT NOT NULL,
+            language TEXT NOT NULL,
+            sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
+            FOREIGN KEY (sent_by) REFERENCES users (id)
+        )
+    ''')
+
+    # Exam Preset Templates table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exam_preset_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_by_user_id INTEGER NOT NULL,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by_user_id) REFERENCES users (id)
+        )
+    ''')
+
+    # Junction table for preset templates and exam topics
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS preset_template_exams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            template_id INTEGER NOT NULL,
+            exam_id INTEGER NOT NULL,
+            easy_count INTEGER DEFAULT 0,
+            medium_count INTEGER DEFAULT 0,
+            hard_count INTEGER DEFAULT 0,
+            FOREIGN KEY (template_id) REFERENCES exam_preset_templates (id) ON DELETE CASCADE,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
+            UNIQUE(template_id, exam_id)
+        )
+    ''')
+
+    # Preset Observers table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS preset_observers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            preset_id INTEGER NOT NULL,
+            observer_id INTEGER NOT NULL,
+            granted_by INTEGER NOT NULL,
+            granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (preset_id) REFERENCES exam_preset_templates (id) ON DELETE CASCADE,
+            FOREIGN KEY (observer_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (granted_by) REFERENCES users (id),
+            UNIQUE(preset_id, observer_id)
+        )
+    ''')
+
+    # Exam Assignments table (allows same exam to be assigned multiple times with different settings)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exam_assignments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exam_id INTEGER NOT NULL,
+            assignment_name TEXT NOT NULL,
+            description TEXT,
+            category TEXT,
+            unit TEXT,
+            duration_minutes INTEGER NOT NULL,
+            passing_score REAL NOT NULL,
+            max_attempts INTEGER DEFAULT 1,
+            randomize_questions BOOLEAN DEFAULT 0,
+            show_results BOOLEAN DEFAULT 1,
+            enable_fullscreen BOOLEAN DEFAULT 0,
+            prevent_focus_loss BOOLEAN DEFAULT 0,
+            enable_logging BOOLEAN DEFAULT 0,
+            enable_pattern_analysis BOOLEAN DEFAULT 0,
+            delivery_method TEXT DEFAULT 'online',
+            use_question_pool BOOLEAN DEFAULT 0,
+            questions_to_select INTEGER DEFAULT 0,
+            easy_questions_count INTEGER DEFAULT 0,
+            medium_questions_count INTEGER DEFAULT 0,
+            hard_questions_count INTEGER DEFAULT 0,
+            start_date TIMESTAMP,
+            end_date TIMESTAMP,
+            deadline TIMESTAMP,
+            created_by INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1,
+            is_archived BOOLEAN DEFAULT 0,
+            pdf_variant_count INTEGER DEFAULT 1,
+            is_deleted BOOLEAN DEFAULT 0,
+            deleted_at TIMESTAMP NULL,
+            deleted_by INTEGER NULL,
+            deletion_reason TEXT NULL,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES users (id)
+        )
+    ''')
+
+    # Assignment Users junction table (tracks which users have access to which assignments)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS assignment_users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            assignment_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            granted_by INTEGER NOT NULL,
+            granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1,
+            FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (granted_by) REFERENCES users (id),
+            UNIQUE(assignment_id, user_id)
+        )
+    ''')
+
+    # Assignment Exam Templates junction table (supports multiple exam templates per assignment)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS assignment_exam_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            assignment_id INTEGER NOT NULL,
+            exam_id INTEGER NOT NULL,
+            order_index INTEGER DEFAULT 0,
+            easy_count INTEGER DEFAULT 0,
+            medium_count INTEGER DEFAULT 0,
+            hard_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
+            UNIQUE(assignment_id, exam_id)
+        )
+    ''')
+
+    # System Settings table (for application-wide settings)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS system_settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            setting_key TEXT UNIQUE NOT NULL,
+            setting_value TEXT NOT NULL,
+            description TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Organizational Structure table (departments, sections, units)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS organizational_structure (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT UNIQUE NOT NULL,
+            type TEXT NOT NULL CHECK(type IN ('department', 'section', 'unit')),
+            name_az TEXT NOT NULL,
+            name_en TEXT NOT NULL,
+            abbr_az TEXT NOT NULL,
+            abbr_en TEXT NOT NULL,
+            parent_key TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (parent_key) REFERENCES organizational_structure(key) ON DELETE CASCADE
+        )
+    ''')
+
+    # Pattern Analysis table (stub for backward compatibility - feature deprecated)
+    # This table is no longer actively used but kept for backward compatibility with legacy code
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pattern_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            suspicion_score INTEGER DEFAULT 0,
+            details TEXT,
+            issues_detected TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES exam_sessions (id)
+        )
+    ''')
+
+    # Grade Edit History table (tracks all grade edits with audit trail)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS grade_edit_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            answer_id INTEGER NOT NULL,
+            old_points REAL NOT NULL,
+            new_points REAL NOT NULL,
+            old_total_score REAL,
+            new_total_score REAL,
+            edited_by INTEGER NOT NULL,
+            edit_reason TEXT,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES exam_sessions (id),
+            FOREIGN KEY (question_id) REFERENCES questions (id),
+            FOREIGN KEY (answer_id) REFERENCES user_answers (id),
+            FOREIGN KEY (edited_by) REFERENCES users (id)
+        )
+    ''')
+
+    # Insert default language setting if not exists
+    cursor.execute('''
+        INSERT OR IGNORE INTO system_settings (setting_key, setting_value, description)
+        VALUES ('language', 'English', 'System-wide language setting')
+    ''')
+
+    # Insert default custom database path setting (empty = use default)
+    cursor.execute('''
+        INSERT OR IGNORE INTO system_settings (setting_key, setting_value, description)
+        VALUES ('custom_database_path', '', 'Custom database location path (empty = use default)')
+    ''')
+
+    # Backfill columns that older databases are missing
+    for table, column, definition in LEGACY_COLUMNS:
+        db.ensure_column_exists(table, column, definition)
+
+    # Set default language preference for existing users who don't have it
+    cursor.execute("UPDATE users SET language_preference = 'en' WHERE language_preference IS NULL")
+
+    # Create indexes for better performance
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_sessions_user_exam ON exam_sessions(user_id, exam_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_sessions_assignment ON exam_sessions(assignment_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_answers_session ON user_answers(session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_exam ON questions(exam_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_options_question ON question_options(question_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_questions_session ON session_questions(session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty_level)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_exports_exam ON pdf_exports(exam_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_exports_variant ON pdf_exports(exam_id, variant_number)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_templates_type_lang ON email_templates(template_type, language)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_log_session ON email_log(session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_log_sent_by ON email_log(sent_by)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_observers_exam ON exam_observers(exam_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_observers_observer ON exam_observers(observer_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_assignments_exam ON exam_assignments(exam_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_assignment_users_assignment ON assignment_users(assignment_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_assignment_users_user ON assignment_users(user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_assignment_exam_templates_assignment ON assignment_exam_templates(assignment_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_settings_key ON system_settings(setting_key)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_organizational_structure_key ON organizational_structure(key)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_organizational_structure_type ON organizational_structure(type)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_organizational_structure_parent ON organizational_structure(parent_key)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pattern_analysis_session ON pattern_analysis(session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_grade_edit_history_session ON grade_edit_history(session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_grade_edit_history_answer ON grade_edit_history(answer_id)')
+
+    # Soft delete indexes for exam_assignments
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_assignments_deleted ON exam_assignments(is_deleted)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exam_assignments_lifecycle ON exam_assignments(is_archived, is_deleted)')
+
+
+def create_tables(db: Optional[Database] = None):
+    """
+    Bring every table up to the latest schema.
+
+    Runs the base schema and the DDL of every later schema migration, all of
+    which are idempotent. user_version is left alone; application startup
+    goes through run_migrations() instead (see init_database).
+    """
+    from quiz_app.database.migrations import apply_schema
+    apply_schema(db or Database())
+
+def create_default_admin(db: Optional[Database] = None):
     """Create default admin user if none exists"""
     import bcrypt
 
-    db = Database()
+    db = db or Database()
 
     # Check if admin exists
     admin = db.execute_single("SELECT id FROM users WHERE role = 'admin'")
@@ -848,11 +1226,11 @@ def create_default_admin():
         print("Password: admin123")
         print("Please change the password after first login!")
 
-def populate_organizational_structure():
+def populate_organizational_structure(db: Optional[Database] = None):
     """Populate organizational structure table with default data from config.py"""
     from quiz_app.config import ORGANIZATIONAL_STRUCTURE
 
-    db = Database()
+    db = db or Database()
 
     # Check if table is already populated
     existing_count = db.execute_query("SELECT COUNT(*) as count FROM organizational_structure")
@@ -928,9 +1306,9 @@ def populate_organizational_structure():
     entries_count = db.execute_query("SELECT COUNT(*) as count FROM organizational_structure")
     print(f"Organizational structure populated with {entries_count[0]['count']} entries")
 
-def populate_email_templates():
+def populate_email_templates(db: Optional[Database] = None):
     """Populate email_templates table with default templates for all types and languages"""
-    db = Database()
+    db = db or Database()
 
     # Check if templates already exist
     existing_count = db.execute_query("SELECT COUNT(*) as count FROM email_templates")
@@ -1122,11 +1500,15 @@ Hörmətlə,
     print(f"Email templates populated: {final_count[0]['count']} templates created")
 
 def init_database():
-    """Initialize the database with tables and default data"""
-    create_tables()
-    create_default_admin()
-    populate_organizational_structure()
-    populate_email_templates()
+    """
+    Initialize the database with tables and default data.
+
+    Delegates to the versioned migration engine; when the schema is already
+    current this is a single PRAGMA user_version read.
+    """
+    from quiz_app.database.migrations import run_migrations
+
+    run_migrations(Database())
     print(f"Database initialized at: {DATABASE_PATH}")
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+"""
+Versioned schema migrations driven by PRAGMA user_version.
+
+Each migration is a numbered function that receives a Database and runs
+inside a single transaction together with the user_version bump, so a
+failed migration leaves the database at the previous version. When the
+stored version already matches the latest migration, startup costs one
+pragma read.
+
+To change the schema, append a new (version, description, function) entry
+to MIGRATIONS with the explicit DDL of the change; never edit or renumber a
+migration that has shipped. Schema migrations must be idempotent (IF NOT
+EXISTS, ensure_column_exists) because create_tables() replays all of them.
+"""
+
+import logging
+import time
+from typing import Callable, List, Optional, Tuple
+
+from quiz_app.database.database import (
+    Database,
+    create_base_schema,
+    create_default_admin,
+    populate_organizational_structure,
+    populate_email_templates,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _migration_001_base_schema(db: Database):
+    """Base schema, legacy column backfill and indexes."""
+    create_base_schema(db)
+
+
+def _migration_002_seed_defaults(db: Database):
+    """Default admin account, organizational structure and email templates."""
+    create_default_admin(db)
+    populate_organizational_structure(db)
+    populate_email_templates(db)
+
+
+def _migration_003_content_addressed_images(db: Database):
+    """Move question image BLOBs into the deduplicated question_images store."""
+    conn = db.get_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS question_images (
+            sha256 TEXT PRIMARY KEY,
+            mime_type TEXT NOT NULL,
+            width INTEGER,
+            height INTEGER,
+            original_data BLOB NOT NULL,
+            display_data BLOB,
+            display_mime_type TEXT,
+            thumbnail_data BLOB,
+            thumbnail_mime_type TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    db.ensure_column_exists('questions', 'image_sha256', 'TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_questions_image ON questions(image_sha256)')
+
+    question_ids = [row[0] for row in db.execute_iter(
+        "SELECT id FROM questions WHERE image_data IS NOT NULL AND image_sha256 IS NULL", row_type='tuple'
+    )]
+    for question_id in question_ids:
+        # One BLOB in memory at a time
+        row = db.execute_single(
+            "SELECT image_data, image_filename, image_mime_type FROM questions WHERE id = ?", (question_id,)
+        )
+        if not db.store_question_image(question_id, row['image_data'],
+                                       row['image_filename'] or 'image.png',
+                                       row['image_mime_type'] or 'image/png'):
+            raise RuntimeError(f"Could not move image of question {question_id}")
+
+
+def _migration_004_session_events(db: Database):
+    """Per-question exam telemetry table."""
+    conn = db.get_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            question_id INTEGER,
+            event_type TEXT NOT NULL,
+            elapsed_ms INTEGER NOT NULL,
+            duration_ms INTEGER
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_session_events_session ON session_events(session_id, question_id)')
+
+
+def _migration_005_assignment_question_selections(db: Database):
+    """Per-user question selections pre-generated when an assignment is saved."""
+    conn = db.get_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS assignment_question_selections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            assignment_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            difficulty_level TEXT,
+            order_index INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (assignment_id) REFERENCES exam_assignments (id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_assignment_question_selections_user '
+                 'ON assignment_question_selections(assignment_id, user_id)')
+
+
+def _migration_006_session_seeds(db: Database):
+    """Seed and pool version columns that make a session's question and option order reproducible."""
+    for table in ('exam_sessions', 'assignment_question_selections'):
+        db.ensure_column_exists(table, 'selection_seed', 'INTEGER')
+        db.ensure_column_exists(table, 'pool_version', 'TEXT')
+
+
+def _create_pool_version_triggers(conn, watched_columns: str):
+    """Triggers that bump an exam's question_pool_versions row on question changes."""
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_pool_insert AFTER INSERT ON questions
+        BEGIN
+            INSERT INTO question_pool_versions (exam_id, version) VALUES (NEW.exam_id, 1)
+            ON CONFLICT(exam_id) DO UPDATE SET version = version + 1;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_pool_update
+        AFTER UPDATE OF {watched_columns} ON questions
+        BEGIN
+            INSERT INTO question_pool_versions (exam_id, version) VALUES (OLD.exam_id, 1)
+            ON CONFLICT(exam_id) DO UPDATE SET version = version + 1;
+            INSERT INTO question_pool_versions (exam_id, version) VALUES (NEW.exam_id, 1)
+            ON CONFLICT(exam_id) DO UPDATE SET version = version + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_pool_delete AFTER DELETE ON questions
+        BEGIN
+            INSERT INTO question_pool_versions (exam_id, version) VALUES (OLD.exam_id, 1)
+            ON CONFLICT(exam_id) DO UPDATE SET version = version + 1;
+        END
+    """)
+
+
+def _migration_007_question_pool_versions(db: Database):
+    """Per-exam question pool change counters and the triggers that maintain them."""
+    conn = db.get_connection()
+    # QuestionPoolIndex (quiz_app.utils.question_pool) rebuilds an exam when its version moves
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS question_pool_versions (
+            exam_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    _create_pool_version_triggers(conn, 'exam_id, difficulty_level, is_active, order_index')
+
+
+def _migration_008_blueprint_rules(db: Database):
+    """Assignment fallback/points rules; pool versions also track question points."""
+    db.ensure_column_exists('exam_assignments', 'pool_fallback', "TEXT DEFAULT 'none'")
+    db.ensure_column_exists('exam_assignments', 'target_points', 'REAL NULL')
+    conn = db.get_connection()
+    conn.execute("DROP TRIGGER IF EXISTS trg_questions_pool_update")
+    _create_pool_version_triggers(conn, 'exam_id, difficulty_level, is_active, order_index, points')
+
+
+def _migration_009_unique_selection_order(db: Database):
+    """One pre-generated question per assignment, user and position."""
+    conn = db.get_connection()
+    # Overlapping pre-generation runs could store two selections for a user; drop
+    # both, the exam start then selects on the spot
+    conn.execute("""
+        DELETE FROM assignment_question_selections
+        WHERE (assignment_id, user_id) IN (
+            SELECT assignment_id, user_id FROM assignment_question_selections
+            GROUP BY assignment_id, user_id, order_index
+            HAVING COUNT(*) > 1
+        )
+    """)
+    # Replaces the (assignment_id, user_id) lookup index
+    conn.execute('DROP INDEX IF EXISTS idx_assignment_question_selections_user')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_assignment_question_selections_order '
+                 'ON assignment_question_selections(assignment_id, user_id, order_index)')
+
+
+def _migration_010_selection_pool_counters(db: Database):
+    """Question pool counters a pre-generated selection was drawn at."""
+    db.ensure_column_exists('assignment_question_selections', 'pool_counters', 'TEXT')
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Database], None]]] = [
+    (1, "base schema", _migration_001_base_schema),
+    (2, "seed default data", _migration_002_seed_defaults),
+    (3, "content-addressed question images", _migration_003_content_addressed_images),
+    (4, "exam session telemetry events", _migration_004_session_events),
+    (5, "pre-generated question selections", _migration_005_assignment_question_selections),
+    (6, "session selection seeds", _migration_006_session_seeds),
+    (7, "question pool versions", _migration_007_question_pool_versions),
+    (8, "question blueprint rules", _migration_008_blueprint_rules),
+    (9, "unique pre-generated selection order", _migration_009_unique_selection_order),
+    (10, "pre-generated selection pool counters", _migration_010_selection_pool_counters),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Migrations that only insert data; create_tables() skips them
+SEED_MIGRATIONS = (2,)
+
+
+def get_schema_version(db: Database) -> int:
+    """Read the schema version stored in the database header."""
+    return db.get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(db: Optional[Database] = None) -> int:
+    """
+    Apply every migration newer than the database's user_version.
+
+    Returns:
+        int: Number of migrations applied (0 when the schema is current)
+    """
+    db = db or Database()
+    current = get_schema_version(db)
+    if current >= LATEST_VERSION:
+        return 0
+
+    applied = 0
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+
+        started = time.perf_counter()
+        with db.transaction() as conn:
+            migrate(db)
+            # PRAGMA does not accept bound parameters; version is a trusted int
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        logger.info("Applied migration %03d (%s) in %.1f ms", version, description, elapsed_ms)
+        print(f"[MIGRATION] {version:03d} {description}: {elapsed_ms:.1f} ms")
+        applied += 1
+
+    return applied
+
+
+def apply_schema(db: Database):
+    """
+    Run the DDL of every schema migration without recording a version.
+
+    Backs create_tables(): tests and tools get the latest schema through the
+    same statements an upgraded database went through.
+    """
+    with db.transaction():
+        for version, _, migrate in MIGRATIONS:
+            if version not in SEED_MIGRATIONS:
+                migrate(db)
@@ -0,0 +1,255 @@
+"""
+Opt-in SQL profiler and slow-query log for the Database layer.
+
+When enabled, every statement run through Database is timed and recorded
+under a normalized fingerprint (literals replaced by '?', IN-lists
+collapsed) together with the view method that issued it. Statements slower
+than the threshold get their EXPLAIN QUERY PLAN captured and are written to
+a rotating slow-query log.
+
+Profiling is off by default; when disabled the Database hot path pays a
+single attribute lookup per statement.
+"""
+
+import os
+import re
+import sys
+import logging
+import threading
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Any, Tuple
+
+from quiz_app.config import QUERY_PROFILING_ENABLED, SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_PATH
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one catches the rest
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, float('inf'))
+
+# Frames from these files are skipped when looking for the calling view
+_INTERNAL_FILES = (
+    os.path.normcase(os.path.join('quiz_app', 'database', 'database.py')),
+    os.path.normcase(os.path.join('quiz_app', 'database', 'profiler.py')),
+    'contextlib.py',
+)
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(query: str) -> str:
+    """
+    Normalize a statement so runs that differ only in literals group together.
+
+    Args:
+        query: Raw SQL text
+
+    Returns:
+        str: Query with comments stripped, literals replaced by '?',
+            IN-lists collapsed to 'IN (?...)' and whitespace squeezed
+    """
+    text = _COMMENT_RE.sub(' ', query)
+    text = _STRING_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _IN_LIST_RE.sub('IN (?...)', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _find_caller() -> str:
+    """Return 'module:Class.method' of the first frame outside the database layer."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.normcase(frame.f_code.co_filename)
+        if not filename.endswith(_INTERNAL_FILES):
+            module = frame.f_globals.get('__name__', '?').rsplit('.', 1)[-1]
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+            return f"{module}:{name}"
+        frame = frame.f_back
+    return '?'
+
+
+class QueryStats:
+    """Latency statistics for one (fingerprint, caller) pair."""
+
+    __slots__ = ('fingerprint', 'caller', 'count', 'total_ms', 'max_ms', 'histogram', 'slow_count', 'last_plan')
+
+    def __init__(self, fingerprint: str, caller: str):
+        self.fingerprint = fingerprint
+        self.caller = caller
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * len(HISTOGRAM_BUCKETS_MS)
+        self.slow_count = 0
+        self.last_plan: Optional[List[str]] = None
+
+    def add(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.histogram[i] += 1
+                break
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'caller': self.caller,
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'slow_count': self.slow_count,
+            'histogram': dict(zip(_bucket_labels(), self.histogram)),
+            'plan': list(self.last_plan) if self.last_plan else [],
+        }
+
+
+def _bucket_labels() -> List[str]:
+    labels = []
+    for bound in HISTOGRAM_BUCKETS_MS:
+        labels.append(f"<={bound:g}ms" if bound != float('inf') else f">{HISTOGRAM_BUCKETS_MS[-2]:g}ms")
+    return labels
+
+
+class QueryProfiler:
+    """
+    Collects per-statement latency histograms and logs slow statements.
+
+    Thread-safe; one instance is shared by every Database in the process.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, log_path: str = SLOW_QUERY_LOG_PATH):
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self._stats: Dict[Tuple[str, str], QueryStats] = {}
+        self._lock = threading.Lock()
+        self._slow_logger: Optional[logging.Logger] = None
+
+    def record(self, query: str, params: Any, elapsed_ms: float, conn=None):
+        """
+        Record one statement execution.
+
+        Args:
+            query: SQL text as executed
+            params: Bound parameters (used for EXPLAIN QUERY PLAN), or None
+            elapsed_ms: Wall-clock execution time in milliseconds
+            conn: Connection the statement ran on; needed to capture the plan
+        """
+        key = (fingerprint(query), _find_caller())
+        is_slow = elapsed_ms >= self.threshold_ms
+        plan = self._explain(conn, query, params) if is_slow and conn is not None else None
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(*key)
+            stats.add(elapsed_ms)
+            if is_slow:
+                stats.slow_count += 1
+                if plan:
+                    stats.last_plan = plan
+
+        if is_slow:
+            self._log_slow(key[1], key[0], elapsed_ms, plan)
+
+    @staticmethod
+    def _explain(conn, query: str, params: Any) -> Optional[List[str]]:
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query}", params if params is not None else ())
+                return [row[-1] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception as e:
+            # Multi-statement scripts, PRAGMAs and DDL cannot be explained
+            logger.debug(f"EXPLAIN QUERY PLAN failed: {e}")
+            return None
+
+    def _get_slow_logger(self) -> logging.Logger:
+        if self._slow_logger is None:
+            slow_logger = logging.getLogger('quiz_app.slow_queries')
+            slow_logger.setLevel(logging.INFO)
+            slow_logger.propagate = False
+            if not slow_logger.handlers:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                handler = RotatingFileHandler(self.log_path, maxBytes=5 * 1024 * 1024,
+                                              backupCount=3, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                slow_logger.addHandler(handler)
+            self._slow_logger = slow_logger
+        return self._slow_logger
+
+    def _log_slow(self, caller: str, query_fingerprint: str, elapsed_ms: float, plan: Optional[List[str]]):
+        try:
+            lines = [f"{elapsed_ms:.1f} ms  {caller}", f"  {query_fingerprint}"]
+            lines.extend(f"  PLAN {detail}" for detail in plan or [])
+            self._get_slow_logger().info("\n".join(lines))
+        except Exception as e:
+            logger.warning(f"Failed to write slow-query log: {e}")
+
+    def top_offenders(self, limit: int = 10, order_by: str = 'total_ms') -> List[Dict[str, Any]]:
+        """
+        Return the most expensive statements seen so far.
+
+        Args:
+            limit: Maximum number of entries
+            order_by: 'total_ms', 'max_ms', 'count' or 'slow_count'
+
+        Returns:
+            List of stats dicts, most expensive first
+        """
+        if order_by not in ('total_ms', 'max_ms', 'count', 'slow_count'):
+            raise ValueError(f"Unsupported order_by: {order_by}")
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=lambda s: getattr(s, order_by), reverse=True)
+            return [stats.to_dict() for stats in ranked[:limit]]
+
+    def reset(self):
+        """Forget all recorded statistics."""
+        with self._lock:
+            self._stats.clear()
+
+
+_profiler: Optional[QueryProfiler] = QueryProfiler() if QUERY_PROFILING_ENABLED else None
+_last_profiler: Optional[QueryProfiler] = _profiler
+
+
+def get_active_profiler() -> Optional[QueryProfiler]:
+    """Return the running profiler, or None when profiling is disabled."""
+    return _profiler
+
+
+def get_profiler() -> Optional[QueryProfiler]:
+    """Return the running profiler, or the last one if profiling was disabled since."""
+    return _profiler or _last_profiler
+
+
+def enable_profiling(threshold_ms: Optional[float] = None) -> QueryProfiler:
+    """
+    Turn profiling on for every Database in the process.
+
+    Keeps statistics gathered by an earlier session; call reset() to clear them.
+    """
+    global _profiler, _last_profiler
+    profiler = _last_profiler or QueryProfiler()
+    if threshold_ms is not None:
+        profiler.threshold_ms = threshold_ms
+    _profiler = _last_profiler = profiler
+    return profiler
+
+
+def disable_profiling():
+    """Stop profiling; collected statistics remain available via get_profiler()."""
+    global _profiler
+    _profiler = None
+
+
+def is_profiling_enabled() -> bool:
+    return _profiler is not None
@@ -0,0 +1,296 @@
+"""
+Write-behind journal for examinee answers.
+
+Saving an answer used to commit an INSERT OR REPLACE on the UI thread, which
+stalls the exam whenever another client holds the (possibly shared-folder)
+database lock. Answers are now appended to a local journal file and queued
+in memory; a background flusher writes the queued answers to user_answers in
+one transaction every few seconds, and immediately when the exam asks for it
+(navigation, submit).
+
+The journal is a JSON-lines file on local disk, fsync'ed per answer. After
+each successful flush it is rewritten to contain only answers still pending.
+If the application dies mid-exam, replay_answer_journals() writes any
+leftover answers on the next start, rescoring the session if it was already
+submitted. Submission itself goes through score_submission(), which refuses
+to score while answers are still only in the journal.
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from quiz_app.config import (
+    ANSWER_JOURNAL_DIR,
+    ANSWER_FLUSH_INTERVAL_SECONDS,
+    ANSWER_SUBMIT_FLUSH_ATTEMPTS,
+    ANSWER_SUBMIT_FLUSH_RETRY_SECONDS,
+)
+from quiz_app.database.database import Database
+from quiz_app.utils.scoring import calculate_session_score, rescore_session
+
+logger = logging.getLogger(__name__)
+
+# Columns written for an upsert, in statement order
+ANSWER_COLUMNS = (
+    'session_id', 'question_id', 'answer_text', 'selected_option_id', 'selected_option_ids',
+    'is_correct', 'points_earned', 'time_spent_seconds', 'answered_at',
+)
+
+_UPSERT_SQL = f"""
+    INSERT OR REPLACE INTO user_answers ({', '.join(ANSWER_COLUMNS)})
+    VALUES ({', '.join('?' for _ in ANSWER_COLUMNS)})
+"""
+_DELETE_SQL = "DELETE FROM user_answers WHERE session_id = ? AND question_id = ?"
+
+
+class AnswerFlushError(Exception):
+    """Queued answers could not be written to the database."""
+
+
+def _apply(db: Database, entries: List[Dict[str, Any]]):
+    """Write journal entries (latest per question) to user_answers in one transaction."""
+    upserts = [tuple(entry.get(column) for column in ANSWER_COLUMNS)
+               for entry in entries if entry['op'] == 'upsert']
+    deletes = [(entry['session_id'], entry['question_id'])
+               for entry in entries if entry['op'] == 'delete']
+    with db.transaction():
+        if deletes:
+            db.execute_many(_DELETE_SQL, deletes)
+        if upserts:
+            db.execute_many(_UPSERT_SQL, upserts)
+
+
+def _read_journal(path: str) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """Read a journal file, keeping the latest entry per (session, question)."""
+    latest: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    with open(path, 'r', encoding='utf-8') as journal_file:
+        for line in journal_file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn final line from a crash mid-write
+                continue
+            latest[(entry['session_id'], entry['question_id'])] = entry
+    return latest
+
+
+class AnswerJournal:
+    """
+    Per-session write-behind queue for user_answers.
+
+    record_answer()/record_delete() return as soon as the entry is on local
+    disk. flush() writes everything pending; request_flush() asks the
+    background flusher to do so without blocking the caller.
+    """
+
+    def __init__(self, session_id: int, db: Optional[Database] = None,
+                 journal_dir: str = ANSWER_JOURNAL_DIR,
+                 flush_interval: float = ANSWER_FLUSH_INTERVAL_SECONDS):
+        self.session_id = session_id
+        self.db_path = db.db_path if db else None
+        self.flush_interval = flush_interval
+        os.makedirs(journal_dir, exist_ok=True)
+        self.path = os.path.join(journal_dir, f"session_{session_id}.jsonl")
+        # Answers left by an earlier run of this session that were not written yet
+        self._pending: Dict[Tuple[int, int], Dict[str, Any]] = (
+            _read_journal(self.path) if os.path.exists(self.path) else {}
+        )
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._flusher = threading.Thread(target=self._flush_loop, name=f'answer-flush-{session_id}', daemon=True)
+        self._flusher.start()
+
+    def record_answer(self, question_id: int, **values):
+        """
+        Queue an INSERT OR REPLACE of the question's answer.
+
+        Args:
+            question_id: Question answered
+            **values: Remaining ANSWER_COLUMNS (answer_text, points_earned, ...);
+                missing columns are written as NULL
+        """
+        entry = {'op': 'upsert', 'session_id': self.session_id, 'question_id': question_id}
+        entry.update({column: values.get(column) for column in ANSWER_COLUMNS[2:]})
+        self._append(entry)
+
+    def record_delete(self, question_id: int):
+        """Queue removal of the question's answer (e.g. cleared essay text)."""
+        self._append({'op': 'delete', 'session_id': self.session_id, 'question_id': question_id})
+
+    def _append(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Answer journal is closed")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending[(entry['session_id'], entry['question_id'])] = entry
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def pending_entries(self) -> Dict[int, Dict[str, Any]]:
+        """Entries not yet written to the database, by question id."""
+        with self._lock:
+            return {question_id: dict(entry) for (_, question_id), entry in self._pending.items()}
+
+    def request_flush(self):
+        """Wake the background flusher now instead of at the next interval."""
+        self._wakeup.set()
+
+    def flush(self) -> bool:
+        """
+        Write all pending answers to the database in one transaction.
+
+        Returns:
+            bool: True if nothing is left pending
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = dict(self._pending)
+            if not batch:
+                return True
+
+            try:
+                _apply(Database(db_path=self.db_path), list(batch.values()))
+            except Exception as e:
+                # Entries stay pending (and journaled) for the next attempt
+                logger.warning(f"Answer flush for session {self.session_id} failed: {e}")
+                return False
+
+            with self._lock:
+                for key, entry in batch.items():
+                    # Keep entries superseded while the batch was being written
+                    if self._pending.get(key) is entry:
+                        del self._pending[key]
+                self._rewrite_journal()
+                return not self._pending
+
+    def flush_with_retry(self, attempts: int = ANSWER_SUBMIT_FLUSH_ATTEMPTS,
+                         delay: float = ANSWER_SUBMIT_FLUSH_RETRY_SECONDS) -> bool:
+        """
+        Flush until nothing is pending, retrying while the database is unavailable.
+
+        Returns:
+            bool: True if every answer reached the database
+        """
+        for attempt in range(attempts):
+            if self.flush():
+                return True
+            if attempt + 1 < attempts:
+                time.sleep(delay)
+        return False
+
+    def _rewrite_journal(self):
+        """Replace the journal with the still-pending entries (caller holds _lock)."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as temp_file:
+            for entry in self._pending.values():
+                temp_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        self._file.close()
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            if self.pending_count():
+                self.flush()
+
+    def close(self) -> bool:
+        """
+        Flush what is left and stop the background flusher.
+
+        The journal file is removed only when everything reached the
+        database; otherwise it stays behind for replay_answer_journals().
+
+        Returns:
+            bool: True if every answer was written
+        """
+        if self._closed:
+            return not self.pending_count()
+        flushed = self.flush()
+        with self._lock:
+            self._closed = True
+            self._file.close()
+        self._wakeup.set()
+        if flushed:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        return flushed
+
+
+def score_submission(db: Database, journal: AnswerJournal, question_ids: List[int]) -> Dict[str, Any]:
+    """
+    Write every queued answer, then score the session being submitted.
+
+    Args:
+        db: Database to score from
+        journal: The session's answer journal (still open)
+        question_ids: Questions the session was given
+
+    Returns:
+        calculate_session_score() result
+
+    Raises:
+        AnswerFlushError: Answers are still pending after all retries; scoring
+            now would leave them out of the stored score
+    """
+    if not journal.flush_with_retry():
+        raise AnswerFlushError(
+            f"{journal.pending_count()} answers of session {journal.session_id} could not be written"
+        )
+    return calculate_session_score(db, journal.session_id, question_ids)
+
+
+def replay_answer_journals(db: Optional[Database] = None, journal_dir: str = ANSWER_JOURNAL_DIR) -> int:
+    """
+    Write answers left behind by exams that did not shut down cleanly.
+
+    Sessions that were already submitted are rescored, since their stored
+    score did not include these answers. Call once at startup, before any
+    exam opens a new journal.
+
+    Returns:
+        int: Number of answers replayed
+    """
+    if not os.path.isdir(journal_dir):
+        return 0
+
+    db = db or Database()
+    replayed = 0
+    for path in sorted(glob.glob(os.path.join(journal_dir, 'session_*.jsonl'))):
+        try:
+            entries = _read_journal(path)
+            if entries:
+                _apply(db, list(entries.values()))
+                for session_id in {session_id for session_id, _ in entries}:
+                    completed = db.execute_single(
+                        "SELECT 1 FROM exam_sessions WHERE id = ? AND is_completed = 1", (session_id,)
+                    )
+                    if completed:
+                        score = rescore_session(db, session_id)
+                        print(f"[JOURNAL] Rescored submitted session {session_id}: {score['score_percentage']:.1f}%")
+            os.remove(path)
+            replayed += len(entries)
+            print(f"[JOURNAL] Replayed {len(entries)} answers from {os.path.basename(path)}")
+        except Exception as e:
+            logger.error(f"Failed to replay answer journal {path}: {e}")
+    return replayed
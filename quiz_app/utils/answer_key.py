@@ -0,0 +1,80 @@
+"""
+Per-session answer key for instant auto-grading.
+
+The exam interface used to query question_options every time an answer was
+saved, and once more per question when scoring the submission. AnswerKey
+loads the options of every question in the session with one bulk query at
+exam start; grading afterwards is in-memory lookups only.
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from quiz_app.database.database import Database
+
+# Stay well below SQLite's bound-parameter limit on older builds
+_IN_CHUNK_SIZE = 900
+
+
+class AnswerKey:
+    """Options and correct-answer sets for a fixed list of questions."""
+
+    def __init__(self, options_by_question: Dict[int, List[Dict]]):
+        self._options = options_by_question
+        self._correct_ids: Dict[int, FrozenSet[int]] = {}
+        self._correct_text: Dict[int, Optional[str]] = {}
+        for question_id, options in options_by_question.items():
+            correct = [option for option in options if option['is_correct']]
+            self._correct_ids[question_id] = frozenset(option['id'] for option in correct)
+            self._correct_text[question_id] = correct[0]['option_text'].lower() if correct else None
+
+    @classmethod
+    def load(cls, db: Database, question_ids: Iterable[int]) -> 'AnswerKey':
+        """
+        Load the options of all given questions in bulk.
+
+        Args:
+            db: Database to read from
+            question_ids: Questions of the exam session
+
+        Returns:
+            AnswerKey covering every question (questions without options map to [])
+        """
+        ids = list(dict.fromkeys(question_ids))
+        options_by_question: Dict[int, List[Dict]] = {question_id: [] for question_id in ids}
+        for start in range(0, len(ids), _IN_CHUNK_SIZE):
+            chunk = ids[start:start + _IN_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for option in db.execute_iter(f"""
+                SELECT * FROM question_options
+                WHERE question_id IN ({placeholders})
+                ORDER BY question_id, order_index, id
+            """, tuple(chunk)):
+                options_by_question[option['question_id']].append(option)
+        return cls(options_by_question)
+
+    def options(self, question_id: int) -> List[Dict]:
+        """Options of a question in display order (same rows as SELECT * FROM question_options)."""
+        return self._options.get(question_id, [])
+
+    def correct_option_ids(self, question_id: int) -> FrozenSet[int]:
+        return self._correct_ids.get(question_id, frozenset())
+
+    def is_correct_option(self, question_id: int, option_id) -> bool:
+        """True if option_id (int or the string a radio control reports) is a correct option."""
+        try:
+            return int(option_id) in self.correct_option_ids(question_id)
+        except (TypeError, ValueError):
+            return False
+
+    def is_correct_selection(self, question_id: int, option_ids: Iterable) -> bool:
+        """True if the selection matches the correct options exactly."""
+        try:
+            selected = {int(option_id) for option_id in option_ids}
+        except (TypeError, ValueError):
+            return False
+        return bool(selected) and selected == self.correct_option_ids(question_id)
+
+    def is_correct_text(self, question_id: int, answer_text: Optional[str]) -> bool:
+        """True if answer_text matches the correct option's text (true/false questions)."""
+        correct = self._correct_text.get(question_id)
+        return bool(answer_text) and correct is not None and answer_text.lower() == correct
@@ -0,0 +1,206 @@
+"""
+Loopback HTTP server for images shown in the Flet client.
+
+Passing images as src_base64 puts the whole encoded image into the control
+tree, and every page.update() touching that control sends it over the
+websocket again. Instead, image bytes are published here and controls carry
+a short URL containing the content hash. Responses are marked immutable so
+the client fetches each image once.
+
+Assets are held in memory only (question images come from the encrypted
+database and must not be written to disk in plain form). The server binds to
+127.0.0.1 on a random port and every URL carries a per-process token.
+
+Unpinned assets are evicted least recently used beyond ASSET_SERVER_MAX_BYTES.
+Holders that keep a URL around (the exam image cache, report charts) publish
+with pin=True and release() the URL when they drop it, so a URL they still
+hand out never starts returning 404.
+"""
+
+import base64
+import hashlib
+import logging
+import mimetypes
+import secrets
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from quiz_app.config import ASSET_SERVER_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class _AssetRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'QuizAppAssets/1.0'
+
+    def do_GET(self):
+        asset_server: 'AssetServer' = self.server.asset_server
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        if len(parts) != 2 or not secrets.compare_digest(parts[0], asset_server.token):
+            self.send_error(404)
+            return
+
+        digest = parts[1].split('.', 1)[0]
+        asset = asset_server.get(digest)
+        if asset is None:
+            self.send_error(404)
+            return
+
+        data, mime_type = asset
+        etag = f'"{digest}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', mime_type)
+        self.send_header('Content-Length', str(len(data)))
+        # URLs are content-addressed, so a given URL never changes
+        self.send_header('Cache-Control', 'private, max-age=31536000, immutable')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keep per-request lines out of the console
+        logger.debug("asset server: " + format, *args)
+
+
+class AssetServer:
+    """In-memory, content-addressed asset store served over loopback HTTP."""
+
+    def __init__(self, max_bytes: int = ASSET_SERVER_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.token = secrets.token_urlsafe(16)
+        self._assets: 'OrderedDict[str, Tuple[bytes, str]]' = OrderedDict()
+        # digest -> number of holders; pinned assets are never evicted
+        self._pins: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        self.start()
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/{self.token}"
+
+    def start(self):
+        """Start serving on a random loopback port (no-op if already running)."""
+        with self._lock:
+            if self._httpd is not None:
+                return
+            httpd = ThreadingHTTPServer(('127.0.0.1', 0), _AssetRequestHandler)
+            httpd.daemon_threads = True
+            httpd.asset_server = self
+            threading.Thread(target=httpd.serve_forever, name='asset-server', daemon=True).start()
+            self._httpd = httpd
+            print(f"[ASSETS] Serving images on 127.0.0.1:{httpd.server_address[1]}")
+
+    def publish(self, data: bytes, mime_type: str = 'image/png', pin: bool = False) -> str:
+        """
+        Make bytes available to the client.
+
+        Args:
+            data: File contents
+            mime_type: Content-Type to serve them with
+            pin: Keep the asset until release() is called with the returned URL
+
+        Returns:
+            str: URL of the asset; identical bytes always get the same URL
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        extension = mimetypes.guess_extension(mime_type) or ''
+        with self._lock:
+            if digest in self._assets:
+                self._assets.move_to_end(digest)
+            else:
+                self._assets[digest] = (data, mime_type)
+                self._size += len(data)
+            if pin:
+                self._pins[digest] = self._pins.get(digest, 0) + 1
+            self._evict(keep=digest)
+        return f"{self.base_url}/{digest}{extension}"
+
+    def release(self, url: str):
+        """Drop one pin taken by publish(pin=True); the asset becomes evictable at zero."""
+        digest = url.rsplit('/', 1)[-1].split('.', 1)[0]
+        with self._lock:
+            count = self._pins.get(digest, 0)
+            if count > 1:
+                self._pins[digest] = count - 1
+            elif count == 1:
+                del self._pins[digest]
+                self._evict()
+
+    def _evict(self, keep: Optional[str] = None):
+        """Evict unpinned assets, least recently used first, down to max_bytes (lock held)."""
+        if self._size <= self.max_bytes:
+            return
+        # Keep the newest asset even if it alone exceeds the budget
+        for digest in [d for d in self._assets if d != keep and d not in self._pins]:
+            evicted, _ = self._assets.pop(digest)
+            self._size -= len(evicted)
+            if self._size <= self.max_bytes:
+                break
+
+    def get(self, digest: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            asset = self._assets.get(digest)
+            if asset is not None:
+                self._assets.move_to_end(digest)
+            return asset
+
+    def stop(self):
+        with self._lock:
+            httpd, self._httpd = self._httpd, None
+            self._assets.clear()
+            self._pins.clear()
+            self._size = 0
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+
+
+_server: Optional[AssetServer] = None
+_server_lock = threading.Lock()
+
+
+def get_asset_server() -> AssetServer:
+    """Return the process-wide asset server."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = AssetServer()
+        return _server
+
+
+def image_src(data: bytes, mime_type: str = 'image/png', pin: bool = False) -> Dict[str, str]:
+    """
+    Build the source arguments for an ft.Image.
+
+    Usage: ft.Image(**image_src(png_bytes), width=...)
+
+    Args:
+        data: Image bytes
+        mime_type: Content-Type of the image
+        pin: Keep the asset served until release_image_src() is called with the result
+
+    Returns:
+        {'src': url} when the asset server is available, otherwise
+        {'src_base64': ...} so the image still displays
+    """
+    try:
+        return {'src': get_asset_server().publish(data, mime_type, pin=pin)}
+    except OSError as e:
+        logger.warning(f"Asset server unavailable, falling back to base64: {e}")
+        return {'src_base64': base64.b64encode(data).decode('utf-8')}
+
+
+def release_image_src(source: Optional[Dict[str, str]]):
+    """Release an image_src(pin=True) result; base64 and empty sources are ignored."""
+    if source and 'src' in source:
+        get_asset_server().release(source['src'])
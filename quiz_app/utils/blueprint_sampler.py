@@ -0,0 +1,234 @@
+"""
+Blueprint sampler for multi-template question selection.
+
+A blueprint is the topic x difficulty matrix of an assignment: one cell per
+(exam template, difficulty) with the number of questions to draw, taken from
+assignment_exam_templates. When the templates carry no counts, there is one
+cell per difficulty drawn across all templates, using the assignment-level
+counts. BlueprintSampler fills every cell from the in-memory
+QuestionPoolIndex in one pass, then:
+
+- makes up shortfalls according to the assignment's pool_fallback rule
+  instead of only logging them, and
+- when the assignment sets target_points, swaps questions within their cell
+  (so the blueprint counts still hold) to bring the total points as close
+  to the target as single swaps allow.
+
+With the default rule ('none') and no points target, the draw is identical
+to sampling each cell on its own, so seeded selections are unchanged.
+"""
+
+import random
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from quiz_app.database.database import Database
+from quiz_app.utils.question_pool import get_pool_index
+
+DIFFICULTY_LEVELS = ('easy', 'medium', 'hard')
+
+# Where a short cell may take its missing questions from:
+#   none       - nowhere; the cell stays short
+#   difficulty - other difficulty levels of the same template (nearest level first)
+#   topic      - the same difficulty level in the other templates
+#   any        - difficulty, then topic, then any level of the other templates
+FALLBACK_RULES = ('none', 'difficulty', 'topic', 'any')
+
+_NEAREST_DIFFICULTIES = {
+    'easy': ('medium', 'hard'),
+    'medium': ('easy', 'hard'),
+    'hard': ('medium', 'easy'),
+}
+
+# (exam ids, difficulty) a question was drawn from
+Source = Tuple[Tuple[int, ...], str]
+
+
+class BlueprintCell:
+    """Questions to draw from one topic at one difficulty level."""
+
+    __slots__ = ('label', 'exam_ids', 'difficulty', 'count')
+
+    def __init__(self, label: str, exam_ids: Sequence[int], difficulty: str, count: int):
+        self.label = label
+        self.exam_ids = tuple(exam_ids)
+        self.difficulty = difficulty
+        self.count = count
+
+
+def template_blueprint(exam_templates: List[Dict]) -> List[BlueprintCell]:
+    """Cells for templates with their own counts, in template then difficulty order."""
+    return [
+        BlueprintCell(template['title'], [template['id']], difficulty, template.get(f'{difficulty}_count', 0) or 0)
+        for template in exam_templates
+        for difficulty in DIFFICULTY_LEVELS
+        if (template.get(f'{difficulty}_count', 0) or 0) > 0
+    ]
+
+
+def shared_blueprint(exam_data: Dict, exam_templates: List[Dict]) -> List[BlueprintCell]:
+    """Cells drawing the assignment-level counts across all templates (ordered by exam id)."""
+    exam_ids = sorted(template['id'] for template in exam_templates)
+    return [
+        BlueprintCell('all templates', exam_ids, difficulty, exam_data.get(f'{difficulty}_questions_count', 0) or 0)
+        for difficulty in DIFFICULTY_LEVELS
+        if (exam_data.get(f'{difficulty}_questions_count', 0) or 0) > 0
+    ]
+
+
+def blueprint_rules(exam_data: Dict) -> Tuple[str, Optional[float]]:
+    """
+    Fallback rule and points target of an assignment.
+
+    Returns:
+        Tuple of (fallback rule, target points or None); unknown rules read as 'none'
+    """
+    fallback = exam_data.get('pool_fallback') or 'none'
+    if fallback not in FALLBACK_RULES:
+        fallback = 'none'
+    target_points = exam_data.get('target_points')
+    return fallback, (float(target_points) if target_points else None)
+
+
+class BlueprintSampler:
+    """Fills a blueprint from the question pool index of a database."""
+
+    def __init__(self, db: Database, rng: Optional[random.Random] = None,
+                 fallback: str = 'none', target_points: Optional[float] = None):
+        """
+        Args:
+            db: Database the questions live in
+            rng: Random source (the selector's seeded RNG)
+            fallback: One of FALLBACK_RULES
+            target_points: Total points the selection should add up to (None: any)
+        """
+        if fallback not in FALLBACK_RULES:
+            raise ValueError(f"Unknown fallback rule: {fallback}")
+        self.db = db
+        self.pool = get_pool_index(db)
+        self.rng = rng or random.Random()
+        self.fallback = fallback
+        self.target_points = target_points
+
+    def sample(self, cells: List[BlueprintCell]) -> List[List[Tuple[int, str]]]:
+        """
+        Draw the questions of every cell.
+
+        Args:
+            cells: Blueprint cells, in the order the questions should appear
+
+        Returns:
+            Per cell, the drawn (question_id, difficulty_level) pairs; questions
+            borrowed from another difficulty keep their own level
+        """
+        chosen = set()
+        picks: List[List[Tuple[int, Source]]] = []
+        shortfalls = []
+
+        for index, cell in enumerate(cells):
+            source = (cell.exam_ids, cell.difficulty)
+            available = self.pool.question_ids(self.db, cell.exam_ids, cell.difficulty)
+            count = min(cell.count, len(available))
+            print(f"  {cell.label} {cell.difficulty}: {len(available)} available, {cell.count} requested")
+            drawn = self.rng.sample(available, count)
+            chosen.update(drawn)
+            picks.append([(question_id, source) for question_id in drawn])
+            if count < cell.count:
+                shortfalls.append((index, cell.count - count))
+
+        for index, missing in shortfalls:
+            cell = cells[index]
+            for source in self._fallback_sources(cell, cells):
+                if missing <= 0:
+                    break
+                spare = [question_id for question_id in self.pool.question_ids(self.db, *source)
+                         if question_id not in chosen]
+                drawn = self.rng.sample(spare, min(missing, len(spare)))
+                chosen.update(drawn)
+                picks[index].extend((question_id, source) for question_id in drawn)
+                missing -= len(drawn)
+            if missing > 0:
+                print(f"  Warning: {cell.label} {cell.difficulty} is {missing} questions short")
+            else:
+                print(f"  {cell.label} {cell.difficulty}: shortfall made up ({self.fallback} fallback)")
+
+        if self.target_points is not None and chosen:
+            self._fit_points(picks, chosen)
+
+        return [[(question_id, source[1]) for question_id, source in cell_picks] for cell_picks in picks]
+
+    def _fallback_sources(self, cell: BlueprintCell, cells: List[BlueprintCell]) -> List[Source]:
+        """Pools a short cell may borrow from under the fallback rule, in preference order."""
+        if self.fallback == 'none':
+            return []
+        other_topics = list(dict.fromkeys(other.exam_ids for other in cells if other.exam_ids != cell.exam_ids))
+        sources = []
+        if self.fallback in ('difficulty', 'any'):
+            sources.extend((cell.exam_ids, difficulty) for difficulty in _NEAREST_DIFFICULTIES[cell.difficulty])
+        if self.fallback in ('topic', 'any'):
+            sources.extend((exam_ids, cell.difficulty) for exam_ids in other_topics)
+        if self.fallback == 'any':
+            sources.extend((exam_ids, difficulty) for exam_ids in other_topics
+                           for difficulty in _NEAREST_DIFFICULTIES[cell.difficulty])
+        return sources
+
+    def _fit_points(self, picks: List[List[Tuple[int, Source]]], chosen: set):
+        """
+        Swap questions for unchosen ones from the same pool until the total
+        points reach the target or no single swap gets closer.
+        """
+        # Per source pool: selected and spare question ids grouped by points value
+        selected: Dict[Source, Dict[float, List[int]]] = {}
+        spare: Dict[Source, Dict[float, List[int]]] = {}
+        points: Dict[Source, Mapping[int, float]] = {}
+        for cell_picks in picks:
+            for question_id, source in cell_picks:
+                if source not in points:
+                    points[source] = self.pool.points(self.db, source[0])
+                selected.setdefault(source, {}).setdefault(points[source][question_id], []).append(question_id)
+        for source in selected:
+            groups = spare[source] = {}
+            for question_id in self.pool.question_ids(self.db, *source):
+                if question_id not in chosen:
+                    groups.setdefault(points[source][question_id], []).append(question_id)
+
+        total = sum(points[source][question_id] for cell_picks in picks for question_id, source in cell_picks)
+        swapped_in: Dict[Source, List[int]] = {}
+        for _ in range(len(chosen)):
+            gap = self.target_points - total
+            best = None
+            for source in selected:
+                for out_points in selected[source]:
+                    for in_points, candidates in spare[source].items():
+                        if not candidates:
+                            continue
+                        remaining = abs(gap - (in_points - out_points))
+                        if remaining < abs(gap) - 1e-9 and (best is None or remaining < best[0]):
+                            best = (remaining, source, out_points, in_points)
+            if best is None:
+                break
+
+            _, source, out_points, in_points = best
+            outgoing = selected[source][out_points]
+            removed = outgoing.pop(self.rng.randrange(len(outgoing)))
+            if not outgoing:
+                del selected[source][out_points]
+            incoming = spare[source][in_points]
+            added = incoming.pop(self.rng.randrange(len(incoming)))
+            selected[source].setdefault(in_points, []).append(added)
+            spare[source].setdefault(out_points, []).append(removed)
+            swapped_in.setdefault(source, []).append(added)
+            total += in_points - out_points
+
+        if swapped_in:
+            final = {source: {question_id for group in groups.values() for question_id in group}
+                     for source, groups in selected.items()}
+            original = {question_id for cell_picks in picks for question_id, _ in cell_picks}
+            # Swaps are one-for-one within a source, so each dropped pick has a replacement
+            replacements = {source: [question_id for question_id in dict.fromkeys(added)
+                                     if question_id in final[source] and question_id not in original]
+                            for source, added in swapped_in.items()}
+            for cell_picks in picks:
+                for position, (question_id, source) in enumerate(cell_picks):
+                    if question_id not in final[source]:
+                        cell_picks[position] = (replacements[source].pop(0), source)
+        print(f"  Selected questions total {total:g} points (target {self.target_points:g})")
@@ -97,84 +97,83 @@ class BulkImporter:
             skipped_count = 0
             error_count = 0
             
-            for idx, row in df.iterrows():
-                try:
-                    # Prepare question data
-                    question_data = {
-                        'exam_id': exam_id,
-                        'question_text': self.safe_str_strip(row['question_text']),
-                        'question_type': self.safe_str_strip(row['question_type']),
-                        'difficulty_level': self.safe_str_strip(row.get('difficulty_level', 'medium'), 'medium'),
-                        'points': float(row.get('points', 1.0)) if pd.notna(row.get('points')) else 1.0,
-                        'explanation': self.safe_str_strip(row.get('explanation', '')) if pd.notna(row.get('explanation')) else None,
-                        'correct_answer': self.safe_str_strip(row['correct_answer'])
-                    }
+            # Import every row in one transaction (one commit for the whole file)
+            with self.db.transaction():
+                for idx, row in df.iterrows():
+                    try:
+                        # Prepare question data
+                        question_data = {
+                            'exam_id': exam_id,
+                            'question_text': self.safe_str_strip(row['question_text']),
+                            'question_type': self.safe_str_strip(row['question_type']),
+                            'difficulty_level': self.safe_str_strip(row.get('difficulty_level', 'medium'), 'medium'),
+                            'points': float(row.get('points', 1.0)) if pd.notna(row.get('points')) else 1.0,
+                            'explanation': self.safe_str_strip(row.get('explanation', '')) if pd.notna(row.get('explanation')) else None,
+                            'correct_answer': self.safe_str_strip(row['correct_answer'])
+                        }
                     
-                    # Insert question (default status is Active)
-                    question_id = self.db.execute_insert('''
-                        INSERT INTO questions (exam_id, question_text, question_type, difficulty_level,
-                                             points, explanation, correct_answer, is_active)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 1)
-                    ''', (
-                        question_data['exam_id'],
-                        question_data['question_text'],
-                        question_data['question_type'],
-                        question_data['difficulty_level'],
-                        question_data['points'],
-                        question_data['explanation'],
-                        question_data['correct_answer']
-                    ))
+                        # Insert question (default status is Active)
+                        question_id = self.db.execute_insert('''
+                            INSERT INTO questions (exam_id, question_text, question_type, difficulty_level,
+                                                 points, explanation, correct_answer, is_active)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                        ''', (
+                            question_data['exam_id'],
+                            question_data['question_text'],
+                            question_data['question_type'],
+                            question_data['difficulty_level'],
+                            question_data['points'],
+                            question_data['explanation'],
+                            question_data['correct_answer']
+                        ))
                     
-                    # Handle options for choice-based questions
-                    if question_data['question_type'] in ['single_choice', 'multiple_choice']:
-                        options_added = 0
-                        correct_answers = []
+                        # Handle options for choice-based questions
+                        if question_data['question_type'] in ['single_choice', 'multiple_choice']:
+                            correct_answers = []
                         
-                        # Parse correct answers (can be comma-separated for multiple choice)
-                        if question_data['question_type'] == 'multiple_choice':
-                            correct_answers = [ans.strip() for ans in question_data['correct_answer'].split(',')]
-                        else:
-                            correct_answers = [question_data['correct_answer']]
+                            # Parse correct answers (can be comma-separated for multiple choice)
+                            if question_data['question_type'] == 'multiple_choice':
+                                correct_answers = [ans.strip() for ans in question_data['correct_answer'].split(',')]
+                            else:
+                                correct_answers = [question_data['correct_answer']]
                         
-                        for i in range(1, 7):  # Support up to 6 options
-                            option_text = row.get(f'option_{i}')
-                            if pd.notna(option_text):
-                                option_text_clean = self.safe_str_strip(option_text)
-                                if option_text_clean:  # Only process non-empty options
-                                    is_correct = option_text_clean in correct_answers
-                                    
-                                    self.db.execute_insert('''
-                                        INSERT INTO question_options (question_id, option_text, is_correct, order_index)
-                                        VALUES (?, ?, ?, ?)
-                                    ''', (question_id, option_text_clean, is_correct, i))
-                                    
-                                    options_added += 1
+                            option_rows = []
+                            for i in range(1, 7):  # Support up to 6 options
+                                option_text = row.get(f'option_{i}')
+                                if pd.notna(option_text):
+                                    option_text_clean = self.safe_str_strip(option_text)
+                                    if option_text_clean:  # Only process non-empty options
+                                        is_correct = option_text_clean in correct_answers
+                                        option_rows.append((question_id, option_text_clean, is_correct, i))
                         
-                        if options_added < 2:
-                            # Not enough options, skip this question
-                            self.db.execute_update("DELETE FROM questions WHERE id = ?", (question_id,))
-                            skipped_count += 1
-                            continue
-                    
-                    elif question_data['question_type'] == 'true_false':
-                        # Add True/False options
-                        is_true_correct = question_data['correct_answer'].lower() in ['true', 't', 'yes', '1']
+                            if len(option_rows) < 2:
+                                # Not enough options, skip this question
+                                self.db.execute_update("DELETE FROM questions WHERE id = ?", (question_id,))
+                                skipped_count += 1
+                                continue
                         
-                        self.db.execute_insert('''
-                            INSERT INTO question_options (question_id, option_text, is_correct, order_index)
-                            VALUES (?, ?, ?, ?)
-                        ''', (question_id, 'True', is_true_correct, 1))
+                            self.db.execute_many('''
+                                INSERT INTO question_options (question_id, option_text, is_correct, order_index)
+                                VALUES (?, ?, ?, ?)
+                            ''', option_rows)
+                    
+                        elif question_data['question_type'] == 'true_false':
+                            # Add True/False options
+                            is_true_correct = question_data['correct_answer'].lower() in ['true', 't', 'yes', '1']
                         
-                        self.db.execute_insert('''
-                            INSERT INTO question_options (question_id, option_text, is_correct, order_index)
-                            VALUES (?, ?, ?, ?)
-                        ''', (question_id, 'False', not is_true_correct, 2))
+                            self.db.execute_many('''
+                                INSERT INTO question_options (question_id, option_text, is_correct, order_index)
+                                VALUES (?, ?, ?, ?)
+                            ''', [
+                                (question_id, 'True', is_true_correct, 1),
+                                (question_id, 'False', not is_true_correct, 2)
+                            ])
                     
-                    imported_count += 1
+                        imported_count += 1
                 
-                except Exception as e:
-                    error_count += 1
-                    print(f"Error importing question at row {idx}: {str(e)}")
+                    except Exception as e:
+                        error_count += 1
+                        print(f"Error importing question at row {idx}: {str(e)}")
             
             if imported_count > 0:
                 return {
@@ -0,0 +1,165 @@
+"""
+Crash-safe checkpoints for in-progress exams.
+
+The exam_sessions row is only written at submission, so an exam interrupted
+by a crash or power loss used to start over with a new question selection,
+new option order and a full timer. The exam interface now checkpoints its
+session state (question order, selection seed, current question, remaining
+time, review marks) to a small JSON file on local disk, next to the answer
+journal. When the examinee reopens the exam, create_exam_interface resumes
+the same session from it; option order is derived from the seed again (see
+quiz_app.utils.session_order) and answers come back from user_answers (and
+the answer journal, replayed at startup).
+
+Writes are atomic (temp file + os.replace) so a crash mid-save leaves the
+previous checkpoint intact.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from quiz_app.config import EXAM_CHECKPOINT_DIR, EXAM_CHECKPOINT_INTERVAL_SECONDS
+from quiz_app.database.database import Database
+from quiz_app.utils.question_pool import fetch_questions
+
+logger = logging.getLogger(__name__)
+
+# 2: option order is derived from selection_seed instead of being stored
+CHECKPOINT_VERSION = 2
+
+
+class ExamCheckpoint:
+    """Checkpoint file of one examinee's in-progress exam (per assignment, or per exam)."""
+
+    def __init__(self, user_id: int, exam_id: int, assignment_id: Optional[int] = None,
+                 checkpoint_dir: str = EXAM_CHECKPOINT_DIR,
+                 interval: float = EXAM_CHECKPOINT_INTERVAL_SECONDS):
+        self.interval = interval
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        scope = f"assignment_{assignment_id}" if assignment_id else f"exam_{exam_id}"
+        self.path = os.path.join(checkpoint_dir, f"user_{user_id}_{scope}.json")
+        self._lock = threading.Lock()
+        self._last_saved: Optional[float] = None
+        self._save_requested = False
+        self._discarded = False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the saved state.
+
+        Returns:
+            Checkpoint dict, or None if there is none (or it is unreadable)
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable exam checkpoint {self.path}: {e}")
+            return None
+        if state.get('version') != CHECKPOINT_VERSION or not state.get('question_ids'):
+            return None
+        return state
+
+    def save(self, state: Dict[str, Any]) -> bool:
+        """
+        Atomically replace the checkpoint.
+
+        Returns:
+            bool: True if written (False after discard() or on I/O errors)
+        """
+        with self._lock:
+            if self._discarded:
+                return False
+            temp_path = self.path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as temp_file:
+                    json.dump({**state, 'version': CHECKPOINT_VERSION, 'saved_at': time.time()},
+                              temp_file, separators=(',', ':'))
+                    temp_file.flush()
+                    os.fsync(temp_file.fileno())
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Failed to write exam checkpoint {self.path}: {e}")
+                return False
+            self._last_saved = time.monotonic()
+            self._save_requested = False
+            return True
+
+    def request_save(self):
+        """Have the next save_if_due() write regardless of the interval."""
+        self._save_requested = True
+
+    def save_if_due(self, snapshot: Callable[[], Dict[str, Any]]) -> bool:
+        """
+        Save if a save was requested or the interval has elapsed.
+
+        Args:
+            snapshot: Builds the state to save (only called when saving)
+        """
+        if self._discarded:
+            return False
+        if (not self._save_requested and self._last_saved is not None
+                and time.monotonic() - self._last_saved < self.interval):
+            return False
+        return self.save(snapshot())
+
+    def discard(self):
+        """Delete the checkpoint once the exam is submitted; later saves are ignored."""
+        with self._lock:
+            self._discarded = True
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove exam checkpoint {self.path}: {e}")
+
+
+def load_questions_in_order(db: Database, question_ids: List[int]) -> List[Dict]:
+    """
+    Load questions by id, in the given order (questions deleted since are skipped).
+
+    Args:
+        db: Database to read from
+        question_ids: Question order saved in the checkpoint
+    """
+    return fetch_questions(db, question_ids)
+
+
+def load_saved_answers(db: Database, session_id: int, journal=None) -> Dict[int, Dict[str, Any]]:
+    """
+    Rebuild the exam interface's user_answers state for a resumed session.
+
+    Args:
+        db: Database to read from
+        session_id: Resumed exam session
+        journal: The session's AnswerJournal; answers it still holds override the database
+
+    Returns:
+        {question_id: answer_data} in the format save_answer() receives
+    """
+    answers: Dict[int, Dict[str, Any]] = {}
+    rows = list(db.execute_iter("""
+        SELECT question_id, answer_text, selected_option_id, selected_option_ids
+        FROM user_answers WHERE session_id = ?
+    """, (session_id,)))
+    if journal is not None:
+        pending = journal.pending_entries()
+        rows = [row for row in rows if row['question_id'] not in pending]
+        rows.extend(entry for entry in pending.values() if entry['op'] == 'upsert')
+
+    for row in rows:
+        if row.get('selected_option_id') is not None:
+            # Radio groups report the selected value as a string
+            answers[row['question_id']] = {'selected_option_id': str(row['selected_option_id'])}
+        elif row.get('selected_option_ids'):
+            answers[row['question_id']] = {'selected_option_ids': json.loads(row['selected_option_ids'])}
+        elif row.get('answer_text') is not None:
+            answers[row['question_id']] = {'answer_text': row['answer_text']}
+    return answers
@@ -0,0 +1,199 @@
+"""
+Per-question time and interaction telemetry for exam sessions.
+
+Question timing in the exam interface was disabled because updating state
+while navigating caused page-update problems, so user_answers.time_spent_seconds
+was always 0. ExamTelemetry never touches the UI: recording an event is an
+in-memory append, and dwell time per question is accumulated from
+time.monotonic() timestamps (paused while the exam window is unfocused).
+
+Events (question views, answer changes, review marks, focus loss) are kept
+in memory and written to session_events in batches when the exam's
+enable_logging or enable_pattern_analysis flag is set. Dwell times are
+always collected and written to user_answers.time_spent_seconds at submit.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from quiz_app.config import TELEMETRY_FLUSH_INTERVAL_SECONDS
+from quiz_app.database.database import Database
+
+logger = logging.getLogger(__name__)
+
+# Event types stored in session_events.event_type
+EVENT_VIEW = 'view'
+EVENT_LEAVE = 'leave'
+EVENT_ANSWER = 'answer'
+EVENT_MARK = 'mark'
+EVENT_UNMARK = 'unmark'
+EVENT_FOCUS_LOST = 'focus_lost'
+EVENT_FOCUS_GAINED = 'focus_gained'
+EVENT_SUBMIT = 'submit'
+
+_INSERT_SQL = """
+    INSERT INTO session_events (session_id, question_id, event_type, elapsed_ms, duration_ms)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class ExamTelemetry:
+    """In-memory event recorder and dwell-time tracker for one exam session."""
+
+    def __init__(self, session_id: int, db: Optional[Database] = None, persist_events: bool = True,
+                 time_spent: Optional[Dict[int, float]] = None,
+                 flush_interval: float = TELEMETRY_FLUSH_INTERVAL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            session_id: Exam session the events belong to
+            db: Database to write events and time spent to
+            persist_events: Write events to session_events (dwell times are kept either way)
+            time_spent: Seconds per question already spent (resumed session)
+            flush_interval: Minimum seconds between flush_if_due() writes
+            clock: Monotonic time source
+        """
+        self.session_id = session_id
+        self.db_path = db.db_path if db else None
+        self.persist_events = persist_events
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._events: List[Tuple[int, Optional[int], str, int, Optional[int]]] = []
+        self._time_spent: Dict[int, float] = dict(time_spent or {})
+        self._last_answers: Dict[int, Any] = {}
+        self._current: Optional[int] = None
+        self._segment_start: Optional[float] = None
+        self._focused = True
+        self._last_flush = clock()
+        self.focus_loss_count = 0
+
+    # --- Recording (UI thread; in-memory only) -----------------------------
+
+    def _record(self, event_type: str, question_id: Optional[int] = None, duration_ms: Optional[int] = None):
+        if not self.persist_events:
+            return
+        elapsed_ms = int((self._clock() - self._started) * 1000)
+        with self._lock:
+            self._events.append((self.session_id, question_id, event_type, elapsed_ms, duration_ms))
+
+    def _close_segment(self) -> Optional[int]:
+        """Add the running dwell segment to the current question; returns its length in ms."""
+        if self._current is None or self._segment_start is None:
+            return None
+        elapsed = self._clock() - self._segment_start
+        self._segment_start = None
+        with self._lock:
+            self._time_spent[self._current] = self._time_spent.get(self._current, 0.0) + elapsed
+        return int(elapsed * 1000)
+
+    def question_shown(self, question_id: int):
+        """The examinee is now looking at question_id (no-op if it already is)."""
+        if question_id == self._current:
+            return
+        if self._current is not None:
+            self._record(EVENT_LEAVE, self._current, self._close_segment())
+        self._current = question_id
+        self._segment_start = self._clock() if self._focused else None
+        self._record(EVENT_VIEW, question_id)
+
+    def answer_changed(self, question_id: int, answer_data: Any = None):
+        """Record an answer save; re-saving an unchanged answer (e.g. on navigation) is ignored."""
+        if question_id in self._last_answers and self._last_answers[question_id] == answer_data:
+            return
+        self._last_answers[question_id] = answer_data
+        self._record(EVENT_ANSWER, question_id)
+
+    def review_marked(self, question_id: int, marked: bool):
+        self._record(EVENT_MARK if marked else EVENT_UNMARK, question_id)
+
+    def focus_changed(self, focused: bool):
+        """Window focus changed; dwell time does not run while unfocused."""
+        if focused == self._focused:
+            return
+        self._focused = focused
+        if focused:
+            if self._current is not None:
+                self._segment_start = self._clock()
+            self._record(EVENT_FOCUS_GAINED, self._current)
+        else:
+            self.focus_loss_count += 1
+            self._record(EVENT_FOCUS_LOST, self._current, self._close_segment())
+
+    def finish(self):
+        """Stop timing at submission."""
+        if self._current is not None:
+            self._record(EVENT_LEAVE, self._current, self._close_segment())
+            self._current = None
+        self._record(EVENT_SUBMIT)
+
+    # --- Reading ---------------------------------------------------------
+
+    def time_spent(self, question_id: int) -> float:
+        """Seconds spent on a question so far, including the running segment."""
+        with self._lock:
+            spent = self._time_spent.get(question_id, 0.0)
+        if question_id == self._current and self._segment_start is not None:
+            spent += self._clock() - self._segment_start
+        return spent
+
+    def time_spent_by_question(self) -> Dict[int, float]:
+        spent = {}
+        with self._lock:
+            question_ids = list(self._time_spent)
+        for question_id in question_ids + ([self._current] if self._current is not None else []):
+            spent[question_id] = self.time_spent(question_id)
+        return spent
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    # --- Writing (background / submit) -----------------------------------
+
+    def flush(self) -> bool:
+        """
+        Write buffered events to session_events in one batch.
+
+        Returns:
+            bool: True if nothing is left buffered
+        """
+        with self._lock:
+            batch, self._events = self._events, []
+        self._last_flush = self._clock()
+        if not batch:
+            return True
+        try:
+            Database(db_path=self.db_path).execute_many(_INSERT_SQL, batch)
+            return True
+        except Exception as e:
+            # Keep the events for the next attempt
+            logger.warning(f"Telemetry flush for session {self.session_id} failed: {e}")
+            with self._lock:
+                self._events[:0] = batch
+            return False
+
+    def flush_if_due(self) -> bool:
+        """Flush when flush_interval has passed since the last write (called from the timer thread)."""
+        if self._clock() - self._last_flush < self.flush_interval:
+            return False
+        return self.flush()
+
+    def write_time_spent(self) -> int:
+        """
+        Store whole seconds spent per question in user_answers.time_spent_seconds.
+
+        Returns:
+            int: Number of answer rows updated
+        """
+        rows = [(int(round(spent)), self.session_id, question_id)
+                for question_id, spent in self.time_spent_by_question().items()]
+        if not rows:
+            return 0
+        return Database(db_path=self.db_path).execute_many("""
+            UPDATE user_answers SET time_spent_seconds = ?
+            WHERE session_id = ? AND question_id = ?
+        """, rows)
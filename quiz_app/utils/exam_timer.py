@@ -0,0 +1,105 @@
+"""
+Exam countdown driven by a monotonic deadline.
+
+The exam interface used to decrement a counter once per time.sleep(1) and
+call page.update() on every tick. Under load the sleeps overran and the
+countdown drifted behind real time, and each tick re-diffed the whole exam.
+ExamTimer derives the remaining time from a fixed time.monotonic() deadline,
+so a late tick shows the correct value instead of losing a second, and the
+caller only redraws the timer control. While the window is unfocused the
+display is refreshed less often; expiry still fires on time.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+from quiz_app.config import EXAM_TIMER_UNFOCUSED_REFRESH_SECONDS
+
+
+class ExamTimer:
+    """
+    Background countdown for one exam session.
+
+    on_tick(remaining_seconds) is called whenever the displayed whole-second
+    value changes (possibly skipping values when ticks are delayed);
+    on_expire() is called once when the deadline passes. Both run on the
+    timer thread.
+    """
+
+    def __init__(self, duration_seconds: float, on_tick: Callable[[int], None],
+                 on_expire: Callable[[], None],
+                 unfocused_interval: float = EXAM_TIMER_UNFOCUSED_REFRESH_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.duration_seconds = duration_seconds
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.unfocused_interval = unfocused_interval
+        self._clock = clock
+        self._deadline: Optional[float] = None
+        self._focused = True
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start counting down from now (no-op if already started)."""
+        if self._thread is not None:
+            return
+        self._deadline = self._clock() + self.duration_seconds
+        self._thread = threading.Thread(target=self._run, name='exam-timer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the countdown without calling on_expire."""
+        self._stopped.set()
+        self._wakeup.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stopped.is_set()
+
+    def remaining(self) -> int:
+        """Whole seconds left, rounded up so the display reaches 00:00 exactly at the deadline."""
+        if self._deadline is None:
+            return int(math.ceil(self.duration_seconds))
+        return max(0, int(math.ceil(self._deadline - self._clock())))
+
+    def set_focused(self, focused: bool):
+        """Refresh every second while focused, every unfocused_interval otherwise."""
+        if focused != self._focused:
+            self._focused = focused
+            # Redraw immediately when the examinee comes back
+            self._wakeup.set()
+
+    def _next_wait(self) -> float:
+        left = self._deadline - self._clock()
+        if left <= 0:
+            return 0
+        # Wake just after the displayed value changes, not one second after the last wakeup
+        until_next_second = left - math.floor(left) or 1.0
+        if not self._focused:
+            until_next_second = max(until_next_second, self.unfocused_interval)
+        return min(until_next_second, left) + 0.001
+
+    def _run(self):
+        last_shown = None
+        try:
+            while not self._stopped.is_set():
+                remaining = self.remaining()
+                if remaining != last_shown:
+                    last_shown = remaining
+                    self.on_tick(remaining)
+                if remaining <= 0:
+                    if not self._stopped.is_set():
+                        self._stopped.set()
+                        self.on_expire()
+                    break
+                self._wakeup.wait(self._next_wait())
+                self._wakeup.clear()
+        except Exception as e:
+            print(f"[TIMER] Timer thread error: {e}")
+        finally:
+            self._stopped.set()
+            print("[TIMER] Timer thread stopped cleanly")
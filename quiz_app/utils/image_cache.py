@@ -0,0 +1,165 @@
+"""
+Per-session cache of question images for the exam interface.
+
+Question images live as BLOBs in the encrypted database. Rendering one means
+a query and a decrypt, which the exam interface used to repeat every time the
+examinee navigated back to a question. This cache publishes the images to the local
+asset server, which holds the only copy of the bytes, and keeps an LRU of
+their URLs within a byte budget. Cached images are pinned in the asset server
+and released when evicted, so a URL handed out by the cache stays valid until
+the cache drops it. Neighbours of the current question are warmed on a
+background thread.
+"""
+
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from quiz_app.config import IMAGE_CACHE_MAX_BYTES, IMAGE_DISPLAY_MAX_PX
+from quiz_app.database.database import Database
+from quiz_app.utils.asset_server import image_src, release_image_src
+
+logger = logging.getLogger(__name__)
+
+# Cached marker for questions that turned out to have no image
+_NO_IMAGE: Dict[str, str] = {}
+
+
+class QuestionImageCache:
+    """
+    LRU of question image sources (ft.Image src arguments) whose bytes are
+    pinned in the asset server, capped by the size of those bytes.
+
+    get() is safe to call from the UI thread while prefetch() warms entries
+    on a worker thread; the worker uses its own database connection.
+    """
+
+    def __init__(self, db: Optional[Database] = None, max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+                 image_size: Optional[int] = IMAGE_DISPLAY_MAX_PX):
+        self.db_path = db.db_path if db else None
+        self.max_bytes = max_bytes
+        # Longest side the images are displayed at; picks the stored derivative
+        self.image_size = image_size
+        # question_id -> (pinned image_src() result, bytes it pins)
+        self._entries: 'OrderedDict[int, Tuple[Dict[str, str], int]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue[Optional[int]]' = queue.Queue()
+        self._queued = set()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evictions = 0
+
+    def get(self, question_id: int) -> Optional[Dict[str, str]]:
+        """
+        Return the question's image source, loading it on a miss.
+
+        Args:
+            question_id: Question to fetch the image for
+
+        Returns:
+            Dict to splat into ft.Image (see image_src), or None if the
+            question has no image
+        """
+        with self._lock:
+            entry = self._entries.get(question_id)
+            if entry is not None:
+                self._entries.move_to_end(question_id)
+                self.hits += 1
+                return entry[0] or None
+            self.misses += 1
+
+        source, size = self._load(question_id)
+        self._store(question_id, source, size)
+        return source or None
+
+    def prefetch(self, question_ids: Iterable[int]):
+        """Queue images for background loading; already cached ids are skipped."""
+        if self._closed:
+            return
+        with self._lock:
+            pending = [qid for qid in question_ids
+                       if qid and qid not in self._entries and qid not in self._queued]
+            self._queued.update(pending)
+        if not pending:
+            return
+
+        for question_id in pending:
+            self._queue.put(question_id)
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._prefetch_loop, name='image-prefetch', daemon=True)
+            self._worker.start()
+
+    def _prefetch_loop(self):
+        while True:
+            question_id = self._queue.get()
+            if question_id is None or self._closed:
+                return
+            try:
+                with self._lock:
+                    cached = question_id in self._entries
+                if not cached:
+                    self._store(question_id, *self._load(question_id))
+                    with self._lock:
+                        self.prefetched += 1
+            except Exception as e:
+                logger.warning(f"Image prefetch failed for question {question_id}: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(question_id)
+
+    def _load(self, question_id: int) -> Tuple[Dict[str, str], int]:
+        image = Database(db_path=self.db_path).get_question_image(question_id, max_size=self.image_size)
+        if not image:
+            return _NO_IMAGE, 0
+        return image_src(image['data'], image['mime_type'], pin=True), len(image['data'])
+
+    def _store(self, question_id: int, source: Dict[str, str], size: int):
+        released = []
+        if size > self.max_bytes:
+            # Larger than the whole budget; serve it uncached (evictable in the asset server)
+            release_image_src(source)
+            return
+        with self._lock:
+            previous = self._entries.pop(question_id, None)
+            if previous is not None:
+                self._size -= previous[1]
+                released.append(previous[0])
+            self._entries[question_id] = (source, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (evicted_source, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                released.append(evicted_source)
+                self.evictions += 1
+        for evicted_source in released:
+            release_image_src(evicted_source)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current memory use."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'prefetched': self.prefetched,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+            }
+
+    def close(self):
+        """Stop the prefetch worker and drop all cached images."""
+        self._closed = True
+        self._queue.put(None)
+        with self._lock:
+            released = [source for source, _ in self._entries.values()]
+            self._entries.clear()
+            self._queued.clear()
+            self._size = 0
+        for source in released:
+            release_image_src(source)
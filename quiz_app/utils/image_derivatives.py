@@ -0,0 +1,94 @@
+"""
+Display derivatives for question images.
+
+Uploaded images are stored at full resolution, but most views show them in
+a small box: a thumbnail in the question list or a ~600px frame in the exam
+interface. A downscaled copy of each size is generated once, at upload time,
+so those views never have to ship or decode the original.
+
+Pillow is optional. Without it only the original is stored, and every view
+falls back to it.
+"""
+
+import io
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from quiz_app.config import IMAGE_THUMBNAIL_MAX_PX, IMAGE_DISPLAY_MAX_PX
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> longest side in pixels, smallest first
+DERIVATIVE_SIZES = (
+    ('thumbnail', IMAGE_THUMBNAIL_MAX_PX),
+    ('display', IMAGE_DISPLAY_MAX_PX),
+)
+
+
+def _encode(image, source_format: str) -> Tuple[bytes, str]:
+    """Encode a resized image, keeping JPEG sources as JPEG and everything else as PNG."""
+    buffer = io.BytesIO()
+    if source_format == 'JPEG':
+        image.convert('RGB').save(buffer, format='JPEG', quality=85, optimize=True)
+        return buffer.getvalue(), 'image/jpeg'
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue(), 'image/png'
+
+
+def generate_derivatives(image_bytes: bytes) -> Dict[str, Any]:
+    """
+    Measure an image and build its downscaled display variants.
+
+    Args:
+        image_bytes: Original image file contents
+
+    Returns:
+        Dict with 'width' and 'height' (None if unknown) and, for every
+        variant in DERIVATIVE_SIZES that is smaller than the original, a
+        (bytes, mime_type) tuple under the variant's name
+    """
+    result: Dict[str, Any] = {'width': None, 'height': None}
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.info("Pillow not installed; storing question image without derivatives")
+        return result
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as original:
+            result['width'], result['height'] = original.size
+            # Animated images would lose their frames; serve the original
+            if getattr(original, 'is_animated', False):
+                return result
+
+            source_format = original.format
+            if original.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                original = original.convert('RGBA')
+
+            for name, max_px in DERIVATIVE_SIZES:
+                if max(original.size) <= max_px:
+                    break
+                resized = original.copy()
+                resized.thumbnail((max_px, max_px), Image.LANCZOS)
+                result[name] = _encode(resized, source_format)
+    except Exception as e:
+        logger.warning(f"Could not generate image derivatives: {e}")
+    return result
+
+
+def pick_variant(available: Dict[str, Optional[bytes]], max_size: Optional[int]) -> str:
+    """
+    Choose the smallest stored variant that still covers max_size pixels.
+
+    Args:
+        available: Variant name -> stored bytes (None when not generated)
+        max_size: Longest side the caller will display, or None for the original
+
+    Returns:
+        str: 'thumbnail', 'display' or 'original'
+    """
+    if max_size is not None:
+        for name, max_px in DERIVATIVE_SIZES:
+            if max_px >= max_size and available.get(name):
+                return name
+    return 'original'
@@ -443,6 +443,9 @@ TRANSLATIONS = {
         'save_continue': 'Save & Continue',
         'skip_question': 'Skip Question',
         'exam_auto_submit': 'Time is up! The exam will be submitted automatically.',
+        'answers_not_saved': 'Answers not saved yet',
+        'answers_not_saved_message': 'Some answers could not be saved to the database, so the exam was not submitted. They are kept on this computer. Check the connection and try again.',
+        'retry_submit': 'Try Again',
         'time_warning': 'Warning: Only {minutes} minutes remaining!',
 
         # Permissions
@@ -722,6 +725,7 @@ TRANSLATIONS = {
         'export_assignment_as_pdf': 'Export Assignment as PDF',
         'randomization_disabled': 'Randomization is disabled. All variants will be identical.',
         'generating_variants': 'Generating {0} variant(s)...',
+        'rendering_documents': '{0} of {1} documents rendered',
         'assignment': 'Assignment',
         'questions': 'Questions',
         'variants_configured': 'Variants configured',
@@ -1328,6 +1332,13 @@ TRANSLATIONS = {
         'using_default_location': 'Using default location (application directory)',
         'reset_to_default': 'Reset to Default',
         'database_location_restart_info': 'Changing database location requires application restart to take effect',
+        'query_profiler': 'SQL Query Profiler',
+        'query_profiler_description': 'Records the latency of every database statement. Statements above the slow-query threshold are written to the log with their query plan.',
+        'enable_query_profiling': 'Enable query profiling',
+        'slow_query_log': 'Slow-query log',
+        'reset_statistics': 'Reset Statistics',
+        'top_slow_queries': 'Top Offenders',
+        'no_profiled_queries': 'No statements recorded yet. Enable profiling and use the application.',
         'current_db_location': 'Current Location',
         'new_db_location': 'New Location',
         'database_exists_at_new_location': 'A database file exists at the new location.',
@@ -1785,6 +1796,9 @@ TRANSLATIONS = {
         'save_continue': 'Yadda saxla və davam et',
         'skip_question': 'Sualı keç',
         'exam_auto_submit': 'Vaxt bitdi! İmtahan avtomatik təqdim ediləcək.',
+        'answers_not_saved': 'Cavablar hələ saxlanılmayıb',
+        'answers_not_saved_message': 'Bəzi cavablar verilənlər bazasına yazıla bilmədi, buna görə imtahan təqdim edilmədi. Onlar bu kompüterdə saxlanılır. Bağlantını yoxlayın və yenidən cəhd edin.',
+        'retry_submit': 'Yenidən cəhd et',
         'time_warning': 'Diqqət: Yalnız {minutes} dəqiqə qalıb!',
 
         # Permissions / İcazələr
@@ -2064,6 +2078,7 @@ TRANSLATIONS = {
         'export_assignment_as_pdf': 'Tapşırığı PDF olaraq İxrac Et',
         'randomization_disabled': 'Qarışdırma deaktivdir. Bütün variantlar eyni olacaq.',
         'generating_variants': '{0} variant yaradılır...',
+        'rendering_documents': '{1} sənəddən {0} hazırlandı',
         'assignment': 'Tapşırıq',
         'questions': 'Suallar',
         'variants_configured': 'Variantlar konfiqurasiya edilib',
@@ -2670,6 +2685,13 @@ TRANSLATIONS = {
         'using_default_location': 'Standart yer istifadə olunur (tətbiq qovluğu)',
         'reset_to_default': 'Standarta Sıfırla',
         'database_location_restart_info': 'Verilənlər bazası yerinin dəyişdirilməsi qüvvəyə minməsi üçün tətbiqin yenidən başladılmasını tələb edir',
+        'query_profiler': 'SQL Sorğu Profilləyicisi',
+        'query_profiler_description': 'Hər verilənlər bazası sorğusunun icra müddətini qeyd edir. Yavaş sorğu həddini aşan sorğular icra planı ilə birlikdə jurnala yazılır.',
+        'enable_query_profiling': 'Sorğu profilləşdirməsini aktivləşdir',
+        'slow_query_log': 'Yavaş sorğular jurnalı',
+        'reset_statistics': 'Statistikanı Sıfırla',
+        'top_slow_queries': 'Ən Yavaş Sorğular',
+        'no_profiled_queries': 'Hələ heç bir sorğu qeyd olunmayıb. Profilləşdirməni aktivləşdirin və tətbiqdən istifadə edin.',
         'current_db_location': 'Cari Yer',
         'new_db_location': 'Yeni Yer',
         'database_exists_at_new_location': 'Yeni yerdə verilənlər bazası faylı mövcuddur.',
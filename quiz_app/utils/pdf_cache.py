@@ -0,0 +1,146 @@
+"""
+Content-addressed disk cache for generated exam PDFs.
+
+A rendered exam paper or answer key depends only on its variant snapshot,
+the content of the questions and options it references, the assignment
+fields printed on it and the generator's layout (version, fonts, logo,
+footer). document_key() hashes exactly those inputs, so re-exporting an
+unchanged assignment is a file copy. Editing a referenced question or
+option changes the key, so the stale file is never served.
+
+Files are keyed by SHA-256 and written atomically. Hits refresh the file's
+mtime and prune() drops the least recently used files beyond the size limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Dict, List
+
+from quiz_app.config import PDF_CACHE_DIR, PDF_CACHE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+# Fields of the inputs that end up on the page
+ASSIGNMENT_FIELDS = ('id', 'assignment_name', 'title', 'duration_minutes')
+QUESTION_FIELDS = ('id', 'question_text', 'question_type', 'points', 'correct_answer', 'explanation')
+OPTION_FIELDS = ('id', 'option_text', 'is_correct')
+
+
+def content_digest(snapshot_data: Dict) -> str:
+    """
+    Hash the printed content of every question and option of an export.
+
+    Args:
+        snapshot_data: ExamPDFGenerator.load_snapshot_data() result
+    """
+    digest = hashlib.sha256()
+    questions = snapshot_data['questions']
+    options = snapshot_data['options']
+    for question_id in sorted(questions):
+        question = questions[question_id]
+        digest.update(json.dumps([question.get(field) for field in QUESTION_FIELDS], default=str).encode())
+        for option in options.get(question_id, []):
+            digest.update(json.dumps([option.get(field) for field in OPTION_FIELDS], default=str).encode())
+    return digest.hexdigest()
+
+
+def document_key(kind: str, assignment: Dict, snapshot: List[Dict], variant_num: int,
+                 content: str, layout: Dict) -> str:
+    """
+    Cache key of one document.
+
+    Args:
+        kind: 'paper' or 'answers'
+        assignment: Assignment record
+        snapshot: Variant snapshot (question order matters)
+        variant_num: Variant number
+        content: content_digest() of the export's questions
+        layout: ExamPDFGenerator.layout_settings()
+    """
+    key_data = {
+        'kind': kind,
+        'variant': variant_num,
+        'assignment': [assignment.get(field) for field in ASSIGNMENT_FIELDS],
+        'snapshot': snapshot,
+        'content': content,
+        'layout': layout,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PDFCache:
+    """Directory of rendered PDFs named by their document_key()."""
+
+    def __init__(self, cache_dir: str = PDF_CACHE_DIR, max_mb: float = PDF_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """
+        Copy a cached document to output_path.
+
+        Returns:
+            bool: True on a hit
+        """
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_path)
+            # Mark as recently used for prune()
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to read cached PDF {path}: {e}")
+            return False
+        return True
+
+    def store(self, key: str, source_path: str):
+        """Add a freshly rendered document (failures only cost a future re-render)."""
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache PDF {source_path}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def prune(self) -> int:
+        """
+        Remove least recently used files until the cache fits its size limit.
+
+        Returns:
+            Number of files removed
+        """
+        with self._lock:
+            try:
+                entries = [entry for entry in os.scandir(self.cache_dir)
+                           if entry.is_file() and entry.name.endswith('.pdf')]
+            except OSError as e:
+                logger.warning(f"Failed to list PDF cache {self.cache_dir}: {e}")
+                return 0
+            stats = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries]
+            total = sum(size for _, size, _ in stats)
+            removed = 0
+            for _, size, path in sorted(stats):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
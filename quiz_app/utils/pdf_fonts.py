@@ -0,0 +1,172 @@
+"""
+Process-wide registry of the fonts and paragraph styles used in PDF output.
+
+Exam papers, answer keys and the report PDFs all need a Unicode TrueType
+family for Azerbaijani text. Each of them used to locate and register the
+TTFs on every call (the report views under their own font names, so the
+same files were parsed twice). get_pdf_fonts() now registers one family
+with ReportLab the first time it is needed and returns the same font names
+for the rest of the process. cached_stylesheet() does the same for
+stylesheets built on top of it.
+
+warm_pdf_fonts() does the registration on a background thread, so the first
+export after an admin or expert logs in does not pay the parsing cost.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# First family whose regular and bold files exist wins
+FONT_CANDIDATES = [
+    {
+        'family': 'AzerSans',
+        'variants': {
+            'normal': ('AzerSans', 'C:\\Windows\\Fonts\\arial.ttf'),
+            'bold': ('AzerSans-Bold', 'C:\\Windows\\Fonts\\arialbd.ttf'),
+            'italic': ('AzerSans-Italic', 'C:\\Windows\\Fonts\\ariali.ttf'),
+            'bold_italic': ('AzerSans-BoldItalic', 'C:\\Windows\\Fonts\\arialbi.ttf')
+        }
+    },
+    {
+        'family': 'AzerSans',
+        'variants': {
+            'normal': ('AzerSans', '/System/Library/Fonts/Supplemental/Arial.ttf'),
+            'bold': ('AzerSans-Bold', '/System/Library/Fonts/Supplemental/Arial Bold.ttf'),
+            'italic': ('AzerSans-Italic', '/System/Library/Fonts/Supplemental/Arial Italic.ttf'),
+            'bold_italic': ('AzerSans-BoldItalic', '/System/Library/Fonts/Supplemental/Arial Bold Italic.ttf')
+        }
+    },
+    {
+        'family': 'DejaVuSans',
+        'variants': {
+            'normal': ('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'),
+            'bold': ('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+            'italic': ('DejaVuSans-Italic', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf'),
+            'bold_italic': ('DejaVuSans-BoldItalic', '/usr/share/fonts/truetype/dejavu/DejaVuSans-BoldOblique.ttf')
+        }
+    }
+]
+
+# Built-in fonts (no Azerbaijani glyphs) used when no candidate is installed
+HELVETICA_FONTS = {
+    'family': 'Helvetica',
+    'normal': 'Helvetica',
+    'bold': 'Helvetica-Bold',
+    'italic': 'Helvetica-Oblique',
+    'bold_italic': 'Helvetica-BoldOblique',
+    'unicode': False,
+}
+
+_lock = threading.RLock()
+_fonts: Optional[Dict] = None
+_stylesheets: Dict[str, object] = {}
+
+
+def _register_fonts() -> Dict:
+    """Register the first available Unicode family with ReportLab."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for candidate in FONT_CANDIDATES:
+        variants = candidate['variants']
+        normal_name, normal_path = variants['normal']
+        bold_name, bold_path = variants['bold']
+
+        if not (os.path.exists(normal_path) and os.path.exists(bold_path)):
+            continue
+
+        italic_name, italic_path = variants['italic']
+        bold_italic_name, bold_italic_path = variants['bold_italic']
+
+        # Fallback to normal if italic variants are missing
+        if not os.path.exists(italic_path):
+            italic_path = normal_path
+        if not os.path.exists(bold_italic_path):
+            bold_italic_path = bold_path
+
+        try:
+            for font_name, font_path in [
+                (normal_name, normal_path),
+                (bold_name, bold_path),
+                (italic_name, italic_path),
+                (bold_italic_name, bold_italic_path)
+            ]:
+                if font_name not in pdfmetrics.getRegisteredFontNames():
+                    pdfmetrics.registerFont(TTFont(font_name, font_path))
+
+            pdfmetrics.registerFontFamily(
+                candidate['family'],
+                normal=normal_name,
+                bold=bold_name,
+                italic=italic_name,
+                boldItalic=bold_italic_name
+            )
+            print(f"[PDF] Registered {candidate['family']} fonts for Azerbaijani text from: {normal_path}")
+            return {
+                'family': candidate['family'],
+                'normal': normal_name,
+                'bold': bold_name,
+                'italic': italic_name,
+                'bold_italic': bold_italic_name,
+                'unicode': True,
+            }
+        except Exception as font_error:
+            print(f"[PDF] Failed to register font {candidate['family']}: {font_error}")
+            continue
+
+    print("[PDF] Using Helvetica (may not display Azerbaijani characters correctly)")
+    return dict(HELVETICA_FONTS)
+
+
+def get_pdf_fonts() -> Dict:
+    """
+    Font names for PDF output, registering them on first use.
+
+    Returns:
+        {'family', 'normal', 'bold', 'italic', 'bold_italic': font names,
+         'unicode': False if only the built-in Helvetica is available}
+    """
+    global _fonts
+    if _fonts is None:
+        with _lock:
+            if _fonts is None:
+                _fonts = _register_fonts()
+    return _fonts
+
+
+def cached_stylesheet(name: str, build: Callable[[Dict], object]) -> object:
+    """
+    Stylesheet shared by every document of this process.
+
+    Args:
+        name: Registry key of the stylesheet
+        build: Builds it from get_pdf_fonts() (called once per process)
+
+    Returns:
+        The stylesheet; treat it as read-only
+    """
+    stylesheet = _stylesheets.get(name)
+    if stylesheet is None:
+        with _lock:
+            stylesheet = _stylesheets.get(name)
+            if stylesheet is None:
+                stylesheet = _stylesheets[name] = build(get_pdf_fonts())
+    return stylesheet
+
+
+def warm_pdf_fonts() -> threading.Thread:
+    """Register the PDF fonts on a background thread ahead of the first export."""
+    def run():
+        try:
+            get_pdf_fonts()
+        except Exception as e:
+            # The first export registers them instead
+            logger.warning(f"Warming PDF fonts failed: {e}")
+
+    thread = threading.Thread(target=run, name='pdf-font-warmup', daemon=True)
+    thread.start()
+    return thread
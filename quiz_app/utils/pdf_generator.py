@@ -13,8 +13,89 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image, PageTemplate, Frame
 from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+
+from quiz_app.utils.pdf_fonts import cached_stylesheet, get_pdf_fonts
+from quiz_app.utils.question_pool import fetch_questions, get_pool_index
+
+# Keeps IN (...) lists of a snapshot well below SQLite's bound-parameter limit
+SNAPSHOT_CHUNK_SIZE = 500
+
+# Bump whenever a change here alters the rendered output, so cached PDFs are re-rendered
+PDF_LAYOUT_VERSION = 1
+
+
+def _build_exam_styles(fonts):
+    """Paragraph styles of exam papers and answer keys (built once per process)"""
+    styles = getSampleStyleSheet()
+
+    # Update base styles to use Unicode-capable fonts
+    base_normal = styles['Normal']
+    base_normal.fontName = fonts['family']
+    base_normal.fontSize = 11
+    base_normal.leading = 14
+
+    heading1 = styles['Heading1']
+    heading1.fontName = fonts['bold']
+
+    heading2 = styles['Heading2']
+    heading2.fontName = fonts['bold']
+    heading2.fontSize = 14
+
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.HexColor('#1a237e'),
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        fontName=fonts['bold']
+    ))
+
+    # Subtitle style
+    styles.add(ParagraphStyle(
+        name='CustomSubtitle',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=colors.HexColor('#424242'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName=fonts['family']
+    ))
+
+    # Topic header style
+    styles.add(ParagraphStyle(
+        name='TopicHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#1565c0'),
+        spaceAfter=8,
+        spaceBefore=12,
+        fontName=fonts['bold']
+    ))
+
+    # Question style
+    styles.add(ParagraphStyle(
+        name='Question',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        leading=14,
+        fontName=fonts['family']
+    ))
+
+    # Footer style
+    styles.add(ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.HexColor('#d32f2f'),
+        alignment=TA_CENTER,
+        leading=10,
+        fontName=fonts['family']
+    ))
+
+    return styles
 
 
 class ExamPDFGenerator:
@@ -25,171 +106,34 @@ class ExamPDFGenerator:
             "SPECIAL WARNING",
             "This document contains confidential information belonging to the Space Agency of the Republic of Azerbaijan (Azercosmos)."
         ]
-        self.font_map = self._register_fonts()
+        # Fonts are registered and styles built once per process
+        self.font_map = get_pdf_fonts()
         self.font_family = self.font_map['family']
         self.normal_font = self.font_map['normal']
         self.bold_font = self.font_map['bold']
         self.italic_font = self.font_map['italic']
         self.bold_italic_font = self.font_map['bold_italic']
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
-
-    def _register_fonts(self):
-        """Register a Unicode-capable font family for Azerbaijani support"""
-        font_candidates = [
-            {
-                'family': 'AzerSans',
-                'variants': {
-                    'normal': ('AzerSans', '/System/Library/Fonts/Supplemental/Arial.ttf'),
-                    'bold': ('AzerSans-Bold', '/System/Library/Fonts/Supplemental/Arial Bold.ttf'),
-                    'italic': ('AzerSans-Italic', '/System/Library/Fonts/Supplemental/Arial Italic.ttf'),
-                    'bold_italic': ('AzerSans-BoldItalic', '/System/Library/Fonts/Supplemental/Arial Bold Italic.ttf')
-                }
-            },
-            {
-                'family': 'AzerSans',
-                'variants': {
-                    'normal': ('AzerSans', 'C:\\\\Windows\\\\Fonts\\\\arial.ttf'),
-                    'bold': ('AzerSans-Bold', 'C:\\\\Windows\\\\Fonts\\\\arialbd.ttf'),
-                    'italic': ('AzerSans-Italic', 'C:\\\\Windows\\\\Fonts\\\\ariali.ttf'),
-                    'bold_italic': ('AzerSans-BoldItalic', 'C:\\\\Windows\\\\Fonts\\\\arialbi.ttf')
-                }
-            },
-            {
-                'family': 'DejaVuSans',
-                'variants': {
-                    'normal': ('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'),
-                    'bold': ('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
-                    'italic': ('DejaVuSans-Italic', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf'),
-                    'bold_italic': ('DejaVuSans-BoldItalic', '/usr/share/fonts/truetype/dejavu/DejaVuSans-BoldOblique.ttf')
-                }
-            }
-        ]
-
-        for candidate in font_candidates:
-            variants = candidate['variants']
-            normal_name, normal_path = variants['normal']
-            bold_name, bold_path = variants['bold']
+        self.styles = cached_stylesheet('exam_paper', _build_exam_styles)
 
-            if not (os.path.exists(normal_path) and os.path.exists(bold_path)):
-                continue
-
-            italic_name, italic_path = variants['italic']
-            bold_italic_name, bold_italic_path = variants['bold_italic']
-
-            # Fallback to normal if italic variants are missing
-            if not os.path.exists(italic_path):
-                italic_path = normal_path
-            if not os.path.exists(bold_italic_path):
-                bold_italic_path = bold_path if os.path.exists(bold_path) else normal_path
-
-            try:
-                for font_name, font_path in [
-                    (normal_name, normal_path),
-                    (bold_name, bold_path),
-                    (italic_name, italic_path),
-                    (bold_italic_name, bold_italic_path)
-                ]:
-                    if font_name not in pdfmetrics.getRegisteredFontNames():
-                        pdfmetrics.registerFont(TTFont(font_name, font_path))
-
-                pdfmetrics.registerFontFamily(
-                    candidate['family'],
-                    normal=normal_name,
-                    bold=bold_name,
-                    italic=italic_name,
-                    boldItalic=bold_italic_name
-                )
-
-                return {
-                    'family': candidate['family'],
-                    'normal': normal_name,
-                    'bold': bold_name,
-                    'italic': italic_name,
-                    'bold_italic': bold_italic_name
-                }
-            except Exception as font_error:
-                print(f"[PDF] Failed to register font {candidate['family']}: {font_error}")
-                continue
+    def layout_settings(self):
+        """
+        Everything besides the questions that shapes the rendered documents.
 
-        # Default fallback to Helvetica if Unicode fonts are unavailable
+        Returns:
+            dict: Part of the PDF cache key (see quiz_app.utils.pdf_cache)
+        """
+        try:
+            logo_stat = os.stat(self.logo_path)
+            logo = [self.logo_path, logo_stat.st_size, logo_stat.st_mtime]
+        except OSError:
+            logo = None
         return {
-            'family': 'Helvetica',
-            'normal': 'Helvetica',
-            'bold': 'Helvetica-Bold',
-            'italic': 'Helvetica-Oblique',
-            'bold_italic': 'Helvetica-BoldOblique'
+            'version': PDF_LAYOUT_VERSION,
+            'fonts': self.font_map,
+            'logo': logo,
+            'footer': self.footer_text,
         }
 
-    def _setup_styles(self):
-        """Setup custom paragraph styles"""
-        # Update base styles to use Unicode-capable fonts
-        base_normal = self.styles['Normal']
-        base_normal.fontName = self.font_family
-        base_normal.fontSize = 11
-        base_normal.leading = 14
-
-        heading1 = self.styles['Heading1']
-        heading1.fontName = self.bold_font
-
-        heading2 = self.styles['Heading2']
-        heading2.fontName = self.bold_font
-        heading2.fontSize = 14
-
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1a237e'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName=self.bold_font
-        ))
-
-        # Subtitle style
-        self.styles.add(ParagraphStyle(
-            name='CustomSubtitle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#424242'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName=self.font_family
-        ))
-
-        # Topic header style
-        self.styles.add(ParagraphStyle(
-            name='TopicHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#1565c0'),
-            spaceAfter=8,
-            spaceBefore=12,
-            fontName=self.bold_font
-        ))
-
-        # Question style
-        self.styles.add(ParagraphStyle(
-            name='Question',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            leading=14,
-            fontName=self.font_family
-        ))
-
-        # Footer style
-        self.styles.add(ParagraphStyle(
-            name='Footer',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#d32f2f'),
-            alignment=TA_CENTER,
-            leading=10,
-            fontName=self.font_family
-        ))
-
     def _add_footer(self, canvas, doc):
         """Add footer to each page"""
         canvas.saveState()
@@ -261,26 +205,19 @@ class ExamPDFGenerator:
 
     def get_topic_questions(self, topic_id, difficulty_counts=None, randomize=False):
         """Get questions for a topic, optionally filtered by difficulty"""
-        questions = []
+        pool = get_pool_index(self.db)
 
         if difficulty_counts:
-            # Get questions by difficulty level
+            # Sample question ids by difficulty level from the pool index
+            question_ids = []
             for level in ['easy', 'medium', 'hard']:
                 count = difficulty_counts.get(level, 0)
                 if count > 0:
-                    level_questions = self.db.execute_query(
-                        """SELECT * FROM questions
-                           WHERE exam_id = ? AND difficulty_level = ? AND is_active = 1
-                           ORDER BY RANDOM() LIMIT ?""",
-                        (topic_id, level, count)
-                    )
-                    questions.extend(level_questions)
+                    question_ids.extend(pool.sample(self.db, [topic_id], level, count))
         else:
             # Get all questions
-            questions = self.db.execute_query(
-                "SELECT * FROM questions WHERE exam_id = ? AND is_active = 1",
-                (topic_id,)
-            )
+            question_ids = pool.question_ids(self.db, [topic_id])
+        questions = fetch_questions(self.db, question_ids)
 
         if randomize and questions:
             random.shuffle(questions)
@@ -294,6 +231,32 @@ class ExamPDFGenerator:
             (question_id,)
         )
 
+    def load_snapshot_data(self, snapshot):
+        """
+        Load every question and option of a snapshot with two bulk queries.
+
+        Variants of an export share one question set, so the result can be
+        passed to generate_exam_paper/generate_answer_key for all of them.
+
+        Returns:
+            {'questions': {question_id: question}, 'options': {question_id: [options in order]}}
+        """
+        question_ids = list(dict.fromkeys(q_id for topic_data in snapshot for q_id in topic_data['questions']))
+        questions = {question['id']: question for question in fetch_questions(self.db, question_ids)}
+
+        options = {question_id: [] for question_id in questions}
+        for start in range(0, len(question_ids), SNAPSHOT_CHUNK_SIZE):
+            chunk = tuple(question_ids[start:start + SNAPSHOT_CHUNK_SIZE])
+            placeholders = ','.join('?' * len(chunk))
+            for option in self.db.execute_query(
+                f"""SELECT * FROM question_options WHERE question_id IN ({placeholders})
+                    ORDER BY question_id, order_index, id""",
+                chunk
+            ):
+                options.setdefault(option['question_id'], []).append(option)
+
+        return {'questions': questions, 'options': options}
+
     def create_question_snapshot(self, assignment_id, randomize=False):
         """Create snapshot of questions for this variant"""
         assignment, topics = self.get_assignment_topics(assignment_id)
@@ -358,21 +321,14 @@ class ExamPDFGenerator:
         """Select questions across multiple templates using assignment-level counts."""
         exam_ids = [topic['id'] for topic in topics]
         selected_by_exam = {exam_id: [] for exam_id in exam_ids}
+        pool = get_pool_index(self.db)
 
         for difficulty in ['easy', 'medium', 'hard']:
             requested = assignment_counts.get(difficulty, 0) or 0
             if requested <= 0:
                 continue
 
-            placeholders = ",".join(["?"] * len(exam_ids))
-            query = f"""
-                SELECT * FROM questions
-                WHERE exam_id IN ({placeholders})
-                  AND difficulty_level = ?
-                  AND is_active = 1
-            """
-            params = tuple(exam_ids) + (difficulty,)
-            available = self.db.execute_query(query, params)
+            available = pool.question_ids(self.db, exam_ids, difficulty)
 
             available_count = len(available)
             print(f"[PDF] {difficulty.capitalize()} pool: {available_count} available across templates, {requested} requested")
@@ -383,9 +339,9 @@ class ExamPDFGenerator:
             if available_count < requested:
                 requested = available_count
 
-            chosen = random.sample(available, requested) if available_count > requested else available
+            chosen = random.sample(available, requested) if available_count > requested else list(available)
 
-            for question in chosen:
+            for question in fetch_questions(self.db, chosen):
                 selected_by_exam.setdefault(question['exam_id'], []).append(question)
 
         snapshot = []
@@ -401,8 +357,11 @@ class ExamPDFGenerator:
 
         return snapshot
 
-    def generate_exam_paper(self, assignment, snapshot, variant_num, output_path):
-        """Generate printable exam paper PDF"""
+    def generate_exam_paper(self, assignment, snapshot, variant_num, output_path, snapshot_data=None):
+        """Generate printable exam paper PDF (snapshot_data: load_snapshot_data() result, loaded if omitted)"""
+        if snapshot_data is None:
+            snapshot_data = self.load_snapshot_data(snapshot)
+        questions = snapshot_data['questions']
         doc = SimpleDocTemplate(
             output_path,
             pagesize=A4,
@@ -433,7 +392,7 @@ class ExamPDFGenerator:
         total_points = 0
         for topic_data in snapshot:
             for q_id in topic_data['questions']:
-                question = self.db.execute_single("SELECT points FROM questions WHERE id = ?", (q_id,))
+                question = questions.get(q_id)
                 if question:
                     total_points += question.get('points', 1.0)
 
@@ -471,10 +430,7 @@ class ExamPDFGenerator:
 
             # Get questions
             for q_id in topic_data['questions']:
-                question = self.db.execute_single(
-                    "SELECT * FROM questions WHERE id = ?",
-                    (q_id,)
-                )
+                question = questions.get(q_id)
 
                 if not question:
                     continue
@@ -496,7 +452,7 @@ class ExamPDFGenerator:
 
                 # Format based on question type
                 if question['question_type'] in ['multiple_choice', 'single_choice']:
-                    options = self.get_question_options(question['id'])
+                    options = snapshot_data['options'].get(question['id'], [])
                     option_labels = ['A', 'B', 'C', 'D', 'E', 'F']
                     # Each option on a new line
                     for i, opt in enumerate(options):
@@ -544,8 +500,11 @@ class ExamPDFGenerator:
         doc.build(story, onFirstPage=self._add_footer, onLaterPages=self._add_footer)
         return exam_id
 
-    def generate_answer_key(self, assignment, snapshot, variant_num, output_path):
-        """Generate answer key PDF"""
+    def generate_answer_key(self, assignment, snapshot, variant_num, output_path, snapshot_data=None):
+        """Generate answer key PDF (snapshot_data: load_snapshot_data() result, loaded if omitted)"""
+        if snapshot_data is None:
+            snapshot_data = self.load_snapshot_data(snapshot)
+        questions = snapshot_data['questions']
         doc = SimpleDocTemplate(
             output_path,
             pagesize=A4,
@@ -595,10 +554,7 @@ class ExamPDFGenerator:
 
             # Get answers - simple format
             for q_id in topic_data['questions']:
-                question = self.db.execute_single(
-                    "SELECT * FROM questions WHERE id = ?",
-                    (q_id,)
-                )
+                question = questions.get(q_id)
 
                 if not question:
                     continue
@@ -608,7 +564,7 @@ class ExamPDFGenerator:
 
                 # Format answer based on question type - SIMPLE FORMAT
                 if question['question_type'] in ['multiple_choice', 'single_choice']:
-                    options = self.get_question_options(question['id'])
+                    options = snapshot_data['options'].get(question['id'], [])
                     correct = next((opt for opt in options if opt['is_correct']), None)
                     if correct:
                         option_labels = ['A', 'B', 'C', 'D', 'E', 'F']
@@ -0,0 +1,350 @@
+"""
+Parallel rendering of PDF exam variants.
+
+Exporting an assignment renders an exam paper and an answer key for each of
+its pdf_variant_count variants. ReportLab rendering is CPU-bound pure Python,
+so the documents are rendered in a ProcessPoolExecutor, one task per
+(variant, document). The pool is created on the first export and reused by
+later ones. Its workers are started with the 'spawn' method (forking the
+multithreaded Flet process is unsafe) and register the PDF fonts once when
+they start; each keeps one ExamPDFGenerator. The questions and options of the
+export are loaded once in the parent (ExamPDFGenerator.load_snapshot_data)
+and sent with every task, so workers do not query the database.
+
+PDFVariantExporter.run() reports progress after every finished document and
+can be cancelled from another thread: pending tasks are dropped, running
+ones finish, and every file of the export is removed. Only the tasks of
+the cancelled export are dropped; the pool stays up for the next one. The
+snapshot rows in pdf_exports are written by save_variant_snapshots() in one
+transaction, only after all documents rendered.
+
+With a PDFCache, documents whose content hash is already cached are copied
+instead of rendered, and freshly rendered ones are added to the cache.
+"""
+
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
+
+from quiz_app.config import PDF_EXPORT_MAX_WORKERS
+from quiz_app.database.database import Database
+from quiz_app.utils.pdf_cache import PDFCache, content_digest, document_key
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_KINDS = ('paper', 'answers')
+
+# ExamPDFGenerator of this worker process, keyed by database path
+_generators: Dict[str, object] = {}
+
+# Worker pool shared by all exports of this process, created on first use
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    """Register the PDF fonts once when a worker process starts."""
+    try:
+        from quiz_app.utils.pdf_fonts import get_pdf_fonts
+        get_pdf_fonts()
+    except Exception as e:
+        # The first render registers them (or reports the real error)
+        logger.warning(f"Failed to preload PDF fonts in worker: {e}")
+
+
+def get_executor(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    """
+    Long-lived worker pool for rendering; recreated if max_workers changes.
+
+    Args:
+        max_workers: Worker processes (None: one per CPU)
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+            _executor_workers = max_workers
+        return _executor
+
+
+def shutdown_executor(executor: Optional[ProcessPoolExecutor] = None):
+    """
+    Stop the worker pool.
+
+    Args:
+        executor: Only stop it if it is still this pool (a broken one)
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or (executor is not None and _executor is not executor):
+            return
+        _executor.shutdown(wait=False)
+        _executor = None
+        _executor_workers = None
+
+
+atexit.register(shutdown_executor)
+
+
+def instance_id(assignment_id: int, variant_num: int) -> str:
+    """Exam instance ID printed on a variant (same as ExamPDFGenerator.generate_instance_id)."""
+    return f"EXAM-{assignment_id:06d}-V{variant_num}"
+
+
+def render_document(db_path: str, assignment: Dict, snapshot: List[Dict], variant_num: int,
+                    kind: str, output_path: str, snapshot_data: Optional[Dict] = None) -> str:
+    """
+    Render one document of one variant (runs in a worker process).
+
+    Args:
+        db_path: Database to read questions from
+        assignment: Assignment record
+        snapshot: Variant snapshot ([{'topic_id', 'topic_title', 'questions'}])
+        variant_num: Variant number (1-based)
+        kind: 'paper' or 'answers'
+        output_path: PDF file to write
+        snapshot_data: Questions and options of the snapshot (read from db_path if None)
+
+    Returns:
+        output_path
+    """
+    generator = _generators.get(db_path)
+    if generator is None:
+        # Imported here so the parent process does not need ReportLab to schedule work
+        from quiz_app.utils.pdf_generator import ExamPDFGenerator
+        generator = _generators[db_path] = ExamPDFGenerator(Database(db_path))
+
+    if kind == 'paper':
+        generator.generate_exam_paper(assignment, snapshot, variant_num, output_path, snapshot_data)
+    else:
+        generator.generate_answer_key(assignment, snapshot, variant_num, output_path, snapshot_data)
+    return output_path
+
+
+def _same_questions(snapshot: List[Dict], master_snapshot: List[Dict]) -> bool:
+    """True if snapshot holds the master's topics and questions (in any order within topics)."""
+    return len(snapshot) == len(master_snapshot) and all(
+        topic['topic_id'] == master_topic['topic_id'] and sorted(topic['questions']) == sorted(master_topic['questions'])
+        for topic, master_topic in zip(snapshot, master_snapshot)
+    )
+
+
+def build_variant_snapshots(master_snapshot: List[Dict], num_variants: int, randomize: bool,
+                            stored: Optional[Dict[int, List[Dict]]] = None) -> List[List[Dict]]:
+    """
+    Snapshots of every variant: the master for variant 1, shuffled within topics for the others.
+
+    Args:
+        master_snapshot: Base question set
+        num_variants: Number of variants
+        randomize: Shuffle questions within each topic for variants 2+
+        stored: Snapshots of a previous export by variant number. A shuffled variant
+            keeps its previous order, so re-exports print (and cache) the same papers.
+    """
+    stored = stored or {}
+    snapshots = [master_snapshot]
+    for variant in range(2, num_variants + 1):
+        if not randomize:
+            snapshots.append(master_snapshot)
+            continue
+        previous = stored.get(variant)
+        if previous and previous != master_snapshot and _same_questions(previous, master_snapshot):
+            snapshots.append(previous)
+            continue
+        variant_snapshot = []
+        for topic_data in master_snapshot:
+            shuffled_questions = topic_data['questions'].copy()
+            random.shuffle(shuffled_questions)
+            variant_snapshot.append({
+                'topic_id': topic_data['topic_id'],
+                'topic_title': topic_data['topic_title'],
+                'questions': shuffled_questions
+            })
+        snapshots.append(variant_snapshot)
+    return snapshots
+
+
+def save_variant_snapshots(db: Database, export_exam_id: int, snapshots: List[List[Dict]],
+                           generated_files: List[Dict], exported_by: int) -> int:
+    """
+    Record every variant's snapshot in pdf_exports in one transaction.
+
+    Args:
+        db: Database to write to
+        export_exam_id: Key the export is cached under (assignment or exam id)
+        snapshots: Snapshot per variant, variant 1 first
+        generated_files: run() result, in variant order
+        exported_by: User who exported
+
+    Returns:
+        Number of rows written
+    """
+    rows = [
+        (export_exam_id, variant, json.dumps(snapshot), exported_by, files['paper'])
+        for variant, (snapshot, files) in enumerate(zip(snapshots, generated_files), start=1)
+    ]
+    with db.transaction():
+        return db.execute_many(
+            """INSERT INTO pdf_exports (exam_id, variant_number, question_snapshot, exported_by, file_path)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(exam_id, variant_number)
+               DO UPDATE SET
+                   question_snapshot=excluded.question_snapshot,
+                   exported_by=excluded.exported_by,
+                   exported_at=CURRENT_TIMESTAMP,
+                   file_path=excluded.file_path
+            """,
+            rows
+        )
+
+
+class PDFVariantExporter:
+    """Renders the documents of all variants of an assignment in worker processes."""
+
+    def __init__(self, db_path: str, max_workers: Optional[int] = PDF_EXPORT_MAX_WORKERS,
+                 render: Callable[..., str] = render_document, cache: Optional[PDFCache] = None):
+        """
+        Args:
+            db_path: Database the workers read questions from
+            max_workers: Worker processes (None: one per CPU); 1 renders in this process
+            render: Document renderer with render_document()'s signature (module level, picklable)
+            cache: Rendered-document cache (None: always render)
+        """
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.render = render
+        self.cache = cache
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the running export; safe to call from any thread."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self, assignment: Dict, snapshots: List[List[Dict]], output_dir: str,
+            on_progress: Optional[Callable[[int, int], None]] = None,
+            snapshot_data: Optional[Dict] = None, layout: Optional[Dict] = None) -> Optional[List[Dict]]:
+        """
+        Render a paper and an answer key per variant.
+
+        Args:
+            assignment: Assignment record
+            snapshots: Snapshot per variant, variant 1 first
+            output_dir: Directory for the PDF files
+            on_progress: Called with (documents done, documents total) after each document
+            snapshot_data: Questions and options of all variants (ExamPDFGenerator.load_snapshot_data)
+            layout: ExamPDFGenerator.layout_settings(); the cache is used only when this
+                and snapshot_data are given
+
+        Returns:
+            [{'exam_id', 'paper', 'answers'}] in variant order, or None if cancelled
+
+        Raises:
+            Exception: The first rendering error (remaining tasks are cancelled)
+        """
+        use_cache = self.cache is not None and snapshot_data is not None and layout is not None
+        content = content_digest(snapshot_data) if use_cache else None
+
+        generated_files = []
+        jobs = []
+        keys = []
+        for variant, snapshot in enumerate(snapshots, start=1):
+            exam_id = instance_id(assignment['id'], variant)
+            files = {'exam_id': exam_id}
+            for kind in DOCUMENT_KINDS:
+                files[kind] = os.path.join(output_dir, f"{exam_id}_{kind}.pdf")
+                jobs.append((self.db_path, assignment, snapshot, variant, kind, files[kind], snapshot_data))
+                keys.append(document_key(kind, assignment, snapshot, variant, content, layout) if use_cache else None)
+            generated_files.append(files)
+
+        total = len(jobs)
+        done = 0
+
+        def finish(key, output_path):
+            nonlocal done
+            if key is not None:
+                self.cache.store(key, output_path)
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+
+        try:
+            to_render = []
+            for job, key in zip(jobs, keys):
+                if self.cancelled:
+                    break
+                if key is not None and self.cache.fetch(key, job[5]):
+                    finish(None, job[5])
+                else:
+                    to_render.append((job, key))
+            if use_cache:
+                print(f"[PDF] {total - len(to_render)} of {total} documents served from cache")
+
+            if self.max_workers == 1 or len(to_render) <= 1:
+                for job, key in to_render:
+                    if self.cancelled:
+                        break
+                    self.render(*job)
+                    finish(key, job[5])
+            elif not self.cancelled:
+                workers = min(self.max_workers or os.cpu_count() or 1, len(to_render))
+                print(f"[PDF] Rendering {len(to_render)} documents in {workers} processes")
+                executor = get_executor(self.max_workers)
+                pending = {executor.submit(self.render, *job): (job, key) for job, key in to_render}
+                try:
+                    while pending and not self.cancelled:
+                        # Short timeout so a cancel is noticed while long documents render
+                        finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            job, key = pending.pop(future)
+                            future.result()
+                            finish(key, job[5])
+                except BrokenProcessPool:
+                    # A worker died; the next export starts a fresh pool
+                    shutdown_executor(executor)
+                    raise
+                finally:
+                    for future in pending:
+                        future.cancel()
+                    # Let documents already rendering finish before their files are removed
+                    wait(pending)
+        except Exception:
+            self._remove_files(generated_files)
+            raise
+
+        if use_cache:
+            self.cache.prune()
+        if self.cancelled:
+            print(f"[PDF] Export cancelled after {done} of {total} documents")
+            self._remove_files(generated_files)
+            return None
+        return generated_files
+
+    @staticmethod
+    def _remove_files(generated_files: List[Dict]):
+        """Delete whatever was written of an export that did not complete."""
+        for files in generated_files:
+            for kind in DOCUMENT_KINDS:
+                try:
+                    os.remove(files[kind])
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Failed to remove partial export {files[kind]}: {e}")
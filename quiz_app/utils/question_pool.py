@@ -0,0 +1,205 @@
+"""
+Shared in-memory index of the active question pool.
+
+Question selection, PDF snapshots and the pool statistics in question
+management all need "the active questions of exam X with difficulty Y".
+Each of them used to query (and some ORDER BY RANDOM()) the questions
+table, reading every matching row to pick a handful.
+
+QuestionPoolIndex keeps, per exam, compact arrays of active question ids
+for each difficulty level in (order_index, id) order. Sampling k questions
+is then rng.sample over an id array plus one query for the k chosen rows,
+and pool statistics are array lengths.
+
+Invalidation: triggers on the questions table bump a per-exam counter in
+question_pool_versions whenever a question is added, deleted, moved,
+re-levelled, re-scored or (de)activated, whoever writes it. Before answering, the
+index reads the counters of the exams it is asked about (one small query)
+and rebuilds only the exams whose counter changed.
+"""
+
+import os
+import random
+import threading
+from array import array
+from collections import ChainMap
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from quiz_app.database.database import Database, question_columns
+
+DIFFICULTY_LEVELS = ('easy', 'medium', 'hard')
+
+# Keeps IN (...) lists well below SQLite's bound-parameter limit
+_ID_CHUNK_SIZE = 500
+
+
+class _ExamPool:
+    """Active question ids (and their points) of one exam at a given pool version."""
+
+    __slots__ = ('version', 'all_ids', 'by_difficulty', 'points')
+
+    def __init__(self, version: int):
+        self.version = version
+        self.all_ids = array('q')
+        self.by_difficulty: Dict[str, array] = {}
+        self.points: Dict[int, float] = {}
+
+
+class QuestionPoolIndex:
+    """Per-database-file index of active question ids by exam and difficulty."""
+
+    _registry: Dict[str, 'QuestionPoolIndex'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[int, _ExamPool] = {}
+
+    @classmethod
+    def for_database(cls, db: Database) -> 'QuestionPoolIndex':
+        """Index shared by every Database instance on the same file."""
+        if db.db_path == ':memory:':
+            # In-memory databases are private to their Database instance
+            return cls()
+        key = os.path.abspath(db.db_path)
+        with cls._registry_lock:
+            index = cls._registry.get(key)
+            if index is None:
+                index = cls._registry[key] = cls()
+            return index
+
+    def _pools_for(self, db: Database, exam_ids: Iterable[int]) -> List[_ExamPool]:
+        """Current pools of the given exams, rebuilding any that changed."""
+        exam_ids = list(dict.fromkeys(exam_ids))
+        if not exam_ids:
+            return []
+        # Read versions before rows: a write in between only causes one extra rebuild later
+        versions = pool_versions(db, exam_ids)
+
+        with self._lock:
+            stale = [exam_id for exam_id in exam_ids
+                     if exam_id not in self._pools or self._pools[exam_id].version != versions[exam_id]]
+        if stale:
+            rebuilt = {exam_id: _ExamPool(versions[exam_id]) for exam_id in stale}
+            placeholders = ','.join('?' * len(stale))
+            for question_id, exam_id, difficulty, points in db.execute_iter(f"""
+                SELECT id, exam_id, difficulty_level, points FROM questions
+                WHERE exam_id IN ({placeholders}) AND is_active = 1
+                ORDER BY exam_id, order_index, id
+            """, tuple(stale), row_type='tuple'):
+                pool = rebuilt[exam_id]
+                pool.all_ids.append(question_id)
+                pool.by_difficulty.setdefault(difficulty, array('q')).append(question_id)
+                pool.points[question_id] = 1.0 if points is None else float(points)
+            with self._lock:
+                self._pools.update(rebuilt)
+
+        with self._lock:
+            return [self._pools[exam_id] for exam_id in exam_ids]
+
+    def question_ids(self, db: Database, exam_ids: Iterable[int], difficulty: Optional[str] = None) -> Sequence[int]:
+        """
+        Active question ids of the given exams, in (order_index, id) order per exam.
+
+        Args:
+            db: Database the pool lives in
+            exam_ids: Exams to include, concatenated in this order
+            difficulty: Only this difficulty level (all levels when None)
+        """
+        pools = self._pools_for(db, exam_ids)
+        if len(pools) == 1:
+            pool = pools[0]
+            return pool.all_ids if difficulty is None else pool.by_difficulty.get(difficulty, array('q'))
+        ids = array('q')
+        for pool in pools:
+            ids.extend(pool.all_ids if difficulty is None else pool.by_difficulty.get(difficulty, ()))
+        return ids
+
+    def counts(self, db: Database, exam_id: int) -> Dict[str, int]:
+        """
+        Active question counts of an exam.
+
+        Returns:
+            {'total': n, 'easy': n, 'medium': n, 'hard': n}
+        """
+        pool = self._pools_for(db, [exam_id])[0]
+        counts = {'total': len(pool.all_ids)}
+        for difficulty in DIFFICULTY_LEVELS:
+            counts[difficulty] = len(pool.by_difficulty.get(difficulty, ()))
+        return counts
+
+    def points(self, db: Database, exam_ids: Iterable[int]) -> Mapping[int, float]:
+        """
+        Points of the active questions of the given exams.
+
+        Returns:
+            Read-only {question_id: points} view over the per-exam pools (not copied)
+        """
+        return ChainMap(*(pool.points for pool in self._pools_for(db, exam_ids)))
+
+    def sample(self, db: Database, exam_ids: Iterable[int], difficulty: Optional[str], count: int,
+               rng: random.Random = None) -> List[int]:
+        """
+        Pick up to count random active question ids without reading question rows.
+
+        Args:
+            db: Database the pool lives in
+            exam_ids: Exams to draw from
+            difficulty: Difficulty level (all levels when None)
+            count: Number of questions wanted
+            rng: Random source (module-level random by default)
+        """
+        ids = self.question_ids(db, exam_ids, difficulty)
+        return (rng or random).sample(ids, min(count, len(ids)))
+
+    def invalidate(self, exam_id: Optional[int] = None):
+        """Drop one exam (or everything) so it is rebuilt on next use."""
+        with self._lock:
+            if exam_id is None:
+                self._pools.clear()
+            else:
+                self._pools.pop(exam_id, None)
+
+
+def pool_versions(db: Database, exam_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Current question_pool_versions counters of the given exams.
+
+    Args:
+        db: Database the pool lives in
+        exam_ids: Exams to read
+
+    Returns:
+        Counter by exam id (0 for exams whose questions never changed)
+    """
+    exam_ids = list(dict.fromkeys(exam_ids))
+    versions = dict.fromkeys(exam_ids, 0)
+    if exam_ids:
+        placeholders = ','.join('?' * len(exam_ids))
+        versions.update(db.execute_iter(
+            f"SELECT exam_id, version FROM question_pool_versions WHERE exam_id IN ({placeholders})",
+            tuple(exam_ids), row_type='tuple'
+        ))
+    return versions
+
+
+def get_pool_index(db: Database) -> QuestionPoolIndex:
+    """Shorthand for QuestionPoolIndex.for_database()."""
+    return QuestionPoolIndex.for_database(db)
+
+
+def fetch_questions(db: Database, question_ids: Sequence[int]) -> List[Dict]:
+    """
+    Load question rows (without image BLOBs) by id, in the given order.
+
+    Ids of questions that no longer exist are skipped.
+    """
+    by_id = {}
+    for start in range(0, len(question_ids), _ID_CHUNK_SIZE):
+        chunk = tuple(question_ids[start:start + _ID_CHUNK_SIZE])
+        placeholders = ','.join('?' * len(chunk))
+        for question in db.execute_query(
+            f"SELECT {question_columns()} FROM questions WHERE id IN ({placeholders})", chunk
+        ):
+            by_id[question['id']] = question
+    return [by_id[question_id] for question_id in question_ids if question_id in by_id]
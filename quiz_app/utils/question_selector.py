@@ -5,16 +5,39 @@ This module handles the random selection of questions from a question pool
 based on difficulty distribution and exam configuration.
 """
 
+import contextlib
+import hashlib
+import json
+import logging
 import random
-from typing import List, Dict, Tuple
-from quiz_app.database.database import Database
+import secrets
+import threading
+from typing import List, Dict, Optional, Set, Tuple
+from quiz_app.database.database import Database, question_columns
+from quiz_app.utils.blueprint_sampler import (
+    BlueprintCell, BlueprintSampler, blueprint_rules, shared_blueprint, template_blueprint
+)
+from quiz_app.utils.question_pool import fetch_questions, get_pool_index, pool_versions
+
+logger = logging.getLogger(__name__)
 
 
 class QuestionSelector:
     """Handles question selection logic for exams with question pools"""
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, store_selection: bool = True, seed: Optional[int] = None):
+        """
+        Args:
+            db: Database to read questions from
+            store_selection: Write the selection to session_questions; when False
+                the rows are collected in selection_rows instead (pre-generation)
+            seed: Session seed; the same seed and pool give the same selection and order
+        """
         self.db = db
+        self.pool = get_pool_index(db)
+        self.rng = random.Random(seed)
+        self.store_selection = store_selection
+        self.selection_rows: List[Tuple[int, str, int]] = []
     
     def select_questions_for_session(self, exam_data: Dict, session_id: int) -> List[Dict]:
         """
@@ -34,12 +57,7 @@ class QuestionSelector:
             return self._get_all_exam_questions(exam_data['id'], randomize)
         
         # Check if questions already selected for this session
-        existing_selection = self.db.execute_query("""
-            SELECT q.* FROM questions q
-            JOIN session_questions sq ON q.id = sq.question_id
-            WHERE sq.session_id = ?
-            ORDER BY sq.order_index, q.order_index, q.id
-        """, (session_id,))
+        existing_selection = self._existing_selection(session_id)
         
         if existing_selection:
             print(f"Using existing question selection for session {session_id}")
@@ -49,6 +67,21 @@ class QuestionSelector:
         print(f"Selecting new questions for session {session_id}")
         return self._select_random_questions(exam_data, session_id)
     
+    def _selection_transaction(self):
+        """Commit a stored selection atomically; pre-generation only reads, so no write lock."""
+        return self.db.transaction() if self.store_selection else contextlib.nullcontext()
+
+    def _existing_selection(self, session_id: Optional[int]) -> List[Dict]:
+        """Questions already stored in session_questions for a session, in order."""
+        if session_id is None:
+            return []
+        return self.db.execute_query(f"""
+            SELECT {question_columns('q')} FROM questions q
+            JOIN session_questions sq ON q.id = sq.question_id
+            WHERE sq.session_id = ?
+            ORDER BY sq.order_index, q.order_index, q.id
+        """, (session_id,))
+
     def _get_all_exam_questions(self, exam_id: int, randomize: bool = False) -> List[Dict]:
         """
         Get all questions for an exam (standard behavior).
@@ -60,8 +93,8 @@ class QuestionSelector:
         Returns:
             List of questions, optionally randomized within topic groups
         """
-        questions = self.db.execute_query("""
-            SELECT * FROM questions
+        questions = self.db.execute_query(f"""
+            SELECT {question_columns()} FROM questions
             WHERE exam_id = ? AND is_active = 1
             ORDER BY order_index, id
         """, (exam_id,))
@@ -102,7 +135,7 @@ class QuestionSelector:
             print(f"    - {topic}: {len(group_questions)} questions")
 
             # Shuffle within this topic group
-            random.shuffle(group_questions)
+            self.rng.shuffle(group_questions)
             randomized_questions.extend(group_questions)
 
         return randomized_questions
@@ -129,18 +162,20 @@ class QuestionSelector:
         selected_questions = []
         order_index = 1
 
-        # Select questions by difficulty level
-        for difficulty, count in [('easy', easy_count), ('medium', medium_count), ('hard', hard_count)]:
-            if count > 0:
-                difficulty_questions = self._select_questions_by_difficulty(
-                    exam_id, difficulty, count, session_id, order_index
-                )
-                selected_questions.extend(difficulty_questions)
-                order_index += len(difficulty_questions)
-
-        # Topic-grouped randomization: Randomize within each category/topic group
-        if exam_data.get('randomize_questions', False):
-            selected_questions = self._randomize_by_topic_groups(selected_questions, session_id)
+        # Store the whole selection (and any reordering) in one commit
+        with self._selection_transaction():
+            # Select questions by difficulty level
+            for difficulty, count in [('easy', easy_count), ('medium', medium_count), ('hard', hard_count)]:
+                if count > 0:
+                    difficulty_questions = self._select_questions_by_difficulty(
+                        exam_id, difficulty, count, session_id, order_index
+                    )
+                    selected_questions.extend(difficulty_questions)
+                    order_index += len(difficulty_questions)
+
+            # Topic-grouped randomization: Randomize within each category/topic group
+            if exam_data.get('randomize_questions', False):
+                selected_questions = self._randomize_by_topic_groups(selected_questions, session_id)
 
         print(f"Selected {len(selected_questions)} questions total")
         return selected_questions
@@ -160,14 +195,10 @@ class QuestionSelector:
         Returns:
             List of selected questions of the specified difficulty
         """
-        # Get all available questions of this difficulty
-        available_questions = self.db.execute_query("""
-            SELECT * FROM questions 
-            WHERE exam_id = ? AND difficulty_level = ? AND is_active = 1
-            ORDER BY order_index, id
-        """, (exam_id, difficulty))
+        # Ids of all available questions of this difficulty (from the in-memory pool index)
+        available_ids = self.pool.question_ids(self.db, [exam_id], difficulty)
         
-        available_count = len(available_questions)
+        available_count = len(available_ids)
         print(f"  {difficulty.capitalize()}: {available_count} available, {count} requested")
         
         # Handle insufficient questions
@@ -179,59 +210,39 @@ class QuestionSelector:
             print(f"  Warning: Only {available_count} {difficulty} questions available, but {count} requested")
             count = available_count
         
-        # Randomly select questions
-        selected = random.sample(available_questions, count)
+        # Randomly select questions; only the chosen rows are read
+        selected = fetch_questions(self.db, self.rng.sample(available_ids, count))
         
         # Store the selection in session_questions table
-        for i, question in enumerate(selected):
-            self.db.execute_insert("""
-                INSERT INTO session_questions (session_id, question_id, difficulty_level, order_index)
-                VALUES (?, ?, ?, ?)
-            """, (session_id, question['id'], difficulty, start_order_index + i))
+        self._store_session_questions(session_id, [
+            (question['id'], difficulty, start_order_index + i) for i, question in enumerate(selected)
+        ])
         
         print(f"  Selected {len(selected)} {difficulty} questions")
         return selected
     
-    def _select_questions_by_difficulty_multi(self, exam_ids: List[int], difficulty: str, count: int,
-                                              session_id: int, start_order_index: int) -> List[Dict]:
-        """
-        Select random questions of a specific difficulty level across multiple exam templates.
-        """
-        if not exam_ids or count <= 0:
-            return []
+    def _sample_blueprint(self, exam_data: Dict, cells: List[BlueprintCell]) -> List[List[Tuple[int, str]]]:
+        """Draw blueprint cells with the assignment's fallback rule and points target."""
+        fallback, target_points = blueprint_rules(exam_data)
+        return BlueprintSampler(self.db, self.rng, fallback, target_points).sample(cells)
 
-        placeholders = ",".join(["?"] * len(exam_ids))
-        query = f"""
-            SELECT * FROM questions
-            WHERE exam_id IN ({placeholders})
-              AND difficulty_level = ?
-              AND is_active = 1
-            ORDER BY exam_id, order_index, id
+    def _store_picks(self, session_id: int, picks: List[Tuple[int, str]], start_order_index: int) -> List[Dict]:
         """
-        params = tuple(exam_ids) + (difficulty,)
-        available_questions = self.db.execute_query(query, params)
-
-        available_count = len(available_questions)
-        print(f"  {difficulty.capitalize()} (multi-template): {available_count} available across {len(exam_ids)} exams, {count} requested")
-
-        if available_count == 0:
-            print(f"  Warning: No {difficulty} questions available across templates")
-            return []
+        Load and store drawn questions in the given order.
 
-        if available_count < count:
-            print(f"  Warning: Only {available_count} {difficulty} questions available across templates, but {count} requested")
-            count = available_count
-
-        selected = random.sample(available_questions, count)
-
-        for i, question in enumerate(selected):
-            self.db.execute_insert("""
-                INSERT INTO session_questions (session_id, question_id, difficulty_level, order_index)
-                VALUES (?, ?, ?, ?)
-            """, (session_id, question['id'], difficulty, start_order_index + i))
+        Args:
+            session_id: Session ID for storing selection
+            picks: (question_id, difficulty_level) pairs from the blueprint sampler
+            start_order_index: Order index of the first question
 
-        print(f"  Selected {len(selected)} multi-template {difficulty} questions")
-        return selected
+        Returns:
+            The questions, in order
+        """
+        questions = fetch_questions(self.db, [question_id for question_id, _ in picks])
+        self._store_session_questions(session_id, [
+            (question_id, difficulty, start_order_index + i) for i, (question_id, difficulty) in enumerate(picks)
+        ])
+        return questions
 
     def _randomize_by_topic_groups(self, questions: List[Dict], session_id: int) -> List[Dict]:
         """
@@ -272,6 +283,7 @@ class QuestionSelector:
 
         # Randomize within each group and reassemble
         randomized_questions = []
+        order_updates = []
         order_index = 1
 
         # Sort topic groups to maintain consistent order across multiple sessions
@@ -290,21 +302,50 @@ class QuestionSelector:
                 print(f"    - {topic_key}: {len(group_questions)} questions")
 
             # Shuffle within this topic group
-            random.shuffle(group_questions)
+            self.rng.shuffle(group_questions)
 
-            # Add to final list and update order indices
+            # Add to final list and record new order indices
             for question in group_questions:
-                self.db.execute_update("""
-                    UPDATE session_questions
-                    SET order_index = ?
-                    WHERE session_id = ? AND question_id = ?
-                """, (order_index, session_id, question['id']))
+                order_updates.append((order_index, session_id, question['id']))
                 order_index += 1
 
             randomized_questions.extend(group_questions)
 
+        # Apply all order changes in one batch
+        if not self.store_selection:
+            new_order = {question_id: order for order, _, question_id in order_updates}
+            self.selection_rows = [(question_id, difficulty, new_order.get(question_id, order))
+                                   for question_id, difficulty, order in self.selection_rows]
+            return randomized_questions
+
+        self.db.execute_many("""
+            UPDATE session_questions
+            SET order_index = ?
+            WHERE session_id = ? AND question_id = ?
+        """, order_updates)
+
         return randomized_questions
 
+    def _store_session_questions(self, session_id: int, rows: List[Tuple[int, str, int]]) -> int:
+        """
+        Insert selected questions into session_questions in one batch.
+
+        Args:
+            session_id: Session ID the selection belongs to
+            rows: (question_id, difficulty_level, order_index) tuples
+
+        Returns:
+            Number of rows inserted
+        """
+        if not self.store_selection:
+            self.selection_rows.extend(rows)
+            return len(rows)
+        return self.db.execute_many("""
+            INSERT INTO session_questions (session_id, question_id, difficulty_level, order_index)
+            VALUES (?, ?, ?, ?)
+        """, [(session_id, question_id, difficulty, order_index)
+              for question_id, difficulty, order_index in rows])
+
     def get_question_pool_stats(self, exam_id: int) -> Dict:
         """
         Get statistics about the question pool for an exam.
@@ -315,24 +356,7 @@ class QuestionSelector:
         Returns:
             Dictionary with question counts by difficulty level
         """
-        stats = {}
-        
-        # Get total questions
-        total = self.db.execute_single("""
-            SELECT COUNT(*) as count FROM questions 
-            WHERE exam_id = ? AND is_active = 1
-        """, (exam_id,))
-        stats['total'] = total['count'] if total else 0
-        
-        # Get counts by difficulty
-        for difficulty in ['easy', 'medium', 'hard']:
-            count = self.db.execute_single("""
-                SELECT COUNT(*) as count FROM questions 
-                WHERE exam_id = ? AND difficulty_level = ? AND is_active = 1
-            """, (exam_id, difficulty))
-            stats[difficulty] = count['count'] if count else 0
-        
-        return stats
+        return self.pool.counts(self.db, exam_id)
     
     def validate_question_pool_config(self, exam_data: Dict) -> Tuple[bool, str]:
         """
@@ -385,12 +409,7 @@ class QuestionSelector:
             Combined list of questions from all templates, randomized within each template if enabled
         """
         # Check if questions already selected for this session
-        existing_selection = self.db.execute_query("""
-            SELECT q.* FROM questions q
-            JOIN session_questions sq ON q.id = sq.question_id
-            WHERE sq.session_id = ?
-            ORDER BY sq.order_index, q.order_index, q.id
-        """, (session_id,))
+        existing_selection = self._existing_selection(session_id)
 
         if existing_selection:
             print(f"Using existing multi-template question selection for session {session_id}")
@@ -405,52 +424,51 @@ class QuestionSelector:
         randomize = exam_data.get('randomize_questions', False)
         use_pool = exam_data.get('use_question_pool', False)
 
-        # Fetch questions from each exam template
-        for template in exam_templates:
-            template_id = template['id']
-            template_title = template['title']
-            template_counts = {
-                'easy': template.get('easy_count', 0) or 0,
-                'medium': template.get('medium_count', 0) or 0,
-                'hard': template.get('hard_count', 0) or 0
-            }
-            template_total_requested = sum(template_counts.values())
-
-            print(f"  - {template_title}: requested {template_counts['easy']}/{template_counts['medium']}/{template_counts['hard']} (total {template_total_requested})")
-
-            template_questions = []
-
-            if use_pool and template_total_requested > 0:
-                # Select questions per difficulty for this template
-                for difficulty, count in [('easy', template_counts['easy']),
-                                          ('medium', template_counts['medium']),
-                                          ('hard', template_counts['hard'])]:
-                    if count > 0:
-                        selected = self._select_questions_by_difficulty(
-                            template_id, difficulty, count, session_id, order_index
-                        )
-                        template_questions.extend(selected)
-                        order_index += len(selected)
-            else:
-                # Use all questions from this template
-                template_questions = self.db.execute_query("""
-                    SELECT * FROM questions
-                    WHERE exam_id = ? AND is_active = 1
-                    ORDER BY order_index, id
-                """, (template_id,))
-
-                if template_questions:
-                    for question in template_questions:
-                        self.db.execute_insert("""
-                            INSERT INTO session_questions (session_id, question_id, difficulty_level, order_index)
-                            VALUES (?, ?, ?, ?)
-                        """, (session_id, question['id'], question.get('difficulty_level', 'medium'), order_index))
-                        order_index += 1
-
-            all_questions.extend(template_questions)
-
-        if randomize and all_questions:
-            all_questions = self._randomize_by_topic_groups(all_questions, session_id)
+        # Topic x difficulty blueprint of the templates with pool counts, drawn in one pass
+        template_cells = {
+            template['id']: template_blueprint([template]) if use_pool else [] for template in exam_templates
+        }
+        drawn = iter(self._sample_blueprint(
+            exam_data, [cell for cells in template_cells.values() for cell in cells]
+        ))
+
+        # Store every template's selection in one commit
+        with self._selection_transaction():
+            # Fetch questions from each exam template
+            for template in exam_templates:
+                template_id = template['id']
+                template_title = template['title']
+                template_counts = {
+                    'easy': template.get('easy_count', 0) or 0,
+                    'medium': template.get('medium_count', 0) or 0,
+                    'hard': template.get('hard_count', 0) or 0
+                }
+                template_total_requested = sum(template_counts.values())
+
+                print(f"  - {template_title}: requested {template_counts['easy']}/{template_counts['medium']}/{template_counts['hard']} (total {template_total_requested})")
+
+                template_questions = []
+
+                if template_cells[template_id]:
+                    # Questions drawn for this template's cells
+                    picks = [pick for _ in template_cells[template_id] for pick in next(drawn)]
+                    template_questions = self._store_picks(session_id, picks, order_index)
+                    order_index += len(template_questions)
+                else:
+                    # Use all questions from this template
+                    template_questions = fetch_questions(self.db, self.pool.question_ids(self.db, [template_id]))
+
+                    if template_questions:
+                        self._store_session_questions(session_id, [
+                            (question['id'], question.get('difficulty_level', 'medium'), order_index + i)
+                            for i, question in enumerate(template_questions)
+                        ])
+                        order_index += len(template_questions)
+
+                all_questions.extend(template_questions)
+
+            if randomize and all_questions:
+                all_questions = self._randomize_by_topic_groups(all_questions, session_id)
 
         print(f"Total questions selected: {len(all_questions)} from {len(exam_templates)} templates")
         return all_questions
@@ -473,25 +491,215 @@ class QuestionSelector:
         print("[POOL] Multi-template assignment missing template counts; using assignment-level distribution")
         print(f"        Requested totals: easy={easy_count}, medium={medium_count}, hard={hard_count}")
 
-        selected_questions = []
-        order_index = 1
+        picks = [pick for cell_picks in self._sample_blueprint(exam_data, shared_blueprint(exam_data, exam_templates))
+                 for pick in cell_picks]
 
-        for difficulty, count in [('easy', easy_count), ('medium', medium_count), ('hard', hard_count)]:
-            if count > 0:
-                chosen = self._select_questions_by_difficulty_multi(
-                    exam_ids, difficulty, count, session_id, order_index
-                )
-                selected_questions.extend(chosen)
-                order_index += len(chosen)
+        with self._selection_transaction():
+            selected_questions = self._store_picks(session_id, picks, 1)
 
-        if exam_data.get('randomize_questions', False) and selected_questions:
-            selected_questions = self._randomize_by_topic_groups(selected_questions, session_id)
+            if exam_data.get('randomize_questions', False) and selected_questions:
+                selected_questions = self._randomize_by_topic_groups(selected_questions, session_id)
 
         print(f"[POOL] Selected {len(selected_questions)} questions total using assignment-level counts")
         return selected_questions
 
 
-def select_questions_for_exam_session(exam_data: Dict, session_id: int, assignment_id: int = None) -> List[Dict]:
+def new_session_seed() -> int:
+    """Random seed for a new exam session (fits a signed SQLite INTEGER)."""
+    return secrets.randbits(62)
+
+
+def _load_exam_templates(db: Database, assignment_id: int) -> List[Dict]:
+    """Exam templates of an assignment with their per-template difficulty counts."""
+    return db.execute_query("""
+        SELECT e.*,
+               aet.order_index,
+               COALESCE(aet.easy_count, 0) AS easy_count,
+               COALESCE(aet.medium_count, 0) AS medium_count,
+               COALESCE(aet.hard_count, 0) AS hard_count
+        FROM assignment_exam_templates aet
+        JOIN exams e ON aet.exam_id = e.id
+        WHERE aet.assignment_id = ?
+        ORDER BY aet.order_index
+    """, (assignment_id,))
+
+
+def load_selection_config(db: Database, exam_id: int, assignment_id: Optional[int] = None) -> Tuple[Optional[Dict], List[Dict]]:
+    """
+    Load the settings a session's questions were selected with.
+
+    Args:
+        db: Database to read from
+        exam_id: Exam (template) ID of the session
+        assignment_id: Assignment of the session, if any
+
+    Returns:
+        Tuple of (exam_data as passed to the exam interface, assignment exam templates);
+        exam_data is None if the exam or assignment no longer exists
+    """
+    if assignment_id:
+        assignment = db.execute_single("SELECT * FROM exam_assignments WHERE id = ?", (assignment_id,))
+        if not assignment:
+            return None, []
+        return {**assignment, 'id': exam_id}, _load_exam_templates(db, assignment_id)
+    return db.execute_single("SELECT * FROM exams WHERE id = ?", (exam_id,)), []
+
+
+def question_pool_version(db: Database, exam_data: Dict, exam_templates: List[Dict]) -> str:
+    """
+    Fingerprint everything a seeded selection depends on besides the seed.
+
+    Covers the selection settings, the active questions of the exam(s) in the
+    order the selector reads them, and their option ids. Two selections with
+    the same seed and pool version are identical.
+
+    Args:
+        db: Database to read from
+        exam_data: Exam configuration data
+        exam_templates: Assignment exam templates (empty for plain exams)
+
+    Returns:
+        Short hex digest
+    """
+    digest = hashlib.sha1()
+    settings = (
+        int(exam_data.get('use_question_pool') or 0),
+        int(exam_data.get('randomize_questions') or 0),
+        int(exam_data.get('easy_questions_count') or 0),
+        int(exam_data.get('medium_questions_count') or 0),
+        int(exam_data.get('hard_questions_count') or 0),
+        [(template['id'], template.get('easy_count') or 0, template.get('medium_count') or 0,
+          template.get('hard_count') or 0) for template in exam_templates],
+    )
+    fallback, target_points = blueprint_rules(exam_data)
+    if fallback != 'none' or target_points is not None:
+        # Only part of the fingerprint when set, so older sessions keep their version
+        settings += (fallback, target_points)
+    digest.update(repr(settings).encode())
+
+    exam_ids = [template['id'] for template in exam_templates] or [exam_data['id']]
+    placeholders = ','.join('?' * len(exam_ids))
+    points_column = ', q.points' if target_points is not None else ''
+    for row in db.execute_iter(f"""
+        SELECT q.id, q.exam_id, q.order_index, q.difficulty_level, q.question_type, qo.id{points_column}
+        FROM questions q
+        LEFT JOIN question_options qo ON qo.question_id = q.id
+        WHERE q.exam_id IN ({placeholders}) AND q.is_active = 1
+        ORDER BY q.id, qo.order_index, qo.id
+    """, tuple(exam_ids), row_type='tuple'):
+        digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()[:16]
+
+
+def _select_questions(selector: QuestionSelector, exam_data: Dict, session_id: Optional[int],
+                      exam_templates: List[Dict]) -> List[Dict]:
+    """
+    Route a selection to the single- or multi-template logic.
+
+    Args:
+        selector: QuestionSelector to select with
+        exam_data: Exam configuration data
+        session_id: Exam session ID (None when pre-generating)
+        exam_templates: Assignment exam templates (empty for plain exams)
+    """
+    template_total_counts = sum(
+        (template.get('easy_count', 0) or 0) +
+        (template.get('medium_count', 0) or 0) +
+        (template.get('hard_count', 0) or 0)
+        for template in exam_templates
+    )
+
+    if len(exam_templates) > 1:
+        # Multiple templates - always use multi-template logic
+        print(f"Multi-template assignment with {len(exam_templates)} templates detected")
+        if template_total_counts > 0:
+            return selector.select_questions_for_multi_template_session(
+                exam_data, exam_templates, session_id
+            )
+        else:
+            return selector.select_questions_for_multi_template_assignment_counts(
+                exam_data, exam_templates, session_id
+            )
+    elif len(exam_templates) == 1:
+        # Single template - check if template-level counts are defined
+        template = exam_templates[0]
+        template_counts = template.get('easy_count', 0) + template.get('medium_count', 0) + template.get('hard_count', 0)
+
+        if template_counts > 0:
+            # Template-level counts are defined - use multi-template logic
+            print(f"Single-template assignment with template-level counts detected ({template_counts} total)")
+            return selector.select_questions_for_multi_template_session(
+                exam_data, exam_templates, session_id
+            )
+        else:
+            # Template-level counts are zero - use assignment-level counts with standard logic
+            print(f"Single-template assignment with assignment-level counts detected")
+            # Fall through to use standard selection method below
+
+    # Single template with assignment-level counts - use normal selection
+    return selector.select_questions_for_session(exam_data, session_id)
+
+
+def _pool_counters(db: Database, exam_ids: List[int]) -> str:
+    """
+    question_pool_versions counters of the given exams as stored with a pre-generated selection.
+
+    Returns:
+        JSON list of [exam_id, counter] pairs
+    """
+    return json.dumps(sorted(pool_versions(db, exam_ids).items()))
+
+
+def _claim_pregenerated_selection(db: Database, assignment_id: int, user_id: int,
+                                  session_id: int) -> Tuple[List[Dict], Optional[int], Optional[str]]:
+    """
+    Move a user's pre-generated selection into session_questions.
+
+    The selection is consumed either way; if the question pool of any of its
+    exams changed since it was generated (questions added, deleted, moved,
+    re-levelled, re-scored or (de)activated), an empty list is returned and
+    the caller selects afresh.
+
+    Returns:
+        Tuple of (selected questions in order, or [] if there was no usable
+        selection; the seed and pool version it was generated with)
+    """
+    selector = QuestionSelector(db)
+    # Read and consume under one write lock so a selection is claimed at most once
+    with db.transaction():
+        rows = db.execute_query("""
+            SELECT s.question_id, s.difficulty_level, s.order_index, s.selection_seed, s.pool_version,
+                   s.pool_counters, q.is_active
+            FROM assignment_question_selections s
+            LEFT JOIN questions q ON q.id = s.question_id
+            WHERE s.assignment_id = ? AND s.user_id = ?
+            ORDER BY s.order_index
+        """, (assignment_id, user_id))
+        if not rows:
+            return [], None, None
+
+        stored_counters = rows[0]['pool_counters']
+        usable = all(row['is_active'] for row in rows) and stored_counters is not None and (
+            _pool_counters(db, [exam_id for exam_id, _ in json.loads(stored_counters)]) == stored_counters
+        )
+        db.execute_update("""
+            DELETE FROM assignment_question_selections
+            WHERE assignment_id = ? AND user_id = ?
+        """, (assignment_id, user_id))
+        if usable:
+            selector._store_session_questions(session_id, [
+                (row['question_id'], row['difficulty_level'], row['order_index']) for row in rows
+            ])
+
+    if not usable:
+        print(f"Pre-generated selection for assignment {assignment_id} is out of date; selecting again")
+        return [], None, None
+    print(f"Using pre-generated question selection for session {session_id}")
+    return selector._existing_selection(session_id), rows[0]['selection_seed'], rows[0]['pool_version']
+
+
+def select_questions_for_exam_session(exam_data: Dict, session_id: int, assignment_id: int = None,
+                                      user_id: int = None, seed: int = None) -> Tuple[List[Dict], int, str]:
     """
     Convenience function to select questions for an exam session.
 
@@ -499,60 +707,140 @@ def select_questions_for_exam_session(exam_data: Dict, session_id: int, assignme
         exam_data: Exam configuration data
         session_id: Exam session ID
         assignment_id: Optional assignment ID for multi-template support
+        user_id: Examinee; a selection pre-generated for them is used if present
+        seed: Session seed (a new one by default)
 
     Returns:
-        List of selected questions for the exam session
+        Tuple of (selected questions, session seed, pool version); store the
+        seed and pool version on the session to reproduce the order later
     """
     db = Database()
-    selector = QuestionSelector(db)
 
     # Check if this is a multi-template assignment
+    exam_templates = []
     if assignment_id:
-        exam_templates = db.execute_query("""
-            SELECT e.*,
-                   aet.order_index,
-                   COALESCE(aet.easy_count, 0) AS easy_count,
-                   COALESCE(aet.medium_count, 0) AS medium_count,
-                   COALESCE(aet.hard_count, 0) AS hard_count
-            FROM assignment_exam_templates aet
-            JOIN exams e ON aet.exam_id = e.id
-            WHERE aet.assignment_id = ?
-            ORDER BY aet.order_index
-        """, (assignment_id,))
-
-        template_total_counts = sum(
-            (template.get('easy_count', 0) or 0) +
-            (template.get('medium_count', 0) or 0) +
-            (template.get('hard_count', 0) or 0)
-            for template in exam_templates
-        )
+        if user_id:
+            pregenerated, pregenerated_seed, pregenerated_version = _claim_pregenerated_selection(
+                db, assignment_id, user_id, session_id
+            )
+            if pregenerated:
+                return pregenerated, pregenerated_seed, pregenerated_version
+        exam_templates = _load_exam_templates(db, assignment_id)
+
+    if seed is None:
+        seed = new_session_seed()
+    selector = QuestionSelector(db, seed=seed)
+    questions = _select_questions(selector, exam_data, session_id, exam_templates)
+    return questions, seed, question_pool_version(db, exam_data, exam_templates)
+
+
+def regenerate_session_questions(db: Database, exam_data: Dict, exam_templates: List[Dict], seed: int) -> List[Dict]:
+    """
+    Rebuild a session's questions, in order, from its seed without storing anything.
 
-        if len(exam_templates) > 1:
-            # Multiple templates - always use multi-template logic
-            print(f"Multi-template assignment with {len(exam_templates)} templates detected")
-            if template_total_counts > 0:
-                return selector.select_questions_for_multi_template_session(
-                    exam_data, exam_templates, session_id
-                )
-            else:
-                return selector.select_questions_for_multi_template_assignment_counts(
-                    exam_data, exam_templates, session_id
-                )
-        elif len(exam_templates) == 1:
-            # Single template - check if template-level counts are defined
-            template = exam_templates[0]
-            template_counts = template.get('easy_count', 0) + template.get('medium_count', 0) + template.get('hard_count', 0)
-
-            if template_counts > 0:
-                # Template-level counts are defined - use multi-template logic
-                print(f"Single-template assignment with template-level counts detected ({template_counts} total)")
-                return selector.select_questions_for_multi_template_session(
-                    exam_data, exam_templates, session_id
-                )
-            else:
-                # Template-level counts are zero - use assignment-level counts with standard logic
-                print(f"Single-template assignment with assignment-level counts detected")
-                # Fall through to use standard selection method below
+    Only meaningful while question_pool_version() still matches the version
+    stored on the session.
+    """
+    selector = QuestionSelector(db, store_selection=False, seed=seed)
+    return _select_questions(selector, exam_data, None, exam_templates)
 
-    # Single template with assignment-level counts - use normal selection
-    return selector.select_questions_for_session(exam_data, session_id)
+
+def _users_with_selection(db: Database, assignment_id: int) -> Set[int]:
+    """Users that already have a pre-generated selection for an assignment."""
+    return {row['user_id'] for row in db.execute_query("""
+        SELECT DISTINCT user_id FROM assignment_question_selections WHERE assignment_id = ?
+    """, (assignment_id,))}
+
+
+def pregenerate_assignment_selections(assignment_id: int, db: Database = None, replace: bool = True) -> int:
+    """
+    Select questions for every user of an assignment ahead of the exam.
+
+    Starting an exam then only copies a ready-made list into session_questions
+    instead of sampling the question pool while everyone starts at once.
+
+    Args:
+        assignment_id: Assignment to pre-generate selections for
+        db: Database to use (a new one by default)
+        replace: Regenerate existing selections (assignment settings changed);
+            when False only users without a selection get one
+
+    Returns:
+        Number of users a selection was generated for
+    """
+    db = db or Database()
+    assignment = db.execute_single("""
+        SELECT * FROM exam_assignments
+        WHERE id = ? AND is_deleted = 0
+    """, (assignment_id,))
+    if not assignment or assignment.get('delivery_method') == 'pdf_export':
+        return 0
+
+    user_ids = [row['user_id'] for row in db.execute_query("""
+        SELECT user_id FROM assignment_users
+        WHERE assignment_id = ? AND is_active = 1
+    """, (assignment_id,))]
+    if not replace:
+        existing = _users_with_selection(db, assignment_id)
+        user_ids = [user_id for user_id in user_ids if user_id not in existing]
+
+    # Same exam_data the exam interface passes: assignment settings with the template exam id
+    exam_data = {**assignment, 'id': assignment['exam_id']}
+    exam_templates = _load_exam_templates(db, assignment_id)
+    pool_version = question_pool_version(db, exam_data, exam_templates)
+    # Read before selecting: a question change in between makes the selection stale, not wrong
+    counters = _pool_counters(db, [template['id'] for template in exam_templates] or [exam_data['id']])
+
+    selections = {}
+    for user_id in user_ids:
+        seed = new_session_seed()
+        selector = QuestionSelector(db, store_selection=False, seed=seed)
+        _select_questions(selector, exam_data, None, exam_templates)
+        if not selector.selection_rows:
+            # Plain exams are not stored per session, so there is nothing to pre-generate
+            break
+        selections[user_id] = [
+            (assignment_id, user_id, question_id, difficulty, order_index, seed, pool_version, counters)
+            for question_id, difficulty, order_index in selector.selection_rows
+        ]
+
+    # Selecting runs outside the write lock; another run for this assignment may
+    # have stored selections meanwhile, so check again under BEGIN IMMEDIATE
+    with db.transaction():
+        if replace:
+            db.execute_update("""
+                DELETE FROM assignment_question_selections WHERE assignment_id = ?
+            """, (assignment_id,))
+        else:
+            for user_id in _users_with_selection(db, assignment_id):
+                selections.pop(user_id, None)
+        db.execute_many("""
+            INSERT OR IGNORE INTO assignment_question_selections
+                (assignment_id, user_id, question_id, difficulty_level, order_index, selection_seed,
+                 pool_version, pool_counters)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [row for rows in selections.values() for row in rows])
+    generated = len(selections)
+
+    print(f"Pre-generated question selections for {generated} users of assignment {assignment_id}")
+    return generated
+
+
+def start_selection_pregeneration(assignment_id: int, replace: bool = True) -> threading.Thread:
+    """
+    Run pregenerate_assignment_selections() on a background thread.
+
+    Args:
+        assignment_id: Assignment that was just saved
+        replace: See pregenerate_assignment_selections()
+    """
+    def run():
+        try:
+            pregenerate_assignment_selections(assignment_id, replace=replace)
+        except Exception as e:
+            # Exam start falls back to selecting on the spot
+            logger.warning(f"Pre-generating selections for assignment {assignment_id} failed: {e}")
+
+    thread = threading.Thread(target=run, name=f'selection-pregen-{assignment_id}', daemon=True)
+    thread.start()
+    return thread
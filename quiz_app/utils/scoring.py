@@ -0,0 +1,101 @@
+"""
+Set-based exam session scoring.
+
+Scores a session with a single aggregate statement over questions LEFT JOIN
+user_answers, instead of one or more queries per question. Used when an
+examinee submits (exam_interface.submit_exam_final), when an instructor's
+manual grading changes a session (GradingView.recalculate_exam_session_score)
+and when journaled answers are replayed into a completed session.
+
+points_earned and is_correct are taken as stored in user_answers: the exam
+interface writes them when auto-grading, and instructors set them for
+essay/short-answer questions. Ungraded answers (points_earned NULL) count as
+answered but earn nothing until graded.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from quiz_app.database.database import Database
+
+_AGGREGATE_SQL = """
+    SELECT COUNT(*) as total_questions,
+           COALESCE(SUM(q.points), 0) as total_points,
+           COALESCE(SUM(CASE WHEN ua.answer_text IS NOT NULL
+                               OR ua.selected_option_id IS NOT NULL
+                               OR ua.selected_option_ids IS NOT NULL THEN 1 ELSE 0 END), 0) as answered_questions,
+           COALESCE(SUM(CASE WHEN ua.points_earned IS NOT NULL THEN 1 ELSE 0 END), 0) as graded_questions,
+           COALESCE(SUM(CASE WHEN ua.is_correct = 1 THEN 1 ELSE 0 END), 0) as correct_answers,
+           COALESCE(SUM(ua.points_earned), 0) as earned_points
+    FROM questions q
+    LEFT JOIN user_answers ua ON ua.session_id = ? AND ua.question_id = q.id
+    WHERE q.id IN ({question_filter})
+"""
+
+# Question-pool sessions list their questions in session_questions; regular
+# exams use every question of the session's exam
+_SESSION_QUESTIONS_SQL = """
+    SELECT question_id FROM session_questions WHERE session_id = ?
+    UNION
+    SELECT q.id FROM questions q
+    JOIN exam_sessions es ON es.exam_id = q.exam_id
+    WHERE es.id = ? AND NOT EXISTS (SELECT 1 FROM session_questions WHERE session_id = ?)
+"""
+
+
+def calculate_session_score(db: Database, session_id: int,
+                            question_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+    """
+    Score an exam session with one aggregate query.
+
+    Args:
+        db: Database to read from
+        session_id: Exam session to score
+        question_ids: Questions the session was given. Pass them when the
+            exam_sessions row does not exist yet (at submission); otherwise
+            they are derived from session_questions or the session's exam.
+
+    Returns:
+        Dict with total_questions, total_points, answered_questions,
+        graded_questions, correct_answers, earned_points and score_percentage
+    """
+    if question_ids is not None:
+        ids = list(dict.fromkeys(question_ids))
+        if not ids:
+            return _with_percentage({
+                'total_questions': 0, 'total_points': 0, 'answered_questions': 0,
+                'graded_questions': 0, 'correct_answers': 0, 'earned_points': 0,
+            })
+        query = _AGGREGATE_SQL.format(question_filter=','.join('?' * len(ids)))
+        params = (session_id, *ids)
+    else:
+        query = _AGGREGATE_SQL.format(question_filter=_SESSION_QUESTIONS_SQL)
+        params = (session_id, session_id, session_id, session_id)
+
+    return _with_percentage(db.execute_single(query, params))
+
+
+def rescore_session(db: Database, session_id: int) -> Dict[str, Any]:
+    """
+    Recalculate a stored session's score and write it to exam_sessions.
+
+    Args:
+        db: Database to read from and write to
+        session_id: Existing exam session
+
+    Returns:
+        calculate_session_score() result (nothing is written if the session has no questions)
+    """
+    score = calculate_session_score(db, session_id)
+    if score['total_questions']:
+        db.execute_update("""
+            UPDATE exam_sessions
+            SET score = ?, correct_answers = ?, total_questions = ?
+            WHERE id = ?
+        """, (score['score_percentage'], score['correct_answers'], score['total_questions'], session_id))
+    return score
+
+
+def _with_percentage(result: Dict[str, Any]) -> Dict[str, Any]:
+    total_points = result['total_points']
+    result['score_percentage'] = (result['earned_points'] / total_points * 100) if total_points > 0 else 0
+    return result
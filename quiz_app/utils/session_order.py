@@ -0,0 +1,108 @@
+"""
+Reproducible question and option order for exam sessions.
+
+Every session gets a random seed when its questions are selected. The
+QuestionSelector draws from an RNG seeded with it, and each question's
+option shuffle uses an RNG derived from the seed and the question id, so
+the order an examinee saw can be rebuilt for resume, result review and
+re-grading instead of being kept only in the exam interface's memory.
+
+The seed and a pool version (see question_pool_version) are stored on
+exam_sessions. Questions are edited and deactivated in place, so a seed
+only reproduces the original order while the pool version still matches;
+session_questions therefore stays the record of which questions a pool
+session got, and SessionOrder falls back to stored order otherwise.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from quiz_app.database.database import Database
+from quiz_app.utils.question_selector import (
+    load_selection_config, question_pool_version, regenerate_session_questions
+)
+
+
+def shuffle_options(options: List[Dict], seed: int, question_id: int) -> List[Dict]:
+    """
+    Shuffle a question's options the same way every time for a session.
+
+    Args:
+        options: Options in their stored order (order_index, id)
+        seed: Session seed
+        question_id: Question the options belong to
+
+    Returns:
+        New list in the session's display order
+    """
+    shuffled = list(options)
+    # String seeds are hashed with SHA-512, so the order is stable across processes
+    random.Random(f"{seed}:{question_id}").shuffle(shuffled)
+    return shuffled
+
+
+def options_are_shuffled(exam_data: Dict, question: Dict) -> bool:
+    """True if the exam shows this question's options in a shuffled order."""
+    return bool(exam_data.get('randomize_questions')) and question.get('question_type') != 'true_false'
+
+
+class SessionOrder:
+    """Question and option order of a completed session, rebuilt from its seed."""
+
+    def __init__(self, db: Database, seed: Optional[int] = None, exam_data: Optional[Dict] = None,
+                 exam_templates: Optional[List[Dict]] = None):
+        """
+        Args:
+            db: Database to read from
+            seed: Session seed, or None if the order cannot be reproduced
+            exam_data: Settings the session was selected with
+            exam_templates: Assignment exam templates of the session
+        """
+        self.db = db
+        self.seed = seed
+        self.exam_data = exam_data or {}
+        self.exam_templates = exam_templates or []
+
+    @property
+    def reproducible(self) -> bool:
+        return self.seed is not None
+
+    @classmethod
+    def load(cls, db: Database, session_id: int) -> 'SessionOrder':
+        """
+        Load a session's seed, checking that the pool it was selected from is unchanged.
+
+        Args:
+            db: Database to read from
+            session_id: Exam session ID
+        """
+        session = db.execute_single("""
+            SELECT exam_id, assignment_id, selection_seed, pool_version
+            FROM exam_sessions WHERE id = ?
+        """, (session_id,))
+        if not session or session['selection_seed'] is None:
+            return cls(db)
+
+        exam_data, exam_templates = load_selection_config(db, session['exam_id'], session['assignment_id'])
+        if not exam_data or question_pool_version(db, exam_data, exam_templates) != session['pool_version']:
+            # Questions or settings changed since the exam; the seed no longer applies
+            return cls(db)
+        return cls(db, session['selection_seed'], exam_data, exam_templates)
+
+    def questions(self) -> Optional[List[Dict]]:
+        """Questions in the order the examinee saw them, or None if not reproducible."""
+        if not self.reproducible:
+            return None
+        return regenerate_session_questions(self.db, self.exam_data, self.exam_templates, self.seed)
+
+    def options(self, question: Dict, options: List[Dict]) -> List[Dict]:
+        """
+        Options of a question in the order the examinee saw them.
+
+        Args:
+            question: Question dict (id and question_type are used)
+            options: Options in their stored order (order_index, id)
+        """
+        if not self.reproducible or not options_are_shuffled(self.exam_data, question):
+            return options
+        return shuffle_options(options, self.seed, question['id'])
@@ -1,8 +1,11 @@
 import flet as ft
 from datetime import datetime
 from quiz_app.config import COLORS
+from quiz_app.database.database import question_columns
 from quiz_app.utils.localization import t
 from quiz_app.utils.permissions import UnitPermissionManager
+from quiz_app.utils.scoring import rescore_session
+from quiz_app.utils.session_order import SessionOrder
 from quiz_app.utils.email_ui_components import create_email_button
 
 class Grading(ft.UserControl):
@@ -1137,78 +1140,27 @@ class Grading(ft.UserControl):
         try:
             print(f"Recalculating score for exam session {session_id}")
             
-            # Get questions for this session (handles both regular exams and question pool exams)
-            # First check if this session has selected questions in session_questions table
-            session_questions = self.db.execute_query("""
-                SELECT q.id, q.points, q.question_type
-                FROM questions q
-                JOIN session_questions sq ON q.id = sq.question_id
-                WHERE sq.session_id = ?
-                ORDER BY sq.order_index, q.order_index, q.id
-            """, (session_id,))
-            
-            if session_questions:
-                # This session uses question pool - use selected questions
-                exam_questions = session_questions
-                print(f"Using question pool: {len(exam_questions)} selected questions for session {session_id}")
-            else:
-                # Regular exam - get all questions from the exam
-                exam_questions = self.db.execute_query("""
-                    SELECT q.id, q.points, q.question_type
-                    FROM questions q
-                    JOIN exam_sessions es ON es.id = ?
-                    JOIN exams e ON e.id = es.exam_id AND e.id = q.exam_id
-                    ORDER BY q.order_index, q.id
-                """, (session_id,))
-                print(f"Using regular exam: {len(exam_questions)} total questions for session {session_id}")
-            
-            if not exam_questions:
+            # One aggregate query over the session's questions (question pool selection or
+            # the whole exam) LEFT JOIN user_answers
+            score = rescore_session(self.db, session_id)
+            total_questions = score['total_questions']
+            if not total_questions:
                 print(f"No questions found for session {session_id}")
                 return
             
-            # Calculate total points for ALL questions
-            total_points = sum(q['points'] for q in exam_questions)
-            earned_points = 0
-            correct_answers = 0
-            answered_questions = 0
-            
-            # Get user answers for each question (avoid duplicates)
-            for question in exam_questions:
-                question_id = question['id']
-                
-                # Get the latest answer for this question (avoid duplicates)
-                answer = self.db.execute_single("""
-                    SELECT points_earned, is_correct
-                    FROM user_answers 
-                    WHERE session_id = ? AND question_id = ?
-                    ORDER BY answered_at DESC
-                    LIMIT 1
-                """, (session_id, question_id))
-                
-                if answer and answer['points_earned'] is not None:
-                    answered_questions += 1
-                    earned_points += answer['points_earned']
-                    
-                    if answer['is_correct']:
-                        correct_answers += 1
-            
-            # Calculate percentage score
-            score_percentage = (earned_points / total_points * 100) if total_points > 0 else 0
+            total_points = score['total_points']
+            earned_points = score['earned_points']
+            correct_answers = score['correct_answers']
+            answered_questions = score['graded_questions']
+            score_percentage = score['score_percentage']
             
             print(f"📊 SCORING SUMMARY:")
-            print(f"   Total questions in exam: {len(exam_questions)}")
+            print(f"   Total questions in exam: {total_questions}")
             print(f"   Questions answered: {answered_questions}")
             print(f"   Correct answers: {correct_answers}")
             print(f"   Points earned: {earned_points}/{total_points}")
             print(f"   Final score: {score_percentage:.1f}%")
             
-            # Update the exam session with new score
-            self.db.execute_update("""
-                UPDATE exam_sessions 
-                SET score = ?, correct_answers = ?, total_questions = ?
-                WHERE id = ?
-            """, (score_percentage, correct_answers, len(exam_questions), session_id))
-            
             print(f"✅ Successfully updated exam session {session_id} score to {score_percentage:.1f}%")
             
         except Exception as e:
@@ -1301,9 +1253,12 @@ class Grading(ft.UserControl):
 
             exam_id = session['exam_id']
 
+            # Question and option order the examinee saw, when the session seed still applies
+            session_order = SessionOrder.load(self.db, session_id)
+
             # Get questions for this session (handles both regular exams and question pool exams)
-            session_questions = self.db.execute_query("""
-                SELECT q.*
+            session_questions = self.db.execute_query(f"""
+                SELECT {question_columns('q')}
                 FROM questions q
                 JOIN session_questions sq ON q.id = sq.question_id
                 WHERE sq.session_id = ?
@@ -1313,10 +1268,14 @@ class Grading(ft.UserControl):
             if session_questions:
                 questions = session_questions
                 print(f"Using question pool: {len(questions)} selected questions for session {session_id}")
+            elif session_order.reproducible:
+                # Regular exam - rebuild the (possibly shuffled) order from the session seed
+                questions = session_order.questions()
+                print(f"Using regular exam: {len(questions)} questions in session order for session {session_id}")
             else:
                 # Regular exam - get all questions from the exam
-                questions = self.db.execute_query("""
-                    SELECT * FROM questions
+                questions = self.db.execute_query(f"""
+                    SELECT {question_columns()} FROM questions
                     WHERE exam_id = ? AND is_active = 1
                     ORDER BY order_index, id
                 """, (exam_id,))
@@ -1341,6 +1300,7 @@ class Grading(ft.UserControl):
                     WHERE question_id = ?
                     ORDER BY order_index, id
                 """, (question_id,))
+                options = session_order.options(question, options)
 
                 # Process the question data for review
                 question_review = {
@@ -1,8 +1,10 @@
 import flet as ft
 import os
 import uuid
-from quiz_app.config import COLORS, UPLOAD_FOLDER, MAX_FILE_SIZE, ALLOWED_EXTENSIONS
+from quiz_app.config import COLORS, UPLOAD_FOLDER, MAX_FILE_SIZE, ALLOWED_EXTENSIONS, IMAGE_DISPLAY_MAX_PX
+from quiz_app.database.database import question_columns
 from quiz_app.utils.localization import t
+from quiz_app.utils.asset_server import image_src
 from quiz_app.utils.bulk_import import BulkImporter
 from quiz_app.utils.question_selector import QuestionSelector
 from quiz_app.utils.permissions import UnitPermissionManager
@@ -494,13 +496,11 @@ class QuestionManagement(ft.UserControl):
 
         print(f"DEBUG: Loading questions for exam ID: {self.selected_exam_id}")
         # Load questions with exam's created_by for permission checking
-        # Note: We don't load image_data BLOB here to avoid loading all images at once
-        # Instead, we check if image_data IS NOT NULL to show icon
-        self.all_questions_data = self.db.execute_query("""
-            SELECT q.id, q.exam_id, q.question_text, q.question_type, q.correct_answer,
-                   q.explanation, q.points, q.difficulty_level, q.order_index, q.is_active,
-                   q.created_at, q.image_filename, q.image_mime_type,
-                   CASE WHEN q.image_data IS NOT NULL THEN 1 ELSE 0 END as has_image,
+        # Note: We don't load image BLOBs here to avoid loading all images at once
+        # Instead, question_columns() exposes a has_image flag to show icon
+        self.all_questions_data = self.db.execute_query(f"""
+            SELECT {question_columns('q')},
+                   q.image_filename, q.image_mime_type,
                    e.created_by as exam_created_by
             FROM questions q
             JOIN exams e ON q.exam_id = e.id
@@ -1459,18 +1459,17 @@ class QuestionManagement(ft.UserControl):
         
         # Add image if present
         if question.get('has_image'):
-            # Load image from encrypted database
-            import base64
-            image_data_dict = self.db.get_question_image(question['id'])
+            # Load display-sized derivative from encrypted database; fullscreen loads the original on demand
+            image_data_dict = self.db.get_question_image(question['id'], max_size=IMAGE_DISPLAY_MAX_PX)
             if image_data_dict:
-                image_base64 = base64.b64encode(image_data_dict['data']).decode('utf-8')
+                image_source = image_src(image_data_dict['data'], image_data_dict['mime_type'])
                 header_content.append(
                     ft.Container(
                         content=ft.Column([
                             ft.Text(t('question_image_label'), size=14, weight=ft.FontWeight.BOLD),
                             ft.Container(
                                 content=ft.Image(
-                                    src_base64=image_base64,
+                                    **image_source,
                                     width=400,
                                     height=250,
                                     fit=ft.ImageFit.CONTAIN,
@@ -1480,7 +1479,7 @@ class QuestionManagement(ft.UserControl):
                                 border_radius=8,
                                 border=ft.border.all(1, ft.colors.OUTLINE),
                                 padding=ft.padding.all(5),
-                                on_click=lambda e, img=image_base64: self.show_fullscreen_image(img)
+                                on_click=lambda e, qid=question['id']: self.show_question_image_fullscreen(qid)
                             ),
                             ft.Text(t('click_to_view'), size=12, italic=True, color=COLORS['text_secondary'])
                         ], spacing=8),
@@ -1783,14 +1782,13 @@ class QuestionManagement(ft.UserControl):
             exam = self.db.execute_single("SELECT title FROM exams WHERE id = ?", (self.selected_exam_id,))
             exam_title = exam['title'] if exam else f"Exam_{self.selected_exam_id}"
 
-            # Get questions for the selected exam
-            questions = self.db.execute_query("""
-                SELECT * FROM questions
-                WHERE exam_id = ?
-                ORDER BY order_index, created_at
-            """, (self.selected_exam_id,))
+            # Only count here; question rows are streamed when the file is written
+            question_count = self.db.execute_single(
+                "SELECT COUNT(*) as count FROM questions WHERE exam_id = ?",
+                (self.selected_exam_id,)
+            )
 
-            if not questions:
+            if not question_count or not question_count['count']:
                 self.show_error_dialog(t('no_questions_found_exam'))
                 return
 
@@ -1798,17 +1796,30 @@ class QuestionManagement(ft.UserControl):
             def on_save_result(e: ft.FilePickerResultEvent):
                 if e.path:
                     try:
-                        # Convert to template format
+                        # Load every option for the exam in one streamed pass
+                        options_by_question = {}
+                        for opt in self.db.execute_iter("""
+                            SELECT qo.question_id, qo.option_text, qo.is_correct
+                            FROM question_options qo
+                            JOIN questions q ON q.id = qo.question_id
+                            WHERE q.exam_id = ?
+                            ORDER BY qo.question_id, qo.order_index
+                        """, (self.selected_exam_id,)):
+                            options_by_question.setdefault(opt['question_id'], []).append(opt)
+
+                        # Convert to template format (image BLOBs are never loaded)
                         export_data = []
-                        for question in questions:
+                        for question in self.db.execute_iter("""
+                            SELECT id, question_text, question_type, difficulty_level,
+                                   points, correct_answer, explanation
+                            FROM questions
+                            WHERE exam_id = ?
+                            ORDER BY order_index, created_at
+                        """, (self.selected_exam_id,)):
                             # Get options for choice-based questions
                             options = {}
                             if question['question_type'] in ['single_choice', 'multiple_choice', 'true_false']:
-                                question_options = self.db.execute_query("""
-                                    SELECT * FROM question_options
-                                    WHERE question_id = ?
-                                    ORDER BY order_index
-                                """, (question['id'],))
+                                question_options = options_by_question.get(question['id'], [])
 
                                 correct_answers = []
                                 for i, opt in enumerate(question_options):
@@ -1848,7 +1859,7 @@ class QuestionManagement(ft.UserControl):
                         success_dialog = ft.AlertDialog(
                             modal=True,
                             title=ft.Text(t('questions_exported_title')),
-                            content=ft.Text(t('questions_exported_message').format(len(questions), e.path)),
+                            content=ft.Text(t('questions_exported_message').format(len(export_data), e.path)),
                             actions=[ft.TextButton("OK", on_click=lambda e: self.close_success_dialog())]
                         )
                         self.page.dialog = success_dialog
@@ -1998,19 +2009,17 @@ class QuestionManagement(ft.UserControl):
     
     def build_image_upload_ui(self):
         """Build the image upload interface"""
-        import base64
-
         # Image preview and upload controls with horizontal layout
         header = ft.Text(t('question_image_title'), size=14, weight=ft.FontWeight.BOLD)
 
         if self.current_image_data:
             # State 1: Image on left, action buttons on right
-            # Convert binary data to base64 for display
-            image_base64 = base64.b64encode(self.current_image_data).decode('utf-8')
+            # Serve the in-memory upload through the local asset server
+            image_source = image_src(self.current_image_data, self.current_image_mime_type or 'image/png')
 
             image_container = ft.Container(
                 content=ft.Image(
-                    src_base64=image_base64,
+                    **image_source,
                     width=200,
                     height=120,
                     fit=ft.ImageFit.CONTAIN,
@@ -2133,7 +2142,13 @@ class QuestionManagement(ft.UserControl):
             if hasattr(self, 'question_dialog') and self.question_dialog:
                 self.page.update()
     
-    def show_fullscreen_image(self, image_base64):
+    def show_question_image_fullscreen(self, question_id):
+        """Load a question's original-resolution image and show it fullscreen"""
+        image_data_dict = self.db.get_question_image(question_id)
+        if image_data_dict:
+            self.show_fullscreen_image(image_src(image_data_dict['data'], image_data_dict['mime_type']))
+
+    def show_fullscreen_image(self, image_source):
         """Show image in fullscreen dialog"""
         def close_image_dialog(e):
             image_dialog.open = False
@@ -2144,7 +2159,7 @@ class QuestionManagement(ft.UserControl):
             title=ft.Text(t('question_image_title'), size=18, weight=ft.FontWeight.BOLD),
             content=ft.Container(
                 content=ft.Image(
-                    src_base64=image_base64,
+                    **image_source,
                     width=800,
                     height=600,
                     fit=ft.ImageFit.CONTAIN
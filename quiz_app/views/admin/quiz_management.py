@@ -1,12 +1,14 @@
 import flet as ft
-import random
 import json
 import os
 import logging
+import threading
 from datetime import datetime, timedelta, date
 from quiz_app.config import COLORS
 from quiz_app.utils.permissions import UnitPermissionManager, get_dept_unit_abbreviation
 from quiz_app.utils.localization import t, get_language, get_department_abbreviation, get_unit_abbreviation
+from quiz_app.utils.question_selector import start_selection_pregeneration
+from quiz_app.utils.question_pool import get_pool_index
 
 logger = logging.getLogger(__name__)
 
@@ -218,6 +220,8 @@ class QuizManagement(ft.UserControl):
     def export_assignment_as_pdf(self, assignment):
         """Show dialog to export assignment as PDF using configured variant count"""
         from quiz_app.utils.pdf_generator import ExamPDFGenerator
+        from quiz_app.utils.pdf_cache import PDFCache
+        from quiz_app.utils.pdf_variants import PDFVariantExporter, build_variant_snapshots, save_variant_snapshots
 
         # Check if assignment has randomization enabled
         has_randomize = bool(assignment.get('randomize_questions'))
@@ -243,21 +247,21 @@ class QuizManagement(ft.UserControl):
             border_radius=6
         )
 
-        def generate_pdfs(e):
-            try:
-                # Show progress
-                export_dialog.content = ft.Container(
-                    content=ft.Column([
-                        ft.ProgressRing(),
-                        ft.Text(t('generating_variants').format(num_variants), size=14)
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
-                    padding=20
-                )
-                export_dialog.actions = []
-                self.page.update()
+        def show_export_error(ex):
+            export_dialog.content = ft.Container(
+                content=ft.Column([
+                    ft.Icon(ft.icons.ERROR, color=COLORS['error'], size=48),
+                    ft.Text(t('error_generating_pdfs'), size=16, weight=ft.FontWeight.BOLD),
+                    ft.Text(str(ex), size=12, color=COLORS['error'])
+                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
+                padding=20
+            )
+            export_dialog.actions = [ft.TextButton(t('close'), on_click=lambda e: self.close_export_dialog(export_dialog))]
+            self.page.update()
 
+        def export_variants(exporter, progress_bar, progress_text):
+            try:
                 pdf_gen = ExamPDFGenerator(self.db)
-                generated_files = []
 
                 # Check if this is a multi-template assignment
                 templates = self.db.execute_query("""
@@ -270,63 +274,45 @@ class QuizManagement(ft.UserControl):
                 # For single-template assignments, use exam_id for backward compatibility
                 export_exam_id = assignment['id'] if is_multi_template else (assignment.get('exam_id') or assignment['id'])
 
-                # Check if a master snapshot already exists for this assignment
-                existing_snapshot = self.db.execute_single(
-                    """SELECT question_snapshot FROM pdf_exports
-                       WHERE exam_id = ? AND variant_number = 1""",
-                    (export_exam_id,)
-                )
+                # Snapshots of a previous export of this assignment, if any
+                stored_snapshots = {
+                    row['variant_number']: json.loads(row['question_snapshot'])
+                    for row in self.db.execute_query(
+                        """SELECT variant_number, question_snapshot FROM pdf_exports
+                           WHERE exam_id = ? AND question_snapshot IS NOT NULL""",
+                        (export_exam_id,)
+                    )
+                }
 
-                # Use existing snapshot or create new one (only once)
-                if existing_snapshot and existing_snapshot['question_snapshot']:
+                # Use existing master snapshot or create new one (only once)
+                if stored_snapshots.get(1):
                     print(f"[PDF] Using existing snapshot for assignment {assignment['id']}")
-                    master_snapshot = json.loads(existing_snapshot['question_snapshot'])
+                    master_snapshot = stored_snapshots[1]
                 else:
                     print(f"[PDF] Creating new snapshot for assignment {assignment['id']}")
                     # Create snapshot WITHOUT randomization to get base question set
                     master_snapshot = pdf_gen.create_question_snapshot(assignment['id'], randomize=False)
 
-                for variant in range(1, num_variants + 1):
-                    # Use the same master snapshot but shuffle for each variant if randomization is enabled
-                    if has_randomize and variant > 1:
-                        # Shuffle questions within each topic for variants 2+
-                        variant_snapshot = []
-                        for topic_data in master_snapshot:
-                            shuffled_questions = topic_data['questions'].copy()
-                            random.shuffle(shuffled_questions)
-                            variant_snapshot.append({
-                                'topic_id': topic_data['topic_id'],
-                                'topic_title': topic_data['topic_title'],
-                                'questions': shuffled_questions
-                            })
-                    else:
-                        # Variant 1 or no randomization - use master snapshot as-is
-                        variant_snapshot = master_snapshot
-
-                    # Generate file paths
-                    exam_id = pdf_gen.generate_instance_id(assignment['id'], variant)
-                    paper_path = os.path.join(self.temp_dir, f"{exam_id}_paper.pdf")
-                    answers_path = os.path.join(self.temp_dir, f"{exam_id}_answers.pdf")
-
-                    # Generate PDFs
-                    pdf_gen.generate_exam_paper(assignment, variant_snapshot, variant, paper_path)
-                    pdf_gen.generate_answer_key(assignment, variant_snapshot, variant, answers_path)
-
-                    # Save snapshot to database (master snapshot for variant 1, variant snapshots for others)
-                    snapshot_to_save = master_snapshot if variant == 1 else variant_snapshot
-                    self.db.execute_insert(
-                        """INSERT INTO pdf_exports (exam_id, variant_number, question_snapshot, exported_by, file_path)
-                           VALUES (?, ?, ?, ?, ?)
-                           ON CONFLICT(exam_id, variant_number)
-                           DO UPDATE SET
-                               exported_by=excluded.exported_by,
-                               exported_at=CURRENT_TIMESTAMP,
-                               file_path=excluded.file_path
-                        """,
-                        (export_exam_id, variant, json.dumps(snapshot_to_save), self.user_data['id'], paper_path)
-                    )
+                # Same master snapshot for every variant, shuffled within topics for variants 2+
+                # (previous shuffles are kept so an unchanged assignment re-exports from the PDF cache)
+                snapshots = build_variant_snapshots(master_snapshot, num_variants, has_randomize, stored_snapshots)
 
-                    generated_files.append({'exam_id': exam_id, 'paper': paper_path, 'answers': answers_path})
+                def on_progress(done, total):
+                    progress_bar.value = done / total
+                    progress_text.value = t('rendering_documents').format(done, total)
+                    self.page.update()
+
+                # Variants share one question set: load it once (two queries) for every document
+                snapshot_data = pdf_gen.load_snapshot_data(master_snapshot)
+
+                generated_files = exporter.run(assignment, snapshots, self.temp_dir, on_progress, snapshot_data,
+                                               pdf_gen.layout_settings())
+                if generated_files is None:
+                    # Cancelled; the dialog is already closed
+                    return
+
+                # All documents rendered: record the snapshots in one transaction
+                save_variant_snapshots(self.db, export_exam_id, snapshots, generated_files, self.user_data['id'])
 
                 # Show success
                 self.show_pdf_success_dialog(generated_files)
@@ -334,17 +320,35 @@ class QuizManagement(ft.UserControl):
                 self.page.update()
 
             except Exception as ex:
-                # Show error
-                export_dialog.content = ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.icons.ERROR, color=COLORS['error'], size=48),
-                        ft.Text(t('error_generating_pdfs'), size=16, weight=ft.FontWeight.BOLD),
-                        ft.Text(str(ex), size=12, color=COLORS['error'])
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
-                    padding=20
-                )
-                export_dialog.actions = [ft.TextButton(t('close'), on_click=lambda e: self.close_export_dialog(export_dialog))]
-                self.page.update()
+                show_export_error(ex)
+
+        def generate_pdfs(e):
+            exporter = PDFVariantExporter(self.db.db_path, cache=PDFCache())
+            progress_bar = ft.ProgressBar(value=0, width=300)
+            progress_text = ft.Text(t('rendering_documents').format(0, num_variants * 2), size=12,
+                                    color=COLORS['text_secondary'])
+
+            def cancel_export(e):
+                exporter.cancel()
+                self.close_export_dialog(export_dialog)
+
+            # Show progress
+            export_dialog.content = ft.Container(
+                content=ft.Column([
+                    ft.Text(t('generating_variants').format(num_variants), size=14),
+                    progress_bar,
+                    progress_text
+                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10, tight=True),
+                padding=20
+            )
+            export_dialog.actions = [ft.TextButton(t('cancel'), on_click=cancel_export)]
+            self.page.update()
+
+            # Rendering runs in worker processes; keep the UI thread free
+            threading.Thread(
+                target=export_variants, args=(exporter, progress_bar, progress_text),
+                name=f"pdf-export-{assignment['id']}", daemon=True
+            ).start()
 
         export_dialog = ft.AlertDialog(
             title=ft.Text(t('export_assignment_as_pdf')),
@@ -1106,18 +1110,10 @@ class QuizManagement(ft.UserControl):
                 self.selected_exam_templates.append(exam)
 
                 # Get available questions by difficulty
-                easy_available = self.db.execute_single(
-                    "SELECT COUNT(*) as count FROM questions WHERE exam_id = ? AND difficulty_level = 'easy' AND is_active = 1",
-                    (exam_id,)
-                )['count']
-                medium_available = self.db.execute_single(
-                    "SELECT COUNT(*) as count FROM questions WHERE exam_id = ? AND difficulty_level = 'medium' AND is_active = 1",
-                    (exam_id,)
-                )['count']
-                hard_available = self.db.execute_single(
-                    "SELECT COUNT(*) as count FROM questions WHERE exam_id = ? AND difficulty_level = 'hard' AND is_active = 1",
-                    (exam_id,)
-                )['count']
+                pool_counts = get_pool_index(self.db).counts(self.db, exam_id)
+                easy_available = pool_counts['easy']
+                medium_available = pool_counts['medium']
+                hard_available = pool_counts['hard']
 
                 # Create dropdown options for Easy
                 easy_options = [ft.dropdown.Option(key=str(i), text=str(i)) for i in range(0, easy_available + 1)]
@@ -1407,23 +1403,10 @@ class QuizManagement(ft.UserControl):
                 pool_configs = {}
                 for exam in exams:
                     # Get available question counts for this exam by difficulty
-                    difficulty_counts = self.db.execute_query("""
-                        SELECT difficulty_level, COUNT(*) as count
-                        FROM questions
-                        WHERE exam_id = ? AND is_active = 1
-                        GROUP BY difficulty_level
-                    """, (exam['id'],))
-
-                    easy_available = 0
-                    medium_available = 0
-                    hard_available = 0
-                    for row in difficulty_counts:
-                        if row['difficulty_level'] == 'easy':
-                            easy_available = row['count']
-                        elif row['difficulty_level'] == 'medium':
-                            medium_available = row['count']
-                        elif row['difficulty_level'] == 'hard':
-                            hard_available = row['count']
+                    pool_counts = get_pool_index(self.db).counts(self.db, exam['id'])
+                    easy_available = pool_counts['easy']
+                    medium_available = pool_counts['medium']
+                    hard_available = pool_counts['hard']
 
                     pool_configs[exam['id']] = {
                         'easy': self.create_styled_dropdown(
@@ -2629,6 +2612,9 @@ class QuizManagement(ft.UserControl):
                                 VALUES (?, ?, ?)
                             """, (assignment_id, user['id'], self.user_data['id']))
 
+                # Select every assigned user's questions now rather than when they all press Start
+                start_selection_pregeneration(assignment_id)
+
                 # Close dialog
                 assignment_dialog.open = False
                 if self.page:
@@ -3436,6 +3422,9 @@ class QuizManagement(ft.UserControl):
                                 VALUES (?, ?, ?)
                             """, (assignment_id, user['id'], self.user_data['id']))
 
+                # Select every assigned user's questions now rather than when they all press Start
+                start_selection_pregeneration(assignment_id)
+
                 # Close dialog
                 assignment_dialog.open = False
                 if self.page:
@@ -4035,81 +4024,55 @@ class QuizManagement(ft.UserControl):
         """Save new user assignments for the exam"""
         self.current_exam_id = exam_id  # Store for remove operations
 
+        # Collect every user to assign, preserving selection order
+        user_ids = []
+
         # Handle all users selected case
         if self.all_users_selected:
             # Assign exam to all non-admin users
-            for user in self.all_available_users:
-                if user['role'] != 'admin':
-                    # Check if already assigned
-                    existing = self.db.execute_single("""
-                        SELECT id FROM exam_permissions
-                        WHERE user_id = ? AND exam_id = ? AND is_active = 1
-                    """, (user['id'], exam_id))
-
-                    if not existing:
-                        self.db.execute_insert("""
-                            INSERT INTO exam_permissions (user_id, exam_id, granted_by)
-                            VALUES (?, ?, ?)
-                        """, (user['id'], exam_id, self.user_data['id']))
+            user_ids = [user['id'] for user in self.all_available_users if user['role'] != 'admin']
+        else:
+            # Handle manually selected users
+            user_ids.extend(self.selected_users)
+
+            # Process department selections (existing logic)
+            for control in self.selected_items_row.controls:
+                if hasattr(control, 'data'):
+                    selection_key = control.data
+
+                    if selection_key.startswith("user_"):
+                        # Individual user assignment
+                        user_ids.append(int(selection_key.replace("user_", "")))
+
+                    elif selection_key.startswith("department_"):
+                        # Department assignment - assign to all users in department
+                        department = selection_key.replace("department_", "")
+
+                        # Get all users in this department
+                        dept_users = self.db.execute_query("""
+                            SELECT id FROM users
+                            WHERE department = ? AND role IN ('examinee', 'expert') AND is_active = 1
+                        """, (department,))
+                        user_ids.extend(user['id'] for user in dept_users)
+
+        if not user_ids:
             return
 
-        # Handle manually selected users
-        for user_id in self.selected_users:
-            # Check if already assigned
-            existing = self.db.execute_single("""
-                SELECT id FROM exam_permissions
-                WHERE user_id = ? AND exam_id = ? AND is_active = 1
-            """, (user_id, exam_id))
-
-            if not existing:
-                self.db.execute_insert("""
-                    INSERT INTO exam_permissions (user_id, exam_id, granted_by)
-                    VALUES (?, ?, ?)
-                """, (user_id, exam_id, self.user_data['id']))
-
-        # Process department selections (existing logic)
-        for control in self.selected_items_row.controls:
-            if hasattr(control, 'data'):
-                selection_key = control.data
-
-                if selection_key.startswith("user_"):
-                    # Individual user assignment
-                    user_id = int(selection_key.replace("user_", ""))
-
-                    # Check if already assigned
-                    existing = self.db.execute_single("""
-                        SELECT id FROM exam_permissions
-                        WHERE user_id = ? AND exam_id = ? AND is_active = 1
-                    """, (user_id, exam_id))
-
-                    if not existing:
-                        self.db.execute_insert("""
-                            INSERT INTO exam_permissions (user_id, exam_id, granted_by)
-                            VALUES (?, ?, ?)
-                        """, (user_id, exam_id, self.user_data['id']))
-
-                elif selection_key.startswith("department_"):
-                    # Department assignment - assign to all users in department
-                    department = selection_key.replace("department_", "")
-
-                    # Get all users in this department
-                    dept_users = self.db.execute_query("""
-                        SELECT id FROM users
-                        WHERE department = ? AND role IN ('examinee', 'expert') AND is_active = 1
-                    """, (department,))
-
-                    for user in dept_users:
-                        # Check if already assigned
-                        existing = self.db.execute_single("""
-                            SELECT id FROM exam_permissions
-                            WHERE user_id = ? AND exam_id = ? AND is_active = 1
-                        """, (user['id'], exam_id))
-
-                        if not existing:
-                            self.db.execute_insert("""
-                                INSERT INTO exam_permissions (user_id, exam_id, granted_by)
-                                VALUES (?, ?, ?)
-                            """, (user['id'], exam_id, self.user_data['id']))
+        # Skip users that are already assigned (one query instead of one per user)
+        already_assigned = {
+            row['user_id'] for row in self.db.execute_query("""
+                SELECT user_id FROM exam_permissions
+                WHERE exam_id = ? AND is_active = 1
+            """, (exam_id,))
+        }
+        new_user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in already_assigned]
+
+        # Insert all new permissions in one atomic commit
+        with self.db.transaction():
+            self.db.execute_many("""
+                INSERT INTO exam_permissions (user_id, exam_id, granted_by)
+                VALUES (?, ?, ?)
+            """, [(user_id, exam_id, self.user_data['id']) for user_id in new_user_ids])
     
     def calculate_exam_status_badges(self, exam):
         """Calculate and return stacked status badges for an exam"""
@@ -4450,6 +4413,8 @@ class QuizManagement(ft.UserControl):
                     VALUES (?, ?, ?)
                 """, (assignment['id'], user_id, self.user_data['id']))
 
+            start_selection_pregeneration(assignment['id'], replace=False)
+
             user_dropdown.value = None
             populate_current_users()
             check_and_archive()
@@ -4492,6 +4457,8 @@ class QuizManagement(ft.UserControl):
                         VALUES (?, ?, ?)
                     """, (assignment['id'], user['id'], self.user_data['id']))
 
+            start_selection_pregeneration(assignment['id'], replace=False)
+
             department_dropdown.value = None
             populate_current_users()
             check_and_archive()
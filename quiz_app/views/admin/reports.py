@@ -6,10 +6,12 @@ import matplotlib.dates as mdates
 import matplotlib.ticker as ticker
 from datetime import datetime, timedelta
 import io
-import base64
+import numpy as np
 import pandas as pd
 from quiz_app.config import COLORS
 from quiz_app.utils.localization import t
+from quiz_app.utils.asset_server import image_src, release_image_src
+from quiz_app.utils.pdf_fonts import get_pdf_fonts
 from quiz_app.database.database import Database
 from quiz_app.utils.permissions import UnitPermissionManager
 
@@ -18,7 +20,7 @@ class Reports(ft.UserControl):
         super().__init__()
         self.db = db
         self.user_data = user_data or {'role': 'admin'}  # Default to admin if not provided
-        self.chart_images = {}  # Store chart images
+        self.chart_images = {}  # chart key -> pinned ft.Image source (see _set_chart_image)
         self.current_dialog = None  # Track current dialog
 
         # Initialize file picker for PDF downloads
@@ -36,44 +38,12 @@ class Reports(ft.UserControl):
 
     def register_unicode_fonts_for_pdf(self):
         """
-        Register Unicode-capable fonts for PDF generation supporting Azerbaijani characters.
+        Unicode-capable fonts for PDF generation supporting Azerbaijani characters.
+        Registered once per process (see quiz_app.utils.pdf_fonts).
         Returns tuple: (font_name, bold_font_name, registered_success)
         """
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        import os
-
-        # Try multiple font paths for cross-platform compatibility
-        font_candidates = [
-            # Windows paths
-            ('Arial', 'C:\\Windows\\Fonts\\arial.ttf', 'C:\\Windows\\Fonts\\arialbd.ttf', 'C:\\Windows\\Fonts\\ariali.ttf'),
-            # macOS paths
-            ('Arial', '/System/Library/Fonts/Supplemental/Arial.ttf', '/System/Library/Fonts/Supplemental/Arial Bold.ttf', '/System/Library/Fonts/Supplemental/Arial Italic.ttf'),
-            # Linux DejaVu paths
-            ('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf'),
-        ]
-
-        for font_name, normal_path, bold_path, italic_path in font_candidates:
-            if os.path.exists(normal_path) and os.path.exists(bold_path):
-                try:
-                    pdfmetrics.registerFont(TTFont(f'{font_name}-Report', normal_path))
-                    pdfmetrics.registerFont(TTFont(f'{font_name}-Report-Bold', bold_path))
-                    if os.path.exists(italic_path):
-                        pdfmetrics.registerFont(TTFont(f'{font_name}-Report-Italic', italic_path))
-                    pdfmetrics.registerFontFamily(
-                        f'{font_name}-Report',
-                        normal=f'{font_name}-Report',
-                        bold=f'{font_name}-Report-Bold',
-                        italic=f'{font_name}-Report-Italic' if os.path.exists(italic_path) else f'{font_name}-Report'
-                    )
-                    print(f"[INFO] Successfully registered {font_name} fonts for Azerbaijani text from: {normal_path}")
-                    return (f'{font_name}-Report', f'{font_name}-Report-Bold', True)
-                except Exception as e:
-                    print(f"[WARN] Could not register {font_name}: {e}")
-                    continue
-
-        print("[WARN] Using Helvetica (may not display Azerbaijani characters correctly)")
-        return ('Helvetica', 'Helvetica-Bold', False)
+        fonts = get_pdf_fonts()
+        return (fonts['normal'], fonts['bold'], fonts['unicode'])
 
     def did_mount(self):
         super().did_mount()
@@ -110,6 +80,8 @@ class Reports(ft.UserControl):
             try:
                 if hasattr(self, 'chart_images'):
                     print(f"[DEBUG] Clearing {len(self.chart_images)} chart images")
+                    for chart_source in self.chart_images.values():
+                        release_image_src(chart_source)
                     self.chart_images.clear()
             except Exception as e:
                 print(f"[ERROR] Failed to clear chart images: {e}")
@@ -393,7 +365,7 @@ class Reports(ft.UserControl):
         if chart_key in self.chart_images:
             chart_content = ft.Container(
                 content=ft.Image(
-                    src_base64=self.chart_images[chart_key],
+                    **self.chart_images[chart_key],
                     fit=ft.ImageFit.CONTAIN
                 ),
                 expand=True,
@@ -534,6 +506,12 @@ class Reports(ft.UserControl):
         except Exception as ex:
             print(f"[ERROR] Error updating metric cards: {ex}")
     
+    def _set_chart_image(self, chart_key, png_data):
+        """Publish a chart PNG, pinned in the asset server while this view shows it"""
+        previous = self.chart_images.get(chart_key)
+        self.chart_images[chart_key] = image_src(png_data, 'image/png', pin=True)
+        release_image_src(previous)
+
     def generate_charts(self):
         """Generate all charts"""
         try:
@@ -602,14 +580,13 @@ class Reports(ft.UserControl):
             plt.xticks(rotation=45)
             plt.tight_layout()
 
-            # Convert to base64 image with higher DPI for sharper quality
+            # Render to PNG with higher DPI for sharper quality; served via the local asset server
             buffer = io.BytesIO()
             plt.savefig(buffer, format='png', dpi=120, bbox_inches='tight')
             buffer.seek(0)
-            image_data = base64.b64encode(buffer.getvalue()).decode()
             plt.close(fig)
 
-            self.chart_images['performance_trend'] = image_data
+            self._set_chart_image('performance_trend', buffer.getvalue())
             print("[SUCCESS] Performance trend chart generated")
 
         except Exception as e:
@@ -633,23 +610,27 @@ class Reports(ft.UserControl):
                 WHERE es.is_completed = 1 AND es.score IS NOT NULL {filter_clause}
             """.format(filter_clause=filter_clause)
 
-            # Execute query
-            scores_data = self.db.execute_query(query, tuple(filter_params))
+            # 10-point bins (0-10, 10-20, 20-30, etc.)
+            bins = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+            # Stream scores into bin counts instead of materializing every row
+            bin_counts = np.zeros(len(bins) - 1, dtype=np.int64)
+            total_scores = 0
+            for chunk in self.db.execute_chunks(query, tuple(filter_params), row_type='tuple'):
+                chunk_scores = np.fromiter((row[0] for row in chunk), dtype=float, count=len(chunk))
+                bin_counts += np.histogram(chunk_scores, bins=bins)[0]
+                total_scores += len(chunk)
 
-            print(f"[DEBUG] Score distribution data: {len(scores_data) if scores_data else 0} scores")
+            print(f"[DEBUG] Score distribution data: {total_scores} scores")
 
-            if not scores_data or len(scores_data) == 0:
+            if total_scores == 0:
                 print("[WARNING] No data for score distribution chart")
                 return
 
-            scores = [row['score'] for row in scores_data]
-
             # Create histogram showing COUNT of exams per score range
             fig, ax = plt.subplots(figsize=(10, 6))
 
-            # Create histogram with 10-point bins (0-10, 10-20, 20-30, etc.)
-            bins = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
-            ax.hist(scores, bins=bins, edgecolor='black', alpha=0.7, color='#38a169')
+            ax.hist(bins[:-1], bins=bins, weights=bin_counts, edgecolor='black', alpha=0.7, color='#38a169')
             ax.set_title(t('score_distribution'), fontsize=14, fontweight='bold')
             ax.set_xlabel(t('score') + ' (%)')
             ax.set_ylabel('Number of ' + t('exams'))
@@ -661,14 +642,13 @@ class Reports(ft.UserControl):
 
             plt.tight_layout()
 
-            # Convert to base64 image with higher DPI for sharper quality
+            # Render to PNG with higher DPI for sharper quality; served via the local asset server
             buffer = io.BytesIO()
             plt.savefig(buffer, format='png', dpi=120, bbox_inches='tight')
             buffer.seek(0)
-            image_data = base64.b64encode(buffer.getvalue()).decode()
             plt.close(fig)
 
-            self.chart_images['score_distribution'] = image_data
+            self._set_chart_image('score_distribution', buffer.getvalue())
             print("[SUCCESS] Score distribution chart generated")
 
         except Exception as e:
@@ -741,14 +721,13 @@ class Reports(ft.UserControl):
             plt.xticks(rotation=45)
             plt.tight_layout()
 
-            # Convert to base64 image
+            # Render to PNG; served via the local asset server
             buffer = io.BytesIO()
             plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
             buffer.seek(0)
-            image_data = base64.b64encode(buffer.getvalue()).decode()
             plt.close(fig)
 
-            self.chart_images['pass_fail_trend'] = image_data
+            self._set_chart_image('pass_fail_trend', buffer.getvalue())
             print("[SUCCESS] Pass/fail rate trend chart generated")
 
         except Exception as e:
@@ -815,14 +794,13 @@ class Reports(ft.UserControl):
 
             plt.tight_layout()
 
-            # Convert to base64 image with higher DPI for sharper quality
+            # Render to PNG with higher DPI for sharper quality; served via the local asset server
             buffer = io.BytesIO()
             plt.savefig(buffer, format='png', dpi=120, bbox_inches='tight')
             buffer.seek(0)
-            image_data = base64.b64encode(buffer.getvalue()).decode()
             plt.close(fig)
 
-            self.chart_images['question_difficulty'] = image_data
+            self._set_chart_image('question_difficulty', buffer.getvalue())
             print("[SUCCESS] Question difficulty chart generated")
 
         except Exception as e:
@@ -1261,8 +1239,6 @@ class Reports(ft.UserControl):
             from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
             from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib import colors as rl_colors
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
             import os
 
             # Get assignment status information (if this is an assignment)
@@ -1626,8 +1602,6 @@ class Reports(ft.UserControl):
             from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
             from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib import colors as rl_colors
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
             import os
 
             # Get student statistics
@@ -1993,8 +1967,6 @@ class Reports(ft.UserControl):
             from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib import colors as rl_colors
             from reportlab.lib.utils import ImageReader
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
             import os
 
             # Get exam session
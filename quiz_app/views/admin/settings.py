@@ -1,6 +1,7 @@
 import flet as ft
 import os
 from quiz_app.database.database import Database
+from quiz_app.database import profiler as query_profiling
 from quiz_app.utils.email_templates import EmailTemplateManager
 from quiz_app.utils.email_handler import EmailHandler
 from quiz_app.utils.localization import t, set_language, get_language_name
@@ -619,6 +620,104 @@ class Settings(ft.UserControl):
             elevation=2,
         )
 
+    def build_query_profiler_card(self):
+        """Build SQL query profiler card showing the slowest statements (admin only)"""
+        offenders_column = ft.Column(spacing=8)
+
+        def load_offenders(e=None):
+            offenders_column.controls.clear()
+            profiler = query_profiling.get_profiler()
+            offenders = profiler.top_offenders(limit=10) if profiler else []
+
+            if not offenders:
+                offenders_column.controls.append(
+                    ft.Text(t('no_profiled_queries'), size=13, color=COLORS['text_secondary'], italic=True)
+                )
+            for entry in offenders:
+                plan_text = "\n".join(entry['plan'])
+                offenders_column.controls.append(
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Row([
+                                ft.Text(entry['caller'], size=13, weight=ft.FontWeight.BOLD,
+                                        color=COLORS['text_primary'], expand=True),
+                                ft.Text(
+                                    f"{entry['count']}x  avg {entry['avg_ms']:.1f} ms  "
+                                    f"max {entry['max_ms']:.1f} ms  total {entry['total_ms']:.0f} ms",
+                                    size=12, color=COLORS['text_secondary']
+                                ),
+                            ]),
+                            ft.Text(entry['fingerprint'], size=12, color=COLORS['text_secondary'],
+                                    selectable=True, max_lines=3, overflow=ft.TextOverflow.ELLIPSIS),
+                            ft.Text(plan_text, size=11, color=COLORS['warning'], selectable=True)
+                            if plan_text else ft.Container(height=0),
+                        ], spacing=4),
+                        padding=10,
+                        border=ft.border.all(1, COLORS['border']),
+                        border_radius=8,
+                    )
+                )
+            if e is not None and self.page:
+                self.update()
+
+        def toggle_profiling(e):
+            if e.control.value:
+                query_profiling.enable_profiling()
+            else:
+                query_profiling.disable_profiling()
+            load_offenders(e)
+
+        def reset_stats(e):
+            profiler = query_profiling.get_profiler()
+            if profiler:
+                profiler.reset()
+            load_offenders(e)
+
+        profiling_switch = ft.Switch(
+            label=t('enable_query_profiling'),
+            value=query_profiling.is_profiling_enabled(),
+            on_change=toggle_profiling,
+        )
+
+        load_offenders()
+
+        from quiz_app.config import SLOW_QUERY_LOG_PATH
+
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(ft.icons.SPEED, color=COLORS['primary']),
+                        ft.Text(
+                            t('query_profiler'),
+                            size=18,
+                            weight=ft.FontWeight.BOLD,
+                            color=COLORS['text_primary']
+                        ),
+                    ], spacing=10),
+                    ft.Divider(height=1, color=COLORS['border']),
+                    ft.Text(t('query_profiler_description'), size=13, color=COLORS['text_secondary']),
+                    ft.Text(
+                        f"{t('slow_query_log')}: {SLOW_QUERY_LOG_PATH}",
+                        size=12,
+                        color=COLORS['text_secondary'],
+                        italic=True,
+                        selectable=True
+                    ),
+                    ft.Row([
+                        profiling_switch,
+                        ft.Container(expand=True),
+                        ft.TextButton(text=t('refresh'), icon=ft.icons.REFRESH, on_click=load_offenders),
+                        ft.TextButton(text=t('reset_statistics'), icon=ft.icons.DELETE_SWEEP, on_click=reset_stats),
+                    ], spacing=10),
+                    ft.Text(t('top_slow_queries'), size=14, weight=ft.FontWeight.BOLD, color=COLORS['text_primary']),
+                    offenders_column,
+                ], spacing=10),
+                padding=20,
+            ),
+            elevation=2,
+        )
+
     def build_org_structure_card(self):
         """Build organizational structure management card (admin only)"""
 
@@ -1338,6 +1437,11 @@ class Settings(ft.UserControl):
         if self.user_data.get('role') == 'admin':
             org_structure_card = self.build_org_structure_card()
 
+        # Query Profiler Card (only for admins)
+        query_profiler_card = None
+        if self.user_data.get('role') == 'admin':
+            query_profiler_card = self.build_query_profiler_card()
+
         # Change Password Card
         def show_change_password_dialog(e):
             """Show dialog to change admin password"""
@@ -1529,6 +1633,8 @@ class Settings(ft.UserControl):
                 ft.Container(height=20) if database_location_card else ft.Container(height=0),
                 database_location_card if database_location_card else ft.Container(height=0),
                 ft.Container(height=20) if org_structure_card else ft.Container(height=0),
-                org_structure_card if org_structure_card else ft.Container(height=0)
+                org_structure_card if org_structure_card else ft.Container(height=0),
+                ft.Container(height=20) if query_profiler_card else ft.Container(height=0),
+                query_profiler_card if query_profiler_card else ft.Container(height=0)
             ], scroll=ft.ScrollMode.AUTO, expand=True)
         ], expand=True)
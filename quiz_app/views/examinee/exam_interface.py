@@ -1,12 +1,19 @@
 import flet as ft
 import json
 import os
-import base64
-import threading
-import time
 from datetime import datetime, timedelta
 from quiz_app.database.database import Database
+from quiz_app.config import IMAGE_PREFETCH_RADIUS
+from quiz_app.utils.image_cache import QuestionImageCache
+from quiz_app.utils.asset_server import image_src
+from quiz_app.utils.answer_journal import AnswerFlushError, AnswerJournal, score_submission
+from quiz_app.utils.answer_key import AnswerKey
+from quiz_app.utils.exam_timer import ExamTimer
+from quiz_app.utils.exam_telemetry import ExamTelemetry
+from quiz_app.utils.exam_checkpoint import ExamCheckpoint, load_questions_in_order, load_saved_answers
+from quiz_app.utils.session_order import options_are_shuffled, shuffle_options
 from quiz_app.utils.localization import t
+from quiz_app.views.examinee.question_navigator import QuestionNavigator
 
 
 class ExamInterfaceWrapper(ft.UserControl):
@@ -51,6 +58,8 @@ class ExamInterfaceWrapper(ft.UserControl):
             # Mark exam as finished to prevent further timer updates
             self.exam_state['exam_finished'] = True
             self.exam_state['timer_running'] = False
+            if self.exam_state.get('exam_timer'):
+                self.exam_state['exam_timer'].stop()
 
             # Force restore window_prevent_close as primary failsafe
             if self.page and hasattr(self.page, 'window_prevent_close'):
@@ -152,19 +161,42 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
     # Initialize data
     db = Database()
 
-    # Generate session ID first
-    session_id = int(datetime.now().timestamp())
-
     # Determine the actual exam_id for fetching questions
     # If exam_id is provided separately (new assignment-based approach), use it
     # Otherwise fall back to exam_data['id'] (old exam-based approach)
     actual_exam_id = exam_id if exam_id is not None else exam_data.get('id')
 
-    # Use question selector to get questions (handles both regular and multi-template exams)
-    from quiz_app.utils.question_selector import select_questions_for_exam_session
-    # Pass a modified exam_data dict with the correct exam_id for question fetching
-    exam_data_for_questions = {**exam_data, 'id': actual_exam_id}
-    questions = select_questions_for_exam_session(exam_data_for_questions, session_id, assignment_id)
+    # Resume an attempt interrupted by a crash: same session, question order and remaining time
+    checkpoint = ExamCheckpoint(user_data['id'], actual_exam_id, assignment_id)
+    resumed = checkpoint.load()
+    if resumed and db.execute_single("SELECT id FROM exam_sessions WHERE id = ?", (resumed['session_id'],)):
+        # Already submitted - the checkpoint outlived its exam
+        checkpoint.discard()
+        checkpoint = ExamCheckpoint(user_data['id'], actual_exam_id, assignment_id)
+        resumed = None
+
+    questions = []
+    if resumed:
+        session_id = resumed['session_id']
+        selection_seed = resumed['selection_seed']
+        pool_version = resumed['pool_version']
+        questions = load_questions_in_order(db, resumed['question_ids'])
+        print(f"[RESUME] Resuming session {session_id} at question {resumed['current_question_index'] + 1}")
+
+    if not questions:
+        resumed = None
+
+        # Generate session ID first
+        session_id = int(datetime.now().timestamp())
+
+        # Use question selector to get questions (handles both regular and multi-template exams)
+        from quiz_app.utils.question_selector import select_questions_for_exam_session
+        # Pass a modified exam_data dict with the correct exam_id for question fetching
+        exam_data_for_questions = {**exam_data, 'id': actual_exam_id}
+        # The seed fixes question and option order so they can be rebuilt for review
+        questions, selection_seed, pool_version = select_questions_for_exam_session(
+            exam_data_for_questions, session_id, assignment_id, user_id=user_data['id']
+        )
 
     if not questions:
         return ft.Container(
@@ -172,6 +204,23 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             padding=ft.padding.all(50)
         )
     
+    # Encoded question images for this session, warmed around the current question
+    image_cache = QuestionImageCache(db)
+
+    # Answers are journaled locally and written to user_answers in the background
+    answer_journal = AnswerJournal(session_id, db)
+
+    # All options and correct answers loaded once; grading never queries the database
+    answer_key = AnswerKey.load(db, [q['id'] for q in questions])
+
+    # Dwell time per question (always) and interaction events (when the exam asks for logging)
+    telemetry = ExamTelemetry(
+        session_id,
+        db,
+        persist_events=bool(exam_data.get('enable_logging') or exam_data.get('enable_pattern_analysis')),
+        time_spent={int(qid): spent for qid, spent in resumed['question_time_spent'].items()} if resumed else None
+    )
+
     exam_state = {
         'current_question_index': 0,
         'user_answers': {},
@@ -182,13 +231,10 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
         'timer_display': None,
         'main_container': None,
         'session_id': session_id,  # Use the session ID generated for question selection
-        'question_start_times': {},  # Track when each question was first viewed
-        'question_time_spent': {},  # Track cumulative time spent on each question
         'enable_fullscreen_lock': exam_data.get('enable_fullscreen', False),  # Fullscreen lock feature
         'fullscreen_lock_active': False,  # Is fullscreen currently locked?
         'page_ref': page,  # Reference to page for fullscreen/close handling
-        'randomize_questions': exam_data.get('randomize_questions', False),  # Randomize answer options
-        'shuffled_options_cache': {},  # Cache shuffled options for consistency during exam
+        'shuffled_options_cache': {},  # Option order per question, derived from selection_seed
         'original_window_event': None,
         'original_window_prevent_close': None,
         'original_keyboard_handler': None,
@@ -198,8 +244,30 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
         'keyboard_hooked': False,
         'window_event_hooked': False,
         'beforeunload_registered': False,
-        'navigator_scroll_offset': 0  # Track navigation sidebar scroll position
+        'main_column': None,  # Page layout, built once by create_main_content()
+        'navigator': None  # QuestionNavigator (sidebar progress and question palette)
     }
+
+    if resumed:
+        exam_state['current_question_index'] = min(resumed['current_question_index'], len(questions) - 1)
+        exam_state['time_remaining'] = resumed['time_remaining']
+        exam_state['start_time'] = datetime.fromisoformat(resumed['start_time'])
+        exam_state['marked_for_review'] = set(resumed['marked_for_review'])
+        exam_state['user_answers'] = load_saved_answers(db, session_id, answer_journal)
+
+    def checkpoint_snapshot():
+        """Session state needed to resume this attempt"""
+        return {
+            'session_id': session_id,
+            'question_ids': [q['id'] for q in questions],
+            'current_question_index': exam_state['current_question_index'],
+            'time_remaining': exam_timer.remaining(),
+            'start_time': exam_state['start_time'].isoformat(),
+            'marked_for_review': list(exam_state['marked_for_review']),
+            'question_time_spent': telemetry.time_spent_by_question(),
+            'selection_seed': selection_seed,
+            'pool_version': pool_version,
+        }
     
     def cleanup_page_handlers():
         """Restore original page event handlers and allow closing the window."""
@@ -259,6 +327,11 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
 
             exam_state['handlers_restored'] = True
             exam_state['exam_finished'] = True
+            print(f"[IMAGE] Cache stats: {image_cache.stats()}")
+            image_cache.close()
+            if not answer_journal.close():
+                print("[JOURNAL] Some answers could not be written; they will be replayed on next start")
+            telemetry.flush()
             print("[CLEANUP] Cleanup process finished.")
 
     def return_to_dashboard():
@@ -327,9 +400,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             if exam_state['current_question_index'] < len(questions) - 1:
                 save_current_answer()
                 exam_state['current_question_index'] += 1
-                exam_state['main_container'].content = create_main_content()
-                if exam_state['main_container'].page:
-                    exam_state['main_container'].page.update()
+                refresh_exam_view()
                 print(f"[KEYBOARD] Navigated to question {exam_state['current_question_index'] + 1}")
 
         elif e.key == "Arrow Left" or e.key == "ArrowLeft":
@@ -337,9 +408,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             if exam_state['current_question_index'] > 0:
                 save_current_answer()
                 exam_state['current_question_index'] -= 1
-                exam_state['main_container'].content = create_main_content()
-                if exam_state['main_container'].page:
-                    exam_state['main_container'].page.update()
+                refresh_exam_view()
                 print(f"[KEYBOARD] Navigated to question {exam_state['current_question_index'] + 1}")
 
         elif e.key == "m" or e.key == "M":
@@ -352,9 +421,8 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             else:
                 exam_state['marked_for_review'].add(question_id)
                 print(f"[KEYBOARD] Marked question {question_id}")
-            exam_state['main_container'].content = create_main_content()
-            if exam_state['main_container'].page:
-                exam_state['main_container'].page.update()
+            telemetry.review_marked(question_id, question_id in exam_state['marked_for_review'])
+            refresh_exam_view()
 
     def register_beforeunload_handler():
         """Register browser beforeunload handler to warn users when closing tab."""
@@ -502,71 +570,47 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
         if question_id in exam_state['shuffled_options_cache']:
             return exam_state['shuffled_options_cache'][question_id]
 
-        # Get options from database
-        options = db.execute_query("""
-            SELECT * FROM question_options
-            WHERE question_id = ?
-            ORDER BY order_index, id
-        """, (question_id,))
-
-        # Shuffle options if randomization is enabled
-        if exam_state['randomize_questions'] and options:
-            # Check question type - don't shuffle true/false questions
-            current_question = next((q for q in questions if q['id'] == question_id), None)
-            if current_question and current_question['question_type'] != 'true_false':
-                # Shuffle the options list
-                import random
-                options = list(options)  # Convert to list if needed
-                random.shuffle(options)
+        # Get options from the answer key loaded at exam start
+        options = answer_key.options(question_id)
+
+        # Shuffle options if randomization is enabled (true/false questions keep their order)
+        current_question = next((q for q in questions if q['id'] == question_id), None)
+        if options and current_question and options_are_shuffled(exam_data, current_question):
+            # Same order on resume and in the result review
+            options = shuffle_options(options, selection_seed, question_id)
 
         # Cache the shuffled (or original) options for consistency
         exam_state['shuffled_options_cache'][question_id] = options
         return options
 
-    def track_question_time(question_id):
-        """Track time spent on current question before leaving it - DISABLED"""
-        pass  # Disabled to fix page update issues
-        # try:
-        #     current_time = datetime.now()
-        #     if question_id in exam_state['question_start_times']:
-        #         start_time = exam_state['question_start_times'][question_id]
-        #         time_spent = (current_time - start_time).total_seconds()
-        #         if question_id in exam_state['question_time_spent']:
-        #             exam_state['question_time_spent'][question_id] += time_spent
-        #         else:
-        #             exam_state['question_time_spent'][question_id] = time_spent
-        # except Exception as e:
-        #     print(f"Error tracking question time: {e}")
-
-    def start_question_timer(question_id):
-        """Start timing for a new question - DISABLED"""
-        pass  # Disabled to fix page update issues
-        # try:
-        #     exam_state['question_start_times'][question_id] = datetime.now()
-        # except Exception as e:
-        #     print(f"Error starting question timer: {e}")
-    
-    def render_question_image(question_id):
-        """Render question image if present - loads from encrypted database"""
-        if not question_id:
-            return ft.Container()
+    def prefetch_neighbour_images():
+        """Warm the image cache for the questions around the current one"""
+        index = exam_state['current_question_index']
+        neighbours = questions[max(0, index - IMAGE_PREFETCH_RADIUS):index + IMAGE_PREFETCH_RADIUS + 1]
+        image_cache.prefetch(
+            q['id'] for q in neighbours
+            if q.get('has_image', True) and q['id'] != questions[index]['id']
+        )
 
-        # Load image from encrypted database
-        db = Database()
-        image_data_dict = db.get_question_image(question_id)
+    def render_question_image(question):
+        """Render question image if present - loads only this question's image from the encrypted database"""
+        question_id = question.get('id')
+        prefetch_neighbour_images()
 
-        if not image_data_dict:
+        # Question rows carry a has_image flag instead of the BLOB; skip the lookup when there is none
+        if not question_id or not question.get('has_image', True):
             return ft.Container()
 
-        print(f"[IMAGE] Loading encrypted image from database for question {question_id}")
+        # Served from the session cache; a miss loads it from the encrypted database and publishes it to the asset server
+        image_source = image_cache.get(question_id)
 
-        # Convert binary data to base64 for display
-        image_base64 = base64.b64encode(image_data_dict['data']).decode('utf-8')
+        if not image_source:
+            return ft.Container()
 
         return ft.Container(
             content=ft.Column([
                 ft.Image(
-                    src_base64=image_base64,
+                    **image_source,
                     width=600,
                     height=300,
                     fit=ft.ImageFit.CONTAIN,
@@ -585,12 +629,17 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             bgcolor=ft.colors.with_opacity(0.02, EXAM_COLORS['primary']),
             border_radius=8,
             border=ft.border.all(1, ft.colors.with_opacity(0.1, EXAM_COLORS['border'])),
-            on_click=lambda e, img=image_base64: show_image_fullscreen(img)
+            on_click=lambda e, qid=question_id: show_image_fullscreen(qid)
         )
     
-    def show_image_fullscreen(image_base64):
-        """Show image in fullscreen dialog"""
+    def show_image_fullscreen(question_id):
+        """Show the original-resolution image in fullscreen dialog"""
         try:
+            image_data_dict = db.get_question_image(question_id)
+            if not image_data_dict:
+                return
+            image_source = image_src(image_data_dict['data'], image_data_dict['mime_type'])
+
             # Access page through main_container
             page = None
             if exam_state['main_container'] and hasattr(exam_state['main_container'], 'page'):
@@ -606,7 +655,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     title=ft.Text(t('question_image'), size=18, weight=ft.FontWeight.BOLD),
                     content=ft.Container(
                         content=ft.Image(
-                            src_base64=image_base64,
+                            **image_source,
                             width=800,
                             height=600,
                             fit=ft.ImageFit.CONTAIN,
@@ -633,39 +682,12 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
         except Exception as e:
             print(f"Error showing fullscreen image: {e}")
     
-    def get_user_answer_from_db(session_id, question_id):
-        """Get user answer from database for scoring"""
-        try:
-            user_answer_data = db.execute_single("""
-                SELECT * FROM user_answers 
-                WHERE session_id = ? AND question_id = ?
-                ORDER BY answered_at DESC
-                LIMIT 1
-            """, (session_id, question_id))
-            
-            if not user_answer_data:
-                return None
-                
-            # Return answer data in the same format as exam_state['user_answers']
-            if user_answer_data.get('selected_option_id'):
-                return {'selected_option_id': user_answer_data['selected_option_id']}
-            elif user_answer_data.get('selected_option_ids'):
-                return {'selected_option_ids': user_answer_data['selected_option_ids']}
-            elif user_answer_data.get('answer_text'):
-                return {'answer_text': user_answer_data['answer_text']}
-            else:
-                return None
-        except Exception as e:
-            print(f"Error retrieving answer for question {question_id}: {e}")
-            return None
-    
     def save_answer(question_id, answer_data):
-        """Save answer to database"""
+        """Save answer to the write-behind journal (flushed to the database in the background)"""
         try:
-            session_id = exam_state['session_id']  # Use consistent session ID
-
             # Get time spent on this question
-            time_spent = int(exam_state['question_time_spent'].get(question_id, 0))
+            time_spent = int(telemetry.time_spent(question_id))
+            telemetry.answer_changed(question_id, answer_data)
 
             # Get question type to determine scoring approach
             question = next((q for q in questions if q['id'] == question_id), None)
@@ -678,22 +700,14 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 # Auto-grade the single choice question
                 points_earned = 0.0
                 is_correct = 0
-                if selected_option_id:
-                    # Check if the selected option is correct
-                    correct_option = db.execute_query("""
-                        SELECT is_correct FROM question_options
-                        WHERE id = ? AND question_id = ?
-                    """, (selected_option_id, question_id))
-
-                    if correct_option and correct_option[0]['is_correct']:
-                        points_earned = question.get('points', 1.0)
-                        is_correct = 1
-
-                db.execute_update("""
-                    INSERT OR REPLACE INTO user_answers (
-                        session_id, question_id, selected_option_id, points_earned, is_correct, time_spent_seconds, answered_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (session_id, question_id, selected_option_id, points_earned, is_correct, time_spent, datetime.now().isoformat()))
+                if selected_option_id and answer_key.is_correct_option(question_id, selected_option_id):
+                    points_earned = question.get('points', 1.0)
+                    is_correct = 1
+
+                answer_journal.record_answer(
+                    question_id, selected_option_id=selected_option_id, points_earned=points_earned,
+                    is_correct=is_correct, time_spent_seconds=time_spent, answered_at=datetime.now().isoformat()
+                )
             elif 'selected_option_ids' in answer_data:
                 # Multiple choice question - auto-grade immediately
                 selected_ids_json = json.dumps(answer_data['selected_option_ids']) if answer_data['selected_option_ids'] else None
@@ -701,26 +715,15 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 # Auto-grade the multiple choice question
                 points_earned = 0.0
                 is_correct = 0
-                if answer_data['selected_option_ids']:
-                    # Get correct options for this question
-                    correct_options = db.execute_query("""
-                        SELECT id FROM question_options 
-                        WHERE question_id = ? AND is_correct = 1
-                    """, (question_id,))
-                    
-                    correct_ids = [opt['id'] for opt in correct_options]
-                    selected_ids = answer_data['selected_option_ids']
-                    
-                    # Check if selected options match exactly with correct options
-                    if set(selected_ids) == set(correct_ids) and len(selected_ids) > 0:
-                        points_earned = question.get('points', 1.0)
-                        is_correct = 1
+                # Selected options must match the correct options exactly
+                if answer_key.is_correct_selection(question_id, answer_data['selected_option_ids'] or []):
+                    points_earned = question.get('points', 1.0)
+                    is_correct = 1
                 
-                db.execute_update("""
-                    INSERT OR REPLACE INTO user_answers (
-                        session_id, question_id, selected_option_ids, points_earned, is_correct, time_spent_seconds, answered_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (session_id, question_id, selected_ids_json, points_earned, is_correct, time_spent, datetime.now().isoformat()))
+                answer_journal.record_answer(
+                    question_id, selected_option_ids=selected_ids_json, points_earned=points_earned,
+                    is_correct=is_correct, time_spent_seconds=time_spent, answered_at=datetime.now().isoformat()
+                )
             elif 'answer_text' in answer_data:
                 # Text-based questions - explicitly set points_earned based on question type
                 if question_type in ['essay', 'short_answer']:
@@ -728,10 +731,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     trimmed_answer = (answer_data['answer_text'] or '').strip()
                     if not trimmed_answer:
                         # DELETE the old answer from database if user cleared the text
-                        db.execute_update("""
-                            DELETE FROM user_answers
-                            WHERE session_id = ? AND question_id = ?
-                        """, (session_id, question_id))
+                        answer_journal.record_delete(question_id)
 
                         # Remove from exam_state if it exists
                         if question_id in exam_state['user_answers']:
@@ -741,11 +741,10 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                         return
 
                     # Essay/short_answer questions need manual grading - set points_earned to NULL
-                    db.execute_update("""
-                        INSERT OR REPLACE INTO user_answers (
-                            session_id, question_id, answer_text, points_earned, time_spent_seconds, answered_at
-                        ) VALUES (?, ?, ?, NULL, ?, ?)
-                    """, (session_id, question_id, trimmed_answer, time_spent, datetime.now().isoformat()))
+                    answer_journal.record_answer(
+                        question_id, answer_text=trimmed_answer, points_earned=None,
+                        time_spent_seconds=time_spent, answered_at=datetime.now().isoformat()
+                    )
                 else:
                     # True/false questions - auto-grade immediately
                     answer_text = answer_data['answer_text']
@@ -754,21 +753,14 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     points_earned = 0.0
                     is_correct = 0
                     if answer_text and answer_text.lower() in ['true', 'false']:
-                        # Get the correct answer for this question
-                        correct_option = db.execute_query("""
-                            SELECT option_text FROM question_options
-                            WHERE question_id = ? AND is_correct = 1
-                        """, (question_id,))
-
-                        if correct_option and correct_option[0]['option_text'].lower() == answer_text.lower():
+                        if answer_key.is_correct_text(question_id, answer_text):
                             points_earned = question.get('points', 1.0)
                             is_correct = 1
 
-                    db.execute_update("""
-                        INSERT OR REPLACE INTO user_answers (
-                            session_id, question_id, answer_text, points_earned, is_correct, time_spent_seconds, answered_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (session_id, question_id, answer_text, points_earned, is_correct, time_spent, datetime.now().isoformat()))
+                    answer_journal.record_answer(
+                        question_id, answer_text=answer_text, points_earned=points_earned,
+                        is_correct=is_correct, time_spent_seconds=time_spent, answered_at=datetime.now().isoformat()
+                    )
             
             exam_state['user_answers'][question_id] = answer_data
             print(f"Answer saved for question {question_id} ({question_type}): {answer_data}")
@@ -791,82 +783,84 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             answer_data = exam_state['user_answers'][question_id]
             save_answer(question_id, answer_data)
             print(f"Saved answer on navigation for question {question_id}")
+
+        # Push queued answers to the database without blocking navigation
+        answer_journal.request_flush()
     
-    def update_timer():
-        """Update timer countdown with proper cleanup"""
-        try:
-            while exam_state['timer_running'] and exam_state['time_remaining'] > 0:
-                time.sleep(1)
-
-                # Check if timer is still running
-                if not exam_state['timer_running']:
-                    break
-
-                exam_state['time_remaining'] -= 1
-
-                # Update timer display
-                if exam_state['timer_display']:
-                    minutes = exam_state['time_remaining'] // 60
-                    seconds = exam_state['time_remaining'] % 60
-                    exam_state['timer_display'].value = f"{minutes:02d}:{seconds:02d}"
-
-                    # Update page - try multiple methods to get page reference
-                    try:
-                        page = None
-                        # Try to get page from main_container
-                        if exam_state['main_container'] and hasattr(exam_state['main_container'], 'page'):
-                            page = exam_state['main_container'].page
-
-                        if page:
-                            page.update()
-                    except Exception as e:
-                        # Page closed or unavailable - stop timer gracefully
-                        print(f"[TIMER] Page unavailable, stopping timer: {e}")
-                        exam_state['timer_running'] = False
-                        break
-
-                # Time warnings
-                if exam_state['time_remaining'] == 600:  # 10 minutes
-                    print("Warning: 10 minutes remaining!")
-                elif exam_state['time_remaining'] == 300:  # 5 minutes
-                    print("Warning: 5 minutes remaining!")
-                elif exam_state['time_remaining'] == 60:  # 1 minute
-                    print("Warning: 1 minute remaining!")
-
-            # This runs when time_remaining reaches 0 OR timer is manually stopped
-            if exam_state['time_remaining'] <= 0 and exam_state['timer_running']:
-                print("⏰ Time's up! Auto-submitting exam...")
-                exam_state['timer_running'] = False
-
-                page_ref = exam_state.get('page_ref')
-                submit_callback = exam_state.get('submit_exam_final')
-
-                if page_ref and callable(submit_callback) and hasattr(page_ref, 'overlay'):
-                    # Use a trigger control to safely marshal the call to the main UI thread
-                    print("[TIMER] Scheduling exam submission on main thread.")
-                    submit_trigger = SubmitTrigger(submit_callback, page_ref)
-                    page_ref.overlay.append(submit_trigger)
-                    page_ref.update()
-                elif callable(submit_callback):
-                    # Fallback if page_ref is not available for some reason
-                    print("[TIMER] WARNING: Page reference not found, calling submit directly (may be unsafe)")
-                    submit_callback()
-                else:
-                    print("[TIMER] ERROR: submit_exam_final function not found in exam_state")
-        except Exception as e:
-            print(f"[TIMER] Timer thread error: {e}")
-        finally:
-            exam_state['timer_running'] = False
-            print("[TIMER] Timer thread stopped cleanly")
-    
-    # Start timer thread
-    timer_thread = threading.Thread(target=update_timer, daemon=True)
-    timer_thread.start()
+    def format_time_remaining(seconds):
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+    def on_timer_tick(remaining):
+        """Redraw only the countdown text (runs on the timer thread)"""
+        previous = exam_state['time_remaining']
+        exam_state['time_remaining'] = remaining
+        if not exam_state['timer_running']:
+            exam_timer.stop()
+            return
+
+        timer_display = exam_state['timer_display']
+        if timer_display is not None:
+            timer_display.value = format_time_remaining(remaining)
+            # Not on the page yet (or being rebuilt) - the next build shows the current value
+            if timer_display.page:
+                try:
+                    timer_display.update()
+                except Exception as e:
+                    # Page closed or unavailable - stop timer gracefully
+                    print(f"[TIMER] Page unavailable, stopping timer: {e}")
+                    exam_state['timer_running'] = False
+                    exam_timer.stop()
+                    return
+
+        # Checkpoint every few seconds, or at the next tick after navigation/answers
+        checkpoint.save_if_due(checkpoint_snapshot)
+        telemetry.flush_if_due()
+
+        # Time warnings (ticks can skip seconds, so check for crossing the threshold)
+        for threshold, label in ((600, "10 minutes"), (300, "5 minutes"), (60, "1 minute")):
+            if remaining <= threshold < previous:
+                print(f"Warning: {label} remaining!")
+
+    def on_timer_expired():
+        """Auto-submit when the deadline passes"""
+        if not exam_state['timer_running']:
+            return
+        print("⏰ Time's up! Auto-submitting exam...")
+        exam_state['timer_running'] = False
+
+        page_ref = exam_state.get('page_ref')
+        submit_callback = exam_state.get('submit_exam_final')
+
+        if page_ref and callable(submit_callback) and hasattr(page_ref, 'overlay'):
+            # Use a trigger control to safely marshal the call to the main UI thread
+            print("[TIMER] Scheduling exam submission on main thread.")
+            submit_trigger = SubmitTrigger(submit_callback, page_ref)
+            page_ref.overlay.append(submit_trigger)
+            page_ref.update()
+        elif callable(submit_callback):
+            # Fallback if page_ref is not available for some reason
+            print("[TIMER] WARNING: Page reference not found, calling submit directly (may be unsafe)")
+            submit_callback()
+        else:
+            print("[TIMER] ERROR: submit_exam_final function not found in exam_state")
+
+    # Countdown against a monotonic deadline, so delayed ticks never lose time
+    exam_timer = ExamTimer(exam_state['time_remaining'], on_timer_tick, on_timer_expired)
+    exam_state['exam_timer'] = exam_timer
+    exam_timer.start()
+
+    # First checkpoint right away, so even an early crash resumes the same question selection
+    checkpoint.save(checkpoint_snapshot())
 
     # === Fullscreen Lock (Anti-Cheating) ===
 
     def on_fullscreen_change(e):
         """Detect and prevent fullscreen exit during exam"""
+        # Every window event reaches this handler (directly or via handle_window_event)
+        if e.data in ('focus', 'blur'):
+            exam_timer.set_focused(e.data == 'focus')
+            telemetry.focus_changed(e.data == 'focus')
+
         if not exam_state['enable_fullscreen_lock'] or not exam_state['fullscreen_lock_active']:
             return  # Feature not enabled or lock not active
 
@@ -929,7 +923,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
         )
         
         # Question image (if present) - loaded from encrypted database
-        question_image = render_question_image(current_question.get('id'))
+        question_image = render_question_image(current_question)
         
         # Answer section based on question type
         if current_question['question_type'] == 'single_choice':
@@ -942,8 +936,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 print("[UI] Answer selected, updating UI...")
                 try:
                     if exam_state['main_container'] and exam_state['main_container'].page:
-                        exam_state['main_container'].content = create_main_content()
-                        exam_state['main_container'].page.update()
+                        refresh_exam_view()
                         print("[UI] UI updated successfully")
                     else:
                         print("[UI] WARNING: No page reference available")
@@ -971,8 +964,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             def on_tf_change(e):
                 save_answer(current_question['id'], {'answer_text': e.control.value})
                 # Update UI immediately to reflect answer selection
-                exam_state['main_container'].content = create_main_content()
-                exam_state['main_container'].page.update()
+                refresh_exam_view()
             
             answer_section = ft.RadioGroup(
                 value=selected_answer,
@@ -1068,8 +1060,7 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 print("[UI] Checkbox answer selected, updating UI...")
                 try:
                     if exam_state['main_container'] and exam_state['main_container'].page:
-                        exam_state['main_container'].content = create_main_content()
-                        exam_state['main_container'].page.update()
+                        refresh_exam_view()
                         print("[UI] UI updated successfully")
                     else:
                         print("[UI] WARNING: No page reference available")
@@ -1102,10 +1093,10 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 exam_state['marked_for_review'].add(question_id)
             else:
                 exam_state['marked_for_review'].discard(question_id)
+            telemetry.review_marked(question_id, bool(e.control.value))
 
             # Update UI immediately to reflect mark change
-            exam_state['main_container'].content = create_main_content()
-            exam_state['main_container'].page.update()
+            refresh_exam_view()
         
         mark_review_checkbox = ft.Checkbox(
             label=t('mark_for_review'),
@@ -1123,12 +1114,53 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             mark_review_checkbox
         ], spacing=0)
     
+    def load_question_topics():
+        """Map question id -> exam template title, used to group the navigator"""
+        if assignment_id:
+            # Multi-template assignment - one query for all template titles
+            template_titles = {
+                exam['id']: exam['title'] for exam in db.execute_query("""
+                    SELECT DISTINCT e.id, e.title
+                    FROM assignment_exam_templates aet
+                    JOIN exams e ON aet.exam_id = e.id
+                    WHERE aet.assignment_id = ?
+                """, (assignment_id,))
+            }
+            return {q['id']: template_titles[q['exam_id']] for q in questions if q.get('exam_id') in template_titles}
+
+        # Single template - use exam title from exam_data
+        exam_title = exam_data.get('title', 'Exam')
+        return {q['id']: exam_title for q in questions}
+
+    def refresh_exam_view():
+        """
+        Show the current question after navigation, an answer or a review mark.
+
+        Only the question pane is rebuilt; the sidebar navigator restyles just
+        the buttons and counters that changed.
+
+        Returns:
+            bool: True if the page was updated
+        """
+        create_main_content()
+        telemetry.question_shown(questions[exam_state['current_question_index']]['id'])
+        checkpoint.request_save()
+        changed = exam_state['navigator'].show(
+            exam_state['current_question_index'],
+            exam_state['user_answers'],
+            exam_state['marked_for_review']
+        )
+        page_ref = exam_state['main_container'].page if exam_state['main_container'] else None
+        if not page_ref:
+            return False
+        page_ref.update(exam_state['main_content_container'], *changed)
+        return True
+
     def create_main_content():
-        """Create main exam content"""
+        """Create main exam content (the full layout once, then only the question pane)"""
         # Progress header
         current_q = exam_state['current_question_index'] + 1
         total_q = len(questions)
-        answered_count = len(exam_state['user_answers'])
         
         # Get current question points for display
         current_question = questions[exam_state['current_question_index']] if questions else None
@@ -1149,44 +1181,23 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 # Save current answer before navigation
                 save_current_answer()
                 exam_state['current_question_index'] -= 1
-                exam_state['main_container'].content = create_main_content()
-
-                # Update page
-                if exam_state['main_container'] and hasattr(exam_state['main_container'], 'page') and exam_state['main_container'].page:
-                    exam_state['main_container'].page.update()
+                refresh_exam_view()
 
         def go_next(e):
             if exam_state['current_question_index'] < len(questions) - 1:
                 # Save current answer before navigation
                 save_current_answer()
                 exam_state['current_question_index'] += 1
-                exam_state['main_container'].content = create_main_content()
-
-                # Update page
-                if exam_state['main_container'] and hasattr(exam_state['main_container'], 'page') and exam_state['main_container'].page:
-                    exam_state['main_container'].page.update()
+                refresh_exam_view()
         
         def navigate_to_question(index):
             if 0 <= index < len(questions):
-                # Track time on current question before leaving
-                current_q = questions[exam_state['current_question_index']]
-                track_question_time(current_q['id'])
-
                 # Save current answer before navigation
                 save_current_answer()
                 exam_state['current_question_index'] = index
 
-                # Start timer for new question
-                new_q = questions[index]
-                start_question_timer(new_q['id'])
-
                 # Update UI with new question content
-                exam_state['main_container'].content = create_main_content()
-
-                # Update page
-                if exam_state['main_container'] and hasattr(exam_state['main_container'], 'page') and exam_state['main_container'].page:
-                    exam_state['main_container'].page.update()
-                else:
+                if not refresh_exam_view():
                     print("[NAV] Warning: No page reference available for navigation update")
         
         def submit_exam(e):
@@ -1333,17 +1344,35 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     return
 
                 exam_state['exam_finished'] = True  # Mark as finished immediately
-                cleanup_page_handlers()
-
-                # Track time for current question before submission
-                if questions and exam_state['current_question_index'] < len(questions):
-                    current_q = questions[exam_state['current_question_index']]
-                    track_question_time(current_q['id'])
 
                 # Save current answer before final submission
                 save_current_answer()
 
+                # Get the consistent session_id for database operations
+                session_id = exam_state['session_id']
+
+                # Scoring reads user_answers: every answer still queued in the local journal
+                # must reach the database first, otherwise the stored score would miss it
+                print(f"Starting score calculation for session {session_id} with {len(questions)} questions")
+                try:
+                    score = score_submission(db, answer_journal, [q['id'] for q in questions])
+                except AnswerFlushError as flush_error:
+                    print(f"[SUBMIT] Submission refused: {flush_error}")
+                    exam_state['exam_finished'] = False
+                    show_submit_failed()
+                    return
+
+                # Stop timing the current question; cleanup writes the remaining events
+                telemetry.finish()
+                cleanup_page_handlers()
+
+                try:
+                    telemetry.write_time_spent()
+                except Exception as telemetry_ex:
+                    print(f"[TELEMETRY] Could not store time spent per question: {telemetry_ex}")
+
                 exam_state['timer_running'] = False  # Stop timer
+                exam_timer.stop()
                 
                 # Calculate exam duration
                 exam_duration = datetime.now() - exam_state['start_time']
@@ -1352,95 +1381,12 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 # Calculate exam results
                 total_questions = len(questions)
                 
-                # Get the consistent session_id for database operations
-                session_id = exam_state['session_id']
-                
-                # Count answered questions and calculate weighted scores
-                answered_questions = 0
-                correct_answers = 0
-                total_points = 0
-                earned_points = 0
-                
-                # CRITICAL FIX: Calculate total points for ALL questions first
-                for question in questions:
-                    question_points = question.get('points', 1.0)
-                    total_points += question_points  # Always add to total, regardless of answer
-                
-                # Calculate score based on correct answers from database
-                print(f"Starting score calculation for session {session_id} with {total_questions} questions")
-                print(f"Total possible points: {total_points}")
-                
-                for question in questions:
-                    question_id = question['id']
-                    question_points = question.get('points', 1.0)  # Get question points
-                    
-                    # Get the latest answer from database instead of in-memory data
-                    user_answer = get_user_answer_from_db(session_id, question_id)
-                    if user_answer:
-                        answered_questions += 1  # Count this as answered
-                        print(f"Question {question_id} ({question['question_type']}) [{question_points}pts]: {user_answer}")
-                        
-                        # Check if answer is correct based on question type
-                        if question['question_type'] in ['single_choice']:
-                            # For single choice, check if selected option is correct
-                            if 'selected_option_id' in user_answer:
-                                correct_option = db.execute_single("""
-                                    SELECT * FROM question_options 
-                                    WHERE question_id = ? AND is_correct = 1
-                                """, (question_id,))
-                                
-                                if correct_option and user_answer['selected_option_id'] == correct_option['id']:
-                                    correct_answers += 1
-                                    earned_points += question_points
-                                    
-                        elif question['question_type'] == 'multiple_choice':
-                            # For multiple choice, check if all selected options are correct
-                            if 'selected_option_ids' in user_answer and user_answer['selected_option_ids']:
-                                # Handle both string (from database) and list (from UI) formats
-                                if isinstance(user_answer['selected_option_ids'], str):
-                                    selected_ids = json.loads(user_answer['selected_option_ids'])
-                                else:
-                                    selected_ids = user_answer['selected_option_ids']
-                                correct_options = db.execute_query("""
-                                    SELECT id FROM question_options 
-                                    WHERE question_id = ? AND is_correct = 1
-                                """, (question_id,))
-                                
-                                correct_ids = [opt['id'] for opt in correct_options]
-                                
-                                # Check if selected options match exactly with correct options
-                                if set(selected_ids) == set(correct_ids) and len(selected_ids) > 0:
-                                    correct_answers += 1
-                                    earned_points += question_points
-                                    
-                        elif question['question_type'] == 'true_false':
-                            # For true/false, check against correct_answer field
-                            if 'answer_text' in user_answer:
-                                correct_answer = question['correct_answer']
-                                if correct_answer and user_answer['answer_text'].lower() == correct_answer.lower():
-                                    correct_answers += 1
-                                    earned_points += question_points
-                                    
-                        # For essay/short_answer questions, use instructor-awarded points if available
-                        elif question['question_type'] in ['short_answer', 'essay']:
-                            if 'answer_text' in user_answer and user_answer['answer_text'].strip():
-                                # Get the latest points from database (instructor might have graded)
-                                db_answer = db.execute_single("""
-                                    SELECT points_earned, is_correct 
-                                    FROM user_answers 
-                                    WHERE session_id = ? AND question_id = ?
-                                    ORDER BY answered_at DESC LIMIT 1
-                                """, (session_id, question_id))
-                                
-                                if db_answer and db_answer['points_earned'] is not None:
-                                    # Instructor has graded this question - only add to earned points
-                                    earned_points += db_answer['points_earned']
-                                    if db_answer['is_correct']:
-                                        correct_answers += 1
-                                # If not graded yet (points_earned is NULL), don't count in score calculation
-                
-                # Calculate percentage score based on weighted points
-                score_percentage = (earned_points / total_points * 100) if total_points > 0 else 0
+                # Scored above from user_answers with one aggregate query (same engine as grading recalculation)
+                answered_questions = score['answered_questions']
+                correct_answers = score['correct_answers']
+                total_points = score['total_points']
+                earned_points = score['earned_points']
+                score_percentage = score['score_percentage']
                 
                 print(f"📊 EXAM SUBMISSION SCORING SUMMARY:")
                 print(f"   Total questions in exam: {total_questions}")
@@ -1454,8 +1400,9 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     db.execute_update("""
                         INSERT INTO exam_sessions (
                             id, user_id, exam_id, assignment_id, start_time, end_time, duration_seconds,
-                            score, total_questions, correct_answers, status, attempt_number, is_completed, focus_loss_count
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            score, total_questions, correct_answers, status, attempt_number, is_completed, focus_loss_count,
+                            selection_seed, pool_version
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         session_id,
                         user_data['id'],
@@ -1470,7 +1417,9 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                         'completed',
                         1,  # TODO: Calculate actual attempt number
                         True,
-                        0  # No longer tracking focus loss
+                        telemetry.focus_loss_count,
+                        selection_seed,
+                        pool_version
                     ))
                 except Exception as db_ex:
                     print(f"Database insert failed, trying without explicit ID: {db_ex}")
@@ -1478,8 +1427,9 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     session_id = db.execute_insert("""
                         INSERT INTO exam_sessions (
                             user_id, exam_id, assignment_id, start_time, end_time, duration_seconds,
-                            score, total_questions, correct_answers, status, attempt_number, is_completed
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            score, total_questions, correct_answers, status, attempt_number, is_completed,
+                            selection_seed, pool_version
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         user_data['id'],
                         actual_exam_id,
@@ -1492,10 +1442,13 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                         correct_answers,
                         'completed',
                         1,
-                        True
+                        True,
+                        selection_seed,
+                        pool_version
                     ))
                 
                 print(f"Exam session created with consistent ID: {session_id}")
+                checkpoint.discard()
                 print(f"Total answers saved: {len(exam_state['user_answers'])}")
 
                 # No need to update user_answers - they already have the correct session_id
@@ -1528,6 +1481,40 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                     # Last resort fallback
                     show_exam_results(len(questions), 0, 0, 0, 70)
 
+        def show_submit_failed():
+            """Tell the examinee the answers could not be saved and offer to retry the submission"""
+            page = None
+            if exam_state['main_container'] and hasattr(exam_state['main_container'], 'page'):
+                page = exam_state['main_container'].page
+            if not page:
+                print("No page context for the submission error dialog")
+                return
+
+            def retry_submit(e):
+                failed_dialog.open = False
+                page.update()
+                submit_exam_final()
+
+            failed_dialog = ft.AlertDialog(
+                modal=True,
+                title=ft.Row([
+                    ft.Icon(ft.icons.ERROR, color=EXAM_COLORS['error'], size=24),
+                    ft.Text(t('answers_not_saved'), color=EXAM_COLORS['error'], weight=ft.FontWeight.BOLD)
+                ], spacing=8),
+                content=ft.Text(t('answers_not_saved_message'), size=15),
+                actions=[
+                    ft.ElevatedButton(
+                        t('retry_submit'),
+                        on_click=retry_submit,
+                        style=ft.ButtonStyle(bgcolor=EXAM_COLORS['primary'], color=ft.colors.WHITE)
+                    )
+                ],
+                actions_alignment=ft.MainAxisAlignment.END
+            )
+            page.dialog = failed_dialog
+            failed_dialog.open = True
+            page.update()
+
         # Store submit_exam_final in exam_state so timer thread can access it
         exam_state['submit_exam_final'] = submit_exam_final
 
@@ -1831,254 +1818,32 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 navigation
             ]
         
+        # The sidebar and page layout are built once; later calls only replace the question pane
+        if exam_state.get('main_column') is not None:
+            return exam_state['main_column']
+
         # Sidebar (30%)
         timer_display = ft.Text(
-            f"{exam_state['time_remaining']//60:02d}:{exam_state['time_remaining']%60:02d}",
+            format_time_remaining(exam_timer.remaining()),
             size=24,
             weight=ft.FontWeight.BOLD
         )
         
         # Store timer display reference in exam_state
         exam_state['timer_display'] = timer_display
-        
-        timer_section = ft.Container(
-            content=ft.Column([
-                ft.Row([
-                    ft.Icon(ft.icons.TIMER, size=24),
-                    timer_display
-                ], alignment=ft.MainAxisAlignment.CENTER, spacing=8),
-                ft.Text(t('time_remaining'), size=12)
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=4),
-            padding=ft.padding.all(16),
-            bgcolor=EXAM_COLORS['surface'],
-            border_radius=8
-        )
-        
-        # Get exam template names for each question (for multi-template assignments)
-        # Build a map of question_id -> exam_title
-        question_to_exam_map = {}
-        if assignment_id:
-            # Multi-template assignment - get exam titles for each question
-            exam_templates = db.execute_query("""
-                SELECT DISTINCT e.id, e.title
-                FROM assignment_exam_templates aet
-                JOIN exams e ON aet.exam_id = e.id
-                WHERE aet.assignment_id = ?
-                ORDER BY aet.order_index
-            """, (assignment_id,))
-
-            # Map each question to its exam title
-            for question in questions:
-                for exam in exam_templates:
-                    # Check if this question belongs to this exam
-                    question_exam = db.execute_single("""
-                        SELECT exam_id FROM questions WHERE id = ?
-                    """, (question['id'],))
-
-                    if question_exam and question_exam['exam_id'] == exam['id']:
-                        question_to_exam_map[question['id']] = exam['title']
-                        break
-        else:
-            # Single template - use exam title from exam_data
-            exam_title = exam_data.get('title', 'Exam')
-            for question in questions:
-                question_to_exam_map[question['id']] = exam_title
-
-        # Progress overview with per-exam breakdown
-        # Group questions by exam template name for progress calculation
-        topic_progress = {}
-        for question in questions:
-            exam_title = question_to_exam_map.get(question['id'], 'Unknown')
-            if exam_title not in topic_progress:
-                topic_progress[exam_title] = {'total': 0, 'answered': 0}
-            topic_progress[exam_title]['total'] += 1
-            if question['id'] in exam_state['user_answers']:
-                topic_progress[exam_title]['answered'] += 1
-
-        # Build progress display with timer in top right
-        progress_items = [
-            # Header row with Progress Overview title and Timer
-            ft.Row([
-                ft.Text(t('overview'), size=14, weight=ft.FontWeight.BOLD),
-                ft.Container(expand=True),
-                ft.Row([
-                    ft.Icon(ft.icons.TIMER, size=18, color=EXAM_COLORS['primary']),
-                    timer_display
-                ], spacing=6)
-            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-            ft.Container(height=8),
-            ft.Text(f"{answered_count} {t('of')} {total_q} {t('answered')}", size=16, weight=ft.FontWeight.W_500),
-            ft.Container(height=8),
-            ft.ProgressBar(
-                value=answered_count/total_q if total_q > 0 else 0,
-                height=8,
-                color=EXAM_COLORS['primary'],
-                bgcolor=EXAM_COLORS['unanswered']
-            )
-        ]
-
-        # Add per-topic progress if multiple topics exist
-        if len(topic_progress) > 1:
-            progress_items.append(ft.Container(height=12))
-            progress_items.append(ft.Divider(height=1, color=EXAM_COLORS['border']))
-            progress_items.append(ft.Container(height=8))
-
-            for topic in sorted(topic_progress.keys()):
-                stats = topic_progress[topic]
-                percentage = (stats['answered'] / stats['total'] * 100) if stats['total'] > 0 else 0
-
-                progress_items.append(
-                    ft.Row([
-                        ft.Text(
-                            f"{topic}:",
-                            size=12,
-                            color=EXAM_COLORS['text_secondary'],
-                            weight=ft.FontWeight.W_500
-                        ),
-                        ft.Container(expand=True),
-                        ft.Text(
-                            f"{stats['answered']}/{stats['total']}",
-                            size=12,
-                            weight=ft.FontWeight.W_500
-                        )
-                    ], spacing=6)
-                )
 
-        progress_overview = ft.Container(
-            content=ft.Column(progress_items, spacing=4),
-            padding=ft.padding.all(16),
-            bgcolor=EXAM_COLORS['surface'],
-            border_radius=8
-        )
-        
-        # Question Navigator/Palette - Grouped by Exam Template Name
-        # Group questions by their original exam template
-        topic_groups = {}
-        topic_question_indices = {}  # Map exam_title to list of question indices
-
-        for i in range(len(questions)):
-            exam_title = question_to_exam_map.get(questions[i]['id'], 'Unknown')
-            if exam_title not in topic_groups:
-                topic_groups[exam_title] = []
-                topic_question_indices[exam_title] = []
-            topic_groups[exam_title].append(questions[i])
-            topic_question_indices[exam_title].append(i)
-
-        # Build navigator with topic groups
-        navigator_sections = []
-
-        # Preserve the order topics first appear in the randomized question list
-        ordered_topics = sorted(topic_groups.keys(), key=lambda t: topic_question_indices[t][0])
-
-        for topic in ordered_topics:
-            topic_questions = topic_groups[topic]
-            topic_indices = topic_question_indices[topic]
-
-            # Calculate topic progress
-            topic_answered = sum(1 for q in topic_questions if q['id'] in exam_state['user_answers'])
-            topic_total = len(topic_questions)
-            if topic_total == 0:
-                continue  # No questions to render for this topic
-
-            # Calculate range of question numbers for this topic (sequential order)
-            topic_start_number = min(topic_indices) + 1
-            topic_end_number = max(topic_indices) + 1
-
-            # Topic header
-            topic_header = ft.Container(
-                content=ft.Row([
-                    ft.Text(
-                        f"{topic} ({topic_start_number}-{topic_end_number})" if topic_total > 1 else f"{topic} ({topic_start_number})",
-                        size=13,
-                        weight=ft.FontWeight.BOLD,
-                        color=EXAM_COLORS['text_primary']
-                    ),
-                    ft.Container(expand=True),
-                    ft.Text(
-                        f"{topic_answered}/{topic_total}",
-                        size=11,
-                        color=EXAM_COLORS['text_secondary']
-                    )
-                ], spacing=6),
-                padding=ft.padding.only(top=8, bottom=4)
-            )
-
-            navigator_sections.append(topic_header)
-
-            # Create question buttons for this topic
-            topic_buttons = []
-            # CRITICAL FIX: Sort indices so buttons appear in sequential navigation order
-            for idx in sorted(topic_indices):
-                # CRITICAL FIX: Use actual array index + 1 for display number (sequential order)
-                display_number = idx + 1
-                question_id = questions[idx]['id']
-                is_current = idx == exam_state['current_question_index']
-                is_answered = question_id in exam_state['user_answers']
-                is_marked = question_id in exam_state['marked_for_review']
-
-                # Determine button color priority: current > marked > answered > unanswered
-                if is_current:
-                    bg_color = EXAM_COLORS['current']
-                    text_color = ft.colors.WHITE
-                elif is_marked:
-                    bg_color = EXAM_COLORS['marked']
-                    text_color = ft.colors.WHITE
-                elif is_answered:
-                    bg_color = EXAM_COLORS['answered']
-                    text_color = ft.colors.WHITE
-                else:
-                    bg_color = EXAM_COLORS['unanswered']
-                    text_color = EXAM_COLORS['text_primary']
-
-                topic_buttons.append(
-                    ft.Container(
-                        content=ft.Text(
-                            str(display_number),
-                            size=11,
-                            weight=ft.FontWeight.BOLD,
-                            color=text_color
-                        ),
-                        width=32,
-                        height=32,
-                        bgcolor=bg_color,
-                        border_radius=4,
-                        alignment=ft.alignment.center,
-                        on_click=lambda e, i=idx: navigate_to_question(i)
-                    )
-                )
-
-            # Add topic button grid with responsive wrap
-            navigator_sections.append(
-                ft.Container(
-                    content=ft.Row(
-                        topic_buttons,
-                        wrap=True,
-                        spacing=4,
-                        run_spacing=6
-                    ),
-                    padding=ft.padding.only(bottom=8)
-                )
-            )
-
-        # Simple Column with scroll - no fancy preservation attempts
-        # User can manually scroll as needed
-        question_navigator = ft.Container(
-            content=ft.Column([
-                ft.Text(t('navigation'), size=14, weight=ft.FontWeight.BOLD),
-                ft.Container(height=8),
-                ft.Container(
-                    content=ft.Column(
-                        navigator_sections,
-                        spacing=4,
-                        scroll=ft.ScrollMode.AUTO
-                    ),
-                    height=280
-                )
-            ]),
-            padding=ft.padding.all(16),
-            bgcolor=EXAM_COLORS['surface'],
-            border_radius=8
+        # Progress overview and question palette, updated in place by refresh_exam_view()
+        navigator = QuestionNavigator(
+            questions,
+            load_question_topics(),
+            EXAM_COLORS,
+            navigate_to_question,
+            timer_display,
+            answered_ids=exam_state['user_answers'],
+            marked_ids=exam_state['marked_for_review'],
+            current_index=exam_state['current_question_index']
         )
+        exam_state['navigator'] = navigator
         
         # Color Legend and Keyboard Shortcuts in 2 columns
         color_legend_and_shortcuts = ft.Container(
@@ -2158,30 +1923,18 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
             alignment=ft.alignment.center
         )
         
-        # Create or reuse sidebar scrollable column to preserve scroll position
-        sidebar_scroll_content = [
-            progress_overview,
-            ft.Container(height=20),
-            question_navigator,
-            ft.Container(height=20),
-            color_legend_and_shortcuts,
-        ]
-
-        if 'sidebar_scroll_column' not in exam_state or exam_state['sidebar_scroll_column'] is None:
-            # First time - create sidebar scroll column
-            sidebar_scroll_col = ft.Column(sidebar_scroll_content, spacing=0, scroll=ft.ScrollMode.AUTO)
-            exam_state['sidebar_scroll_column'] = sidebar_scroll_col
-        else:
-            # Reuse existing scroll column and update content
-            sidebar_scroll_col = exam_state['sidebar_scroll_column']
-            sidebar_scroll_col.controls = sidebar_scroll_content
-
         # Sidebar with scrollable content area and fixed submit button
         sidebar = ft.Container(
             content=ft.Column([
                 # Scrollable content area
                 ft.Container(
-                    content=sidebar_scroll_col,
+                    content=ft.Column([
+                        navigator.progress_overview,
+                        ft.Container(height=20),
+                        navigator.panel,
+                        ft.Container(height=20),
+                        color_legend_and_shortcuts,
+                    ], spacing=0, scroll=ft.ScrollMode.AUTO),
                     expand=True
                 ),
                 # Fixed submit button at bottom
@@ -2220,10 +1973,8 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
 
         # Fullscreen lock banner removed (feature temporarily disabled)
 
-        # Create or reuse main layout row to preserve sidebar scroll
-        if 'main_layout_row' not in exam_state or exam_state['main_layout_row'] is None:
-            # First time - create main layout
-            main_layout_container = ft.Container(
+        column_controls.append(
+            ft.Container(
                 content=ft.Row([
                     main_content,
                     ft.VerticalDivider(width=1, color=EXAM_COLORS['border']),
@@ -2233,20 +1984,10 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
                 padding=ft.padding.all(24),
                 bgcolor=EXAM_COLORS['background']
             )
-            exam_state['main_layout_row'] = main_layout_container
-            column_controls.append(main_layout_container)
-        else:
-            # Reuse existing layout - sidebar scroll will be preserved
-            main_layout_container = exam_state['main_layout_row']
-            # Update the row content with updated main_content and sidebar
-            main_layout_container.content.controls = [
-                main_content,
-                ft.VerticalDivider(width=1, color=EXAM_COLORS['border']),
-                sidebar
-            ]
-            column_controls.append(main_layout_container)
+        )
 
-        return ft.Column(column_controls, spacing=0)
+        exam_state['main_column'] = ft.Column(column_controls, spacing=0)
+        return exam_state['main_column']
     
     # Create the main container that will be returned
     main_container = ft.Container(
@@ -2260,11 +2001,10 @@ def create_exam_interface(exam_data, user_data, return_callback, exam_id=None, a
     # Note: Page reference and focus listener will be attached after container is added to page
     # This is handled in the did_mount equivalent when the container gets its page reference
 
-    # Start timer for the first question
-    if questions:
-        first_question = questions[0]
-        start_question_timer(first_question['id'])
-        print(f"[TIME] Exam started - timer started for first question {first_question['id']}")
+    # Start timing the first question shown
+    first_question = questions[exam_state['current_question_index']]
+    telemetry.question_shown(first_question['id'])
+    print(f"[TIME] Exam started - timer started for question {first_question['id']}")
 
     # Return the main container directly (no wrapper to avoid page reference issues)
     # Note: Fullscreen lock disabled for now due to technical limitations
@@ -1,7 +1,9 @@
 import flet as ft
 from datetime import datetime
 from quiz_app.config import COLORS
+from quiz_app.database.database import question_columns
 from quiz_app.utils.localization import t
+from quiz_app.utils.session_order import SessionOrder
 from quiz_app.views.common.help_view import HelpView
 from quiz_app.utils.feedback_dialog import create_feedback_button
 
@@ -1406,11 +1408,14 @@ class ExamineeDashboard(ft.UserControl):
                 return None
             
             exam_id = session['exam_id']
+
+            # Question and option order the examinee saw, when the session seed still applies
+            session_order = SessionOrder.load(self.db, session_id)
             
             # Get questions for this session (handles both regular exams and question pool exams)
             # First check if this session has selected questions in session_questions table
-            session_questions = self.db.execute_query("""
-                SELECT q.*
+            session_questions = self.db.execute_query(f"""
+                SELECT {question_columns('q')}
                 FROM questions q
                 JOIN session_questions sq ON q.id = sq.question_id
                 WHERE sq.session_id = ?
@@ -1421,10 +1426,14 @@ class ExamineeDashboard(ft.UserControl):
                 # This session uses question pool - use selected questions
                 questions = session_questions
                 print(f"Using question pool: {len(questions)} selected questions for session {session_id}")
+            elif session_order.reproducible:
+                # Regular exam - rebuild the (possibly shuffled) order from the session seed
+                questions = session_order.questions()
+                print(f"Using regular exam: {len(questions)} questions in session order for session {session_id}")
             else:
                 # Regular exam - get all questions from the exam
-                questions = self.db.execute_query("""
-                    SELECT * FROM questions 
+                questions = self.db.execute_query(f"""
+                    SELECT {question_columns()} FROM questions
                     WHERE exam_id = ? AND is_active = 1 
                     ORDER BY order_index, id
                 """, (exam_id,))
@@ -1449,6 +1458,7 @@ class ExamineeDashboard(ft.UserControl):
                     WHERE question_id = ? 
                     ORDER BY order_index, id
                 """, (question_id,))
+                options = session_order.options(question, options)
                 
                 # Process the question data for review
                 question_review = {
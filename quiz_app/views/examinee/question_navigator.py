@@ -0,0 +1,267 @@
+"""
+Question navigator and progress overview for the exam sidebar.
+
+The exam interface used to rebuild the whole sidebar on every navigation and
+answer: one button per question, every topic header, and per-topic counts
+recomputed by scanning all questions. The navigator is now built once.
+Buttons are kept by question index, and answered counts are adjusted as
+individual questions change. show() restyles only the buttons and counters
+that changed and returns them, so the caller can update just those controls.
+"""
+
+from typing import Callable, Dict, Iterable, List, Set
+
+import flet as ft
+
+from quiz_app.utils.localization import t
+
+
+class QuestionNavigator:
+    """Persistent sidebar controls: progress overview and question palette."""
+
+    def __init__(self, questions: List[Dict], topic_by_question: Dict[int, str], colors: Dict[str, str],
+                 on_select: Callable[[int], None], timer_display: ft.Control,
+                 answered_ids: Iterable[int] = (), marked_ids: Iterable[int] = (), current_index: int = 0):
+        """
+        Args:
+            questions: Exam questions in display order
+            topic_by_question: Topic (exam template title) of each question id
+            colors: EXAM_COLORS of the exam interface
+            on_select: Called with the question index when a button is clicked
+            timer_display: Countdown Text shown in the overview header
+            answered_ids / marked_ids: Initial question states
+            current_index: Question shown first
+        """
+        self.questions = questions
+        self.colors = colors
+        self.current_index = current_index
+        question_ids = {q['id'] for q in questions}
+        self._answered: Set[int] = question_ids.intersection(answered_ids)
+        self._marked: Set[int] = question_ids.intersection(marked_ids)
+
+        self._topic_of_index = [topic_by_question.get(q['id'], 'Unknown') for q in questions]
+        self._topic_indices: Dict[str, List[int]] = {}
+        for index, topic in enumerate(self._topic_of_index):
+            self._topic_indices.setdefault(topic, []).append(index)
+        self._topic_answered = {
+            topic: sum(1 for i in indices if questions[i]['id'] in self._answered)
+            for topic, indices in self._topic_indices.items()
+        }
+
+        self.buttons: Dict[int, ft.Container] = {
+            index: self._create_button(index, on_select) for index in range(len(questions))
+        }
+        self._topic_header_counts: Dict[str, ft.Text] = {}
+        self._topic_overview_counts: Dict[str, ft.Text] = {}
+        self.progress_overview = self._build_progress_overview(timer_display)
+        self.panel = self._build_panel()
+
+    # --- State changes -------------------------------------------------
+
+    def show(self, current_index: int, answered_ids, marked_ids) -> List[ft.Control]:
+        """
+        Move the current marker and pick up answer/mark changes.
+
+        Answers and marks only change on the question being shown, so only
+        the previous and the new current question are checked.
+
+        Args:
+            current_index: Question now shown
+            answered_ids: Container of answered question ids (exam_state['user_answers'])
+            marked_ids: Container of question ids marked for review
+
+        Returns:
+            Controls whose properties changed
+        """
+        previous_index, self.current_index = self.current_index, current_index
+        dirty: List[ft.Control] = []
+        for index in dict.fromkeys((previous_index, current_index)):
+            question_id = self.questions[index]['id']
+            if self._set_answered(index, question_id in answered_ids):
+                dirty.extend(self._count_controls(self._topic_of_index[index]))
+            if question_id in marked_ids:
+                self._marked.add(question_id)
+            else:
+                self._marked.discard(question_id)
+            if self._restyle(index):
+                dirty.append(self.buttons[index])
+        # Deduplicate while keeping order (both questions may share a topic)
+        return list({id(control): control for control in dirty}.values())
+
+    @property
+    def answered_count(self) -> int:
+        return len(self._answered)
+
+    def _set_answered(self, index: int, answered: bool) -> bool:
+        question_id = self.questions[index]['id']
+        if answered == (question_id in self._answered):
+            return False
+        topic = self._topic_of_index[index]
+        if answered:
+            self._answered.add(question_id)
+            self._topic_answered[topic] += 1
+        else:
+            self._answered.discard(question_id)
+            self._topic_answered[topic] -= 1
+        self._refresh_counts(topic)
+        return True
+
+    # --- Controls --------------------------------------------------------
+
+    def _button_colors(self, index: int):
+        question_id = self.questions[index]['id']
+        # Priority: current > marked > answered > unanswered
+        if index == self.current_index:
+            return self.colors['current'], ft.colors.WHITE
+        if question_id in self._marked:
+            return self.colors['marked'], ft.colors.WHITE
+        if question_id in self._answered:
+            return self.colors['answered'], ft.colors.WHITE
+        return self.colors['unanswered'], self.colors['text_primary']
+
+    def _create_button(self, index: int, on_select: Callable[[int], None]) -> ft.Container:
+        bg_color, text_color = self._button_colors(index)
+        return ft.Container(
+            content=ft.Text(str(index + 1), size=11, weight=ft.FontWeight.BOLD, color=text_color),
+            width=32,
+            height=32,
+            bgcolor=bg_color,
+            border_radius=4,
+            alignment=ft.alignment.center,
+            on_click=lambda e, i=index: on_select(i)
+        )
+
+    def _restyle(self, index: int) -> bool:
+        button = self.buttons[index]
+        bg_color, text_color = self._button_colors(index)
+        if button.bgcolor == bg_color and button.content.color == text_color:
+            return False
+        button.bgcolor = bg_color
+        button.content.color = text_color
+        return True
+
+    def _answered_summary(self) -> str:
+        return f"{self.answered_count} {t('of')} {len(self.questions)} {t('answered')}"
+
+    def _progress_value(self) -> float:
+        return self.answered_count / len(self.questions) if self.questions else 0
+
+    def _refresh_counts(self, topic: str):
+        self._answered_text.value = self._answered_summary()
+        self._progress_bar.value = self._progress_value()
+        count = f"{self._topic_answered[topic]}/{len(self._topic_indices[topic])}"
+        self._topic_header_counts[topic].value = count
+        if topic in self._topic_overview_counts:
+            self._topic_overview_counts[topic].value = count
+
+    def _count_controls(self, topic: str) -> List[ft.Control]:
+        controls = [self._answered_text, self._progress_bar, self._topic_header_counts[topic]]
+        if topic in self._topic_overview_counts:
+            controls.append(self._topic_overview_counts[topic])
+        return controls
+
+    def _build_progress_overview(self, timer_display: ft.Control) -> ft.Container:
+        self._answered_text = ft.Text(self._answered_summary(), size=16, weight=ft.FontWeight.W_500)
+        self._progress_bar = ft.ProgressBar(
+            value=self._progress_value(),
+            height=8,
+            color=self.colors['primary'],
+            bgcolor=self.colors['unanswered']
+        )
+        progress_items = [
+            # Header row with Progress Overview title and Timer
+            ft.Row([
+                ft.Text(t('overview'), size=14, weight=ft.FontWeight.BOLD),
+                ft.Container(expand=True),
+                ft.Row([
+                    ft.Icon(ft.icons.TIMER, size=18, color=self.colors['primary']),
+                    timer_display
+                ], spacing=6)
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            ft.Container(height=8),
+            self._answered_text,
+            ft.Container(height=8),
+            self._progress_bar
+        ]
+
+        # Add per-topic progress if multiple topics exist
+        if len(self._topic_indices) > 1:
+            progress_items.append(ft.Container(height=12))
+            progress_items.append(ft.Divider(height=1, color=self.colors['border']))
+            progress_items.append(ft.Container(height=8))
+
+            for topic in sorted(self._topic_indices):
+                count_text = ft.Text(
+                    f"{self._topic_answered[topic]}/{len(self._topic_indices[topic])}",
+                    size=12,
+                    weight=ft.FontWeight.W_500
+                )
+                self._topic_overview_counts[topic] = count_text
+                progress_items.append(
+                    ft.Row([
+                        ft.Text(f"{topic}:", size=12, color=self.colors['text_secondary'], weight=ft.FontWeight.W_500),
+                        ft.Container(expand=True),
+                        count_text
+                    ], spacing=6)
+                )
+
+        return ft.Container(
+            content=ft.Column(progress_items, spacing=4),
+            padding=ft.padding.all(16),
+            bgcolor=self.colors['surface'],
+            border_radius=8
+        )
+
+    def _build_panel(self) -> ft.Container:
+        navigator_sections = []
+        # Topics keep the order in which they first appear in the (possibly randomized) question list
+        for topic, topic_indices in self._topic_indices.items():
+            topic_total = len(topic_indices)
+            first_number, last_number = topic_indices[0] + 1, topic_indices[-1] + 1
+            count_text = ft.Text(
+                f"{self._topic_answered[topic]}/{topic_total}",
+                size=11,
+                color=self.colors['text_secondary']
+            )
+            self._topic_header_counts[topic] = count_text
+
+            navigator_sections.append(ft.Container(
+                content=ft.Row([
+                    ft.Text(
+                        f"{topic} ({first_number}-{last_number})" if topic_total > 1 else f"{topic} ({first_number})",
+                        size=13,
+                        weight=ft.FontWeight.BOLD,
+                        color=self.colors['text_primary']
+                    ),
+                    ft.Container(expand=True),
+                    count_text
+                ], spacing=6),
+                padding=ft.padding.only(top=8, bottom=4)
+            ))
+            navigator_sections.append(ft.Container(
+                content=ft.Row(
+                    [self.buttons[index] for index in topic_indices],
+                    wrap=True,
+                    spacing=4,
+                    run_spacing=6
+                ),
+                padding=ft.padding.only(bottom=8)
+            ))
+
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(t('navigation'), size=14, weight=ft.FontWeight.BOLD),
+                ft.Container(height=8),
+                ft.Container(
+                    content=ft.Column(
+                        navigator_sections,
+                        spacing=4,
+                        scroll=ft.ScrollMode.AUTO
+                    ),
+                    height=280
+                )
+            ]),
+            padding=ft.padding.all(16),
+            bgcolor=self.colors['surface'],
+            border_radius=8
+        )
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import sqlite3
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from quiz_app.config import ANSWER_SUBMIT_FLUSH_ATTEMPTS
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils import answer_journal
+from quiz_app.utils.answer_journal import AnswerFlushError, AnswerJournal, replay_answer_journals, score_submission
+
+
+class TestAnswerJournal(unittest.TestCase):
+    """Tests for the write-behind user_answers journal."""
+
+    SESSION_ID = 1700000000
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_dir = str(Path(self.temp_dir.name) / 'journal')
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Journal', 1)")
+        self.db.execute_many(
+            "INSERT INTO questions (id, exam_id, question_text, question_type, points) VALUES (?, ?, ?, 'single_choice', 1)",
+            [(question_id, exam_id, f"Question {question_id}") for question_id in range(1, 6)]
+        )
+        self.exam_id = exam_id
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _answers(self):
+        return self.db.execute_query(
+            'SELECT question_id, selected_option_id, answer_text, points_earned FROM user_answers ORDER BY question_id'
+        )
+
+    def _journal(self):
+        # Long interval so only explicit flushes write to the database
+        return AnswerJournal(self.SESSION_ID, self.db, journal_dir=self.journal_dir, flush_interval=3600)
+
+    def test_answers_are_batched_until_flush(self):
+        journal = self._journal()
+        journal.record_answer(1, selected_option_id=10, points_earned=1.0, is_correct=1)
+        journal.record_answer(1, selected_option_id=11, points_earned=0.0, is_correct=0)
+        journal.record_answer(2, answer_text='essay', points_earned=None)
+        self.assertEqual(self._answers(), [])
+        self.assertEqual(journal.pending_count(), 2)
+
+        self.assertTrue(journal.flush())
+        self.assertEqual(self._answers(), [
+            {'question_id': 1, 'selected_option_id': 11, 'answer_text': None, 'points_earned': 0.0},
+            {'question_id': 2, 'selected_option_id': None, 'answer_text': 'essay', 'points_earned': None},
+        ])
+
+        journal.record_delete(2)
+        self.assertTrue(journal.close())
+        self.assertEqual([row['question_id'] for row in self._answers()], [1])
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_request_flush_writes_in_background(self):
+        journal = self._journal()
+        journal.record_answer(5, answer_text='true', points_earned=1.0, is_correct=1)
+        journal.request_flush()
+        deadline = time.time() + 5
+        while journal.pending_count() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(journal.pending_count(), 0)
+        self.assertEqual(len(self._answers()), 1)
+        journal.close()
+
+    def test_unflushed_answers_are_replayed(self):
+        journal = self._journal()
+        journal.record_answer(3, selected_option_id=30, points_earned=2.0, is_correct=1)
+        journal.record_answer(4, selected_option_id=40, points_earned=0.0, is_correct=0)
+        self._crash(journal)
+        with open(journal.path, 'a', encoding='utf-8') as torn:
+            torn.write('{"op":"upsert","session_id":')
+
+        self.assertEqual(replay_answer_journals(self.db, journal_dir=self.journal_dir), 2)
+        self.assertEqual([row['selected_option_id'] for row in self._answers()], [30, 40])
+        self.assertFalse(os.path.exists(journal.path))
+
+    def _crash(self, journal):
+        # The process dies before the journal is flushed or closed
+        journal._closed = True
+        journal._file.close()
+
+    def test_submit_refused_while_answers_cannot_be_written(self):
+        journal = self._journal()
+        journal.record_answer(1, selected_option_id=10, points_earned=1.0, is_correct=1)
+        journal.record_answer(2, selected_option_id=20, points_earned=1.0, is_correct=1)
+        question_ids = list(range(1, 6))
+
+        with mock.patch.object(answer_journal, '_apply', side_effect=sqlite3.OperationalError('database is locked')) as apply, \
+                mock.patch.object(answer_journal.time, 'sleep'):
+            with self.assertRaises(AnswerFlushError):
+                score_submission(self.db, journal, question_ids)
+        self.assertEqual(apply.call_count, ANSWER_SUBMIT_FLUSH_ATTEMPTS)
+        self.assertEqual(journal.pending_count(), 2)
+        self.assertEqual(self._answers(), [])
+        self.assertTrue(os.path.exists(journal.path))
+
+        # Once the database is reachable again the retried submission scores every answer
+        score = score_submission(self.db, journal, question_ids)
+        self.assertEqual((score['answered_questions'], score['earned_points']), (2, 2.0))
+        self.assertTrue(journal.close())
+
+    def test_replay_rescores_submitted_session(self):
+        self.db.execute_insert(
+            "INSERT INTO exam_sessions (id, user_id, exam_id, score, correct_answers, total_questions, "
+            "status, is_completed) VALUES (?, 1, ?, 20.0, 1, 5, 'completed', 1)",
+            (self.SESSION_ID, self.exam_id)
+        )
+        self.db.execute_insert(
+            "INSERT INTO user_answers (session_id, question_id, selected_option_id, is_correct, points_earned) "
+            "VALUES (?, 1, 10, 1, 1.0)", (self.SESSION_ID,)
+        )
+        journal = self._journal()
+        journal.record_answer(2, selected_option_id=20, points_earned=1.0, is_correct=1)
+        journal.record_answer(3, selected_option_id=30, points_earned=1.0, is_correct=1)
+        self._crash(journal)
+
+        self.assertEqual(replay_answer_journals(self.db, journal_dir=self.journal_dir), 2)
+        session = self.db.execute_single(
+            "SELECT score, correct_answers FROM exam_sessions WHERE id = ?", (self.SESSION_ID,)
+        )
+        self.assertEqual(session, {'score': 60.0, 'correct_answers': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
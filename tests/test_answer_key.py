@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.answer_key import AnswerKey
+
+
+class TestAnswerKey(unittest.TestCase):
+    """Tests for the in-memory per-session answer key."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Key', 1)")
+        self.single = self._question(exam_id, 'single_choice', [('A', 0), ('B', 1), ('C', 0)])
+        self.multi = self._question(exam_id, 'multiple_choice', [('A', 1), ('B', 0), ('C', 1)])
+        self.true_false = self._question(exam_id, 'true_false', [('True', 0), ('False', 1)])
+        self.essay = self._question(exam_id, 'essay', [])
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _question(self, exam_id, question_type, options):
+        question_id = self.db.execute_insert(
+            "INSERT INTO questions (exam_id, question_text, question_type) VALUES (?, 'Q', ?)",
+            (exam_id, question_type)
+        )
+        self.db.execute_many(
+            "INSERT INTO question_options (question_id, option_text, is_correct, order_index) VALUES (?, ?, ?, ?)",
+            [(question_id, text, correct, index) for index, (text, correct) in enumerate(options)]
+        )
+        return question_id
+
+    def test_grades_from_memory(self):
+        key = AnswerKey.load(self.db, [self.single, self.multi, self.true_false, self.essay])
+        self.db.close()
+        self.db.execute_update("DELETE FROM question_options")
+
+        single_ids = [option['id'] for option in key.options(self.single)]
+        self.assertTrue(key.is_correct_option(self.single, str(single_ids[1])))
+        self.assertFalse(key.is_correct_option(self.single, single_ids[0]))
+
+        multi_ids = [option['id'] for option in key.options(self.multi)]
+        self.assertTrue(key.is_correct_selection(self.multi, [multi_ids[2], multi_ids[0]]))
+        self.assertFalse(key.is_correct_selection(self.multi, [multi_ids[0]]))
+        self.assertFalse(key.is_correct_selection(self.multi, []))
+
+        self.assertTrue(key.is_correct_text(self.true_false, 'false'))
+        self.assertFalse(key.is_correct_text(self.true_false, 'True'))
+        self.assertEqual(key.options(self.essay), [])
+
+    def test_options_keep_display_order(self):
+        key = AnswerKey.load(self.db, [self.multi])
+        self.assertEqual([option['option_text'] for option in key.options(self.multi)], ['A', 'B', 'C'])
+        self.assertEqual(key.options(self.single), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
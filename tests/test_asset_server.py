@@ -0,0 +1,60 @@
+import unittest
+import urllib.error
+import urllib.request
+
+from quiz_app.utils.asset_server import AssetServer
+
+
+class TestAssetServer(unittest.TestCase):
+    """Tests for the loopback image server."""
+
+    def setUp(self):
+        self.server = AssetServer(max_bytes=100)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_serves_content_addressed_urls_with_cache_headers(self):
+        url = self.server.publish(b'chart-bytes', 'image/png')
+        self.assertTrue(url.startswith('http://127.0.0.1:'))
+        self.assertTrue(url.endswith('.png'))
+        self.assertEqual(self.server.publish(b'chart-bytes', 'image/png'), url)
+
+        with urllib.request.urlopen(url) as response:
+            self.assertEqual(response.read(), b'chart-bytes')
+            self.assertEqual(response.headers['Content-Type'], 'image/png')
+            self.assertIn('immutable', response.headers['Cache-Control'])
+            etag = response.headers['ETag']
+
+        request = urllib.request.Request(url, headers={'If-None-Match': etag})
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(request)
+        self.assertEqual(ctx.exception.code, 304)
+
+    def test_rejects_unknown_token_and_evicts_over_budget(self):
+        url = self.server.publish(b'a' * 60, 'image/png')
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(url.replace(self.server.token, 'wrong-token'))
+        self.assertEqual(ctx.exception.code, 404)
+
+        self.server.publish(b'b' * 60, 'image/png')
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(url)
+        self.assertEqual(ctx.exception.code, 404)
+
+    def test_pinned_assets_survive_eviction_until_released(self):
+        pinned = self.server.publish(b'a' * 60, 'image/png', pin=True)
+        self.server.publish(b'b' * 60, 'image/png')
+        self.server.publish(b'c' * 60, 'image/png')
+        with urllib.request.urlopen(pinned) as response:
+            self.assertEqual(response.read(), b'a' * 60)
+
+        self.server.release(pinned)
+        self.server.publish(b'd' * 60, 'image/png')
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(pinned)
+        self.assertEqual(ctx.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
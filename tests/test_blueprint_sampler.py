@@ -0,0 +1,132 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.blueprint_sampler import BlueprintCell, BlueprintSampler, template_blueprint
+from quiz_app.utils.question_pool import get_pool_index
+from quiz_app.utils.question_selector import QuestionSelector
+
+
+class TestBlueprintSampler(unittest.TestCase):
+    """Tests for topic x difficulty blueprint sampling."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        self.user_id = self.db.execute_insert(
+            "INSERT INTO users (username, email, password_hash, full_name, role) "
+            "VALUES ('admin', 'admin@example.com', 'x', 'Admin', 'admin')"
+        )
+        # Topic A: 5 easy (1 pt), 2 medium (2 pts), 1 hard (3 pts); topic B: 3 easy, 4 medium, 3 hard (mixed points)
+        self.topic_a = self._exam('Topic A', [('easy', 1.0)] * 5 + [('medium', 2.0)] * 2 + [('hard', 3.0)])
+        self.topic_b = self._exam('Topic B', [('easy', 1.0)] * 3 + [('medium', 1.0), ('medium', 3.0)] * 2
+                                  + [('hard', 2.0), ('hard', 4.0), ('hard', 5.0)])
+        get_pool_index(self.db).invalidate()
+
+    def tearDown(self):
+        get_pool_index(self.db).invalidate()
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _exam(self, title, questions):
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES (?, ?)", (title, self.user_id))
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level, points) "
+            "VALUES (?, ?, 'single_choice', ?, ?)",
+            [(exam_id, f"{title} Q{i}", difficulty, points) for i, (difficulty, points) in enumerate(questions)]
+        )
+        return exam_id
+
+    def _template(self, exam_id, title, easy=0, medium=0, hard=0):
+        return {'id': exam_id, 'title': title, 'easy_count': easy, 'medium_count': medium, 'hard_count': hard}
+
+    def _difficulties(self, question_ids):
+        return {row['id']: (row['exam_id'], row['difficulty_level'], row['points']) for row in self.db.execute_query(
+            f"SELECT id, exam_id, difficulty_level, points FROM questions WHERE id IN ({','.join('?' * len(question_ids))})",
+            tuple(question_ids)
+        )}
+
+    def test_matches_per_cell_sampling_without_rules(self):
+        cells = template_blueprint([self._template(self.topic_a, 'A', easy=2, medium=1),
+                                    self._template(self.topic_b, 'B', hard=2)])
+        picks = BlueprintSampler(self.db, random.Random(5)).sample(cells)
+
+        rng = random.Random(5)
+        pool = get_pool_index(self.db)
+        expected = [rng.sample(pool.question_ids(self.db, [cell.exam_ids[0]], cell.difficulty), cell.count)
+                    for cell in cells]
+        self.assertEqual([[question_id for question_id, _ in cell_picks] for cell_picks in picks], expected)
+
+    def test_shortfall_stays_short_by_default(self):
+        picks = BlueprintSampler(self.db, random.Random(1)).sample([BlueprintCell('A', [self.topic_a], 'hard', 3)])
+        self.assertEqual(len(picks[0]), 1)
+
+    def test_difficulty_fallback_takes_nearest_level_of_same_topic(self):
+        cells = [BlueprintCell('A', [self.topic_a], 'hard', 3)]
+        picks = BlueprintSampler(self.db, random.Random(1), fallback='difficulty').sample(cells)[0]
+        self.assertEqual(len(picks), 3)
+        info = self._difficulties([question_id for question_id, _ in picks])
+        self.assertEqual([difficulty for _, difficulty in picks], ['hard', 'medium', 'medium'])
+        self.assertTrue(all(info[question_id][0] == self.topic_a for question_id, _ in picks))
+
+    def test_topic_fallback_takes_same_level_elsewhere(self):
+        cells = template_blueprint([self._template(self.topic_a, 'A', medium=4),
+                                    self._template(self.topic_b, 'B', medium=1)])
+        picks = BlueprintSampler(self.db, random.Random(3), fallback='topic').sample(cells)
+        question_ids = [question_id for cell_picks in picks for question_id, _ in cell_picks]
+        self.assertEqual(len(question_ids), 5)
+        self.assertEqual(len(set(question_ids)), 5)
+        info = self._difficulties(question_ids)
+        self.assertTrue(all(info[question_id][1] == 'medium' for question_id in question_ids))
+        self.assertEqual(sum(info[question_id][0] == self.topic_b for question_id, _ in picks[0]), 2)
+
+    def test_points_target_keeps_blueprint_counts(self):
+        cells = template_blueprint([self._template(self.topic_a, 'A', easy=2),
+                                    self._template(self.topic_b, 'B', medium=2, hard=2)])
+        for target in (10.0, 11.0, 15.0, 17.0):
+            picks = BlueprintSampler(self.db, random.Random(11), target_points=target).sample(cells)
+            question_ids = [question_id for cell_picks in picks for question_id, _ in cell_picks]
+            info = self._difficulties(question_ids)
+            self.assertEqual(sum(info[question_id][2] for question_id in question_ids), target)
+            self.assertEqual([len(cell_picks) for cell_picks in picks], [2, 2, 2])
+            for cell, cell_picks in zip(cells, picks):
+                self.assertTrue(all(info[question_id][:2] == (cell.exam_ids[0], cell.difficulty)
+                                    for question_id, _ in cell_picks))
+            self.assertEqual(len(set(question_ids)), 6)
+
+    def test_selector_uses_assignment_rules(self):
+        exam_data = {'id': self.topic_a, 'use_question_pool': 1, 'randomize_questions': 0,
+                     'pool_fallback': 'difficulty', 'target_points': None}
+        templates = [self._template(self.topic_a, 'A', hard=2), self._template(self.topic_b, 'B', easy=1)]
+        questions = QuestionSelector(self.db, seed=4).select_questions_for_multi_template_session(
+            exam_data, templates, 1700000000
+        )
+        self.assertEqual(len(questions), 3)
+        stored = self.db.execute_query(
+            "SELECT question_id, difficulty_level FROM session_questions WHERE session_id = 1700000000 ORDER BY order_index"
+        )
+        self.assertEqual([row['question_id'] for row in stored], [q['id'] for q in questions])
+        self.assertEqual([row['difficulty_level'] for row in stored], ['hard', 'medium', 'easy'])
+
+    def test_large_pool_is_fast(self):
+        exam_ids = [self._exam(f"Large {n}", [(difficulty, float(1 + i % 4)) for i, difficulty in
+                                              enumerate(['easy', 'medium', 'hard'] * 1667)])
+                    for n in range(4)]
+        cells = template_blueprint([self._template(exam_id, f"Large {exam_id}", easy=10, medium=10, hard=5)
+                                    for exam_id in exam_ids])
+        sampler = BlueprintSampler(self.db, random.Random(2), fallback='any', target_points=250.0)
+        sampler.sample(cells)  # builds the index
+
+        started = time.perf_counter()
+        picks = sampler.sample(cells)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(sum(len(cell_picks) for cell_picks in picks), 100)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database
+
+
+class TestDatabaseConcurrency(unittest.TestCase):
+    """Stress tests for the per-thread connection manager."""
+
+    EXAMINEES = 50
+    QUESTIONS = 20
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / 'test.db'
+        self.db = Database(db_path=str(self.db_path), busy_timeout_ms=10000)
+        with self.db.get_connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE user_answers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER NOT NULL,
+                    question_id INTEGER NOT NULL,
+                    answer_text TEXT,
+                    is_correct BOOLEAN,
+                    points_earned REAL DEFAULT 0,
+                    UNIQUE(session_id, question_id)
+                )
+                """
+            )
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_wal_mode_enabled(self):
+        """New connections should switch the database to WAL journaling."""
+        mode = self.db.execute_single('PRAGMA journal_mode')
+        self.assertEqual(list(mode.values())[0].lower(), 'wal')
+
+    def test_threads_get_separate_connections(self):
+        """Each thread should receive its own read-write connection."""
+        connections = []
+
+        def grab():
+            connections.append(self.db.get_connection())
+
+        threads = [threading.Thread(target=grab) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(conn) for conn in connections}), 3)
+        self.assertIs(self.db.get_connection(), self.db.get_connection())
+
+    def test_instances_share_connections_per_file(self):
+        """A new Database() for the same file reuses the thread's open connection."""
+        other = Database(db_path=str(self.db_path))
+        self.assertIs(other.get_connection(), self.db.get_connection())
+
+    def test_close_only_releases_calling_thread(self):
+        """Closing one Database leaves other threads' shared connections open."""
+        opened = threading.Event()
+        closed = threading.Event()
+        results = []
+
+        def worker():
+            conn = self.db.get_connection()
+            opened.set()
+            closed.wait()
+            results.append(conn.execute('SELECT 1').fetchone()[0])
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        opened.wait()
+        own = self.db.get_connection()
+        Database(db_path=str(self.db_path)).close()
+        closed.set()
+        thread.join()
+
+        self.assertEqual(results, [1])
+        self.assertIsNot(self.db.get_connection(), own)
+
+    def test_read_connection_rejects_writes(self):
+        """The reader connection is opened read-only."""
+        reader = self.db.get_read_connection()
+        self.assertIsNot(reader, self.db.get_connection())
+        with self.assertRaises(Exception):
+            reader.execute("INSERT INTO user_answers (session_id, question_id) VALUES (1, 1)")
+
+    def test_examinee_writes_alongside_report_reads(self):
+        """50 examinee threads save answers while a reports thread aggregates."""
+        errors = []
+        writers_done = threading.Event()
+        report_runs = []
+
+        def examinee(session_id):
+            try:
+                for question_id in range(1, self.QUESTIONS + 1):
+                    self.db.execute_insert(
+                        """
+                        INSERT OR REPLACE INTO user_answers
+                        (session_id, question_id, answer_text, is_correct, points_earned)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (session_id, question_id, 'answer', question_id % 2, 1.0)
+                    )
+            except Exception as exc:
+                errors.append(exc)
+
+        def reports():
+            try:
+                while not writers_done.is_set():
+                    summary = self.db.execute_single(
+                        """
+                        SELECT COUNT(*) as answers,
+                               COUNT(DISTINCT session_id) as sessions,
+                               SUM(points_earned) as points
+                        FROM user_answers
+                        """
+                    )
+                    report_runs.append(summary['answers'])
+            except Exception as exc:
+                errors.append(exc)
+
+        reporter = threading.Thread(target=reports)
+        reporter.start()
+        examinees = [threading.Thread(target=examinee, args=(i,)) for i in range(1, self.EXAMINEES + 1)]
+        for thread in examinees:
+            thread.start()
+        for thread in examinees:
+            thread.join()
+        writers_done.set()
+        reporter.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(report_runs, 'Reports thread should have completed at least one query')
+        self.assertEqual(report_runs, sorted(report_runs), 'Readers should only ever see committed growth')
+        total = self.db.execute_single('SELECT COUNT(*) as count FROM user_answers')
+        self.assertEqual(total['count'], self.EXAMINEES * self.QUESTIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database
+
+
+class TestDatabaseStreaming(unittest.TestCase):
+    """Tests for the fetchmany-based execute_iter/execute_chunks APIs."""
+
+    ROWS = 1234
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        with self.db.get_connection() as conn:
+            conn.execute('CREATE TABLE scores (id INTEGER PRIMARY KEY, score REAL)')
+            conn.executemany(
+                'INSERT INTO scores (id, score) VALUES (?, ?)',
+                [(i, i % 100) for i in range(1, self.ROWS + 1)]
+            )
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_chunks_respect_chunk_size(self):
+        chunks = list(self.db.execute_chunks('SELECT id, score FROM scores ORDER BY id', chunk_size=500))
+        self.assertEqual([len(chunk) for chunk in chunks], [500, 500, 234])
+        self.assertEqual(chunks[0][0], {'id': 1, 'score': 1.0})
+
+    def test_iter_matches_execute_query(self):
+        query = 'SELECT id, score FROM scores WHERE score > ? ORDER BY id'
+        self.assertEqual(list(self.db.execute_iter(query, (50,))), self.db.execute_query(query, (50,)))
+
+    def test_row_types(self):
+        query = 'SELECT id, score FROM scores ORDER BY id LIMIT 1'
+        self.assertEqual(next(self.db.execute_iter(query, row_type='tuple')), (1, 1.0))
+        row = next(self.db.execute_iter(query, row_type='row'))
+        self.assertEqual((row['id'], row['score']), (1, 1.0))
+        with self.assertRaises(ValueError):
+            list(self.db.execute_iter(query, row_type='namedtuple'))
+
+    def test_early_close_releases_cursor(self):
+        rows = self.db.execute_iter('SELECT id FROM scores ORDER BY id', fetch_size=10)
+        self.assertEqual(next(rows)['id'], 1)
+        rows.close()
+        # Connection remains usable for writes afterwards
+        self.db.execute_update('DELETE FROM scores WHERE id = 1')
+        self.assertEqual(self.db.execute_single('SELECT COUNT(*) as count FROM scores')['count'], self.ROWS - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
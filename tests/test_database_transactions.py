@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database
+
+
+class TestDatabaseTransactions(unittest.TestCase):
+    """Tests for db.transaction() and execute_many()."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        self.db.execute_update(
+            'CREATE TABLE session_questions (session_id INTEGER, question_id INTEGER, '
+            'order_index INTEGER, UNIQUE(session_id, question_id))'
+        )
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _count(self):
+        return self.db.execute_single('SELECT COUNT(*) as count FROM session_questions')['count']
+
+    def test_execute_many_reports_rows_affected(self):
+        inserted = self.db.execute_many(
+            'INSERT INTO session_questions VALUES (?, ?, ?)',
+            [(1, q, q) for q in range(1, 26)]
+        )
+        self.assertEqual(inserted, 25)
+
+        updated = self.db.execute_many(
+            'UPDATE session_questions SET order_index = ? WHERE session_id = ? AND question_id = ?',
+            [(100 + q, 1, q) for q in range(1, 11)]
+        )
+        self.assertEqual(updated, 10)
+
+    def test_transaction_commits_once_at_end(self):
+        with self.db.transaction():
+            self.db.execute_insert('INSERT INTO session_questions VALUES (1, 1, 1)')
+            self.db.execute_many('INSERT INTO session_questions VALUES (?, ?, ?)', [(1, 2, 2), (1, 3, 3)])
+            self.assertTrue(self.db.in_transaction())
+            # Reads inside the block see the pending rows
+            self.assertEqual(self._count(), 3)
+            # Another connection does not see them until commit
+            outside = Database(db_path=self.db.db_path).get_read_connection()
+            self.assertEqual(outside.execute('SELECT COUNT(*) FROM session_questions').fetchone()[0], 0)
+
+        self.assertFalse(self.db.in_transaction())
+        self.assertEqual(self._count(), 3)
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(Exception):
+            with self.db.transaction():
+                self.db.execute_insert('INSERT INTO session_questions VALUES (1, 1, 1)')
+                # Violates UNIQUE(session_id, question_id)
+                self.db.execute_many('INSERT INTO session_questions VALUES (?, ?, ?)', [(1, 2, 2), (1, 2, 3)])
+
+        self.assertEqual(self._count(), 0)
+
+    def test_nested_transactions_join_outer(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                with self.db.transaction():
+                    self.db.execute_insert('INSERT INTO session_questions VALUES (1, 1, 1)')
+                raise RuntimeError('abort outer block')
+
+        self.assertEqual(self._count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.answer_journal import AnswerJournal
+from quiz_app.utils.exam_checkpoint import ExamCheckpoint, load_questions_in_order, load_saved_answers
+
+
+class TestExamCheckpoint(unittest.TestCase):
+    """Tests for in-progress exam checkpoints and session resume."""
+
+    SESSION_ID = 1700000000
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_dir = str(Path(self.temp_dir.name) / 'checkpoints')
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Resume', 1)")
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type) VALUES (?, ?, 'single_choice')",
+            [(exam_id, f"Question {i}") for i in range(4)]
+        )
+        self.question_ids = [row['id'] for row in self.db.execute_query("SELECT id FROM questions ORDER BY id")]
+        self.db.execute_many(
+            "INSERT INTO question_options (question_id, option_text, is_correct, order_index) VALUES (?, ?, ?, ?)",
+            [(question_id, f"Option {j}", int(j == 0), j) for question_id in self.question_ids for j in range(3)]
+        )
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _checkpoint(self, **kwargs):
+        return ExamCheckpoint(7, 1, assignment_id=3, checkpoint_dir=self.checkpoint_dir, **kwargs)
+
+    def _state(self, **overrides):
+        state = {
+            'session_id': self.SESSION_ID,
+            'question_ids': list(reversed(self.question_ids)),
+            'current_question_index': 2,
+            'time_remaining': 1234,
+            'start_time': '2026-01-01T09:00:00',
+            'marked_for_review': [self.question_ids[1]],
+            'question_time_spent': {},
+            'selection_seed': 12345,
+            'pool_version': 'abc123',
+        }
+        state.update(overrides)
+        return state
+
+    def test_save_and_load_round_trip(self):
+        checkpoint = self._checkpoint()
+        self.assertIsNone(checkpoint.load())
+        self.assertTrue(checkpoint.save(self._state()))
+
+        loaded = self._checkpoint().load()
+        self.assertEqual(loaded['session_id'], self.SESSION_ID)
+        self.assertEqual(loaded['time_remaining'], 1234)
+        self.assertEqual(loaded['question_ids'], list(reversed(self.question_ids)))
+        self.assertEqual(loaded['selection_seed'], 12345)
+        self.assertFalse(os.path.exists(checkpoint.path + '.tmp'))
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        checkpoint = self._checkpoint()
+        with open(checkpoint.path, 'w', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write('{"session_id": 1, "quest')
+        self.assertIsNone(checkpoint.load())
+
+    def test_save_if_due_respects_interval_and_requests(self):
+        checkpoint = self._checkpoint(interval=3600)
+        snapshots = []
+
+        def snapshot():
+            snapshots.append(1)
+            return self._state()
+
+        self.assertTrue(checkpoint.save_if_due(snapshot))  # Never saved yet
+        self.assertFalse(checkpoint.save_if_due(snapshot))
+        checkpoint.request_save()
+        self.assertTrue(checkpoint.save_if_due(snapshot))
+        self.assertEqual(len(snapshots), 2)
+
+    def test_discard_removes_file_and_blocks_late_saves(self):
+        checkpoint = self._checkpoint()
+        checkpoint.save(self._state())
+        checkpoint.discard()
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+        # e.g. a timer tick racing with submission
+        checkpoint.request_save()
+        self.assertFalse(checkpoint.save_if_due(self._state))
+        self.assertIsNone(self._checkpoint().load())
+
+    def test_question_order_is_restored(self):
+        order = list(reversed(self.question_ids))
+        self.db.execute_update("DELETE FROM questions WHERE id = ?", (self.question_ids[0],))
+        self.assertEqual([q['id'] for q in load_questions_in_order(self.db, order)], order[:-1])
+
+    def test_checkpoint_from_older_version_is_ignored(self):
+        checkpoint = self._checkpoint()
+        with open(checkpoint.path, 'w', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write('{"version": 1, "session_id": 1, "question_ids": [1], "option_order": {}}')
+        self.assertIsNone(checkpoint.load())
+
+    def test_saved_answers_include_unflushed_journal_entries(self):
+        first, second, third = self.question_ids[:3]
+        self.db.execute_many(
+            "INSERT INTO user_answers (session_id, question_id, selected_option_id, answer_text) VALUES (?, ?, ?, ?)",
+            [(self.SESSION_ID, first, 5, None), (self.SESSION_ID, second, 6, None)]
+        )
+        journal_dir = str(Path(self.temp_dir.name) / 'journal')
+        journal = AnswerJournal(self.SESSION_ID, self.db, journal_dir=journal_dir, flush_interval=3600)
+        journal.record_answer(second, selected_option_ids='[7, 8]')
+        journal.record_answer(third, answer_text='True')
+
+        # A new journal for the same session picks up entries that never reached the database
+        reopened = AnswerJournal(self.SESSION_ID, self.db, journal_dir=journal_dir, flush_interval=3600)
+        answers = load_saved_answers(self.db, self.SESSION_ID, reopened)
+        self.assertEqual(answers, {
+            first: {'selected_option_id': '5'},
+            second: {'selected_option_ids': [7, 8]},
+            third: {'answer_text': 'True'},
+        })
+        self.assertTrue(reopened.close())
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.exam_telemetry import ExamTelemetry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 500.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestExamTelemetry(unittest.TestCase):
+    """Tests for the per-question exam event recorder."""
+
+    SESSION_ID = 1700000000
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _telemetry(self, **kwargs):
+        return ExamTelemetry(self.SESSION_ID, self.db, clock=self.clock, flush_interval=30, **kwargs)
+
+    def _events(self):
+        return [(row['question_id'], row['event_type'], row['duration_ms']) for row in self.db.execute_query(
+            "SELECT question_id, event_type, duration_ms FROM session_events WHERE session_id = ? ORDER BY id",
+            (self.SESSION_ID,)
+        )]
+
+    def test_dwell_time_accumulates_across_visits(self):
+        telemetry = self._telemetry()
+        telemetry.question_shown(1)
+        self.clock.now += 10
+        telemetry.question_shown(2)
+        self.clock.now += 4
+        telemetry.question_shown(1)
+        self.clock.now += 5
+
+        self.assertAlmostEqual(telemetry.time_spent(1), 15)
+        self.assertAlmostEqual(telemetry.time_spent(2), 4)
+        self.assertEqual(telemetry.time_spent_by_question(), {1: 15, 2: 4})
+
+    def test_unfocused_time_is_not_counted(self):
+        telemetry = self._telemetry()
+        telemetry.question_shown(1)
+        self.clock.now += 3
+        telemetry.focus_changed(False)
+        self.clock.now += 60
+        telemetry.focus_changed(True)
+        self.clock.now += 2
+
+        self.assertAlmostEqual(telemetry.time_spent(1), 5)
+        self.assertEqual(telemetry.focus_loss_count, 1)
+
+    def test_events_are_batched(self):
+        telemetry = self._telemetry()
+        telemetry.question_shown(1)
+        telemetry.answer_changed(1, {'selected_option_id': '4'})
+        telemetry.answer_changed(1, {'selected_option_id': '4'})  # re-saved on navigation
+        self.clock.now += 2
+        telemetry.question_shown(2)
+        telemetry.review_marked(2, True)
+
+        self.assertEqual(self._events(), [])
+        self.assertFalse(telemetry.flush_if_due())
+        self.clock.now += 30
+        self.assertTrue(telemetry.flush_if_due())
+        self.assertEqual(self._events(), [
+            (1, 'view', None), (1, 'answer', None), (1, 'leave', 2000), (2, 'view', None), (2, 'mark', None),
+        ])
+        self.assertEqual(telemetry.pending_count(), 0)
+
+    def test_events_are_not_stored_without_logging(self):
+        telemetry = self._telemetry(persist_events=False)
+        telemetry.question_shown(1)
+        self.clock.now += 7
+        telemetry.finish()
+        telemetry.flush()
+
+        self.assertEqual(self._events(), [])
+        self.assertAlmostEqual(telemetry.time_spent(1), 7)
+
+    def test_write_time_spent_at_submit(self):
+        self.db.execute_many(
+            "INSERT INTO user_answers (session_id, question_id, answer_text, time_spent_seconds) VALUES (?, ?, 'x', 0)",
+            [(self.SESSION_ID, 1), (self.SESSION_ID, 2)]
+        )
+        # Resumed session: 20 seconds already spent on question 2
+        telemetry = self._telemetry(time_spent={2: 20.0})
+        telemetry.question_shown(1)
+        self.clock.now += 12.4
+        telemetry.question_shown(3)  # viewed, never answered
+        self.clock.now += 1
+        telemetry.finish()
+
+        self.assertEqual(telemetry.write_time_spent(), 2)
+        rows = self.db.execute_query(
+            "SELECT question_id, time_spent_seconds FROM user_answers WHERE session_id = ? ORDER BY question_id",
+            (self.SESSION_ID,)
+        )
+        self.assertEqual([(row['question_id'], row['time_spent_seconds']) for row in rows], [(1, 12), (2, 20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
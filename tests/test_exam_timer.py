@@ -0,0 +1,66 @@
+import threading
+import unittest
+
+from quiz_app.utils.exam_timer import ExamTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestExamTimer(unittest.TestCase):
+    """Tests for the monotonic-deadline exam countdown."""
+
+    def test_remaining_follows_the_deadline_not_tick_count(self):
+        clock = FakeClock()
+        timer = ExamTimer(600, lambda remaining: None, lambda: None, clock=clock)
+        self.assertEqual(timer.remaining(), 600)
+
+        timer._deadline = clock() + 600
+        clock.now += 0.4
+        self.assertEqual(timer.remaining(), 600)
+        # A tick delayed by several seconds still shows the exact time left
+        clock.now += 7.3
+        self.assertEqual(timer.remaining(), 593)
+        clock.now += 1000
+        self.assertEqual(timer.remaining(), 0)
+
+    def test_unfocused_timer_wakes_less_often_but_not_past_the_deadline(self):
+        clock = FakeClock()
+        timer = ExamTimer(600, lambda remaining: None, lambda: None, unfocused_interval=5, clock=clock)
+        timer._deadline = clock() + 600.25
+        self.assertAlmostEqual(timer._next_wait(), 0.251, places=3)
+
+        timer.set_focused(False)
+        self.assertAlmostEqual(timer._next_wait(), 5.001, places=3)
+        clock.now = timer._deadline - 2
+        self.assertAlmostEqual(timer._next_wait(), 2.001, places=3)
+
+    def test_ticks_and_expires(self):
+        ticks = []
+        expired = threading.Event()
+        timer = ExamTimer(1.2, ticks.append, expired.set)
+        timer.start()
+
+        self.assertTrue(expired.wait(5))
+        self.assertEqual(ticks[0], 2)
+        self.assertEqual(ticks[-1], 0)
+        self.assertFalse(timer.running)
+
+    def test_stop_does_not_expire(self):
+        expired = threading.Event()
+        timer = ExamTimer(60, lambda remaining: None, expired.set)
+        timer.start()
+        timer.stop()
+        timer._thread.join(5)
+
+        self.assertFalse(timer._thread.is_alive())
+        self.assertFalse(expired.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
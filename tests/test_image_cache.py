@@ -0,0 +1,98 @@
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils import asset_server
+from quiz_app.utils.image_cache import QuestionImageCache
+
+
+class TestQuestionImageCache(unittest.TestCase):
+    """Tests for the exam interface's per-session image cache."""
+
+    IMAGE_SIZE = 3000
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Images', 1)")
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type) VALUES (?, ?, 'single_choice')",
+            [(exam_id, f"Question {i}") for i in range(5)]
+        )
+        self.question_ids = [row['id'] for row in self.db.execute_query("SELECT id FROM questions ORDER BY id")]
+        for question_id in self.question_ids[:4]:
+            self.db.store_question_image(question_id, bytes([question_id]) * self.IMAGE_SIZE, 'q.png', 'image/png')
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_hits_and_misses(self):
+        cache = QuestionImageCache(self.db)
+        first = cache.get(self.question_ids[0])
+        with urllib.request.urlopen(first['src']) as response:
+            self.assertEqual(response.read(), bytes([self.question_ids[0]]) * self.IMAGE_SIZE)
+        self.assertEqual(cache.get(self.question_ids[0]), first)
+        # A question without an image is cached as such
+        self.assertIsNone(cache.get(self.question_ids[4]))
+        self.assertIsNone(cache.get(self.question_ids[4]))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 2))
+        cache.close()
+
+    def test_evicts_least_recently_used_within_budget(self):
+        cache = QuestionImageCache(self.db, max_bytes=self.IMAGE_SIZE * 2)
+        first, second, third = self.question_ids[:3]
+        cache.get(first)
+        cache.get(second)
+        cache.get(first)  # first becomes most recently used
+        cache.get(third)  # evicts second
+
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], self.IMAGE_SIZE * 2)
+        cache.get(first)
+        self.assertEqual(cache.stats()['hits'], 2)
+        cache.get(second)
+        self.assertEqual(cache.stats()['misses'], 4)
+        cache.close()
+
+    def test_prefetch_warms_cache(self):
+        cache = QuestionImageCache(self.db)
+        cache.prefetch(self.question_ids[1:3])
+        deadline = time.time() + 5
+        while cache.stats()['prefetched'] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(cache.stats()['prefetched'], 2)
+        self.assertIsNotNone(cache.get(self.question_ids[1]))
+        self.assertEqual(cache.stats()['misses'], 0)
+        cache.close()
+
+    def test_cached_urls_outlive_asset_server_eviction(self):
+        server = asset_server.AssetServer(max_bytes=self.IMAGE_SIZE)
+        with mock.patch.object(asset_server, '_server', server):
+            cache = QuestionImageCache(self.db)
+            url = cache.get(self.question_ids[0])['src']
+            # Unrelated assets push the server over its budget
+            server.publish(b'chart' * self.IMAGE_SIZE, 'image/png')
+            with urllib.request.urlopen(url) as response:
+                self.assertEqual(response.read(), bytes([self.question_ids[0]]) * self.IMAGE_SIZE)
+
+            # Dropped by the cache, the image becomes evictable
+            cache.close()
+            server.publish(b'other' * self.IMAGE_SIZE, 'image/png')
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(url)
+            self.assertEqual(ctx.exception.code, 404)
+        server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class TestQuestionImageStore(unittest.TestCase):
+    """Tests for the content-addressed question image store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Images', 1)")
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type) VALUES (?, ?, 'single_choice')",
+            [(exam_id, f"Question {i}") for i in range(3)]
+        )
+        self.q1, self.q2, self.q3 = [row['id'] for row in self.db.execute_query("SELECT id FROM questions ORDER BY id")]
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _stored_images(self):
+        return self.db.execute_single("SELECT COUNT(*) as count FROM question_images")['count']
+
+    def test_identical_uploads_are_stored_once(self):
+        self.assertTrue(self.db.store_question_image(self.q1, b'diagram', 'a.png', 'image/png'))
+        self.assertTrue(self.db.store_question_image(self.q2, b'diagram', 'b.png', 'image/png'))
+        self.assertEqual(self._stored_images(), 1)
+
+        image = self.db.get_question_image(self.q2)
+        self.assertEqual((image['data'], image['filename']), (b'diagram', 'b.png'))
+        self.assertIsNone(self.db.get_question_image(self.q3))
+
+    def test_unused_images_are_removed(self):
+        self.db.store_question_image(self.q1, b'first', 'a.png', 'image/png')
+        self.db.store_question_image(self.q2, b'first', 'a.png', 'image/png')
+
+        # Replacing q1's image keeps the original alive for q2
+        self.db.store_question_image(self.q1, b'second', 'b.png', 'image/png')
+        self.assertEqual(self._stored_images(), 2)
+
+        self.db.delete_question_image(self.q2)
+        self.assertEqual(self._stored_images(), 1)
+        self.assertIsNone(self.db.get_question_image(self.q2))
+        self.assertEqual(self.db.get_question_image(self.q1)['data'], b'second')
+
+    @unittest.skipIf(Image is None, "Pillow not installed")
+    def test_smallest_fitting_variant_is_served(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (1600, 800), 'navy').save(buffer, format='PNG')
+        self.db.store_question_image(self.q1, buffer.getvalue(), 'big.png', 'image/png')
+
+        thumbnail = self.db.get_question_image(self.q1, max_size=120)
+        display = self.db.get_question_image(self.q1, max_size=600)
+        original = self.db.get_question_image(self.q1)
+        self.assertEqual([thumbnail['variant'], display['variant'], original['variant']],
+                         ['thumbnail', 'display', 'original'])
+        self.assertEqual(Image.open(io.BytesIO(display['data'])).size, (600, 300))
+        self.assertLess(len(thumbnail['data']), len(display['data']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from quiz_app.database import migrations
+from quiz_app.database.database import Database, create_tables
+
+
+class TestMigrations(unittest.TestCase):
+    """Tests for the PRAGMA user_version migration engine."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / 'test.db'
+        self.db = Database(db_path=str(self.db_path))
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _base_schema_only(self):
+        return mock.patch.object(migrations, 'MIGRATIONS', migrations.MIGRATIONS[:1])
+
+    def test_base_schema_backfills_legacy_columns(self):
+        """Migration 1 upgrades a legacy users table and records the version."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, '
+                     'password_hash TEXT, full_name TEXT, role TEXT)')
+        conn.execute("INSERT INTO users (username) VALUES ('legacy')")
+        conn.commit()
+        conn.close()
+
+        with self._base_schema_only():
+            self.assertEqual(migrations.run_migrations(self.db), 1)
+
+        self.assertEqual(migrations.get_schema_version(self.db), 1)
+        user = self.db.execute_single('SELECT section, unit, language_preference FROM users')
+        self.assertEqual(user, {'section': None, 'unit': None, 'language_preference': 'en'})
+
+    def test_current_schema_is_a_no_op(self):
+        """A database already at the latest version runs nothing."""
+        with self._base_schema_only():
+            migrations.run_migrations(self.db)
+            with mock.patch('quiz_app.database.migrations.create_base_schema') as create_base_schema:
+                self.assertEqual(migrations.run_migrations(self.db), 0)
+                create_base_schema.assert_not_called()
+
+    def test_failed_migration_rolls_back(self):
+        """A failing migration leaves neither its changes nor its version behind."""
+        def broken(db):
+            db.execute_update('CREATE TABLE half_done (id INTEGER)')
+            raise RuntimeError('boom')
+
+        with mock.patch.object(migrations, 'MIGRATIONS', [(1, 'broken', broken)]):
+            with self.assertRaises(RuntimeError):
+                migrations.run_migrations(self.db)
+
+        self.assertEqual(migrations.get_schema_version(self.db), 0)
+        self.assertIsNone(self.db.execute_single(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'half_done'"
+        ))
+
+    def test_image_migration_deduplicates_legacy_blobs(self):
+        """Migration 3 moves per-question BLOBs into the content-addressed store."""
+        with self._base_schema_only():
+            migrations.run_migrations(self.db)
+        exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Legacy', 1)")
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type, image_data, image_filename) "
+            "VALUES (?, ?, 'single_choice', ?, 'scan.png')",
+            [(exam_id, 'Q1', b'same-bytes'), (exam_id, 'Q2', b'same-bytes'), (exam_id, 'Q3', b'other')]
+        )
+        self.db.get_connection().execute('PRAGMA user_version = 2')
+
+        with mock.patch.object(migrations, 'MIGRATIONS', [migrations.MIGRATIONS[0], migrations.MIGRATIONS[2]]):
+            self.assertEqual(migrations.run_migrations(self.db), 1)
+
+        self.assertEqual(self.db.execute_single('SELECT COUNT(*) as count FROM question_images')['count'], 2)
+        legacy = self.db.execute_single('SELECT COUNT(*) as count FROM questions WHERE image_data IS NOT NULL')
+        self.assertEqual(legacy['count'], 0)
+        question_id = self.db.execute_single("SELECT id FROM questions WHERE question_text = 'Q2'")['id']
+        self.assertEqual(self.db.get_question_image(question_id)['data'], b'same-bytes')
+
+    def test_create_tables_matches_migrated_schema(self):
+        """create_tables() and stepwise upgrades from version 1 end at the same schema."""
+        schema_only = [m for m in migrations.MIGRATIONS if m[0] not in migrations.SEED_MIGRATIONS]
+        with mock.patch.object(migrations, 'MIGRATIONS', schema_only[:1]):
+            migrations.run_migrations(self.db)
+        with mock.patch.object(migrations, 'MIGRATIONS', schema_only):
+            self.assertEqual(migrations.run_migrations(self.db), len(schema_only) - 1)
+
+        fresh = Database(db_path=str(Path(self.temp_dir.name) / 'fresh.db'))
+        create_tables(fresh)
+        schema = "SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' ORDER BY type, name"
+        self.assertEqual(fresh.execute_query(schema), self.db.execute_query(schema))
+        fresh.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import unittest
+from unittest import mock
+
+from quiz_app.utils import pdf_fonts
+
+
+class TestPDFFontRegistry(unittest.TestCase):
+    """Tests for the process-wide PDF font and style registry."""
+
+    FONTS = dict(pdf_fonts.HELVETICA_FONTS)
+
+    def setUp(self):
+        self._saved = (pdf_fonts._fonts, dict(pdf_fonts._stylesheets))
+        pdf_fonts._fonts = None
+        pdf_fonts._stylesheets.clear()
+
+    def tearDown(self):
+        pdf_fonts._fonts = self._saved[0]
+        pdf_fonts._stylesheets.clear()
+        pdf_fonts._stylesheets.update(self._saved[1])
+
+    def test_fonts_registered_once_across_threads(self):
+        with mock.patch.object(pdf_fonts, '_register_fonts', return_value=self.FONTS) as register:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(pdf_fonts.get_pdf_fonts())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            pdf_fonts.warm_pdf_fonts().join()
+
+        self.assertEqual(register.call_count, 1)
+        self.assertTrue(all(result is self.FONTS for result in results))
+
+    def test_stylesheet_built_once_per_name(self):
+        built = []
+
+        def build(fonts):
+            built.append(fonts)
+            return object()
+
+        with mock.patch.object(pdf_fonts, '_register_fonts', return_value=self.FONTS):
+            first = pdf_fonts.cached_stylesheet('exam_paper', build)
+            self.assertIs(pdf_fonts.cached_stylesheet('exam_paper', build), first)
+            self.assertIsNot(pdf_fonts.cached_stylesheet('report', build), first)
+        self.assertEqual(built, [self.FONTS, self.FONTS])
+
+    def test_warmup_failure_is_logged(self):
+        with mock.patch.object(pdf_fonts, '_register_fonts', side_effect=ImportError('reportlab')):
+            with self.assertLogs(pdf_fonts.logger, level='WARNING'):
+                pdf_fonts.warm_pdf_fonts().join()
+        self.assertIsNone(pdf_fonts._fonts)
+
+
+if __name__ == '__main__':
+    unittest.main()
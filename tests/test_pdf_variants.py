@@ -0,0 +1,193 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.pdf_cache import PDFCache
+from quiz_app.utils.pdf_variants import PDFVariantExporter, build_variant_snapshots, save_variant_snapshots
+
+
+def fake_render(db_path, assignment, snapshot, variant_num, kind, output_path, snapshot_data=None):
+    """Stand-in for render_document() that writes the inputs instead of a PDF."""
+    with open(output_path, 'w') as output_file:
+        json.dump({'variant': variant_num, 'kind': kind, 'snapshot': snapshot, 'data': snapshot_data}, output_file)
+    return output_path
+
+
+rendered = []
+
+
+def counting_render(db_path, assignment, snapshot, variant_num, kind, output_path, snapshot_data=None):
+    rendered.append((variant_num, kind))
+    return fake_render(db_path, assignment, snapshot, variant_num, kind, output_path, snapshot_data)
+
+
+def slow_render(db_path, assignment, snapshot, variant_num, kind, output_path, snapshot_data=None):
+    time.sleep(0.3)
+    return fake_render(db_path, assignment, snapshot, variant_num, kind, output_path)
+
+
+def pid_render(db_path, assignment, snapshot, variant_num, kind, output_path, snapshot_data=None):
+    """Writes the id of the process that rendered the document."""
+    with open(output_path, 'w') as output_file:
+        output_file.write(str(os.getpid()))
+    return output_path
+
+
+def failing_render(db_path, assignment, snapshot, variant_num, kind, output_path, snapshot_data=None):
+    if variant_num == 2:
+        raise ValueError('broken question')
+    return fake_render(db_path, assignment, snapshot, variant_num, kind, output_path)
+
+
+class TestPDFVariantExporter(unittest.TestCase):
+    """Tests for parallel PDF variant export."""
+
+    MASTER = [
+        {'topic_id': 1, 'topic_title': 'Orbits', 'questions': list(range(1, 21))},
+        {'topic_id': 2, 'topic_title': 'Antennas', 'questions': list(range(21, 31))},
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+        self.assignment = {'id': 7, 'assignment_name': 'Final', 'duration_minutes': 60}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_variant_snapshots(self):
+        snapshots = build_variant_snapshots(self.MASTER, 3, randomize=True)
+        self.assertEqual(len(snapshots), 3)
+        self.assertIs(snapshots[0], self.MASTER)
+        for snapshot in snapshots[1:]:
+            for topic, master_topic in zip(snapshot, self.MASTER):
+                self.assertEqual(sorted(topic['questions']), master_topic['questions'])
+        self.assertEqual(build_variant_snapshots(self.MASTER, 2, randomize=False), [self.MASTER, self.MASTER])
+
+        # Re-exports keep earlier shuffles unless the question set changed
+        stored = {1: self.MASTER, 2: snapshots[1], 3: [dict(self.MASTER[0], questions=[1, 2]), self.MASTER[1]]}
+        again = build_variant_snapshots(self.MASTER, 3, randomize=True, stored=stored)
+        self.assertEqual(again[1], snapshots[1])
+        self.assertEqual(sorted(again[2][0]['questions']), self.MASTER[0]['questions'])
+
+    def test_renders_every_document_in_processes(self):
+        snapshots = build_variant_snapshots(self.MASTER, 3, randomize=True)
+        progress = []
+        exporter = PDFVariantExporter('unused.db', max_workers=2, render=fake_render)
+        snapshot_data = {'questions': {}, 'options': {}}
+        files = exporter.run(self.assignment, snapshots, self.output_dir,
+                             lambda done, total: progress.append((done, total)), snapshot_data)
+
+        self.assertEqual([f['exam_id'] for f in files], ['EXAM-000007-V1', 'EXAM-000007-V2', 'EXAM-000007-V3'])
+        self.assertEqual(progress, [(done, 6) for done in range(1, 7)])
+        for variant, (snapshot, variant_files) in enumerate(zip(snapshots, files), start=1):
+            for kind in ('paper', 'answers'):
+                with open(variant_files[kind]) as rendered:
+                    self.assertEqual(json.load(rendered), {'variant': variant, 'kind': kind, 'snapshot': snapshot,
+                                                           'data': snapshot_data})
+
+    def test_exports_share_worker_processes(self):
+        """Later exports reuse the worker processes started by the first one."""
+        pids = set()
+        for _ in range(2):
+            exporter = PDFVariantExporter('unused.db', max_workers=2, render=pid_render)
+            for files in exporter.run(self.assignment, build_variant_snapshots(self.MASTER, 3, False), self.output_dir):
+                for kind in ('paper', 'answers'):
+                    with open(files[kind]) as rendered:
+                        pids.add(int(rendered.read()))
+
+        self.assertLessEqual(len(pids), 2)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_cancel_removes_partial_output(self):
+        exporter = PDFVariantExporter('unused.db', max_workers=2, render=slow_render)
+        snapshots = build_variant_snapshots(self.MASTER, 6, randomize=False)
+        threading.Timer(0.1, exporter.cancel).start()
+
+        self.assertIsNone(exporter.run(self.assignment, snapshots, self.output_dir))
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_render_error_propagates(self):
+        exporter = PDFVariantExporter('unused.db', max_workers=1, render=failing_render)
+        with self.assertRaises(ValueError):
+            exporter.run(self.assignment, build_variant_snapshots(self.MASTER, 3, False), self.output_dir)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_snapshots_saved_together(self):
+        db = Database(db_path=str(Path(self.output_dir) / 'test.db'))
+        create_tables(db)
+        snapshots = build_variant_snapshots(self.MASTER, 2, randomize=True)
+        files = PDFVariantExporter('unused.db', max_workers=1, render=fake_render).run(
+            self.assignment, snapshots, self.output_dir
+        )
+
+        self.assertEqual(save_variant_snapshots(db, 7, snapshots, files, exported_by=1), 2)
+        rows = db.execute_query("SELECT variant_number, question_snapshot, file_path FROM pdf_exports ORDER BY variant_number")
+        self.assertEqual([json.loads(row['question_snapshot']) for row in rows], snapshots)
+        self.assertEqual([row['file_path'] for row in rows], [f['paper'] for f in files])
+        db.close()
+
+
+class TestPDFCache(unittest.TestCase):
+    """Tests for reusing rendered documents across exports."""
+
+    MASTER = TestPDFVariantExporter.MASTER[:1]
+    LAYOUT = {'version': 1, 'fonts': {'family': 'Helvetica'}, 'logo': None, 'footer': ['WARNING']}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PDFCache(os.path.join(self.temp_dir.name, 'cache'))
+        self.assignment = {'id': 7, 'assignment_name': 'Final', 'duration_minutes': 60}
+        self.snapshot_data = {
+            'questions': {qid: {'id': qid, 'question_text': f"Question {qid}", 'question_type': 'single_choice',
+                                'points': 1.0} for qid in self.MASTER[0]['questions']},
+            'options': {1: [{'id': 1, 'option_text': 'GEO', 'is_correct': 1}]},
+        }
+        rendered.clear()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def export(self, name, snapshot_data=None, layout=LAYOUT):
+        output_dir = os.path.join(self.temp_dir.name, name)
+        os.makedirs(output_dir)
+        exporter = PDFVariantExporter('unused.db', max_workers=1, render=counting_render, cache=self.cache)
+        snapshots = build_variant_snapshots(self.MASTER, 2, randomize=False)
+        return exporter.run(self.assignment, snapshots, output_dir, None,
+                            snapshot_data or self.snapshot_data, layout)
+
+    def test_unchanged_export_is_copied(self):
+        first = self.export('first')
+        self.assertEqual(len(rendered), 4)
+        second = self.export('second')
+        self.assertEqual(len(rendered), 4)
+        for first_files, second_files in zip(first, second):
+            for kind in ('paper', 'answers'):
+                self.assertEqual(Path(first_files[kind]).read_text(), Path(second_files[kind]).read_text())
+
+    def test_edits_invalidate(self):
+        self.export('first')
+        self.snapshot_data['options'][1][0]['option_text'] = 'LEO'
+        self.export('option_edit')
+        self.assertEqual(len(rendered), 8)
+        self.export('layout_edit', layout=dict(self.LAYOUT, version=2))
+        self.assertEqual(len(rendered), 12)
+
+        self.assignment['duration_minutes'] = 90
+        self.export('assignment_edit')
+        self.assertEqual(len(rendered), 16)
+
+    def test_prune_to_size_limit(self):
+        self.export('first')
+        self.cache.max_bytes = 0
+        self.assertEqual(self.cache.prune(), 4)
+        self.assertEqual(os.listdir(self.cache.cache_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
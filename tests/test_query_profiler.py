@@ -0,0 +1,79 @@
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database import profiler as query_profiling
+from quiz_app.database.database import Database
+from quiz_app.database.profiler import fingerprint
+
+
+class TestQueryProfiler(unittest.TestCase):
+    """Tests for the opt-in SQL profiler and slow-query log."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        self.db.execute_update('CREATE TABLE user_answers (id INTEGER PRIMARY KEY, session_id INTEGER, score REAL)')
+        self.db.execute_many('INSERT INTO user_answers (session_id, score) VALUES (?, ?)',
+                             [(i % 7, i) for i in range(200)])
+        self.log_path = str(Path(self.temp_dir.name) / 'logs' / 'slow_queries.log')
+
+    def tearDown(self):
+        query_profiling.disable_profiling()
+        slow_logger = logging.getLogger('quiz_app.slow_queries')
+        for handler in list(slow_logger.handlers):
+            handler.close()
+            slow_logger.removeHandler(handler)
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_fingerprint_normalizes_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM users  WHERE id = 42 AND name = 'O''Brien' -- lookup"),
+            "SELECT * FROM users WHERE id = ? AND name = ?"
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t1 WHERE id IN (?, ?, ?)"),
+            fingerprint("SELECT * FROM t1 WHERE id IN (1,2)")
+        )
+
+    def test_disabled_records_nothing(self):
+        profiler = query_profiling.enable_profiling()
+        profiler.reset()
+        query_profiling.disable_profiling()
+        self.assertIsNone(query_profiling.get_active_profiler())
+        self.db.execute_query('SELECT COUNT(*) FROM user_answers')
+        self.assertEqual(query_profiling.get_profiler().top_offenders(), [])
+
+    def test_records_by_fingerprint_and_caller(self):
+        profiler = query_profiling.enable_profiling(threshold_ms=10_000)
+        profiler.reset()
+        for session_id in range(3):
+            self.db.execute_query('SELECT * FROM user_answers WHERE session_id = ?', (session_id,))
+        list(self.db.execute_iter('SELECT score FROM user_answers'))
+
+        offenders = {entry['fingerprint']: entry for entry in profiler.top_offenders(order_by='count')}
+        entry = offenders['SELECT * FROM user_answers WHERE session_id = ?']
+        self.assertEqual(entry['count'], 3)
+        self.assertEqual(sum(entry['histogram'].values()), 3)
+        self.assertEqual(entry['caller'], 'test_query_profiler:TestQueryProfiler.test_records_by_fingerprint_and_caller')
+        self.assertIn('SELECT score FROM user_answers', offenders)
+
+    def test_slow_statements_are_logged_with_plan(self):
+        profiler = query_profiling.enable_profiling(threshold_ms=0)
+        profiler.reset()
+        profiler.log_path = self.log_path
+        profiler._slow_logger = None
+        self.db.execute_query('SELECT * FROM user_answers WHERE session_id = ?', (3,))
+
+        entry = profiler.top_offenders(limit=1)[0]
+        self.assertEqual(entry['slow_count'], 1)
+        self.assertTrue(any('SCAN' in step or 'SEARCH' in step for step in entry['plan']))
+        log_text = Path(self.log_path).read_text(encoding='utf-8')
+        self.assertIn('PLAN', log_text)
+        self.assertIn('WHERE session_id = ?', log_text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+try:
+    import flet as ft
+    from quiz_app.views.examinee.question_navigator import QuestionNavigator
+except ImportError:  # pragma: no cover - flet is a runtime dependency of the UI only
+    ft = None
+
+COLORS = {
+    'primary': '#3182ce', 'current': '#3182ce', 'answered': '#38a169', 'marked': '#d69e2e',
+    'unanswered': '#e2e8f0', 'surface': '#ffffff', 'border': '#e2e8f0',
+    'text_primary': '#1a202c', 'text_secondary': '#718096',
+}
+
+
+@unittest.skipIf(ft is None, "flet is not installed")
+class TestQuestionNavigator(unittest.TestCase):
+    """Tests for the incrementally updated exam navigator."""
+
+    def setUp(self):
+        self.questions = [{'id': 100 + i} for i in range(6)]
+        topics = {q['id']: ('Math' if i % 2 == 0 else 'Physics') for i, q in enumerate(self.questions)}
+        self.selected = []
+        self.navigator = QuestionNavigator(
+            self.questions, topics, COLORS, self.selected.append, ft.Text("10:00"),
+            answered_ids={101: {}}, marked_ids={104}
+        )
+
+    def test_initial_state(self):
+        self.assertEqual(self.navigator.answered_count, 1)
+        self.assertEqual(self.navigator.buttons[0].bgcolor, COLORS['current'])
+        self.assertEqual(self.navigator.buttons[1].bgcolor, COLORS['answered'])
+        self.assertEqual(self.navigator.buttons[4].bgcolor, COLORS['marked'])
+        self.assertEqual(self.navigator._topic_header_counts['Physics'].value, '1/3')
+
+        self.navigator.buttons[3].on_click(None)
+        self.assertEqual(self.selected, [3])
+
+    def test_navigation_only_touches_two_buttons(self):
+        changed = self.navigator.show(2, {101: {}}, {104})
+        self.assertEqual(changed, [self.navigator.buttons[0], self.navigator.buttons[2]])
+        self.assertEqual(self.navigator.buttons[0].bgcolor, COLORS['unanswered'])
+        self.assertEqual(self.navigator.buttons[2].bgcolor, COLORS['current'])
+
+    def test_answer_on_left_question_updates_counts(self):
+        # Question 0 was answered before moving to question 3
+        answers = {100: {}, 101: {}}
+        changed = self.navigator.show(3, answers, {104})
+
+        self.assertEqual(self.navigator.answered_count, 2)
+        self.assertEqual(self.navigator.buttons[0].bgcolor, COLORS['answered'])
+        self.assertEqual(self.navigator._topic_header_counts['Math'].value, '1/3')
+        self.assertEqual(self.navigator._topic_overview_counts['Math'].value, '1/3')
+        self.assertEqual(self.navigator._answered_text.value.split()[0], '2')
+        self.assertAlmostEqual(self.navigator._progress_bar.value, 2 / 6)
+        self.assertIn(self.navigator._topic_header_counts['Math'], changed)
+        self.assertNotIn(self.navigator._topic_header_counts['Physics'], changed)
+
+        # Clearing the answer reverses the counts
+        self.navigator.show(0, answers, {104})
+        self.navigator.show(0, {101: {}}, {104})
+        self.assertEqual(self.navigator.answered_count, 1)
+        self.assertEqual(self.navigator._topic_header_counts['Math'].value, '0/3')
+
+    def test_unchanged_refresh_reports_nothing(self):
+        self.assertEqual(self.navigator.show(0, {101: {}}, {104}), [])
+
+    def test_mark_for_review(self):
+        self.navigator.show(1, {101: {}}, {104, 101})
+        changed = self.navigator.show(2, {101: {}}, {104, 101})
+        self.assertIn(self.navigator.buttons[1], changed)
+        self.assertEqual(self.navigator.buttons[1].bgcolor, COLORS['marked'])
+
+
+if __name__ == '__main__':
+    unittest.main()
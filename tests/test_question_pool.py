@@ -0,0 +1,102 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.question_pool import QuestionPoolIndex, fetch_questions, get_pool_index
+
+
+class TestQuestionPoolIndex(unittest.TestCase):
+    """Tests for the in-memory index of active questions."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        user_id = self.db.execute_insert(
+            "INSERT INTO users (username, email, password_hash, full_name, role) "
+            "VALUES ('admin', 'admin@example.com', 'x', 'Admin', 'admin')"
+        )
+        self.exam_ids = [
+            self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES (?, ?)", (title, user_id))
+            for title in ('First', 'Second')
+        ]
+        for exam_id in self.exam_ids:
+            self.db.execute_many(
+                "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level, order_index) "
+                "VALUES (?, ?, 'single_choice', ?, ?)",
+                [(exam_id, f"Q{i}", difficulty, 10 - i)
+                 for i, difficulty in enumerate(['easy'] * 4 + ['medium'] * 3 + ['hard'])]
+            )
+        self.index = get_pool_index(self.db)
+        self.index.invalidate()
+
+    def tearDown(self):
+        self.index.invalidate()
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _ids(self, exam_id, difficulty):
+        return [row['id'] for row in self.db.execute_query("""
+            SELECT id FROM questions WHERE exam_id = ? AND difficulty_level = ? AND is_active = 1
+            ORDER BY order_index, id
+        """, (exam_id, difficulty))]
+
+    def test_counts_and_order(self):
+        self.assertEqual(self.index.counts(self.db, self.exam_ids[0]),
+                         {'total': 8, 'easy': 4, 'medium': 3, 'hard': 1})
+        self.assertEqual(list(self.index.question_ids(self.db, [self.exam_ids[0]], 'easy')),
+                         self._ids(self.exam_ids[0], 'easy'))
+        self.assertEqual(list(self.index.question_ids(self.db, self.exam_ids, 'medium')),
+                         self._ids(self.exam_ids[0], 'medium') + self._ids(self.exam_ids[1], 'medium'))
+        # Shared by every Database instance on the same file
+        other = Database(db_path=self.db.db_path)
+        self.assertIs(get_pool_index(other), self.index)
+        other.close()
+
+    def test_writes_rebuild_only_the_changed_exam(self):
+        first, second = self.exam_ids
+        self.index.counts(self.db, first)
+        second_pool = self.index._pools_for(self.db, [second])[0]
+
+        easy = self._ids(first, 'easy')
+        self.db.execute_update("UPDATE questions SET is_active = 0 WHERE id = ?", (easy[0],))
+        self.assertEqual(self.index.counts(self.db, first)['easy'], 3)
+
+        self.db.execute_update("UPDATE questions SET difficulty_level = 'hard' WHERE id = ?", (easy[1],))
+        self.assertEqual(self.index.counts(self.db, first)['hard'], 2)
+
+        self.db.execute_update("DELETE FROM questions WHERE id = ?", (easy[2],))
+        self.db.execute_insert(
+            "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level) "
+            "VALUES (?, 'New', 'single_choice', 'medium')", (first,)
+        )
+        self.assertEqual(self.index.counts(self.db, first), {'total': 7, 'easy': 1, 'medium': 4, 'hard': 2})
+
+        # Text edits do not touch the pool
+        version = self.index._pools_for(self.db, [first])[0].version
+        self.db.execute_update("UPDATE questions SET question_text = 'Edited' WHERE exam_id = ?", (first,))
+        self.assertEqual(self.index._pools_for(self.db, [first])[0].version, version)
+        self.assertIs(self.index._pools_for(self.db, [second])[0], second_pool)
+
+    def test_sample_and_fetch(self):
+        exam_id = self.exam_ids[0]
+        available = self._ids(exam_id, 'easy')
+        sampled = self.index.sample(self.db, [exam_id], 'easy', 3, random.Random(7))
+        self.assertEqual(sampled, random.Random(7).sample(available, 3))
+        self.assertEqual(len(self.index.sample(self.db, [exam_id], 'hard', 5)), 1)
+        self.assertEqual(self.index.sample(self.db, [exam_id], 'missing', 2), [])
+
+        questions = fetch_questions(self.db, sampled + [999999])
+        self.assertEqual([q['id'] for q in questions], sampled)
+        self.assertNotIn('image_data', questions[0])
+
+    def test_memory_database_gets_private_index(self):
+        memory_db = Database(db_path=':memory:')
+        self.assertIsNot(QuestionPoolIndex.for_database(memory_db), QuestionPoolIndex.for_database(memory_db))
+        memory_db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.question_selector import QuestionSelector
+
+
+class TestQuestionProjection(unittest.TestCase):
+    """Question selection must not load image BLOBs."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        self.exam_id = self.db.execute_insert(
+            "INSERT INTO exams (title, created_by) VALUES ('Pool', 1)"
+        )
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level, order_index) "
+            "VALUES (?, ?, 'single_choice', 'easy', ?)",
+            [(self.exam_id, f"Question {i}", i) for i in range(4)]
+        )
+        first_id = self.db.execute_single("SELECT MIN(id) as id FROM questions")['id']
+        self.image_question_id = first_id
+        self.db.store_question_image(first_id, b'\x89PNG' + b'\x00' * 1024, 'diagram.png', 'image/png')
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_selection_excludes_image_columns(self):
+        selector = QuestionSelector(self.db)
+        questions = selector._get_all_exam_questions(self.exam_id)
+
+        self.assertEqual(len(questions), 4)
+        for question in questions:
+            self.assertNotIn('image_data', question)
+            self.assertEqual(question['has_image'], 1 if question['id'] == self.image_question_id else 0)
+
+        pool = selector._select_questions_by_difficulty(self.exam_id, 'easy', 2, session_id=99, start_order_index=0)
+        self.assertEqual(len(pool), 2)
+        self.assertTrue(all('image_data' not in question for question in pool))
+
+    def test_image_bytes_load_on_demand(self):
+        image = self.db.get_question_image(self.image_question_id)
+        self.assertEqual(image['filename'], 'diagram.png')
+        self.assertEqual(len(image['data']), 1028)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.scoring import calculate_session_score
+
+
+class TestSessionScoring(unittest.TestCase):
+    """Tests for the aggregate session scoring engine."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        self.user_id = self.db.execute_insert(
+            "INSERT INTO users (username, email, password_hash, full_name, role) "
+            "VALUES ('examinee', 'examinee@example.com', 'x', 'Examinee', 'examinee')"
+        )
+        self.exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Scoring', ?)", (self.user_id,))
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type, points) VALUES (?, ?, ?, ?)",
+            [
+                (self.exam_id, 'Single', 'single_choice', 2.0),
+                (self.exam_id, 'Multiple', 'multiple_choice', 3.0),
+                (self.exam_id, 'Essay', 'essay', 5.0),
+                (self.exam_id, 'Unanswered', 'true_false', 1.0),
+            ]
+        )
+        self.question_ids = [row['id'] for row in self.db.execute_query("SELECT id FROM questions ORDER BY id")]
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _create_session(self):
+        return self.db.execute_insert(
+            "INSERT INTO exam_sessions (user_id, exam_id, start_time) VALUES (?, ?, CURRENT_TIMESTAMP)",
+            (self.user_id, self.exam_id)
+        )
+
+    def _answer(self, session_id, question_id, points_earned, is_correct, **columns):
+        self.db.execute_insert(
+            """INSERT INTO user_answers (session_id, question_id, answer_text, selected_option_id,
+                                         selected_option_ids, is_correct, points_earned)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (session_id, question_id, columns.get('answer_text'), columns.get('selected_option_id'),
+             columns.get('selected_option_ids'), is_correct, points_earned)
+        )
+
+    def _answer_all(self, session_id):
+        single, multiple, essay, _ = self.question_ids
+        self._answer(session_id, single, 2.0, 1, selected_option_id=1)
+        self._answer(session_id, multiple, 0.0, 0, selected_option_ids='[1, 2]')
+        self._answer(session_id, essay, None, None, answer_text='Ungraded essay')
+
+    def test_scores_regular_exam_session(self):
+        session_id = self._create_session()
+        self._answer_all(session_id)
+
+        score = calculate_session_score(self.db, session_id)
+        self.assertEqual(score['total_questions'], 4)
+        self.assertEqual(score['total_points'], 11.0)
+        self.assertEqual(score['answered_questions'], 3)
+        self.assertEqual(score['graded_questions'], 2)
+        self.assertEqual(score['correct_answers'], 1)
+        self.assertEqual(score['earned_points'], 2.0)
+        self.assertAlmostEqual(score['score_percentage'], 2.0 / 11.0 * 100)
+
+    def test_grading_an_essay_changes_the_score(self):
+        session_id = self._create_session()
+        self._answer_all(session_id)
+        self.db.execute_update(
+            "UPDATE user_answers SET points_earned = 5.0, is_correct = 1 WHERE session_id = ? AND question_id = ?",
+            (session_id, self.question_ids[2])
+        )
+
+        score = calculate_session_score(self.db, session_id)
+        self.assertEqual(score['graded_questions'], 3)
+        self.assertEqual(score['correct_answers'], 2)
+        self.assertEqual(score['earned_points'], 7.0)
+
+    def test_question_pool_session_uses_selected_questions(self):
+        session_id = self._create_session()
+        self.db.execute_many(
+            "INSERT INTO session_questions (session_id, question_id, difficulty_level, order_index) VALUES (?, ?, 'easy', ?)",
+            [(session_id, question_id, index) for index, question_id in enumerate(self.question_ids[:2])]
+        )
+        self._answer_all(session_id)
+
+        score = calculate_session_score(self.db, session_id)
+        self.assertEqual(score['total_questions'], 2)
+        self.assertEqual(score['total_points'], 5.0)
+        self.assertEqual(score['answered_questions'], 2)
+        self.assertAlmostEqual(score['score_percentage'], 40.0)
+
+    def test_explicit_question_ids_before_session_row_exists(self):
+        # At submission the answers are written before the exam_sessions row
+        session_id = 999
+        self._answer_all(session_id)
+
+        score = calculate_session_score(self.db, session_id, self.question_ids)
+        self.assertEqual(score['total_questions'], 4)
+        self.assertEqual(score['answered_questions'], 3)
+        self.assertEqual(score['earned_points'], 2.0)
+
+        empty = calculate_session_score(self.db, session_id, [])
+        self.assertEqual((empty['total_questions'], empty['score_percentage']), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
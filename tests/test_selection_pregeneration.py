@@ -0,0 +1,157 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.question_selector import _claim_pregenerated_selection, pregenerate_assignment_selections
+
+
+class TestSelectionPregeneration(unittest.TestCase):
+    """Tests for question selections generated when an assignment is saved."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        self.db.execute_many(
+            "INSERT INTO users (username, email, password_hash, full_name, role) VALUES (?, ?, 'x', ?, 'examinee')",
+            [(f"user{i}", f"user{i}@example.com", f"User {i}") for i in range(4)]
+        )
+        self.user_ids = [row['id'] for row in self.db.execute_query("SELECT id FROM users ORDER BY id")]
+        self.exam_id = self.db.execute_insert("INSERT INTO exams (title, created_by) VALUES ('Pool', ?)", (self.user_ids[0],))
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level) VALUES (?, ?, 'single_choice', ?)",
+            [(self.exam_id, f"Q{i}", difficulty) for i, difficulty in enumerate(['easy'] * 5 + ['medium'] * 4 + ['hard'] * 2)]
+        )
+        self.assignment_id = self._assignment(use_pool=1)
+        self.db.execute_insert("""
+            INSERT INTO assignment_exam_templates (assignment_id, exam_id, order_index, easy_count, medium_count, hard_count)
+            VALUES (?, ?, 0, 2, 1, 1)
+        """, (self.assignment_id, self.exam_id))
+        self._assign(self.assignment_id, self.user_ids[:3])
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _assignment(self, use_pool: int) -> int:
+        return self.db.execute_insert("""
+            INSERT INTO exam_assignments (exam_id, assignment_name, duration_minutes, passing_score,
+                                          randomize_questions, use_question_pool, created_by)
+            VALUES (?, 'Assignment', 30, 60, 1, ?, ?)
+        """, (self.exam_id, use_pool, self.user_ids[0]))
+
+    def _assign(self, assignment_id, user_ids):
+        self.db.execute_many(
+            "INSERT INTO assignment_users (assignment_id, user_id, granted_by) VALUES (?, ?, ?)",
+            [(assignment_id, user_id, self.user_ids[0]) for user_id in user_ids]
+        )
+
+    def _selection(self, user_id):
+        return self.db.execute_query("""
+            SELECT question_id, difficulty_level, order_index FROM assignment_question_selections
+            WHERE assignment_id = ? AND user_id = ? ORDER BY order_index
+        """, (self.assignment_id, user_id))
+
+    def test_selection_per_assigned_user(self):
+        self.assertEqual(pregenerate_assignment_selections(self.assignment_id, self.db), 3)
+
+        for user_id in self.user_ids[:3]:
+            rows = self._selection(user_id)
+            self.assertEqual(sorted(row['difficulty_level'] for row in rows), ['easy', 'easy', 'hard', 'medium'])
+            self.assertEqual([row['order_index'] for row in rows], [1, 2, 3, 4])
+        self.assertEqual(self._selection(self.user_ids[3]), [])
+        # Nothing was written for a live session
+        self.assertEqual(self.db.execute_single("SELECT COUNT(*) AS n FROM session_questions")['n'], 0)
+
+    def test_only_new_users_without_replace(self):
+        pregenerate_assignment_selections(self.assignment_id, self.db)
+        first_user_selection = self._selection(self.user_ids[0])
+
+        self._assign(self.assignment_id, [self.user_ids[3]])
+        self.assertEqual(pregenerate_assignment_selections(self.assignment_id, self.db, replace=False), 1)
+        self.assertEqual(self._selection(self.user_ids[0]), first_user_selection)
+        self.assertEqual(len(self._selection(self.user_ids[3])), 4)
+
+    def test_overlapping_runs_store_one_selection_per_user(self):
+        """Background runs started by consecutive saves do not duplicate selections."""
+        errors = []
+
+        def run():
+            try:
+                pregenerate_assignment_selections(self.assignment_id, Database(db_path=self.db.db_path), replace=False)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for user_id in self.user_ids[:3]:
+            self.assertEqual([row['order_index'] for row in self._selection(user_id)], [1, 2, 3, 4])
+        # A repeated position is dropped rather than stored twice
+        self.db.execute_insert("""
+            INSERT OR IGNORE INTO assignment_question_selections (assignment_id, user_id, question_id, order_index)
+            VALUES (?, ?, 1, 1)
+        """, (self.assignment_id, self.user_ids[0]))
+        self.assertEqual(len(self._selection(self.user_ids[0])), 4)
+
+    def test_claim_moves_selection_into_session(self):
+        pregenerate_assignment_selections(self.assignment_id, self.db)
+        expected = [row['question_id'] for row in self._selection(self.user_ids[1])]
+
+        seed = self.db.execute_single(
+            "SELECT selection_seed FROM assignment_question_selections WHERE user_id = ?", (self.user_ids[1],)
+        )['selection_seed']
+        questions, claimed_seed, pool_version = _claim_pregenerated_selection(
+            self.db, self.assignment_id, self.user_ids[1], 1700000000
+        )
+        self.assertEqual([q['id'] for q in questions], expected)
+        # The session inherits the seed, so its order can be rebuilt later
+        self.assertEqual(claimed_seed, seed)
+        self.assertTrue(pool_version)
+        self.assertEqual(self._selection(self.user_ids[1]), [])
+        self.assertEqual(self.db.execute_single(
+            "SELECT COUNT(*) AS n FROM session_questions WHERE session_id = 1700000000")['n'], 4)
+
+        # Consumed: a second attempt selects afresh
+        self.assertEqual(_claim_pregenerated_selection(self.db, self.assignment_id, self.user_ids[1], 1700000001)[0], [])
+
+    def test_stale_selection_is_discarded(self):
+        pregenerate_assignment_selections(self.assignment_id, self.db)
+        question_id = self._selection(self.user_ids[0])[0]['question_id']
+        self.db.execute_update("UPDATE questions SET is_active = 0 WHERE id = ?", (question_id,))
+
+        self.assertEqual(_claim_pregenerated_selection(self.db, self.assignment_id, self.user_ids[0], 1700000000)[0], [])
+        self.assertEqual(self._selection(self.user_ids[0]), [])
+        self.assertEqual(self.db.execute_single("SELECT COUNT(*) AS n FROM session_questions")['n'], 0)
+
+    def test_selection_is_discarded_when_pool_changes(self):
+        """A question added or re-scored after generation invalidates the selection."""
+        pregenerate_assignment_selections(self.assignment_id, self.db)
+        self.db.execute_insert(
+            "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level) "
+            "VALUES (?, 'New', 'single_choice', 'hard')", (self.exam_id,)
+        )
+        self.assertEqual(_claim_pregenerated_selection(self.db, self.assignment_id, self.user_ids[0], 1700000000)[0], [])
+
+        question_id = self._selection(self.user_ids[1])[0]['question_id']
+        self.db.execute_update("UPDATE questions SET points = 5 WHERE id = ?", (question_id,))
+        self.assertEqual(_claim_pregenerated_selection(self.db, self.assignment_id, self.user_ids[1], 1700000001)[0], [])
+
+        # Regenerating picks the change up
+        pregenerate_assignment_selections(self.assignment_id, self.db)
+        self.assertEqual(len(_claim_pregenerated_selection(self.db, self.assignment_id, self.user_ids[0], 1700000002)[0]), 4)
+
+    def test_plain_exam_has_nothing_to_pregenerate(self):
+        assignment_id = self._assignment(use_pool=0)
+        self._assign(assignment_id, self.user_ids[:2])
+        self.assertEqual(pregenerate_assignment_selections(assignment_id, self.db), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
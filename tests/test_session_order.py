@@ -0,0 +1,119 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from quiz_app.database.database import Database, create_tables
+from quiz_app.utils.question_selector import (
+    QuestionSelector, load_selection_config, question_pool_version, regenerate_session_questions
+)
+from quiz_app.utils.session_order import SessionOrder, options_are_shuffled, shuffle_options
+
+
+class TestSessionOrder(unittest.TestCase):
+    """Tests for seed-based question and option order."""
+
+    SEED = 987654321
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(db_path=str(Path(self.temp_dir.name) / 'test.db'))
+        create_tables(self.db)
+        self.user_id = self.db.execute_insert(
+            "INSERT INTO users (username, email, password_hash, full_name, role) "
+            "VALUES ('examinee', 'examinee@example.com', 'x', 'Examinee', 'examinee')"
+        )
+        self.exam_id = self.db.execute_insert("""
+            INSERT INTO exams (title, created_by, use_question_pool, randomize_questions,
+                               easy_questions_count, medium_questions_count)
+            VALUES ('Seeded', ?, 1, 1, 3, 2)
+        """, (self.user_id,))
+        self.db.execute_many(
+            "INSERT INTO questions (exam_id, question_text, question_type, difficulty_level) VALUES (?, ?, 'single_choice', ?)",
+            [(self.exam_id, f"Q{i}", 'easy' if i < 8 else 'medium') for i in range(14)]
+        )
+        self.question_ids = [row['id'] for row in self.db.execute_query("SELECT id FROM questions ORDER BY id")]
+        self.db.execute_many(
+            "INSERT INTO question_options (question_id, option_text, is_correct, order_index) VALUES (?, ?, 0, ?)",
+            [(question_id, f"Option {j}", j) for question_id in self.question_ids for j in range(5)]
+        )
+        self.exam_data, self.exam_templates = load_selection_config(self.db, self.exam_id)
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def _select(self, session_id, seed):
+        return QuestionSelector(self.db, seed=seed).select_questions_for_session(self.exam_data, session_id)
+
+    def _store_session(self, session_id, seed):
+        self.db.execute_insert("""
+            INSERT INTO exam_sessions (id, user_id, exam_id, selection_seed, pool_version)
+            VALUES (?, ?, ?, ?, ?)
+        """, (session_id, self.user_id, self.exam_id, seed,
+              question_pool_version(self.db, self.exam_data, self.exam_templates)))
+
+    def test_same_seed_gives_same_selection(self):
+        first = [q['id'] for q in self._select(1, self.SEED)]
+        second = [q['id'] for q in self._select(2, self.SEED)]
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 5)
+
+        regenerated = regenerate_session_questions(self.db, self.exam_data, self.exam_templates, self.SEED)
+        self.assertEqual([q['id'] for q in regenerated], first)
+
+        other_seeds = {tuple(q['id'] for q in self._select(10 + seed, seed)) for seed in range(5)}
+        self.assertGreater(len(other_seeds), 1)
+
+    def test_option_shuffle_is_deterministic(self):
+        options = [{'id': i} for i in range(6)]
+        shuffled = shuffle_options(options, self.SEED, 42)
+        self.assertEqual(shuffled, shuffle_options(options, self.SEED, 42))
+        self.assertEqual(sorted(o['id'] for o in shuffled), list(range(6)))
+        self.assertEqual([o['id'] for o in options], list(range(6)))  # input untouched
+        self.assertNotEqual(
+            {tuple(o['id'] for o in shuffle_options(options, self.SEED, question_id)) for question_id in range(10)},
+            {tuple(range(6))}
+        )
+
+        self.assertTrue(options_are_shuffled({'randomize_questions': 1}, {'question_type': 'single_choice'}))
+        self.assertFalse(options_are_shuffled({'randomize_questions': 1}, {'question_type': 'true_false'}))
+        self.assertFalse(options_are_shuffled({'randomize_questions': 0}, {'question_type': 'single_choice'}))
+
+    def test_session_order_rebuilds_review_order(self):
+        selected = [q['id'] for q in self._select(1700000000, self.SEED)]
+        self._store_session(1700000000, self.SEED)
+
+        order = SessionOrder.load(self.db, 1700000000)
+        self.assertTrue(order.reproducible)
+        self.assertEqual([q['id'] for q in order.questions()], selected)
+
+        question = {'id': selected[0], 'question_type': 'single_choice'}
+        options = self.db.execute_query(
+            "SELECT * FROM question_options WHERE question_id = ? ORDER BY order_index, id", (selected[0],)
+        )
+        self.assertEqual(order.options(question, options), shuffle_options(options, self.SEED, selected[0]))
+
+    def test_changed_pool_is_not_reproducible(self):
+        self._store_session(1700000000, self.SEED)
+        self.db.execute_update("UPDATE questions SET is_active = 0 WHERE id = ?", (self.question_ids[3],))
+
+        order = SessionOrder.load(self.db, 1700000000)
+        self.assertFalse(order.reproducible)
+        self.assertIsNone(order.questions())
+        options = [{'id': 1}, {'id': 2}, {'id': 3}]
+        self.assertEqual(order.options({'id': 1, 'question_type': 'single_choice'}, options), options)
+
+    def test_pool_version_tracks_settings(self):
+        version = question_pool_version(self.db, self.exam_data, self.exam_templates)
+        self.assertEqual(version, question_pool_version(self.db, dict(self.exam_data), []))
+        self.assertNotEqual(version, question_pool_version(self.db, {**self.exam_data, 'easy_questions_count': 4}, []))
+
+    def test_session_without_seed(self):
+        self.db.execute_insert(
+            "INSERT INTO exam_sessions (id, user_id, exam_id) VALUES (5, ?, ?)", (self.user_id, self.exam_id)
+        )
+        self.assertFalse(SessionOrder.load(self.db, 5).reproducible)
+
+
+if __name__ == '__main__':
+    unittest.main()